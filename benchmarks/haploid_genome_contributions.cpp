@@ -0,0 +1,259 @@
+//
+// Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+//
+// This file is part of fwdpy11.
+//
+// fwdpy11 is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// fwdpy11 is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+//
+
+// Compare two ways of calculating the genetic values of all
+// diploids under the multiplicative model, as done once per
+// generation of a simulation:
+//
+// * lookup: cache the contribution of each haploid genome, calling
+//   log1p for every mutation of every genome, then merge the keys
+//   of the two genomes of each diploid, reading the position and
+//   effect of each key from pop.mutations.
+// * effects: fill fwdpy11::haploid_genome_contributions, which
+//   calls log1p once per mutation and stores the position and
+//   effects of each mutation in a contiguous array, then merge
+//   the keys of each diploid using that array.
+//
+// Each "generation" refills the cache, reusing its memory, and
+// the time spent filling it and visiting the diploids is reported
+// separately.
+//
+// The population has ngenomes distinct genomes, each carrying
+// every one of nmutations selected mutations with that
+// mutation's frequency.  The diploids are random pairs of
+// genomes, so that some are homozygous for a whole genome,
+// as happens in a simulation.
+//
+// This program needs the fwdpy11 and fwdpp headers:
+//
+// g++ -std=c++11 -O2 -I fwdpy11/headers -I /path/to/fwdpp
+//     -o haploid_genome_contributions
+//     benchmarks/haploid_genome_contributions.cpp
+// ./haploid_genome_contributions [N] [nmutations] [ngenomes] [repeats]
+//
+// The output is tab-separated.
+
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <cstdlib>
+#include <iostream>
+#include <limits>
+#include <random>
+#include <vector>
+#include <fwdpy11/genetic_values/details/haploid_genome_contributions.hpp>
+
+using contributions = fwdpy11::haploid_genome_contributions<
+    fwdpy11::multiplicative_contributions>;
+
+fwdpy11::DiploidPopulation
+make_population(const fwdpp::uint_t N, const std::size_t nmutations,
+                const std::size_t ngenomes)
+{
+    std::mt19937_64 rng(42);
+    std::uniform_real_distribution<double> uniform(0., 1.);
+    fwdpy11::DiploidPopulation pop(N, 1.0);
+    std::vector<double> frequencies;
+    for (std::size_t i = 0; i < nmutations; ++i)
+        {
+            pop.mutations.emplace_back(uniform(rng), -0.01 * uniform(rng),
+                                       uniform(rng), 0);
+            // Most mutations are rare
+            frequencies.push_back(std::pow(uniform(rng), 4.0));
+        }
+    std::vector<fwdpp::uint_t> by_position(nmutations);
+    for (std::size_t i = 0; i < nmutations; ++i)
+        {
+            by_position[i] = static_cast<fwdpp::uint_t>(i);
+        }
+    std::sort(by_position.begin(), by_position.end(),
+              [&pop](const fwdpp::uint_t a, const fwdpp::uint_t b) {
+                  return pop.mutations[a].pos < pop.mutations[b].pos;
+              });
+    pop.haploid_genomes.clear();
+    for (std::size_t i = 0; i < ngenomes; ++i)
+        {
+            std::vector<fwdpp::uint_t> keys;
+            for (auto k : by_position)
+                {
+                    if (uniform(rng) < frequencies[k])
+                        {
+                            keys.push_back(k);
+                        }
+                }
+            pop.haploid_genomes.emplace_back(
+                0, std::vector<fwdpp::uint_t>(), std::move(keys));
+        }
+    std::uniform_int_distribution<std::size_t> pick(0, ngenomes - 1);
+    for (auto& dip : pop.diploids)
+        {
+            dip.first = pick(rng);
+            dip.second = pick(rng);
+            pop.haploid_genomes[dip.first].n++;
+            pop.haploid_genomes[dip.second].n++;
+        }
+    return pop;
+}
+
+void
+lookup_fill(const fwdpy11::DiploidPopulation& pop,
+            std::vector<double>& values)
+// The cache used before the effects were stored
+{
+    values.assign(pop.haploid_genomes.size(), 0.0);
+    for (std::size_t i = 0; i < pop.haploid_genomes.size(); ++i)
+        {
+            const auto& g = pop.haploid_genomes[i];
+            if (g.n > 0)
+                {
+                    for (auto k : g.smutations)
+                        {
+                            const auto& m = pop.mutations[k];
+                            if (!(m.h * m.s > -1.0))
+                                {
+                                    values[i] = std::numeric_limits<
+                                        double>::quiet_NaN();
+                                    break;
+                                }
+                            values[i] += std::log1p(m.h * m.s);
+                        }
+                }
+        }
+}
+
+double
+lookup_value(const fwdpy11::multiplicative_contributions& p,
+             const std::vector<double>& values,
+             const fwdpy11::DiploidPopulation& pop,
+             const std::size_t diploid_index)
+// The calculation done before the effects were stored
+{
+    const auto& dip = pop.diploids[diploid_index];
+    const double value1 = values[dip.first], value2 = values[dip.second];
+    if (std::isnan(value1) || std::isnan(value2))
+        {
+            return p.product(pop, dip);
+        }
+    const auto& keys1 = pop.haploid_genomes[dip.first].smutations;
+    const auto& keys2 = pop.haploid_genomes[dip.second].smutations;
+    double value = value1 + value2;
+    bool positive = true;
+    fwdpy11::visit_diploid_mutations(
+        keys1.begin(), keys1.end(), keys2.begin(), keys2.end(),
+        [&pop](const fwdpp::uint_t k) { return pop.mutations[k].pos; },
+        [&p, &pop, &value, &positive](const fwdpp::uint_t k,
+                                      const bool homozygous) {
+            if (homozygous)
+                {
+                    const auto& m = pop.mutations[k];
+                    positive = positive && p.scaling * m.s > -1.0;
+                    value += std::log1p(p.scaling * m.s)
+                             - 2.0 * std::log1p(m.h * m.s);
+                }
+        });
+    if (!positive)
+        {
+            return p.product(pop, dip);
+        }
+    return p.finalize(std::exp(value));
+}
+
+struct timing
+{
+    double fill, diploids;
+};
+
+template <typename Fill, typename Value>
+timing
+time_generations(const fwdpy11::DiploidPopulation& pop,
+                 const unsigned repeats, const Fill& fill, const Value& value,
+                 std::vector<double>& output)
+{
+    using clock = std::chrono::steady_clock;
+    timing t{ 0.0, 0.0 };
+    output.assign(pop.diploids.size(), 0.0);
+    // The first generation allocates the cache
+    fill();
+    for (unsigned r = 0; r < repeats; ++r)
+        {
+            auto start = clock::now();
+            fill();
+            auto filled = clock::now();
+            for (std::size_t i = 0; i < pop.diploids.size(); ++i)
+                {
+                    output[i] += value(i);
+                }
+            std::chrono::duration<double> fill_time = filled - start,
+                                          diploid_time
+                                          = clock::now() - filled;
+            t.fill += fill_time.count();
+            t.diploids += diploid_time.count();
+        }
+    return t;
+}
+
+void
+write(const fwdpp::uint_t N, const std::size_t nmutations,
+      const std::size_t ngenomes, const unsigned repeats, const char* method,
+      const timing& t)
+{
+    std::cout << N << '\t' << nmutations << '\t' << ngenomes << '\t'
+              << repeats << '\t' << method << '\t' << t.fill << '\t'
+              << t.diploids << '\t' << t.fill + t.diploids << '\n';
+}
+
+int
+main(int argc, char** argv)
+{
+    const fwdpp::uint_t N
+        = argc > 1 ? std::strtoul(argv[1], nullptr, 10) : 10000;
+    const std::size_t nmutations
+        = argc > 2 ? std::strtoul(argv[2], nullptr, 10) : 2000;
+    const std::size_t ngenomes
+        = argc > 3 ? std::strtoul(argv[3], nullptr, 10) : N;
+    const unsigned repeats
+        = argc > 4 ? std::strtoul(argv[4], nullptr, 10) : 10;
+
+    const auto pop = make_population(N, nmutations, ngenomes);
+    const fwdpy11::multiplicative_contributions p(
+        fwdpp::multiplicative_diploid(fwdpp::fitness(2.0)));
+    std::vector<double> values, lookup_output, effects_output;
+    const auto lookup_time = time_generations(
+        pop, repeats, [&]() { lookup_fill(pop, values); },
+        [&](const std::size_t i) { return lookup_value(p, values, pop, i); },
+        lookup_output);
+    contributions cache;
+    const auto effects_time = time_generations(
+        pop, repeats, [&]() { cache.fill(p, pop); },
+        [&](const std::size_t i) { return cache(p, pop, i); },
+        effects_output);
+    for (std::size_t i = 0; i < pop.diploids.size(); ++i)
+        {
+            if (std::fabs(lookup_output[i] - effects_output[i])
+                > 1e-9 * std::fabs(lookup_output[i]))
+                {
+                    std::cerr << "genetic values disagree\n";
+                    return 1;
+                }
+        }
+    std::cout << "N\tnmutations\tngenomes\trepeats\tmethod\tfill\t"
+                 "diploids\ttotal\n";
+    write(N, nmutations, ngenomes, repeats, "lookup", lookup_time);
+    write(N, nmutations, ngenomes, repeats, "effects", effects_time);
+}
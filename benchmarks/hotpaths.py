@@ -0,0 +1,383 @@
+#
+# Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+#
+# This file is part of fwdpy11.
+#
+# fwdpy11 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# fwdpy11 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+#
+"""
+Time the main simulation and analysis paths of fwdpy11
+over a grid of population sizes (N), scaled neutral
+mutation rates (theta = 4N mu), scaled recombination
+rates (rho = 4Nr) and simplification intervals.
+
+The paths are:
+
+* evolvets, evolve_genomes
+* simplify
+* TreeIterator, VariantIterator, DataMatrixIterator
+* dump_to_file, load_from_file
+* pickle.dumps, pickle.loads
+* dump_tables_to_tskit
+
+Each path is run in a fresh process, so that the peak
+resident set size (RSS) of that process can be attributed to it.
+The population given to the analysis paths is the output of
+evolvets for the same grid point.  Reading that population
+back in is not part of the timing, but does contribute to
+the peak RSS, and so the peak RSS after reading the inputs
+is reported as well.
+
+evolvets is run once for each number of threads given
+by --nthreads.  Its records include the time spent generating
+offspring and calculating fitnesses, and the speedups of the
+whole simulation and of those two phases relative to the
+run with one thread at the same grid point.  The analysis
+paths use the output of the run with the first number of
+threads.  For example,
+
+    python hotpaths.py --paths evolvets --nthreads 1 2 4
+
+measures the benefit of threads for offspring generation.
+
+Results are written as JSON (default) or CSV, one record
+per path, grid point, number of threads, and repeat.
+Paths that do not depend on the simplification interval
+have no interval.
+"""
+import argparse
+import concurrent.futures
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import pickle
+import platform
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import fwdpy11
+
+FIELDS = ['path', 'N', 'theta', 'rho', 'interval', 'nthreads', 'repeat',
+          'seconds', 'offspring_seconds', 'fitness_seconds', 'speedup',
+          'offspring_speedup', 'fitness_speedup', 'baseline_rss_mb',
+          'peak_rss_mb', 'nmutations', 'nnodes', 'nedges', 'nitems']
+
+# The phases of evolvets whose times are reported
+PHASES = {'offspring_seconds': 'offspring_generation',
+          'fitness_seconds': 'fitness_calculation'}
+
+EVOLVE_PATHS = ['evolvets', 'evolve_genomes']
+
+ANALYSIS_PATHS = ['simplify', 'TreeIterator', 'VariantIterator',
+                  'DataMatrixIterator', 'dump_to_file', 'load_from_file',
+                  'pickle.dumps', 'pickle.loads', 'dump_tables_to_tskit']
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--N', type=int, nargs='+', default=[1000, 5000],
+                        help="Diploid population sizes")
+    parser.add_argument('--theta', type=float, nargs='+',
+                        default=[100.],
+                        help="Scaled neutral mutation rates, 4N mu")
+    parser.add_argument('--rho', type=float, nargs='+',
+                        default=[100., 1000.],
+                        help="Scaled recombination rates, 4Nr")
+    parser.add_argument('--intervals', type=int, nargs='+',
+                        default=[10, 100],
+                        help="Simplification intervals")
+    parser.add_argument('--nthreads', type=int, nargs='+', default=[1],
+                        help="Numbers of threads used by evolvets")
+    parser.add_argument('--mu', type=float, default=1e-3,
+                        help="Selected mutation rate")
+    parser.add_argument('--generations', type=float, default=1.0,
+                        help="Number of generations, in units of N")
+    parser.add_argument('--nsam', type=int, default=100,
+                        help="Number of nodes to simplify down to")
+    parser.add_argument('--nwindows', type=int, default=10,
+                        help="Number of windows for DataMatrixIterator")
+    parser.add_argument('--paths', type=str, nargs='+',
+                        default=EVOLVE_PATHS + ANALYSIS_PATHS,
+                        choices=EVOLVE_PATHS + ANALYSIS_PATHS,
+                        help="The paths to time")
+    parser.add_argument('--repeats', type=int, default=1,
+                        help="Number of times to run each path")
+    parser.add_argument('--seed', type=int, default=42,
+                        help="Random number seed")
+    parser.add_argument('--format', type=str, default='json',
+                        choices=['json', 'csv'], help="Output format")
+    parser.add_argument('--output', type=str, default=None,
+                        help="Output file.  Default is to write to stdout.")
+    return parser
+
+
+def peak_rss_mb():
+    """
+    Peak RSS of the calling process, in megabytes.
+    """
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes and macOS reports bytes
+    if sys.platform == 'darwin':
+        return rss / 1024. / 1024.
+    return rss / 1024.
+
+
+def make_params(N, theta, rho, args):
+    pdict = {'gvalue': fwdpy11.Multiplicative(2.),
+             'rates': (theta/(4.*N), args.mu, rho/(4.*N)),
+             'nregions': [fwdpy11.Region(0, 1, 1)],
+             'sregions': [fwdpy11.ExpS(0, 1, 1, -0.05)],
+             'recregions': [fwdpy11.Region(0, 1, 1)],
+             'demography': np.array([N]*int(args.generations*N),
+                                    dtype=np.uint32)
+             }
+    return fwdpy11.ModelParams(**pdict)
+
+
+def table_sizes(pop):
+    return {'nmutations': len(pop.mutations),
+            'nnodes': len(pop.tables.nodes),
+            'nedges': len(pop.tables.edges)}
+
+
+def all_samples(pop):
+    return [i for i in range(2*pop.N)]
+
+
+def count(iterator):
+    n = 0
+    for _ in iterator:
+        n += 1
+    return n
+
+
+def time_evolvets(case, args, input_file):
+    pop = fwdpy11.DiploidPopulation(case['N'], 1.0)
+    params = make_params(case['N'], case['theta'], case['rho'], args)
+    rng = fwdpy11.GSLrng(args.seed + case['repeat'])
+    timings = fwdpy11.EvolvetsTimings()
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    fwdpy11.evolvets(rng, pop, params, case['interval'],
+                     nthreads=case['nthreads'], timings=timings)
+    seconds = time.perf_counter() - start
+    rv = {'seconds': seconds, 'baseline_rss_mb': baseline}
+    for field, phase in PHASES.items():
+        rv[field] = timings.seconds[phase]
+    rv.update(table_sizes(pop))
+    pop.dump_to_file(input_file)
+    return rv
+
+
+def time_evolve_genomes(case, args, input_file):
+    pop = fwdpy11.DiploidPopulation(case['N'])
+    params = make_params(case['N'], case['theta'], case['rho'], args)
+    rng = fwdpy11.GSLrng(args.seed + case['repeat'])
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    fwdpy11.evolve_genomes(rng, pop, params)
+    seconds = time.perf_counter() - start
+    return {'seconds': seconds, 'baseline_rss_mb': baseline,
+            'nmutations': len(pop.mutations)}
+
+
+def time_analysis(case, args, input_file):
+    """
+    Read in the output of evolvets and time one
+    analysis path on it.
+    """
+    path = case['path']
+    pop = fwdpy11.DiploidPopulation.load_from_file(input_file)
+    samples = all_samples(pop)
+    if path == 'simplify':
+        np.random.seed(args.seed + case['repeat'])
+        nsam = min(args.nsam, len(samples))
+        to_keep = sorted(np.random.choice(samples, nsam, replace=False))
+
+        def f():
+            tables, _ = fwdpy11.simplify(pop, to_keep)
+            return len(tables.nodes)
+    elif path == 'TreeIterator':
+        def f():
+            return count(fwdpy11.TreeIterator(pop.tables, samples))
+    elif path == 'VariantIterator':
+        def f():
+            return count(fwdpy11.VariantIterator(pop.tables, samples))
+    elif path == 'DataMatrixIterator':
+        step = pop.tables.genome_length / args.nwindows
+        windows = [(i*step, (i+1)*step) for i in range(args.nwindows)]
+
+        def f():
+            return count(fwdpy11.DataMatrixIterator(pop.tables, samples,
+                                                    windows, True, True))
+    elif path == 'dump_to_file':
+        output_file = input_file + '.dump'
+
+        def f():
+            pop.dump_to_file(output_file)
+            return os.path.getsize(output_file)
+    elif path == 'load_from_file':
+        del pop
+
+        def f():
+            pop = fwdpy11.DiploidPopulation.load_from_file(input_file)
+            return pop.N
+    elif path == 'pickle.dumps':
+        def f():
+            return len(pickle.dumps(pop, -1))
+    elif path == 'pickle.loads':
+        pickled = pickle.dumps(pop, -1)
+        del pop
+
+        def f():
+            pop = pickle.loads(pickled)
+            return pop.N
+    elif path == 'dump_tables_to_tskit':
+        def f():
+            return pop.dump_tables_to_tskit().num_trees
+    else:
+        raise ValueError("unknown path: {}".format(path))
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    nitems = f()
+    seconds = time.perf_counter() - start
+    return {'seconds': seconds, 'baseline_rss_mb': baseline,
+            'nitems': nitems}
+
+
+def run_case(case, args, input_file):
+    """
+    Entry point in the child process.
+    """
+    if case['path'] == 'evolvets':
+        rv = time_evolvets(case, args, input_file)
+    elif case['path'] == 'evolve_genomes':
+        rv = time_evolve_genomes(case, args, input_file)
+    else:
+        rv = time_analysis(case, args, input_file)
+    rv['peak_rss_mb'] = peak_rss_mb()
+    return rv
+
+
+def run_in_new_process(case, args, input_file):
+    # "spawn" rather than "fork" so that the child
+    # does not inherit the parent's memory
+    context = multiprocessing.get_context('spawn')
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=1, mp_context=context) as executor:
+        rv = executor.submit(run_case, case, args, input_file).result()
+    record = {key: None for key in FIELDS}
+    record.update(case)
+    record.update(rv)
+    return record
+
+
+def run(args):
+    paths = set(args.paths)
+    analyses = [i for i in ANALYSIS_PATHS if i in paths]
+    results = []
+    for N, theta, rho in itertools.product(args.N, args.theta, args.rho):
+        for repeat in range(args.repeats):
+            case = {'N': N, 'theta': theta, 'rho': rho, 'repeat': repeat}
+            if 'evolve_genomes' in paths:
+                case.update({'path': 'evolve_genomes', 'interval': None})
+                results.append(run_in_new_process(case, args, None))
+            if 'evolvets' not in paths and len(analyses) == 0:
+                continue
+            for interval in args.intervals:
+                with tempfile.TemporaryDirectory() as tmpdir:
+                    input_file = os.path.join(tmpdir, 'pop.bin')
+                    for nthreads in args.nthreads:
+                        case.update({'path': 'evolvets',
+                                     'interval': interval,
+                                     'nthreads': nthreads})
+                        record = run_in_new_process(
+                            case, args, os.path.join(
+                                tmpdir, 'pop{}.bin'.format(nthreads)))
+                        if 'evolvets' in paths:
+                            results.append(record)
+                    os.rename(os.path.join(
+                        tmpdir, 'pop{}.bin'.format(args.nthreads[0])),
+                        input_file)
+                    case['nthreads'] = None
+                    for path in analyses:
+                        case['path'] = path
+                        results.append(
+                            run_in_new_process(case, args, input_file))
+    add_speedups(results)
+    return results
+
+
+def add_speedups(results):
+    """
+    Add the speedups of each run of evolvets
+    relative to the run with one thread at the
+    same grid point.
+    """
+    def key(r):
+        return (r['N'], r['theta'], r['rho'], r['interval'], r['repeat'])
+
+    serial = {key(r): r for r in results
+              if r['path'] == 'evolvets' and r['nthreads'] == 1}
+    for r in results:
+        if r['path'] != 'evolvets' or key(r) not in serial:
+            continue
+        s = serial[key(r)]
+        for field, seconds in [('speedup', 'seconds'),
+                               ('offspring_speedup', 'offspring_seconds'),
+                               ('fitness_speedup', 'fitness_seconds')]:
+            if r[seconds] > 0.0:
+                r[field] = s[seconds] / r[seconds]
+
+
+def metadata(args):
+    return {'fwdpy11_version': fwdpy11.__version__,
+            'python_version': platform.python_version(),
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'arguments': vars(args)}
+
+
+def write(results, args, f):
+    if args.format == 'json':
+        json.dump({'metadata': metadata(args), 'results': results},
+                  f, indent=1)
+        f.write('\n')
+    else:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for r in results:
+            writer.writerow(r)
+
+
+if __name__ == "__main__":
+    parser = make_parser()
+    args = parser.parse_args(sys.argv[1:])
+
+    results = run(args)
+    if args.output is None:
+        write(results, args, sys.stdout)
+    else:
+        with open(args.output, 'w', newline='') as f:
+            write(results, args, f)
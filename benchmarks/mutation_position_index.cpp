@@ -0,0 +1,185 @@
+//
+// Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+//
+// This file is part of fwdpy11.
+//
+// fwdpy11 is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// fwdpy11 is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+//
+
+// Compare fwdpy11::mutation_position_index to the
+// std::unordered_multimap previously used for a population's
+// mut_lookup.
+//
+// The workload mimics a simulation: each generation,
+// new mutations are added at unique positions (one lookup
+// plus one insertion each), a fraction of the existing
+// mutations are lost (equal_range plus erase), and every
+// "interval" generations the table is rebuilt from scratch,
+// as after removing extinct mutations.
+//
+// This program only needs the fwdpy11 headers:
+//
+// g++ -std=c++11 -O2 -I fwdpy11/headers -o mutation_position_index
+//     benchmarks/mutation_position_index.cpp
+// ./mutation_position_index [nmutations] [generations] [interval]
+//
+// The output is tab-separated.
+
+#include <chrono>
+#include <cstdint>
+#include <cstdlib>
+#include <iostream>
+#include <random>
+#include <stdexcept>
+#include <unordered_map>
+#include <vector>
+#include <fwdpy11/types/mutation_position_index.hpp>
+
+struct workload
+{
+    std::vector<double> positions;
+    std::vector<std::vector<std::uint32_t>> lost;
+
+    workload(const std::size_t nmutations, const unsigned generations)
+        : positions{}, lost(generations)
+    // Each generation adds nmutations/10 mutations, and loses
+    // as many, so that the table size is roughly constant.
+    {
+        std::mt19937_64 rng(42);
+        std::uniform_real_distribution<double> uniform(0., 1.);
+        const auto per_generation = nmutations / 10;
+        for (std::size_t i = 0; i < nmutations; ++i)
+            {
+                positions.push_back(uniform(rng));
+            }
+        std::vector<std::uint32_t> alive(nmutations);
+        for (std::size_t i = 0; i < nmutations; ++i)
+            {
+                alive[i] = static_cast<std::uint32_t>(i);
+            }
+        for (auto& g : lost)
+            {
+                for (std::size_t i = 0; i < per_generation; ++i)
+                    {
+                        std::uniform_int_distribution<std::size_t> pick(
+                            0, alive.size() - 1);
+                        auto j = pick(rng);
+                        g.push_back(alive[j]);
+                        alive[j] = alive.back();
+                        alive.pop_back();
+                    }
+                for (std::size_t i = 0; i < per_generation; ++i)
+                    {
+                        alive.push_back(
+                            static_cast<std::uint32_t>(positions.size()));
+                        positions.push_back(uniform(rng));
+                    }
+            }
+    }
+};
+
+template <typename lookup_table>
+std::size_t
+run(const workload& w, const std::size_t nmutations, const unsigned interval)
+{
+    lookup_table lookup;
+    std::size_t checksum = 0, next = 0;
+    std::vector<bool> alive(w.positions.size(), false);
+    for (; next < nmutations; ++next)
+        {
+            lookup.emplace(w.positions[next], next);
+            alive[next] = true;
+        }
+    for (unsigned generation = 0; generation < w.lost.size(); ++generation)
+        {
+            for (auto i : w.lost[generation])
+                {
+                    auto itr = lookup.equal_range(w.positions[i]);
+                    while (itr.first != itr.second)
+                        {
+                            if (itr.first->second == i)
+                                {
+                                    lookup.erase(itr.first);
+                                    break;
+                                }
+                            ++itr.first;
+                        }
+                    alive[i] = false;
+                }
+            for (std::size_t i = 0; i < w.lost[generation].size(); ++i, ++next)
+                {
+                    if (lookup.find(w.positions[next]) != lookup.end())
+                        {
+                            throw std::runtime_error("position collision");
+                        }
+                    lookup.emplace(w.positions[next], next);
+                    alive[next] = true;
+                }
+            if (interval && (generation + 1) % interval == 0)
+                {
+                    lookup.clear();
+                    lookup.reserve(nmutations);
+                    for (std::size_t i = 0; i < next; ++i)
+                        {
+                            if (alive[i])
+                                {
+                                    lookup.emplace(w.positions[i], i);
+                                }
+                        }
+                }
+            checksum += lookup.size();
+        }
+    return checksum;
+}
+
+template <typename lookup_table>
+double
+time_run(const workload& w, const std::size_t nmutations,
+         const unsigned interval, std::size_t& checksum)
+{
+    auto start = std::chrono::steady_clock::now();
+    checksum = run<lookup_table>(w, nmutations, interval);
+    std::chrono::duration<double> elapsed
+        = std::chrono::steady_clock::now() - start;
+    return elapsed.count();
+}
+
+int
+main(int argc, char** argv)
+{
+    const std::size_t nmutations
+        = argc > 1 ? std::strtoul(argv[1], nullptr, 10) : 100000;
+    const unsigned generations
+        = argc > 2 ? std::strtoul(argv[2], nullptr, 10) : 1000;
+    const unsigned interval
+        = argc > 3 ? std::strtoul(argv[3], nullptr, 10) : 100;
+
+    workload w(nmutations, generations);
+    std::size_t multimap_checksum, index_checksum;
+    auto multimap_time
+        = time_run<std::unordered_multimap<double, std::uint32_t>>(
+            w, nmutations, interval, multimap_checksum);
+    auto index_time = time_run<fwdpy11::mutation_position_index>(
+        w, nmutations, interval, index_checksum);
+    if (multimap_checksum != index_checksum)
+        {
+            std::cerr << "lookup tables disagree\n";
+            return 1;
+        }
+    std::cout << "nmutations\tgenerations\tinterval\ttable\ttime\n";
+    std::cout << nmutations << '\t' << generations << '\t' << interval
+              << "\tunordered_multimap\t" << multimap_time << '\n';
+    std::cout << nmutations << '\t' << generations << '\t' << interval
+              << "\tmutation_position_index\t" << index_time << '\n';
+}
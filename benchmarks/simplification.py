@@ -0,0 +1,130 @@
+#
+# Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+#
+# This file is part of fwdpy11.
+#
+# fwdpy11 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# fwdpy11 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+#
+"""
+Compare full vs incremental sorting of tables prior to
+simplification during :func:`fwdpy11.evolvets`.
+
+For each population size and simplification interval,
+the same model is run with both methods.  The outputs
+are checked for equality and the mean time per simplification
+is reported.
+
+The time spent in a simplification is estimated as the
+time of a generation in which simplification happened minus
+the mean time of generations with no simplification.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+import fwdpy11
+
+
+class GenerationTimer(object):
+    """
+    Used as a stopping criterion, which is called
+    once per generation and is told whether or not
+    the tables were simplified.
+    """
+
+    def __init__(self):
+        self.last = None
+        self.with_simplification = []
+        self.without_simplification = []
+
+    def __call__(self, pop, simplified):
+        now = time.perf_counter()
+        if self.last is not None:
+            if simplified is True:
+                self.with_simplification.append(now - self.last)
+            else:
+                self.without_simplification.append(now - self.last)
+        self.last = now
+        return False
+
+    def time_per_simplification(self):
+        if len(self.with_simplification) == 0:
+            return float('nan')
+        base = 0.0
+        if len(self.without_simplification) > 0:
+            base = np.mean(self.without_simplification)
+        return np.mean(self.with_simplification) - base
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--N', type=int, nargs='+',
+                        default=[1000, 5000, 10000],
+                        help="Diploid population sizes")
+    parser.add_argument('--intervals', type=int, nargs='+',
+                        default=[10, 100, 500],
+                        help="Simplification intervals")
+    parser.add_argument('--generations', type=float, default=2.0,
+                        help="Number of generations, in units of N")
+    parser.add_argument('--rho', type=float, default=1000.,
+                        help="Scaled recombination rate, 4Nr")
+    parser.add_argument('--mu', type=float, default=1e-3,
+                        help="Selected mutation rate")
+    parser.add_argument('--seed', type=int, default=42,
+                        help="Random number seed")
+    return parser
+
+
+def run(N, interval, args, incremental):
+    pdict = {'gvalue': fwdpy11.Multiplicative(2.),
+             'rates': (0., args.mu, args.rho/(4.*N)),
+             'nregions': [],
+             'sregions': [fwdpy11.ExpS(0, 1, 1, -0.05)],
+             'recregions': [fwdpy11.Region(0, 1, 1)],
+             'demography': np.array([N]*int(args.generations*N),
+                                    dtype=np.uint32)
+             }
+    params = fwdpy11.ModelParams(**pdict)
+    pop = fwdpy11.DiploidPopulation(N, 1.0)
+    rng = fwdpy11.GSLrng(args.seed)
+    timer = GenerationTimer()
+    start = time.perf_counter()
+    fwdpy11.evolvets(rng, pop, params, interval,
+                     stopping_criterion=timer,
+                     incremental_simplification=incremental)
+    total = time.perf_counter() - start
+    return pop, total, timer.time_per_simplification()
+
+
+if __name__ == "__main__":
+    parser = make_parser()
+    args = parser.parse_args(sys.argv[1:])
+
+    print("N\tinterval\tmethod\ttotal_time\ttime_per_simplification")
+    for N in args.N:
+        for interval in args.intervals:
+            full = run(N, interval, args, False)
+            incremental = run(N, interval, args, True)
+            if full[0].tables != incremental[0].tables:
+                raise RuntimeError("incremental simplification gave "
+                                   "different tables for N = {}, "
+                                   "interval = {}".format(N, interval))
+            for method, res in zip(['full', 'incremental'],
+                                   [full, incremental]):
+                print("{}\t{}\t{}\t{}\t{}".format(
+                    N, interval, method, res[1], res[2]))
@@ -0,0 +1,199 @@
+#
+# Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+#
+# This file is part of fwdpy11.
+#
+# fwdpy11 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# fwdpy11 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+#
+"""
+Time evolvets for circular stepping-stone models defined
+by a DiscreteDemography.
+
+Each deme exchanges migrants with its two neighbors at
+rate m.  Optionally, demographic events are spread evenly over
+the simulation.  Each event changes the size of one deme and
+then, at the next event, changes it back, so that the model
+is the same for any number of events, and the cost of the event
+generations may be compared to that of the other generations.
+
+The time spent in each phase of a generation is reported
+using fwdpy11.EvolvetsTimings.  Results are written as
+JSON (default) or CSV, one record per grid point and repeat.
+"""
+import argparse
+import csv
+import itertools
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+import scipy.sparse
+
+import fwdpy11
+
+FIELDS = ['ndemes', 'N', 'm', 'nevents', 'repeat', 'generations',
+          'seconds', 'seconds_per_generation', 'nnodes', 'nedges']
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ndemes', type=int, nargs='+', default=[100],
+                        help="Numbers of demes")
+    parser.add_argument('--N', type=int, nargs='+', default=[100],
+                        help="Diploid size of each deme")
+    parser.add_argument('--m', type=float, nargs='+', default=[1e-2],
+                        help="Migration rate between neighboring demes")
+    parser.add_argument('--events', type=int, nargs='+', default=[0, 100],
+                        help="Numbers of demographic events")
+    parser.add_argument('--generations', type=int, default=1000,
+                        help="Number of generations")
+    parser.add_argument('--rho', type=float, default=100.,
+                        help="Scaled recombination rate, 4Nr, "
+                        "where N is the total size")
+    parser.add_argument('--interval', type=int, default=100,
+                        help="Simplification interval")
+    parser.add_argument('--nthreads', type=int, default=1,
+                        help="Number of threads")
+    parser.add_argument('--repeats', type=int, default=1,
+                        help="Number of times to run each grid point")
+    parser.add_argument('--seed', type=int, default=42,
+                        help="Random number seed")
+    parser.add_argument('--format', type=str, default='json',
+                        choices=['json', 'csv'], help="Output format")
+    parser.add_argument('--output', type=str, default=None,
+                        help="Output file.  Default is to write to stdout.")
+    return parser
+
+
+def stepping_stone(ndemes, m):
+    """
+    A sparse migration matrix, so that models with
+    many demes do not need a dense matrix.
+    """
+    demes = np.arange(ndemes)
+    rows = np.tile(demes, 3)
+    cols = np.concatenate((demes, (demes + 1) % ndemes,
+                           (demes - 1) % ndemes))
+    rates = np.repeat([1. - m, m/2., m/2.], ndemes)
+    # Duplicate entries, when ndemes < 3, are summed
+    return scipy.sparse.coo_matrix((rates, (rows, cols)),
+                                   shape=(ndemes, ndemes))
+
+
+def deme_size_changes(ndemes, N, nevents, generations):
+    """
+    Halve the size of a deme and restore it at the next event.
+    """
+    rv = []
+    if nevents == 0:
+        return rv
+    times = np.linspace(0, generations - 1, nevents, dtype=np.uint32)
+    for i, t in enumerate(np.unique(times)):
+        deme = (i//2) % ndemes
+        size = N//2 if i % 2 == 0 else N
+        rv.append(fwdpy11.SetDemeSize(int(t), deme, size))
+    return rv
+
+
+def make_pop(ndemes, N):
+    pop = fwdpy11.DiploidPopulation(ndemes*N, 1.)
+    md = np.array(pop.diploid_metadata, copy=False)
+    md['deme'][:] = np.repeat(np.arange(ndemes, dtype=np.int32), N)
+    return pop
+
+
+def make_params(case, args):
+    demography = fwdpy11.DiscreteDemography(
+        set_deme_sizes=deme_size_changes(case['ndemes'], case['N'],
+                                         case['nevents'], args.generations),
+        migmatrix=stepping_stone(case['ndemes'], case['m']))
+    Ntot = case['ndemes']*case['N']
+    pdict = {'gvalue': fwdpy11.Multiplicative(2.),
+             'rates': (0., 0., args.rho/(4.*Ntot)),
+             'nregions': [],
+             'sregions': [],
+             'recregions': [fwdpy11.Region(0, 1, 1)],
+             'demography': demography,
+             'simlen': args.generations
+             }
+    return fwdpy11.ModelParams(**pdict)
+
+
+def run_case(case, args):
+    pop = make_pop(case['ndemes'], case['N'])
+    params = make_params(case, args)
+    rng = fwdpy11.GSLrng(args.seed + case['repeat'])
+    timings = fwdpy11.EvolvetsTimings()
+    start = time.perf_counter()
+    fwdpy11.evolvets(rng, pop, params, args.interval,
+                     nthreads=args.nthreads, timings=timings)
+    seconds = time.perf_counter() - start
+    rv = dict(case)
+    rv.update({'generations': args.generations,
+               'seconds': seconds,
+               'seconds_per_generation': seconds/args.generations,
+               'nnodes': len(pop.tables.nodes),
+               'nedges': len(pop.tables.edges)})
+    for phase, s in timings.seconds.items():
+        rv[phase] = s
+    return rv
+
+
+def run(args):
+    results = []
+    for ndemes, N, m, nevents in itertools.product(args.ndemes, args.N,
+                                                   args.m, args.events):
+        for repeat in range(args.repeats):
+            case = {'ndemes': ndemes, 'N': N, 'm': m,
+                    'nevents': nevents, 'repeat': repeat}
+            results.append(run_case(case, args))
+    return results
+
+
+def metadata(args):
+    return {'fwdpy11_version': fwdpy11.__version__,
+            'python_version': platform.python_version(),
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'arguments': vars(args)}
+
+
+def write(results, args, f):
+    if args.format == 'json':
+        json.dump({'metadata': metadata(args), 'results': results},
+                  f, indent=1)
+        f.write('\n')
+    else:
+        phases = [i for i in results[0].keys() if i not in FIELDS]
+        writer = csv.DictWriter(f, fieldnames=FIELDS + phases)
+        writer.writeheader()
+        for r in results:
+            writer.writerow(r)
+
+
+if __name__ == "__main__":
+    parser = make_parser()
+    args = parser.parse_args(sys.argv[1:])
+
+    results = run(args)
+    if args.output is None:
+        write(results, args, sys.stdout)
+    else:
+        with open(args.output, 'w', newline='') as f:
+            write(results, args, f)
@@ -44,6 +44,11 @@ def evolve_genomes(rng, pop, params, recorder=None):
         # Will throw exception if anything is wrong:
         params.validate()
 
+    from ._fwdpy11 import DiscreteDemography
+    if isinstance(params.demography, DiscreteDemography):
+        raise ValueError("DiscreteDemography requires tree sequence "
+                         "recording.  Use fwdpy11.evolvets instead.")
+
     from ._fwdpy11 import MutationRegions
     from ._fwdpy11 import evolve_without_tree_sequences
     from ._fwdpy11 import dispatch_create_GeneticMap
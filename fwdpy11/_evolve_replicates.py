@@ -0,0 +1,156 @@
+#
+# Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+#
+# This file is part of fwdpy11.
+#
+# fwdpy11 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# fwdpy11 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import collections
+
+__all__ = ['ReplicateResult', 'evolve_replicates']
+
+ReplicateResult = collections.namedtuple(
+    'ReplicateResult', ['seed', 'pop', 'recorder', 'seconds'])
+ReplicateResult.__doc__ = """
+The output of one replicate run by :func:`fwdpy11.evolve_replicates`.
+
+.. versionadded:: 0.6.0
+"""
+ReplicateResult.seed.__doc__ = "The seed of the random number generator"
+ReplicateResult.pop.__doc__ = "The evolved population"
+ReplicateResult.recorder.__doc__ = "The recorder, or None"
+ReplicateResult.seconds.__doc__ = "The run time of the simulation, in seconds"
+
+
+def evolve_replicates(pop, params, seeds, recorder_factory=None,
+                      simplification_interval=None, max_workers=None,
+                      **kwargs):
+    """
+    Evolve independent replicates of a population using a pool of threads.
+
+    :param pop: The initial population, which is not modified
+    :type pop: :class:`fwdpy11.DiploidPopulation`
+    :param params: simulation parameters
+    :type params: :class:`fwdpy11.ModelParams`
+    :param seeds: One random number seed per replicate
+    :type seeds: iterable
+    :param recorder_factory: (None) A callable returning the recorder for a replicate.
+    :type recorder_factory: callable
+    :param simplification_interval: (None) If not None, replicates are evolved with :func:`fwdpy11.evolvets`.  Otherwise, :func:`fwdpy11.evolve_genomes` is used.
+    :type simplification_interval: int or callable
+    :param max_workers: (None) The number of threads.  See :class:`concurrent.futures.ThreadPoolExecutor`.
+    :type max_workers: int
+    :param kwargs: Additional arguments to :func:`fwdpy11.evolvets`.  Only allowed when `simplification_interval` is not None.
+
+    :returns: A generator of :class:`fwdpy11.ReplicateResult`, in the
+              order in which the replicates finish.
+
+    Each replicate evolves a copy of `pop` using a copy of `params`
+    and a :class:`fwdpy11.GSLrng` initialized with its seed.  Thus,
+    the output of a replicate is the same as the output of a serial
+    simulation with the same seed.
+
+    The GIL is released while the populations evolve, meaning that
+    the replicates run in parallel.  A recorder defined in Python
+    must hold the GIL while it runs, which limits the speedup.
+    The recorders returned by `recorder_factory` should not share
+    data unless that data are protected by a lock.
+
+    Replicates are only started as threads become available, so
+    that the populations of replicates that have been yielded can
+    be freed by the caller.  Closing the generator early cancels
+    the replicates that have not started.
+
+    Simplification schedulers have state, so they cannot be shared
+    among replicates.  Instead, `simplification_interval` may be a
+    callable returning a new :class:`fwdpy11.SimplificationScheduler`
+    for each replicate.  Likewise, a :class:`fwdpy11.EvolvetsTimings`
+    cannot be passed on to :func:`fwdpy11.evolvets`.
+
+    :func:`fwdpy11.evolve_genomes` takes no additional arguments, so
+    a ValueError is raised if `kwargs` are given without a
+    `simplification_interval`.
+
+    .. versionadded:: 0.6.0
+    """
+    import concurrent.futures
+    import copy
+    import itertools
+    import os
+    import time
+    from ._fwdpy11 import GSLrng
+    from ._evolve_genomes import evolve_genomes
+    from ._evolvets import evolvets
+    from ._fwdpy11 import SimplificationScheduler
+
+    if isinstance(simplification_interval, SimplificationScheduler):
+        raise ValueError("a SimplificationScheduler cannot be shared "
+                         "among replicates")
+    if simplification_interval is None and kwargs:
+        raise ValueError("additional arguments are only passed to "
+                         "evolvets, which requires a "
+                         "simplification_interval")
+    if kwargs.get('timings') is not None:
+        raise ValueError("an EvolvetsTimings cannot be shared "
+                         "among replicates")
+    seeds = list(seeds)
+
+    def run(seed):
+        # Genetic value objects hold buffers and state,
+        # so each replicate needs its own parameters.
+        rpop = copy.deepcopy(pop)
+        rparams = copy.deepcopy(params)
+        rng = GSLrng(seed)
+        recorder = None
+        if recorder_factory is not None:
+            recorder = recorder_factory()
+        start = time.perf_counter()
+        if simplification_interval is None:
+            evolve_genomes(rng, rpop, rparams, recorder)
+        else:
+            interval = simplification_interval
+            if callable(interval):
+                interval = interval()
+            evolvets(rng, rpop, rparams, interval, recorder, **kwargs)
+        return ReplicateResult(seed, rpop, recorder,
+                               time.perf_counter() - start)
+
+    def results():
+        # At most nworkers replicates are queued or running, so that
+        # populations are only kept until they have been yielded.
+        nworkers = max_workers
+        if nworkers is None:
+            nworkers = min(32, (os.cpu_count() or 1) + 4)
+        remaining = iter(seeds)
+        pool = concurrent.futures.ThreadPoolExecutor(nworkers)
+        pending = set(pool.submit(run, seed)
+                      for seed in itertools.islice(remaining, nworkers))
+        try:
+            while pending:
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for seed in itertools.islice(remaining, len(done)):
+                    pending.add(pool.submit(run, seed))
+                while done:
+                    yield done.pop().result()
+        finally:
+            # Only reached with pending futures if the generator
+            # is closed early.  Replicates that have not started
+            # are cancelled, and running ones are not waited for.
+            for f in pending:
+                f.cancel()
+            pool.shutdown(wait=not pending)
+
+    return results()
@@ -23,7 +23,9 @@ def evolvets(rng, pop, params, simplification_interval, recorder=None,
              suppress_table_indexing=False, record_gvalue_matrix=False,
              stopping_criterion=None,
              track_mutation_counts=False,
-             remove_extinct_variants=True):
+             remove_extinct_variants=True,
+             incremental_simplification=False,
+             nthreads=1, timings=None):
     """
     Evolve a population with tree sequence recording
 
@@ -33,8 +35,8 @@ def evolvets(rng, pop, params, simplification_interval, recorder=None,
     :type pop: :class:`fwdpy11.DiploidPopulation`
     :param params: simulation parameters
     :type params: :class:`fwdpy11.ModelParams`
-    :param simplification_interval: Number of generations between simplifications.
-    :type simplification_interval: int
+    :param simplification_interval: Number of generations between simplifications, or an object deciding when to simplify.
+    :type simplification_interval: int or :class:`fwdpy11.SimplificationScheduler`
     :param recorder: (None) A temporal sampler/data recorder.
     :type recorder: callable
     :param post_simplification_recorder: (None) A temporal sampler
@@ -43,6 +45,12 @@ def evolvets(rng, pop, params, simplification_interval, recorder=None,
     :type suppress_table_indexing: boolean
     :param record_gvalue_matrix: (False) Whether to record genetic values into :attr:`fwdpy11.PopulationBase.genetic_values`.
     :type record_gvalue_matrix: boolean
+    :param incremental_simplification: (False) Only sort the edges and mutations added since the previous simplification.
+    :type incremental_simplification: boolean
+    :param nthreads: (1) Number of threads used to generate offspring and to calculate genetic values and fitnesses.
+    :type nthreads: int
+    :param timings: (None) If not None, the time spent in each phase of a generation is added to this object.
+    :type timings: :class:`fwdpy11.EvolvetsTimings`
 
     The recording of genetic values into :attr:`fwdpy11.PopulationBase.genetic_values` is suppressed by default.  First, it
     is redundant with :attr:`fwdpy11.DiploidMetadata.g` for the common case of mutational effects on a single trait.
@@ -62,6 +70,71 @@ def evolvets(rng, pop, params, simplification_interval, recorder=None,
 
         Added post_simplification_recorder.
 
+    .. versionadded:: 0.6.0
+
+        Added incremental_simplification.  The output of a simulation
+        is the same whether or not this option is used.  The tables
+        output by a simplification are sorted, so only the newly-recorded
+        data need to be sorted prior to the next simplification.
+
+    .. versionchanged:: 0.6.0
+
+        simplification_interval may be a :class:`fwdpy11.SimplificationScheduler`.
+        The scheduler is queried once per generation and its records
+        describe each simplification.
+
+    .. versionadded:: 0.6.0
+
+        Added nthreads.  When nthreads > 1, the genomes of offspring
+        are constructed in parallel.  All random numbers are still
+        generated by a single thread, so the output depends on the
+        seed but not on the number of threads.  However, the output
+        differs from that obtained with nthreads = 1, which generates
+        random numbers in a different order.
+        The genetic values and fitnesses of the built-in genetic value
+        types are also calculated in parallel.  These calculations give
+        the same results for any number of threads.
+
+    .. versionchanged:: 0.6.0
+
+        The GIL is released while the population evolves.
+        It is reacquired to call any recorder or stopping
+        criterion defined in Python, so simulations using
+        the built-in types may run in parallel in Python threads.
+        See :func:`fwdpy11.evolve_replicates`.
+
+    .. versionadded:: 0.6.0
+
+        Added timings.  When timings is None, the phases
+        of a generation are not timed.
+
+    .. versionadded:: 0.6.0
+
+        :attr:`fwdpy11.ModelParams.demography` may be a
+        :class:`fwdpy11.DiscreteDemography`, in which case
+        :attr:`fwdpy11.ModelParams.simlen` generations are
+        simulated.  The deme of each individual is taken from
+        :attr:`fwdpy11.DiploidMetadata.deme` and is recorded
+        in the nodes of its genomes.  Selfing rates are set by
+        :class:`fwdpy11.SetSelfingRate` events, so
+        :attr:`fwdpy11.ModelParams.pself` must be zero.
+        The generations with demographic events are found
+        when the simulation starts, and no work is done
+        for the events in other generations.
+
+    .. versionchanged:: 0.6.0
+
+        If the selected mutation rate is zero, no individual
+        has selected mutations, and the genetic value is a
+        :class:`fwdpy11.Additive`, :class:`fwdpy11.Multiplicative`,
+        or :class:`fwdpy11.GBR` with :class:`fwdpy11.NoNoise`
+        and :class:`fwdpy11.GeneticValueIsFitness`, then all
+        individuals have the same fitness.  Parents are then
+        sampled uniformly.  The metadata of individuals are only
+        updated before they may be used by recorders, stopping
+        criteria, or a :class:`fwdpy11.DiscreteDemography`, and
+        at the end of the simulation.
+
     """
     import warnings
 
@@ -86,6 +159,12 @@ def evolvets(rng, pop, params, simplification_interval, recorder=None,
         from ._fwdpy11 import _no_stopping
         stopping_criterion = _no_stopping
 
+    from ._fwdpy11 import SimplificationScheduler
+    if not isinstance(simplification_interval, SimplificationScheduler):
+        from ._fwdpy11 import FixedSimplificationInterval
+        simplification_interval = FixedSimplificationInterval(
+            simplification_interval)
+
     from ._fwdpy11 import MutationRegions
     from ._fwdpy11 import dispatch_create_GeneticMap
     from ._fwdpy11 import evolve_with_tree_sequences
@@ -97,6 +176,28 @@ def evolvets(rng, pop, params, simplification_interval, recorder=None,
 
     from ._fwdpy11 import SampleRecorder
     sr = SampleRecorder()
+    from ._fwdpy11 import DiscreteDemography
+    if isinstance(params.demography, DiscreteDemography):
+        if params.pself != 0.0:
+            raise ValueError("pself must be zero when demography is a "
+                             "DiscreteDemography.  Use SetSelfingRate "
+                             "instead.")
+        from ._fwdpy11 import evolve_with_tree_sequences_and_discrete_demography
+        evolve_with_tree_sequences_and_discrete_demography(
+            rng, pop, sr, simplification_interval,
+            params.demography, params.simlen,
+            params.mutrate_n, params.mutrate_s,
+            mm, rm, params.gvalue,
+            recorder, stopping_criterion,
+            params.prune_selected is False,
+            suppress_table_indexing, record_gvalue_matrix,
+            track_mutation_counts,
+            remove_extinct_variants,
+            reset_treeseqs_after_simplify,
+            post_simplification_recorder,
+            incremental_simplification,
+            nthreads, timings)
+        return
     evolve_with_tree_sequences(rng, pop, sr, simplification_interval,
                                params.demography, params.mutrate_n, params.mutrate_s,
                                mm, rm, params.gvalue,
@@ -106,4 +207,6 @@ def evolvets(rng, pop, params, simplification_interval, recorder=None,
                                track_mutation_counts,
                                remove_extinct_variants,
                                reset_treeseqs_after_simplify,
-                               post_simplification_recorder)
+                               post_simplification_recorder,
+                               incremental_simplification,
+                               nthreads, timings)
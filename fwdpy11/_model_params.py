@@ -35,6 +35,7 @@ class ModelParams(object):
         self.__sregions = None
         self.__recregions = None
         self.__demography = None
+        self.__simlen = None
         self.__prune_selected = True
         self.__rates = None
         self.__gvalue = None
@@ -111,6 +112,26 @@ class ModelParams(object):
     def demography(self, value):
         self.__demography = value
 
+    @property
+    def simlen(self):
+        """
+        Get or set the number of generations to simulate.
+        Required when :attr:`demography` is a
+        :class:`fwdpy11.DiscreteDemography`, and ignored
+        otherwise.
+
+        .. versionadded:: 0.6.0
+        """
+        return self.__simlen
+
+    @simlen.setter
+    def simlen(self, value):
+        if value is not None:
+            value = int(value)
+            if value <= 0:
+                raise ValueError("simlen must be > 0")
+        self.__simlen = value
+
     @property
     def gvalue(self):
         """
@@ -183,6 +204,11 @@ class ModelParams(object):
             raise TypeError("recombination regions cannot be None")
         if self.demography is None:
             raise TypeError("demography cannot be None")
+        from ._fwdpy11 import DiscreteDemography
+        if isinstance(self.demography, DiscreteDemography):
+            if self.simlen is None:
+                raise TypeError(
+                    "simlen cannot be None when demography is a DiscreteDemography")
         if self.prune_selected is None:
             raise TypeError("prune_selected cannot be None")
         if self.gvalue is None:
@@ -73,27 +73,9 @@ def _traverse_sample_timepoints(self, include_alive=True):
         yield self.generation, nodes, md
 
 
-# NOTE: mutation origin times are recorded forwards in time,
-# So we convert them into mutation ages.
-def _generate_mutation_metadata(self):
-    muts = []
-    for mr in self.tables.mutations:
-        m = self.mutations[mr.key]
-        d = {'s': m.s,
-             'h': m.h,
-             'age': self.generation - m.g + 1,
-             'label': m.label,
-             'esizes': list(m.esizes),
-             'heffects': list(m.heffects),
-             'neutral': m.neutral,
-             'key': mr.key}
-        muts.append(str(d).encode('utf-8'))
-    return tskit.pack_bytes(muts)
-
-
-def _initializePopulationTable(node_view, tc):
+def _initializePopulationTable(population, tc):
     population_metadata = []
-    for i in sorted(np.unique(node_view['population'])):
+    for i in sorted(np.unique(population)):
         md = "deme"+str(i)
         population_metadata.append(md.encode("utf-8"))
 
@@ -101,59 +83,38 @@ def _initializePopulationTable(node_view, tc):
     tc.populations.set_columns(metadata=pmd, metadata_offset=pmdo)
 
 
-def _generate_individual_metadata(dmd, tc):
-    strings = []
-    for i in dmd:
-        d = {'g': i.g,
-             'e': i.e,
-             'w': i.w,
-             'geography': i.geography,
-             'parents': i.parents,
-             'sex': i.sex,
-             'deme': i.deme,
-             'label': i.label}
-        strings.append(str(d).encode("utf-8"))
-    return strings
-
-
-def _initializeIndividualTable(self, tc):
-    """
-    Returns node ID -> individual map
-    """
-    # First, alive individuals:
-    individal_nodes = {}
-    for i in range(self.N):
-        individal_nodes[2*i] = i
-        individal_nodes[2*i+1] = i
-    metadata_strings = _generate_individual_metadata(self.diploid_metadata, tc)
-
-    # Now, preserved nodes
-    num_ind_nodes = self.N
-    for i in self.ancient_sample_metadata:
-        assert i not in individal_nodes, "indivudal record error"
-        individal_nodes[i.nodes[0]] = num_ind_nodes
-        individal_nodes[i.nodes[1]] = num_ind_nodes
-        num_ind_nodes += 1
-
-    metadata_strings.extend(_generate_individual_metadata(
-        self.ancient_sample_metadata, tc))
-
-    md, mdo = tskit.pack_bytes(metadata_strings)
-    flags = [0 for i in range(self.N+len(self.ancient_sample_metadata))]
-    tc.individuals.set_columns(flags=flags, metadata=md, metadata_offset=mdo)
-    return individal_nodes
-
-
-def _dump_tables_to_tskit(self):
+def _dump_tables_to_tskit(self, binary_metadata=False):
     """
     Dump the population's TableCollection into
     an tskit TreeSequence
 
+    :param binary_metadata: If True, encode metadata in binary.
+    :type binary_metadata: bool
+
     :rtype: tskit.TreeSequence
+
+    By default, the metadata of individuals and mutations
+    are the string representations of Python dicts, which
+    may be decoded with :func:`eval`.
+
+    If binary_metadata is True, the metadata are packed, little-endian
+    structs that may be decoded with :func:`struct.unpack_from`.
+    The metadata of individuals have format ``"<6d2Q2iQ"``,
+    whose fields are g, e, w, geography (3 values), parents (2 values),
+    sex, deme, and label. The metadata of mutations have format
+    ``"<2dqHBQ2I"``, whose fields are s, h, age, label, neutral, key,
+    and the lengths of esizes and heffects.  These are followed by
+    the values of esizes and heffects, as little-endian doubles.
+
+    .. versionchanged:: 0.6.0
+
+        Columns and metadata are generated in C++.
+        Added binary_metadata.
     """
-    node_view = np.array(self.tables.nodes, copy=True)
-    node_view['time'] -= node_view['time'].max()
-    node_view['time'][np.where(node_view['time'] != 0.0)[0]] *= -1.0
+    from .._fwdpy11 import _tskit_node_columns, _tskit_site_positions
+    from .._fwdpy11 import _tskit_individual_metadata
+    from .._fwdpy11 import _tskit_mutation_metadata
+    flags, time, population, individual = _tskit_node_columns(self)
     edge_view = np.array(self.tables.edges, copy=False)
     mut_view = np.array(self.tables.mutations, copy=False)
 
@@ -165,25 +126,20 @@ def _dump_tables_to_tskit(self):
     # other than -1 in an tskit.NodeTable will
     # raise an exception if the PopulationTable
     # isn't set up.
-    _initializePopulationTable(node_view, tc)
-    node_to_individual = _initializeIndividualTable(self, tc)
-
-    individual = [-1 for i in range(len(node_view))]
-    for k, v in node_to_individual.items():
-        individual[k] = v
-    flags = [1]*2*self.N + [0]*(len(node_view) - 2*self.N)
-    # Bug fixed in 0.3.1: add preserved nodes to samples list
-    for i in self.tables.preserved_nodes:
-        flags[i] = 1
-    tc.nodes.set_columns(flags=flags, time=node_view['time'],
-                         population=node_view['population'],
+    _initializePopulationTable(population, tc)
+    md, mdo = _tskit_individual_metadata(self, binary_metadata)
+    tc.individuals.set_columns(flags=np.zeros(len(mdo) - 1, dtype=np.uint32),
+                               metadata=md, metadata_offset=mdo)
+
+    tc.nodes.set_columns(flags=flags, time=time,
+                         population=population,
                          individual=individual)
     tc.edges.set_columns(left=edge_view['left'],
                          right=edge_view['right'],
                          parent=edge_view['parent'],
                          child=edge_view['child'])
 
-    mpos = np.array([self.mutations[i].pos for i in mut_view['key']])
+    mpos = _tskit_site_positions(self)
     ancestral_state = np.zeros(len(mut_view), dtype=np.int8)+ord('0')
     ancestral_state_offset = np.arange(len(mut_view)+1, dtype=np.uint32)
     tc.sites.set_columns(position=mpos,
@@ -191,7 +147,7 @@ def _dump_tables_to_tskit(self):
                          ancestral_state_offset=ancestral_state_offset)
 
     derived_state = np.zeros(len(mut_view), dtype=np.int8)+ord('1')
-    md, mdo = _generate_mutation_metadata(self)
+    md, mdo = _tskit_mutation_metadata(self, binary_metadata)
     tc.mutations.set_columns(site=np.arange(len(mpos), dtype=np.int32),
                              node=mut_view['node'],
                              derived_state=derived_state,
@@ -201,7 +157,26 @@ def _dump_tables_to_tskit(self):
     return tc.tree_sequence()
 
 
+def _diploid_population_from_arrays(arrays):
+    from .._fwdpy11 import DiploidPopulation
+    return DiploidPopulation._from_arrays(arrays)
+
+
+def _reduce_ex(self, protocol):
+    """
+    With pickle protocol 5 or higher, the population is
+    pickled as numpy arrays, which may be sent out-of-band
+    as :class:`pickle.PickleBuffer` objects.
+
+    .. versionadded:: 0.6.0
+    """
+    if protocol >= 5:
+        return (_diploid_population_from_arrays, (self._to_arrays(),))
+    return object.__reduce_ex__(self, protocol)
+
+
 def _patch_diploid_population(d):
     d.alive_nodes = property(_alive_nodes)
     d.sample_timepoints = _traverse_sample_timepoints
     d.dump_tables_to_tskit = _dump_tables_to_tskit
+    d.__reduce_ex__ = _reduce_ex
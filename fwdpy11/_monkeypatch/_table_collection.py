@@ -0,0 +1,95 @@
+#
+# Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+#
+# This file is part of fwdpy11.
+#
+# fwdpy11 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# fwdpy11 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import struct
+import numpy as np
+
+# See fwdpy11/headers/fwdpy11/serialization/sections.hpp
+_SECTIONS_MAGIC = b"fp11sect"
+_SECTIONS_FORMAT_VERSION = 1
+
+
+def _read_sections_index(f):
+    """
+    Returns a dict mapping section names to
+    (compressed, offset, stored size, size).
+    """
+    if f.read(len(_SECTIONS_MAGIC)) != _SECTIONS_MAGIC:
+        raise ValueError("file is not a population sections file")
+    version, nsections = struct.unpack("=iQ", f.read(12))
+    if version > _SECTIONS_FORMAT_VERSION:
+        raise ValueError("file format version is newer than "
+                         "this version of fwdpy11")
+    index = {}
+    for i in range(nsections):
+        length = struct.unpack("=I", f.read(4))[0]
+        name = f.read(length).decode("utf-8")
+        index[name] = struct.unpack("=B3Q", f.read(25))
+    return index
+
+
+def _memmap_sections_file(filename):
+    """
+    Memory-map the tables in a file written by
+    :func:`fwdpy11.DiploidPopulation.dump_sections_to_file`.
+
+    :param filename: The file name
+    :type filename: str
+
+    :returns: Read-only arrays for nodes, edges, sites, mutations,
+              and preserved_nodes, keyed by name.
+    :rtype: dict
+
+    The arrays have the same dtypes as numpy arrays created
+    from :class:`fwdpy11.TableCollection`.  The file is not read
+    into memory, which allows analysis of very large tables.
+
+    The file must have been written without compression.
+
+    .. versionadded:: 0.6.0
+    """
+    from .._fwdpy11 import NodeTable, EdgeTable, SiteTable, MutationTable
+    dtypes = {'nodes': np.array(NodeTable(), copy=False).dtype,
+              'edges': np.array(EdgeTable(), copy=False).dtype,
+              'sites': np.array(SiteTable(), copy=False).dtype,
+              'mutations': np.array(MutationTable(), copy=False).dtype,
+              'preserved_nodes': np.dtype(np.int32)}
+    with open(filename, "rb") as f:
+        index = _read_sections_index(f)
+        rv = {}
+        for name, dtype in dtypes.items():
+            compressed, offset, stored_size, size = index["tables." + name]
+            if compressed:
+                raise ValueError("cannot memory-map compressed section "
+                                 "tables." + name)
+            f.seek(offset)
+            # Each table is its length followed by its rows
+            n = struct.unpack("=Q", f.read(8))[0]
+            if n == 0:
+                a = np.zeros(0, dtype=dtype)
+                a.flags.writeable = False
+            else:
+                a = np.memmap(filename, dtype=dtype, mode='r',
+                              offset=offset + 8, shape=(n,))
+            rv[name] = a
+    return rv
+
+
+def _patch_table_collection(t):
+    t.memmap_sections_file = staticmethod(_memmap_sections_file)
@@ -186,14 +186,14 @@ namespace fwdpy11
                 return { v.cbegin(), v.cend() };
             }
 
-            template <typename T>
+            template <typename E, typename T>
             void
-            update_event_times(std::uint32_t t, T& range)
+            update_event_times(std::uint32_t t, const std::vector<E>& events,
+                               T& range)
             {
                 range.get().first = std::lower_bound(
-                    range.get().first, range.get().second, t,
-                    [](const typename T::value_type::first_type::value_type v,
-                       std::uint32_t t) { return v.when < t; });
+                    events.cbegin(), range.get().second, t,
+                    [](const E& v, std::uint32_t t) { return v.when < t; });
             }
 
           public:
@@ -242,17 +242,19 @@ namespace fwdpy11
             // When a simulation starts with the population's generation time
             // not at zero, then we assume that the pop'n has been evolved
             // and we may need to update the iterators accordingly.
-            // NOTE: needs test.
+            // The iterators are set from the start of each event vector,
+            // so that an instance may be used for more than one simulation.
             {
-                update_event_times(current_pop_generation,
+                update_event_times(current_pop_generation, mass_migrations,
                                    mass_migration_tracker);
-                update_event_times(current_pop_generation,
+                update_event_times(current_pop_generation, set_growth_rates,
                                    growth_rate_change_tracker);
-                update_event_times(current_pop_generation,
+                update_event_times(current_pop_generation, set_deme_sizes,
                                    deme_size_change_tracker);
-                update_event_times(current_pop_generation,
+                update_event_times(current_pop_generation, set_selfing_rates,
                                    selfing_rate_change_tracker);
                 update_event_times(current_pop_generation,
+                                   set_migration_rates,
                                    migration_rate_change_tracker);
             }
         };
@@ -20,11 +20,13 @@
 #ifndef FWDPY11_MIGRATION_MATRIX_HPP
 #define FWDPY11_MIGRATION_MATRIX_HPP
 
+#include <cstdint>
 #include <vector>
 #include <memory>
 #include <numeric>
 #include <algorithm>
 #include <cmath>
+#include <stdexcept>
 #include <fwdpp/gsl_discrete.hpp>
 #include "constants.hpp"
 
@@ -32,58 +34,189 @@ namespace fwdpy11
 {
     namespace discrete_demography
     {
+        inline void
+        validate_sparse_migration_rates(
+            const std::size_t ncols,
+            const std::vector<std::size_t>& row_offsets,
+            const std::vector<std::int32_t>& destinations,
+            const std::vector<double>& rates)
+        /// Validate rows of migration rates in compressed
+        /// sparse row form.  See MigrationMatrix.
+        {
+            if (row_offsets.empty() || row_offsets.front() != 0
+                || row_offsets.back() != destinations.size()
+                || destinations.size() != rates.size())
+                {
+                    throw std::invalid_argument(
+                        "invalid sparse migration rates");
+                }
+            for (std::size_t i = 1; i < row_offsets.size(); ++i)
+                {
+                    if (row_offsets[i] < row_offsets[i - 1])
+                        {
+                            throw std::invalid_argument(
+                                "invalid sparse migration rates");
+                        }
+                    double sum = 0.0;
+                    for (auto j = row_offsets[i - 1]; j < row_offsets[i]; ++j)
+                        {
+                            if (destinations[j] < 0
+                                || static_cast<std::size_t>(destinations[j])
+                                       >= ncols)
+                                {
+                                    throw std::invalid_argument(
+                                        "destination deme index out of "
+                                        "range");
+                                }
+                            if (j > row_offsets[i - 1]
+                                && destinations[j] <= destinations[j - 1])
+                                {
+                                    throw std::invalid_argument(
+                                        "destination demes must be sorted "
+                                        "and unique within a row");
+                                }
+                            auto v = rates[j];
+                            if (v < 0.0)
+                                {
+                                    throw std::invalid_argument(
+                                        "migration rates must be "
+                                        "non-negative");
+                                }
+                            if (!std::isfinite(v))
+                                {
+                                    throw std::invalid_argument(
+                                        "migration rates must be finite");
+                                }
+                            sum += v;
+                        }
+                    if (!std::isfinite(sum))
+                        {
+                            throw std::invalid_argument(
+                                "migration rates must have a finite sum");
+                        }
+                }
+        }
+
+        inline void
+        append_sparse_migration_rates(const double* row,
+                                      const std::size_t ncols,
+                                      std::vector<std::size_t>& row_offsets,
+                                      std::vector<std::int32_t>& destinations,
+                                      std::vector<double>& rates)
+        /// Add a dense row of rates to rows in compressed
+        /// sparse row form.  Zeros are skipped.
+        {
+            for (std::size_t j = 0; j < ncols; ++j)
+                {
+                    // Negative and non-finite values are kept
+                    // so that validation reports them.
+                    if (row[j] != 0.0)
+                        {
+                            destinations.push_back(
+                                static_cast<std::int32_t>(j));
+                            rates.push_back(row[j]);
+                        }
+                }
+            row_offsets.push_back(destinations.size());
+        }
+
         class MigrationMatrix
+        /// A square matrix of migration rates.  Rows are source
+        /// demes and columns are destination demes.
+        ///
+        /// The matrix is stored in compressed sparse row (CSR) form,
+        /// so that memory use and the cost of changes are proportional
+        /// to the number of nonzero rates.  The rates from source deme i
+        /// are in rates[row_offsets[i]] to rates[row_offsets[i + 1] - 1],
+        /// and the same elements of destinations are their destination
+        /// demes, in increasing order.
         {
           private:
-            void
-            validate_row(std::size_t i) const
+            static std::vector<std::size_t>
+            dense_to_sparse(const std::vector<double>& matrix,
+                            const std::size_t nrows, const std::size_t ncols,
+                            std::vector<std::int32_t>& destinations,
+                            std::vector<double>& rates)
             {
-                if (i * npops >= M.size())
+                std::vector<std::size_t> row_offsets(1, 0);
+                for (std::size_t i = 0; i < nrows; ++i)
                     {
-                        throw std::invalid_argument(
-                            "MigrationMatrix: row index out of range");
+                        append_sparse_migration_rates(
+                            matrix.data() + i * ncols, ncols, row_offsets,
+                            destinations, rates);
                     }
-                for (std::size_t j = i * npops; j < i * npops + npops; ++j)
+                return row_offsets;
+            }
+
+            void
+            validate_all_row_sums() const
+            {
+                if (row_offsets.size() != npops + 1)
                     {
-                        auto v = M[j];
-                        if (v < 0.0)
-                            {
-                                throw std::invalid_argument(
-                                    "migration rates must be non-negative");
-                            }
-                        if (!std::isfinite(v))
-                            {
-                                throw std::invalid_argument(
-                                    "migration rates must be finite");
-                            }
+                        throw std::invalid_argument(
+                            "MigrationMatrix must be square");
                     }
+                validate_sparse_migration_rates(npops, row_offsets,
+                                                destinations, rates);
             }
 
             void
-            validate_all_row_sums() const
+            replace_row(const std::size_t source,
+                        const std::vector<std::size_t>& new_offsets,
+                        const std::vector<std::int32_t>& new_destinations,
+                        const std::vector<double>& new_rates)
             {
-                for (std::size_t i = 0; i < npops; ++i)
+                const auto b = row_offsets[source],
+                           e = row_offsets[source + 1];
+                destinations.erase(destinations.begin() + b,
+                                   destinations.begin() + e);
+                destinations.insert(destinations.begin() + b,
+                                    new_destinations.begin(),
+                                    new_destinations.end());
+                rates.erase(rates.begin() + b, rates.begin() + e);
+                rates.insert(rates.begin() + b, new_rates.begin(),
+                             new_rates.end());
+                const auto n = new_offsets.back();
+                for (auto i = source + 1; i <= npops; ++i)
                     {
-                        validate_row(i);
+                        row_offsets[i] = row_offsets[i] - (e - b) + n;
                     }
             }
 
           public:
-            std::vector<double> M;
+            std::vector<std::size_t> row_offsets;
+            std::vector<std::int32_t> destinations;
+            std::vector<double> rates;
             const std::size_t npops;
             const bool scaled;
 
-            template <typename T>
-            MigrationMatrix(T&& matrix, std::size_t nrows,
-                            const bool scaled_rates)
-                : M(std::forward<T>(matrix)), npops(nrows),
+            MigrationMatrix(const std::vector<double>& matrix,
+                            std::size_t nrows, const bool scaled_rates)
+                /// Construct from a dense matrix in row-major order
+                : row_offsets(), destinations(), rates(), npops(nrows),
                   scaled(scaled_rates)
             {
-                if (M.size() % nrows != 0.0)
+                if (matrix.size() != nrows * nrows)
                     {
                         throw std::invalid_argument(
                             "MigrationMatrix must be square");
                     }
+                row_offsets = dense_to_sparse(matrix, nrows, nrows,
+                                              destinations, rates);
+                validate_all_row_sums();
+            }
+
+            MigrationMatrix(std::size_t nrows,
+                            std::vector<std::size_t> offsets,
+                            std::vector<std::int32_t> destination_demes,
+                            std::vector<double> migration_rates,
+                            const bool scaled_rates)
+                /// Construct from a matrix in CSR form
+                : row_offsets(std::move(offsets)),
+                  destinations(std::move(destination_demes)),
+                  rates(std::move(migration_rates)), npops(nrows),
+                  scaled(scaled_rates)
+            {
                 validate_all_row_sums();
             }
 
@@ -94,35 +227,100 @@ namespace fwdpy11
                     new MigrationMatrix(*this));
             }
 
+            std::vector<double>
+            dense() const
+            /// Return the matrix in row-major order
+            {
+                std::vector<double> M(npops * npops, 0.0);
+                for (std::size_t i = 0; i < npops; ++i)
+                    {
+                        for (auto j = row_offsets[i]; j < row_offsets[i + 1];
+                             ++j)
+                            {
+                                M[i * npops + destinations[j]] = rates[j];
+                            }
+                    }
+                return M;
+            }
+
+            std::size_t
+            nnz() const
+            {
+                return rates.size();
+            }
+
             void
             set_migration_rates(std::int32_t source,
+                                const std::size_t ncols,
+                                const std::vector<std::size_t>& offsets,
+                                const std::vector<std::int32_t>& dests,
                                 const std::vector<double>& migrates)
+            /// Replace the rates from source, or the entire
+            /// matrix if source is NULLDEME, by rates in CSR form.
+            /// The cost is linear in the number of nonzero rates.
             {
                 if (source != NULLDEME
-                    && static_cast<std::size_t>(source) >= npops)
+                    && (source < 0
+                        || static_cast<std::size_t>(source) >= npops))
                     {
                         throw std::invalid_argument(
                             "source pop index out of range");
                     }
-                if (source != NULLDEME && migrates.size() != npops)
+                if (source != NULLDEME
+                    && (ncols != npops || offsets.size() != 2))
                     {
                         throw std::invalid_argument(
                             "invalid number of migration rates");
                     }
-                else if (source == NULLDEME && migrates.size() != M.size())
+                else if (source == NULLDEME
+                         && (ncols != npops || offsets.size() != npops + 1))
                     {
                         throw std::invalid_argument(
                             "migration matrix size mismatch");
                     }
+                validate_sparse_migration_rates(ncols, offsets, dests,
+                                                migrates);
                 if (source != NULLDEME)
                     {
-                        std::copy(begin(migrates), end(migrates),
-                                  M.begin() + npops * source);
+                        replace_row(source, offsets, dests, migrates);
                     }
                 else
                     {
-                        std::copy(begin(migrates), end(migrates), M.begin());
+                        row_offsets = offsets;
+                        destinations = dests;
+                        rates = migrates;
+                    }
+            }
+
+            void
+            set_migration_rates(std::int32_t source,
+                                const std::vector<double>& migrates)
+            /// Replace the rates from source, or the entire
+            /// matrix if source is NULLDEME, by dense rates.
+            {
+                if (source != NULLDEME
+                    && static_cast<std::size_t>(source) >= npops)
+                    {
+                        throw std::invalid_argument(
+                            "source pop index out of range");
+                    }
+                if (source != NULLDEME && migrates.size() != npops)
+                    {
+                        throw std::invalid_argument(
+                            "invalid number of migration rates");
+                    }
+                else if (source == NULLDEME
+                         && migrates.size() != npops * npops)
+                    {
+                        throw std::invalid_argument(
+                            "migration matrix size mismatch");
                     }
+                std::vector<std::int32_t> dests;
+                std::vector<double> r;
+                auto offsets = dense_to_sparse(
+                    migrates, source == NULLDEME ? npops : 1, npops, dests,
+                    r);
+                set_migration_rates(source, npops, offsets, dests, r);
             }
         };
     } // namespace discrete_demography
@@ -28,19 +28,30 @@
 #include <limits>
 #include <pybind11/numpy.h>
 #include "constants.hpp"
+#include "MigrationMatrix.hpp"
 
 namespace fwdpy11
 {
     namespace discrete_demography
     {
         struct SetMigrationRates
+        /// Changes the rates from one source deme, or the
+        /// entire migration matrix when deme is NULLDEME.
+        ///
+        /// The rates are stored in the compressed sparse row
+        /// form used by MigrationMatrix, with one row for a
+        /// source deme, or npops rows for an entire matrix.
         {
             std::uint32_t when;
             std::int32_t deme; // source deme
-            std::vector<double> migrates;
+            std::size_t npops; // number of destination demes
+            std::vector<std::size_t> row_offsets;
+            std::vector<std::int32_t> destinations;
+            std::vector<double> rates;
             SetMigrationRates(std::uint32_t w, std::int32_t d,
                               std::vector<double> r)
-                : when(w), deme(d), migrates(std::move(r))
+                : when(w), deme(d), npops(r.size()), row_offsets(1, 0),
+                  destinations(), rates()
             {
                 if (deme < 0)
                     {
@@ -48,28 +59,32 @@ namespace fwdpy11
                             "SetMigrationRates: deme label must be "
                             "non-negative");
                     }
-                if (migrates.empty())
+                if (r.empty())
                     {
                         throw std::invalid_argument(
                             "SetMigrationRates: empty list of rates");
                     }
-                for (auto r : migrates)
+                for (auto x : r)
                     {
-                        if (r < 0.0)
+                        if (x < 0.0)
                             {
                                 throw std::invalid_argument(
                                     "SetMigrationRates: rates must be "
                                     "non-negative");
                             }
-                        if (!std::isfinite(r))
+                        if (!std::isfinite(x))
                             {
                                 throw std::invalid_argument(
                                     "SetMigrationRates: rates must be finite");
                             }
                     }
+                append_sparse_migration_rates(r.data(), r.size(),
+                                              row_offsets, destinations,
+                                              rates);
             }
             SetMigrationRates(std::uint32_t w, pybind11::array_t<double> m)
-                : when(w), deme(NULLDEME), migrates()
+                : when(w), deme(NULLDEME), npops(0), row_offsets(1, 0),
+                  destinations(), rates()
             {
                 auto r = m.unchecked<2>();
                 if (r.shape(0) != r.shape(1))
@@ -77,6 +92,8 @@ namespace fwdpy11
                         throw std::invalid_argument(
                             "SetMigrationRates: input matrix must be square");
                     }
+                npops = r.shape(0);
+                std::vector<double> row(npops);
                 for (decltype(r.shape(0)) i = 0; i < r.shape(0); ++i)
                     {
                         for (decltype(i) j = 0; j < r.shape(1); ++j)
@@ -93,10 +110,58 @@ namespace fwdpy11
                                             "SetMigrationRates: rates must be "
                                             "finite");
                                     }
-                                migrates.push_back(r(i, j));
+                                row[j] = r(i, j);
                             }
+                        append_sparse_migration_rates(row.data(), npops,
+                                                      row_offsets,
+                                                      destinations, rates);
                     }
             }
+            SetMigrationRates(std::uint32_t w, std::int32_t d, std::size_t n,
+                              std::vector<std::size_t> offsets,
+                              std::vector<std::int32_t> dests,
+                              std::vector<double> r)
+                /// Rates in compressed sparse row form.  If d is
+                /// NULLDEME, there must be n rows.  Otherwise,
+                /// there must be one row.
+                : when(w), deme(d), npops(n), row_offsets(std::move(offsets)),
+                  destinations(std::move(dests)), rates(std::move(r))
+            {
+                if (deme < 0 && deme != NULLDEME)
+                    {
+                        throw std::invalid_argument(
+                            "SetMigrationRates: deme label must be "
+                            "non-negative");
+                    }
+                if (npops == 0)
+                    {
+                        throw std::invalid_argument(
+                            "SetMigrationRates: empty list of rates");
+                    }
+                if (row_offsets.size() != (deme == NULLDEME ? npops + 1 : 2))
+                    {
+                        throw std::invalid_argument(
+                            "SetMigrationRates: invalid number of rows");
+                    }
+                validate_sparse_migration_rates(npops, row_offsets,
+                                                destinations, rates);
+            }
+
+            std::vector<double>
+            dense() const
+            /// The rates in row-major order, including zeros
+            {
+                std::vector<double> rv((row_offsets.size() - 1) * npops, 0.0);
+                for (std::size_t i = 0; i + 1 < row_offsets.size(); ++i)
+                    {
+                        for (auto j = row_offsets[i]; j < row_offsets[i + 1];
+                             ++j)
+                            {
+                                rv[i * npops + destinations[j]] = rates[j];
+                            }
+                    }
+                return rv;
+            }
         };
 
         inline bool
@@ -0,0 +1,94 @@
+//
+// Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+//
+// This file is part of fwdpy11.
+//
+// fwdpy11 is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// fwdpy11 is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+//
+
+#ifndef FWDPY11_DISCRETE_DEMOGRAPY_EVENT_TIMELINE_HPP
+#define FWDPY11_DISCRETE_DEMOGRAPY_EVENT_TIMELINE_HPP
+
+#include <algorithm>
+#include <cstdint>
+#include <vector>
+#include "../DiscreteDemography.hpp"
+
+namespace fwdpy11
+{
+    namespace discrete_demography
+    {
+        class demographic_event_timeline
+        /// The generations, sorted and without duplicates, in which
+        /// a DiscreteDemography has at least one event of any type.
+        ///
+        /// A simulation queries the timeline once per generation,
+        /// in non-decreasing order, so that the event ranges of
+        /// the DiscreteDemography, and any lookup tables that depend
+        /// on them, are only visited in generations with events.
+        {
+          private:
+            std::vector<std::uint32_t> times;
+            std::size_t next;
+
+            template <typename T>
+            void
+            add_event_times(const std::vector<T>& events)
+            {
+                for (auto&& e : events)
+                    {
+                        times.push_back(e.when);
+                    }
+            }
+
+          public:
+            demographic_event_timeline(const DiscreteDemography& demography,
+                                       const std::uint32_t first_generation)
+                : times{}, next{ 0 }
+            {
+                add_event_times(demography.mass_migrations);
+                add_event_times(demography.set_growth_rates);
+                add_event_times(demography.set_deme_sizes);
+                add_event_times(demography.set_selfing_rates);
+                add_event_times(demography.set_migration_rates);
+                std::sort(begin(times), end(times));
+                times.erase(std::unique(begin(times), end(times)), end(times));
+                // Events prior to the start of a simulation never happen
+                times.erase(begin(times),
+                            std::lower_bound(begin(times), end(times),
+                                             first_generation));
+            }
+
+            bool
+            events_at(const std::uint32_t t)
+            /// Returns true if there are events in generation t.
+            /// Calls must be made with non-decreasing values of t.
+            {
+                while (next < times.size() && times[next] < t)
+                    {
+                        ++next;
+                    }
+                return next < times.size() && times[next] == t;
+            }
+
+            std::size_t
+            size() const
+            {
+                return times.size();
+            }
+        };
+    } // namespace discrete_demography
+} // namespace fwdpy11
+
+#endif
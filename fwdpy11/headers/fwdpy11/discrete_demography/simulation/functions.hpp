@@ -155,8 +155,10 @@ namespace fwdpy11
                 for (; range.first < range.second && range.first->when == t;
                      ++range.first)
                     {
-                        M->set_migration_rates(range.first->deme,
-                                               range.first->migrates);
+                        M->set_migration_rates(
+                            range.first->deme, range.first->npops,
+                            range.first->row_offsets,
+                            range.first->destinations, range.first->rates);
                     }
             }
 
@@ -25,6 +25,7 @@
 #include <algorithm>
 #include <functional>
 #include <memory>
+#include <numeric>
 #include <fwdpp/gsl_discrete.hpp>
 #include "../../rng.hpp"
 #include "deme_property_types.hpp"
@@ -36,87 +37,231 @@ namespace fwdpy11
     namespace discrete_demography
     {
         struct migration_lookup
+        /// Lookup tables of the parental deme of an offspring
+        /// in each destination deme.  lookups[dest] is used
+        /// for the first parent and olookups[dest] for a second
+        /// parent, when there is no selfing.
+        ///
+        /// The tables only contain the source demes with nonzero
+        /// migration rates into dest, so a table gives the index
+        /// of a source in that list.  Use source_deme to get the
+        /// source deme.  The lists are stored in compressed sparse
+        /// row (CSR) form, which is the transpose of the CSR form
+        /// of the MigrationMatrix.
+        ///
+        /// build_migration_lookup records the inputs of each table,
+        /// so that later calls only rebuild the tables whose inputs
+        /// changed.
         {
             std::vector<fwdpp::gsl_ran_discrete_t_ptr> lookups, olookups;
             const bool null_migmatrix;
+            // The source demes with nonzero rates into each
+            // destination, and those rates.
+            std::vector<std::size_t> source_offsets;
+            std::vector<std::int32_t> sources;
+            std::vector<double> rates;
+            // The inputs of the current tables.  The matrix is also
+            // used to find the destinations of each source deme.
+            std::vector<std::size_t> matrix_row_offsets;
+            std::vector<std::int32_t> matrix_destinations;
+            std::vector<double> matrix_rates;
+            std::vector<double> source_weights, source_selfing_rates;
+            std::vector<bool> stale;
+            std::vector<double> buffer;
+
             migration_lookup(std::int32_t maxdemes, bool isnull)
-                : lookups(maxdemes), olookups(maxdemes), null_migmatrix(isnull)
+                : lookups(maxdemes), olookups(maxdemes),
+                  null_migmatrix(isnull), source_offsets(maxdemes + 1, 0),
+                  sources(), rates(), matrix_row_offsets(),
+                  matrix_destinations(), matrix_rates(),
+                  // Negative weights mean "never built"
+                  source_weights(maxdemes, -1.0),
+                  source_selfing_rates(maxdemes, 0.), stale(maxdemes, false),
+                  buffer()
+            {
+            }
+
+            std::int32_t
+            source_deme(const std::int32_t destination,
+                        const std::size_t i) const
+            /// The source deme of the i-th entry
+            /// in the tables for destination.
             {
+                return sources[source_offsets[destination] + i];
             }
         };
 
-        void
+        namespace detail
+        {
+            inline bool
+            migration_matrix_changed(const MigrationMatrix& M,
+                                     const migration_lookup& ml)
+            {
+                return M.row_offsets != ml.matrix_row_offsets
+                       || M.destinations != ml.matrix_destinations
+                       || M.rates != ml.matrix_rates;
+            }
+
+            inline void
+            update_migration_lookup_structure(const MigrationMatrix& M,
+                                              migration_lookup& ml)
+            // Transpose M and mark the destinations whose
+            // column of M changed as stale.  The cost is
+            // linear in the number of demes and nonzero rates.
+            {
+                const std::size_t npops = M.npops;
+                auto old_offsets(ml.source_offsets);
+                auto old_sources(ml.sources);
+                auto old_rates(ml.rates);
+                // Count the sources of each destination...
+                std::fill(ml.source_offsets.begin(),
+                          ml.source_offsets.begin() + npops + 1, 0);
+                for (auto dest : M.destinations)
+                    {
+                        ++ml.source_offsets[dest + 1];
+                    }
+                std::partial_sum(ml.source_offsets.begin(),
+                                 ml.source_offsets.begin() + npops + 1,
+                                 ml.source_offsets.begin());
+                // ...and then fill them in, in increasing order
+                ml.sources.resize(M.nnz());
+                ml.rates.resize(M.nnz());
+                std::vector<std::size_t> next(ml.source_offsets.begin(),
+                                              ml.source_offsets.begin()
+                                                  + npops);
+                for (std::size_t source = 0; source < npops; ++source)
+                    {
+                        for (auto i = M.row_offsets[source];
+                             i < M.row_offsets[source + 1]; ++i)
+                            {
+                                auto k = next[M.destinations[i]]++;
+                                ml.sources[k] = source;
+                                ml.rates[k] = M.rates[i];
+                            }
+                    }
+                for (std::size_t dest = 0; dest < npops; ++dest)
+                    {
+                        auto b = ml.source_offsets[dest],
+                             e = ml.source_offsets[dest + 1];
+                        auto ob = old_offsets[dest],
+                             oe = old_offsets[dest + 1];
+                        if (e - b != oe - ob
+                            || !std::equal(ml.sources.begin() + b,
+                                           ml.sources.begin() + e,
+                                           old_sources.begin() + ob)
+                            || !std::equal(ml.rates.begin() + b,
+                                           ml.rates.begin() + e,
+                                           old_rates.begin() + ob))
+                            {
+                                ml.stale[dest] = true;
+                            }
+                    }
+                ml.matrix_row_offsets = M.row_offsets;
+                ml.matrix_destinations = M.destinations;
+                ml.matrix_rates = M.rates;
+            }
+
+            inline void
+            rebuild_migration_lookup(const std::size_t dest,
+                                     const selfing_rates_vector& selfing_rates,
+                                     migration_lookup& ml)
+            {
+                const auto b = ml.source_offsets[dest],
+                           e = ml.source_offsets[dest + 1];
+                ml.buffer.clear();
+                bool nonzero = false;
+                for (auto i = b; i < e; ++i)
+                    {
+                        ml.buffer.push_back(
+                            ml.source_weights[ml.sources[i]] * ml.rates[i]);
+                        nonzero = nonzero || ml.buffer.back() != 0.;
+                    }
+                if (!nonzero) // There is no possible migration into this deme
+                    {
+                        ml.lookups[dest].reset(nullptr);
+                        ml.olookups[dest].reset(nullptr);
+                        return;
+                    }
+                ml.lookups[dest].reset(gsl_ran_discrete_preproc(
+                    ml.buffer.size(), ml.buffer.data()));
+                nonzero = false;
+                for (auto i = b; i < e; ++i)
+                    {
+                        ml.buffer[i - b]
+                            *= 1.0 - selfing_rates.get()[ml.sources[i]];
+                        nonzero = nonzero || ml.buffer[i - b] != 0.;
+                    }
+                if (nonzero)
+                    {
+                        ml.olookups[dest].reset(gsl_ran_discrete_preproc(
+                            ml.buffer.size(), ml.buffer.data()));
+                    }
+                else
+                    {
+                        ml.olookups[dest].reset(nullptr);
+                    }
+            }
+        } // namespace detail
+
+        inline void
         build_migration_lookup(
             const std::unique_ptr<MigrationMatrix>& M,
             const current_deme_sizes_vector& current_deme_sizes,
             const selfing_rates_vector& selfing_rates, migration_lookup& ml)
         // The lookup data is the transpose of a migration matrix multiplied
         // by the source population sizes, element-wise per row.
-        // NOTE: the migration matrix entered into a simulation could be transposed immediately, right?
+        //
+        // Only the tables of destinations whose inputs changed since
+        // the previous call are rebuilt.  The inputs are the column of
+        // the migration matrix, and the weights and selfing rates of
+        // the source demes with nonzero rates into the destination.
+        // Source demes with a rate of zero are not in the tables.
         {
             if (M != nullptr)
                 {
-                    std::vector<double> temp;
-                    std::size_t npops = ml.lookups.size();
-                    temp.reserve(npops);
+                    if (detail::migration_matrix_changed(*M, ml))
+                        {
+                            detail::update_migration_lookup_structure(*M, ml);
+                        }
                     const auto& ref = current_deme_sizes.get();
-                    for (std::size_t dest = 0; dest < npops; ++dest)
+                    for (std::size_t source = 0; source < M->npops; ++source)
                         {
-                            for (std::size_t source = 0; source < npops;
-                                 ++source)
+                            // By default, input migration rates are
+                            // weighted by the current deme size...
+                            double weight = static_cast<double>(ref[source]);
+                            // ...unless we are told not to do that.
+                            // But if the deme size is zero, we make
+                            // sure it is removed as a possible source
+                            // of a parent.
+                            if (M->scaled == false)
                                 {
-                                    // By default, input migration rates are
-                                    // weighted by the current deme size...
-                                    double scaling_factor
-                                        = static_cast<double>(ref[source]);
-                                    // ...unless we are told not to do that.
-                                    // But if the deme size is zero, we make
-                                    // sure it is removed as a possible source
-                                    // of a parent.
-                                    if (M->scaled == false && ref[source] == 0)
-                                        {
-                                            scaling_factor = 0.0;
-                                        }
-                                    temp.push_back(
-                                        scaling_factor
-                                        * M->M[source * npops + dest]);
+                                    weight = (ref[source] > 0) ? 1.0 : 0.0;
                                 }
-                            if (std::find_if(begin(temp), end(temp),
-                                             [](double d) { return d != 0.; })
-                                != end(temp))
+                            const double selfing
+                                = selfing_rates.get()[source];
+                            if (weight != ml.source_weights[source]
+                                || selfing
+                                       != ml.source_selfing_rates[source])
                                 {
-                                    ml.lookups[dest].reset(
-                                        gsl_ran_discrete_preproc(temp.size(),
-                                                                 temp.data()));
-                                    bool nonzero = false;
-                                    for (std::size_t source = 0;
-                                         source < npops; ++source)
+                                    ml.source_weights[source] = weight;
+                                    ml.source_selfing_rates[source] = selfing;
+                                    for (auto i = M->row_offsets[source];
+                                         i < M->row_offsets[source + 1];
+                                         ++i)
                                         {
-                                            double p = 1.0
-                                                       - selfing_rates
-                                                             .get()[source];
-                                            temp[source] *= p;
-                                            if (p > 0.)
-                                                {
-                                                    nonzero = true;
-                                                }
-                                        }
-                                    if (nonzero)
-                                        {
-                                            ml.olookups[dest].reset(
-                                                gsl_ran_discrete_preproc(
-                                                    temp.size(), temp.data()));
-                                        }
-                                    else
-                                        {
-                                            ml.olookups[dest].reset(nullptr);
+                                            ml.stale[M->destinations[i]]
+                                                = true;
                                         }
                                 }
-                            else // There is no possible migration into this deme
+                        }
+                    for (std::size_t dest = 0; dest < M->npops; ++dest)
+                        {
+                            if (ml.stale[dest])
                                 {
-                                    ml.lookups[dest].reset(nullptr);
+                                    detail::rebuild_migration_lookup(
+                                        dest, selfing_rates, ml);
+                                    ml.stale[dest] = false;
                                 }
-                            temp.clear();
                         }
                 }
         }
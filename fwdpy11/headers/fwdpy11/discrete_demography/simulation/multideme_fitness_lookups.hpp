@@ -23,10 +23,11 @@
 #include <algorithm>
 #include <numeric>
 #include <limits>
+#include <stdexcept>
 #include "deme_property_types.hpp"
 #include "../exceptions.hpp"
 #include "../../rng.hpp"
-#include <fwdpp/gsl_discrete.hpp>
+#include "../../util/alias_table.hpp"
 
 namespace fwdpy11
 {
@@ -37,7 +38,7 @@ namespace fwdpy11
             std::vector<T> starts, stops, offsets;
             std::vector<double> fitnesses;
             std::vector<std::uint32_t> individuals;
-            std::vector<fwdpp::gsl_ran_discrete_t_ptr> lookups;
+            std::vector<alias_table> lookups;
 
             multideme_fitness_lookups(std::int32_t max_number_demes)
                 : starts(max_number_demes, 0), stops(max_number_demes, 0),
@@ -76,9 +77,14 @@ namespace fwdpy11
                             {
                                 // NOTE: the size of the i-th deme's
                                 // fitness array is starts[i]-stops[i]
-                                lookups[i].reset(gsl_ran_discrete_preproc(
-                                    stops[i] - starts[i],
-                                    fitnesses.data() + starts[i]));
+                                if (!lookups[i].assign(
+                                        fitnesses.begin() + starts[i],
+                                        fitnesses.begin() + stops[i]))
+                                    {
+                                        throw std::runtime_error(
+                                            "fitness lookup table could not "
+                                            "be generated");
+                                    }
                             }
                     }
             }
@@ -92,7 +98,7 @@ namespace fwdpy11
                     {
                         throw EmptyDeme("parental deme is empty");
                     }
-                auto o = gsl_ran_discrete(rng.get(), lookups[deme].get());
+                auto o = lookups[deme](rng);
                 return individuals[starts[deme] + o];
             }
         };
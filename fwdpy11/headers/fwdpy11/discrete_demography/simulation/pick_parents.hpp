@@ -78,8 +78,10 @@ namespace fwdpy11
                 {
                     throw MigrationError("parental deme lookup is NULL");
                 }
-            std::int32_t pdeme1 = static_cast<std::int32_t>(gsl_ran_discrete(
-                rng.get(), miglookup.lookups[offspring_deme].get()));
+            std::int32_t pdeme1 = miglookup.source_deme(
+                offspring_deme,
+                gsl_ran_discrete(rng.get(),
+                                 miglookup.lookups[offspring_deme].get()));
             auto p1 = wlookups.get_parent(rng, current_deme_sizes, pdeme1);
             if (selfing_rates.get()[pdeme1] > 0.
                 && gsl_rng_uniform(rng.get()) <= selfing_rates.get()[pdeme1])
@@ -91,9 +93,11 @@ namespace fwdpy11
                 {
                     throw std::runtime_error("olookups is nullptr");
                 }
-            std::int32_t pdeme2 = static_cast<std::int32_t>(gsl_ran_discrete(
-                rng.get(), miglookup.olookups[offspring_deme].get()));
-            auto p2 = wlookups.get_parent(rng, current_deme_sizes, pdeme1);
+            std::int32_t pdeme2 = miglookup.source_deme(
+                offspring_deme,
+                gsl_ran_discrete(rng.get(),
+                                 miglookup.olookups[offspring_deme].get()));
+            auto p2 = wlookups.get_parent(rng, current_deme_sizes, pdeme2);
             return { p1, p2, pdeme1, pdeme2, mating_event_type::outcrossing };
         }
     } // namespace discrete_demography
@@ -0,0 +1,160 @@
+//
+// Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+//
+// This file is part of fwdpy11.
+//
+// fwdpy11 is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// fwdpy11 is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+//
+#ifndef FWDPY11_EVOLVETS_EVOLVETS_TIMINGS_HPP
+#define FWDPY11_EVOLVETS_EVOLVETS_TIMINGS_HPP
+
+#include <array>
+#include <chrono>
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+#include <fwdpp/ts/table_collection.hpp>
+
+namespace fwdpy11
+{
+    enum class evolvets_phase : std::size_t
+    /// The parts of a simulation with tree sequences
+    /// that are timed by EvolvetsTimings.
+    {
+        offspring_generation,
+        fitness_calculation,
+        simplification,
+        mutation_counting,
+        recycling_bin_rebuild,
+        recorders,
+        ancient_samples
+    };
+
+    constexpr std::size_t num_evolvets_phases = 7;
+
+    inline const char*
+    evolvets_phase_name(const std::size_t phase)
+    {
+        static const char* names[num_evolvets_phases]
+            = { "offspring_generation",  "fitness_calculation",
+                "simplification",        "mutation_counting",
+                "recycling_bin_rebuild", "recorders",
+                "ancient_samples" };
+        return names[phase];
+    }
+
+    struct simplification_tables_record
+    /// Table sizes before and after a simplification.
+    {
+        std::uint32_t generation;
+        std::uint64_t nodes_before, nodes_after, edges_before, edges_after,
+            sites_before, sites_after, mutations_before, mutations_after;
+    };
+
+    struct EvolvetsTimings
+    /// Accumulates the wall time spent in, and the number of
+    /// calls to, each evolvets_phase, and records the table sizes
+    /// around each simplification.
+    ///
+    /// The simulation engine only does this book-keeping when
+    /// given a non-null pointer to an instance of this type.
+    {
+        std::array<double, num_evolvets_phases> seconds;
+        std::array<std::uint64_t, num_evolvets_phases> counts;
+        std::uint64_t generations, new_mutations, recycled_mutations;
+        std::vector<simplification_tables_record> simplifications;
+
+        EvolvetsTimings()
+            : seconds{}, counts{}, generations{ 0 }, new_mutations{ 0 },
+              recycled_mutations{ 0 }, simplifications{}
+        {
+        }
+
+        void
+        clear()
+        {
+            seconds.fill(0.);
+            counts.fill(0);
+            generations = new_mutations = recycled_mutations = 0;
+            simplifications.clear();
+        }
+
+        void
+        add(const evolvets_phase phase, const double s)
+        {
+            const auto i = static_cast<std::size_t>(phase);
+            seconds[i] += s;
+            ++counts[i];
+        }
+
+        static simplification_tables_record
+        before_simplification(const std::uint32_t generation,
+                              const fwdpp::ts::table_collection& tables)
+        {
+            simplification_tables_record r{};
+            r.generation = generation;
+            r.nodes_before = tables.node_table.size();
+            r.edges_before = tables.edge_table.size();
+            r.sites_before = tables.site_table.size();
+            r.mutations_before = tables.mutation_table.size();
+            return r;
+        }
+
+        void
+        simplification_completed(simplification_tables_record r,
+                                 const fwdpp::ts::table_collection& tables)
+        {
+            r.nodes_after = tables.node_table.size();
+            r.edges_after = tables.edge_table.size();
+            r.sites_after = tables.site_table.size();
+            r.mutations_after = tables.mutation_table.size();
+            simplifications.push_back(r);
+        }
+    };
+
+    class evolvets_phase_timer
+    /// Adds the time between construction and destruction
+    /// to a phase of an EvolvetsTimings.  Does nothing,
+    /// including reading the clock, if the pointer is null.
+    {
+      private:
+        EvolvetsTimings* timings;
+        const evolvets_phase phase;
+        const std::chrono::steady_clock::time_point start;
+
+      public:
+        evolvets_phase_timer(EvolvetsTimings* t, const evolvets_phase p)
+            : timings{ t }, phase{ p },
+              start{ t == nullptr ? std::chrono::steady_clock::time_point{}
+                                  : std::chrono::steady_clock::now() }
+        {
+        }
+
+        ~evolvets_phase_timer()
+        {
+            if (timings != nullptr)
+                {
+                    timings->add(phase,
+                                 std::chrono::duration<double>(
+                                     std::chrono::steady_clock::now() - start)
+                                     .count());
+                }
+        }
+
+        evolvets_phase_timer(const evolvets_phase_timer&) = delete;
+        evolvets_phase_timer& operator=(const evolvets_phase_timer&) = delete;
+    };
+} // namespace fwdpy11
+
+#endif
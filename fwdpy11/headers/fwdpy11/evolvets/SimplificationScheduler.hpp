@@ -0,0 +1,219 @@
+//
+// Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+//
+// This file is part of fwdpy11.
+//
+// fwdpy11 is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// fwdpy11 is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+//
+#ifndef FWDPY11_EVOLVETS_SIMPLIFICATION_SCHEDULER_HPP
+#define FWDPY11_EVOLVETS_SIMPLIFICATION_SCHEDULER_HPP
+
+#include <cmath>
+#include <cstdint>
+#include <vector>
+#include <stdexcept>
+#include <fwdpp/ts/table_collection.hpp>
+#include <fwdpy11/types/DiploidPopulation.hpp>
+
+namespace fwdpy11
+{
+    struct simplification_record
+    /// Data recorded for each simplification
+    /// during a simulation with tree sequences.
+    {
+        std::uint32_t generation, interval;
+        std::uint64_t edges_before, edges_after, nodes_before, nodes_after,
+            bytes_before, bytes_after;
+        // Wall time, in seconds, of the simplification
+        // and of the generations since the last simplification
+        double simplification_time, generation_time;
+    };
+
+    inline std::uint64_t
+    table_collection_bytes(const fwdpp::ts::table_collection& tables)
+    /// Estimate of the memory used by the node, edge,
+    /// site, and mutation tables.
+    {
+        return tables.node_table.size() * sizeof(fwdpp::ts::node)
+               + tables.edge_table.size() * sizeof(fwdpp::ts::edge)
+               + tables.site_table.size() * sizeof(fwdpp::ts::site)
+               + tables.mutation_table.size()
+                     * sizeof(fwdpp::ts::mutation_record);
+    }
+
+    struct SimplificationScheduler
+    ///ABC for deciding when to simplify during simulations
+    ///with tree sequences.
+    ///
+    ///The simulation engine calls simplify once per generation.
+    ///The remaining (non-virtual) member functions
+    ///are for book-keeping by the engine.
+    {
+        std::vector<simplification_record> records;
+        std::uint32_t generations_since_simplification;
+        double generation_time_since_simplification, last_simplification_time;
+
+        SimplificationScheduler()
+            : records{}, generations_since_simplification{ 0 },
+              generation_time_since_simplification{ 0. },
+              last_simplification_time{ -1. }
+        {
+        }
+
+        virtual ~SimplificationScheduler() = default;
+
+        virtual bool simplify(const DiploidPopulation& /*pop*/,
+                              const std::uint32_t /*generation*/) const = 0;
+
+        void
+        begin_simulation()
+        /// Reset the counters at the start of a simulation.
+        /// The records are kept, allowing a scheduler to be
+        /// reused over several calls to evolvets.
+        {
+            generations_since_simplification = 0;
+            generation_time_since_simplification = 0.;
+        }
+
+        void
+        generation_completed(const double seconds)
+        {
+            ++generations_since_simplification;
+            generation_time_since_simplification += seconds;
+        }
+
+        void
+        simplification_completed(const DiploidPopulation& pop,
+                                 const std::uint64_t edges_before,
+                                 const std::uint64_t nodes_before,
+                                 const std::uint64_t bytes_before,
+                                 const double seconds)
+        {
+            records.emplace_back(simplification_record{
+                pop.generation, generations_since_simplification,
+                edges_before, pop.tables.edge_table.size(), nodes_before,
+                pop.tables.node_table.size(), bytes_before,
+                table_collection_bytes(pop.tables), seconds,
+                generation_time_since_simplification });
+            last_simplification_time = seconds;
+            begin_simulation();
+        }
+    };
+
+    struct FixedSimplificationInterval : public SimplificationScheduler
+    /// Simplify every interval generations.
+    {
+        const std::uint32_t interval;
+        explicit FixedSimplificationInterval(const std::uint32_t i)
+            : SimplificationScheduler(), interval{ i }
+        {
+            if (interval == 0)
+                {
+                    throw std::invalid_argument(
+                        "simplification interval must be > 0");
+                }
+        }
+
+        bool
+        simplify(const DiploidPopulation& /*pop*/,
+                 const std::uint32_t generation) const override
+        // NOTE: generation is the number of generations
+        // simulated so far during this call to evolvets,
+        // minus one.
+        {
+            return generation > 0 && generation % interval == 0;
+        }
+    };
+
+    struct EdgeTableSizeScheduler : public SimplificationScheduler
+    /// Simplify when the number of edges reaches a threshold.
+    {
+        const std::uint64_t max_edges;
+        explicit EdgeTableSizeScheduler(const std::uint64_t m)
+            : SimplificationScheduler(), max_edges{ m }
+        {
+            if (max_edges == 0)
+                {
+                    throw std::invalid_argument("max_edges must be > 0");
+                }
+        }
+
+        bool
+        simplify(const DiploidPopulation& pop,
+                 const std::uint32_t /*generation*/) const override
+        {
+            return pop.tables.edge_table.size() >= max_edges;
+        }
+    };
+
+    struct MemoryBudgetScheduler : public SimplificationScheduler
+    /// Simplify when the memory used by the tables
+    /// reaches a threshold.
+    {
+        const std::uint64_t max_bytes;
+        explicit MemoryBudgetScheduler(const std::uint64_t m)
+            : SimplificationScheduler(), max_bytes{ m }
+        {
+            if (max_bytes == 0)
+                {
+                    throw std::invalid_argument("max_bytes must be > 0");
+                }
+        }
+
+        bool
+        simplify(const DiploidPopulation& pop,
+                 const std::uint32_t /*generation*/) const override
+        {
+            return table_collection_bytes(pop.tables) >= max_bytes;
+        }
+    };
+
+    struct TimeRatioScheduler : public SimplificationScheduler
+    /// Simplify when the ratio of the time taken by the last
+    /// simplification to the time spent simulating generations
+    /// since then drops to a target value.
+    {
+        const double ratio;
+        const std::uint32_t initial_interval;
+        TimeRatioScheduler(const double r, const std::uint32_t i)
+            : SimplificationScheduler(), ratio{ r }, initial_interval{ i }
+        {
+            if (!std::isfinite(ratio) || ratio <= 0.)
+                {
+                    throw std::invalid_argument(
+                        "ratio must be finite and > 0");
+                }
+            if (initial_interval == 0)
+                {
+                    throw std::invalid_argument(
+                        "initial_interval must be > 0");
+                }
+        }
+
+        bool
+        simplify(const DiploidPopulation& /*pop*/,
+                 const std::uint32_t /*generation*/) const override
+        {
+            if (last_simplification_time < 0.)
+                {
+                    return generations_since_simplification
+                           >= initial_interval;
+                }
+            return last_simplification_time
+                   <= ratio * generation_time_since_simplification;
+        }
+    };
+} // namespace fwdpy11
+
+#endif
@@ -23,6 +23,7 @@
 
 #include <cstdint>
 #include <algorithm>
+#include <limits>
 #include <vector>
 #include <tuple>
 #include <gsl/gsl_randist.h>
@@ -33,6 +34,7 @@
 #include <fwdpp/ts/get_parent_ids.hpp>
 #include <fwdpp/ts/table_collection.hpp>
 #include <fwdpp/ts/table_simplifier.hpp>
+#include <fwdpy11/util/parallel.hpp>
 
 namespace fwdpy11
 {
@@ -128,5 +130,258 @@ namespace fwdpy11
         pop.diploids.swap(offspring);
         pop.diploid_metadata.swap(offspring_metadata);
     }
+
+    struct parallel_gamete_data
+    /// Intermediate data for one offspring gamete
+    /// during evolve_generation_ts_parallel
+    {
+        std::size_t g1, g2;
+        bool swapped;
+        std::vector<double> breakpoints;
+        std::vector<fwdpp::uint_t> mutation_keys;
+        // Location of the selected mutation keys in the
+        // buffer of the thread that processed this gamete.
+        // When reuse_parent is true, the offspring
+        // inherits g1 unchanged.
+        std::size_t thread, keys_begin, keys_end;
+        bool reuse_parent;
+        parallel_gamete_data()
+            : g1{}, g2{}, swapped{}, breakpoints{}, mutation_keys{},
+              thread{}, keys_begin{}, keys_end{}, reuse_parent{}
+        {
+        }
+    };
+
+    template <typename mcont_t>
+    void
+    recombine_and_mutate_keys(const mcont_t& mutations,
+                              const std::vector<double>& breakpoints,
+                              const std::vector<fwdpp::uint_t>& k1,
+                              const std::vector<fwdpp::uint_t>& k2,
+                              const std::vector<fwdpp::uint_t>& new_mutations,
+                              std::vector<fwdpp::uint_t>& recombined,
+                              std::vector<fwdpp::uint_t>& output)
+    /// Append the selected mutation keys of a recombinant
+    /// of k1 and k2 plus any new selected mutations to output.
+    /// All inputs are sorted by position.  Positions less than
+    /// a breakpoint are inherited from the current genome.
+    /// The last element of a non-empty breakpoints is
+    /// std::numeric_limits<double>::max().
+    {
+        recombined.clear();
+        if (breakpoints.empty())
+            {
+                recombined.insert(recombined.end(), k1.begin(), k1.end());
+            }
+        else
+            {
+                auto current = k1.cbegin(), current_end = k1.cend(),
+                     other = k2.cbegin(), other_end = k2.cend();
+                for (auto bp : breakpoints)
+                    {
+                        const auto before_breakpoint
+                            = [&mutations, bp](const fwdpp::uint_t k) {
+                                  return mutations[k].pos < bp;
+                              };
+                        auto itr = std::partition_point(current, current_end,
+                                                        before_breakpoint);
+                        recombined.insert(recombined.end(), current, itr);
+                        current = itr;
+                        other = std::partition_point(other, other_end,
+                                                     before_breakpoint);
+                        std::swap(current, other);
+                        std::swap(current_end, other_end);
+                    }
+            }
+        const auto by_position
+            = [&mutations](const fwdpp::uint_t a, const fwdpp::uint_t b) {
+                  return mutations[a].pos < mutations[b].pos;
+              };
+        auto next = recombined.cbegin();
+        for (auto k : new_mutations)
+            {
+                if (mutations[k].neutral == false)
+                    {
+                        auto itr = std::upper_bound(next, recombined.cend(), k,
+                                                    by_position);
+                        output.insert(output.end(), next, itr);
+                        output.push_back(k);
+                        next = itr;
+                    }
+            }
+        output.insert(output.end(), next, recombined.cend());
+    }
+
+    template <typename rng_t, typename poptype, typename pick_parent1_fxn,
+              typename pick_parent2_fxn, typename offspring_metadata_fxn,
+              typename genetic_param_holder>
+    void
+    evolve_generation_ts_parallel(
+        const rng_t& rng, poptype& pop, genetic_param_holder& genetics,
+        const fwdpp::uint_t N_next, const pick_parent1_fxn& pick1,
+        const pick_parent2_fxn& pick2,
+        const offspring_metadata_fxn& update_offspring,
+        const fwdpp::uint_t generation, fwdpp::ts::table_collection& tables,
+        std::int32_t first_parental_index, std::int32_t next_index,
+        util::thread_pool& threads)
+    /// Equivalent to evolve_generation_ts, but the construction
+    /// of offspring genomes is done by the threads of a pool.
+    ///
+    /// All random numbers are generated by the calling thread,
+    /// in offspring order.  So are new mutations, meaning that
+    /// mutation keys are taken from the recycling bin serially.
+    /// Thus, the output only depends on the seed and not
+    /// on the number of threads.  Offspring genomes and the
+    /// tables are updated by the calling thread, in offspring order,
+    /// from the keys stored in per-thread buffers.
+    {
+        fwdpp::debug::all_haploid_genomes_extant(pop);
+
+        // Genomes that went extinct last generation
+        // can be recycled.  Reversed so that the lowest
+        // index is used first.
+        std::vector<std::size_t> extinct_genomes;
+        for (std::size_t i = pop.haploid_genomes.size(); i > 0; --i)
+            {
+                if (pop.haploid_genomes[i - 1].n == 0)
+                    {
+                        extinct_genomes.push_back(i - 1);
+                    }
+            }
+
+        fwdpp::zero_out_haploid_genomes(pop);
+
+        decltype(pop.diploids) offspring(N_next);
+        decltype(pop.diploid_metadata) offspring_metadata(N_next);
+        std::vector<std::pair<std::size_t, std::size_t>> parents(N_next);
+        std::vector<parallel_gamete_data> gametes(2 * N_next);
+
+        // Serial: parents, Mendel, breakpoints, and new mutations
+        for (std::size_t next_offspring = 0; next_offspring < offspring.size();
+             ++next_offspring)
+            {
+                auto p1 = pick1();
+                auto p2 = pick2(p1);
+                parents[next_offspring] = std::make_pair(p1, p2);
+                for (std::size_t i = 0; i < 2; ++i)
+                    {
+                        auto p = (i == 0) ? p1 : p2;
+                        auto& g = gametes[2 * next_offspring + i];
+                        g.g1 = pop.diploids[p].first;
+                        g.g2 = pop.diploids[p].second;
+                        g.swapped = (gsl_rng_uniform(rng.get()) < 0.5);
+                        if (g.swapped)
+                            {
+                                std::swap(g.g1, g.g2);
+                            }
+                        g.breakpoints = genetics.generate_breakpoints();
+                        g.mutation_keys = genetics.generate_mutations(
+                            genetics.mutation_recycling_bin, pop.mutations);
+                    }
+            }
+
+        // Parallel: build the selected mutation keys of each gamete
+        std::vector<std::vector<fwdpp::uint_t>> thread_keys(threads.size());
+        util::parallel_for(
+            threads, gametes.size(),
+            [&pop, &gametes, &thread_keys](const std::size_t begin,
+                                           const std::size_t end,
+                                           const std::size_t thread) {
+                auto& keys = thread_keys[thread];
+                std::vector<fwdpp::uint_t> recombined;
+                for (std::size_t i = begin; i < end; ++i)
+                    {
+                        auto& g = gametes[i];
+                        g.thread = thread;
+                        g.reuse_parent = g.breakpoints.empty()
+                                         && std::none_of(
+                                             g.mutation_keys.begin(),
+                                             g.mutation_keys.end(),
+                                             [&pop](const fwdpp::uint_t k) {
+                                                 return pop.mutations[k]
+                                                            .neutral
+                                                        == false;
+                                             });
+                        g.keys_begin = keys.size();
+                        if (!g.reuse_parent)
+                            {
+                                recombine_and_mutate_keys(
+                                    pop.mutations, g.breakpoints,
+                                    pop.haploid_genomes[g.g1].smutations,
+                                    pop.haploid_genomes[g.g2].smutations,
+                                    g.mutation_keys, recombined, keys);
+                            }
+                        g.keys_end = keys.size();
+                    }
+            });
+
+        // Serial: offspring genomes, tables, and metadata
+        const auto add_genome = [&pop, &extinct_genomes, &thread_keys](
+                                    const parallel_gamete_data& g) {
+            if (g.reuse_parent)
+                {
+                    pop.haploid_genomes[g.g1].n++;
+                    return g.g1;
+                }
+            auto b = thread_keys[g.thread].begin() + g.keys_begin;
+            auto e = thread_keys[g.thread].begin() + g.keys_end;
+            std::size_t idx;
+            if (!extinct_genomes.empty())
+                {
+                    idx = extinct_genomes.back();
+                    extinct_genomes.pop_back();
+                    pop.haploid_genomes[idx].mutations.clear();
+                    pop.haploid_genomes[idx].smutations.assign(b, e);
+                }
+            else
+                {
+                    idx = pop.haploid_genomes.size();
+                    pop.haploid_genomes.emplace_back(
+                        0, std::vector<fwdpp::uint_t>(),
+                        std::vector<fwdpp::uint_t>(b, e));
+                }
+            pop.haploid_genomes[idx].n++;
+            return idx;
+        };
+
+        auto next_index_local = next_index;
+        for (std::size_t next_offspring = 0; next_offspring < offspring.size();
+             ++next_offspring)
+            {
+                auto p1 = parents[next_offspring].first;
+                auto p2 = parents[next_offspring].second;
+                const auto& gamete1 = gametes[2 * next_offspring];
+                const auto& gamete2 = gametes[2 * next_offspring + 1];
+                auto& dip = offspring[next_offspring];
+                dip.first = add_genome(gamete1);
+                dip.second = add_genome(gamete2);
+                auto p1id = fwdpp::ts::get_parent_ids(first_parental_index,
+                                                      p1, gamete1.swapped);
+                auto p2id = fwdpp::ts::get_parent_ids(first_parental_index,
+                                                      p2, gamete2.swapped);
+                next_index_local = tables.register_diploid_offspring(
+                    gamete1.breakpoints, p1id, 0, generation);
+                fwdpp::ts::record_mutations_infinite_sites(
+                    next_index_local, pop.mutations, gamete1.mutation_keys,
+                    tables);
+                next_index_local = tables.register_diploid_offspring(
+                    gamete2.breakpoints, p2id, 0, generation);
+                fwdpp::ts::record_mutations_infinite_sites(
+                    next_index_local, pop.mutations, gamete2.mutation_keys,
+                    tables);
+
+                offspring_metadata[next_offspring].label = next_offspring;
+                update_offspring(offspring_metadata[next_offspring], p1, p2,
+                                 pop.diploid_metadata);
+                offspring_metadata[next_offspring].nodes[0]
+                    = next_index_local - 1;
+                offspring_metadata[next_offspring].nodes[1]
+                    = next_index_local;
+            }
+        assert(next_index_local
+               == next_index + 2 * static_cast<std::int32_t>(N_next) - 1);
+        pop.diploids.swap(offspring);
+        pop.diploid_metadata.swap(offspring_metadata);
+    }
 } // namespace fwdpy11
 #endif
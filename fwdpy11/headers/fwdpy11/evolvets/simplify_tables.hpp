@@ -22,6 +22,7 @@
 
 #include <cstdint>
 #include <vector>
+#include <algorithm>
 #include <stdexcept>
 #include <fwdpp/ts/table_collection.hpp>
 #include <fwdpp/ts/table_simplifier.hpp>
@@ -32,6 +33,78 @@
 
 namespace fwdpy11
 {
+    struct sorted_table_offsets
+    /// Lengths of the prefixes of the edge and mutation
+    /// tables that are known to be sorted.  After a simplification,
+    /// the tables are sorted in their entirety.  All edges/mutations
+    /// added by subsequent generations are appended after these offsets.
+    {
+        std::size_t edge_offset, mutation_offset;
+        sorted_table_offsets() : edge_offset{ 0 }, mutation_offset{ 0 } {}
+    };
+
+    template <typename mcont_t>
+    void
+    sort_tables_for_incremental_simplification(
+        const mcont_t &mutations, const sorted_table_offsets &offsets,
+        fwdpp::ts::table_collection &tables)
+    /// Sort only the edges and mutations added since the last simplification.
+    ///
+    /// Edges born since the last simplification all have parents
+    /// that are younger than any parent in the (already sorted) prefix.
+    /// Thus, we sort the new edges and rotate them to the front of the table,
+    /// which gives the same order as sorting the entire table.
+    /// New mutations are sorted by position and merged into the prefix.
+    {
+        if (offsets.edge_offset == 0 && offsets.mutation_offset == 0)
+            {
+                // Nothing is known about the tables, so
+                // we have to sort everything.
+                tables.sort_tables_for_simplification();
+                return;
+            }
+        if (offsets.edge_offset > tables.edge_table.size()
+            || offsets.mutation_offset > tables.mutation_table.size())
+            {
+                throw std::runtime_error("sorted table offsets are invalid");
+            }
+        const auto &nodes = tables.node_table;
+        auto new_edges
+            = tables.edge_table.begin()
+              + static_cast<std::ptrdiff_t>(offsets.edge_offset);
+        std::sort(new_edges, tables.edge_table.end(),
+                  [&nodes](const fwdpp::ts::edge &a, const fwdpp::ts::edge &b) {
+                      auto ga = nodes[a.parent].time;
+                      auto gb = nodes[b.parent].time;
+                      if (ga == gb)
+                          {
+                              if (a.parent == b.parent)
+                                  {
+                                      if (a.child == b.child)
+                                          {
+                                              return a.left < b.left;
+                                          }
+                                      return a.child < b.child;
+                                  }
+                              return a.parent < b.parent;
+                          }
+                      return ga > gb;
+                  });
+        std::rotate(tables.edge_table.begin(), new_edges,
+                    tables.edge_table.end());
+
+        auto new_mutations
+            = tables.mutation_table.begin()
+              + static_cast<std::ptrdiff_t>(offsets.mutation_offset);
+        const auto by_position
+            = [&mutations](const fwdpp::ts::mutation_record &a,
+                           const fwdpp::ts::mutation_record &b) {
+                  return mutations[a.key].pos < mutations[b.key].pos;
+              };
+        std::sort(new_mutations, tables.mutation_table.end(), by_position);
+        std::inplace_merge(tables.mutation_table.begin(), new_mutations,
+                           tables.mutation_table.end(), by_position);
+    }
 
     // TODO allow for fixation recording
     // and simulation of neutral variants
@@ -43,9 +116,19 @@ namespace fwdpy11
                     fwdpp::ts::table_simplifier &simplifier,
                     const bool preserve_selected_fixations,
                     const bool simulating_neutral_variants,
-                    const bool suppress_edge_table_indexing)
+                    const bool suppress_edge_table_indexing,
+                    const bool incremental_sorting,
+                    sorted_table_offsets &offsets)
     {
-        tables.sort_tables_for_simplification();
+        if (incremental_sorting)
+            {
+                sort_tables_for_incremental_simplification(pop.mutations,
+                                                           offsets, tables);
+            }
+        else
+            {
+                tables.sort_tables_for_simplification();
+            }
         std::vector<std::int32_t> samples;
         samples.reserve(2 * pop.diploids.size());
         for (auto &m : pop.diploid_metadata)
@@ -69,6 +152,9 @@ namespace fwdpy11
                     }
             }
 #endif
+        // The output of simplification is sorted.
+        offsets.edge_offset = tables.edge_table.size();
+        offsets.mutation_offset = tables.mutation_table.size();
         if (suppress_edge_table_indexing == true)
             {
                 return rv;
@@ -119,6 +205,8 @@ namespace fwdpy11
             {
                 tables.rebuild_site_table();
             }
+        // Removing fixations preserves the sort order
+        offsets.mutation_offset = tables.mutation_table.size();
         return rv;
     } // namespace fwdpy11
 } // namespace fwdpy11
@@ -7,6 +7,7 @@
 #include <functional>
 #include "DiploidPopulationMultivariateGeneticValueWithMapping.hpp"
 #include "default_update.hpp"
+#include "details/effect_sizes.hpp"
 
 namespace fwdpy11
 {
@@ -14,13 +15,14 @@ namespace fwdpy11
         : public DiploidPopulationMultivariateGeneticValueWithMapping
     {
         std::size_t focal_trait_index;
+        mutable effect_size_arena effect_sizes;
 
         DiploidMultivariateEffectsStrictAdditive(
             std::size_t ndim, std::size_t focal_trait,
             const MultivariateGeneticValueToFitnessMap &gv2w_)
             : DiploidPopulationMultivariateGeneticValueWithMapping(ndim,
                                                                    gv2w_),
-              focal_trait_index(focal_trait)
+              focal_trait_index(focal_trait), effect_sizes{}
         {
             if (focal_trait_index >= ndim)
                 {
@@ -35,7 +37,7 @@ namespace fwdpy11
             const GeneticValueNoise &noise_)
             : DiploidPopulationMultivariateGeneticValueWithMapping(ndim, gv2w_,
                                                                    noise_),
-              focal_trait_index(focal_trait)
+              focal_trait_index(focal_trait), effect_sizes{}
         {
             if (focal_trait_index >= ndim)
                 {
@@ -48,20 +50,43 @@ namespace fwdpy11
         calculate_gvalue(const std::size_t diploid_index,
                          const DiploidPopulation &pop) const
         {
-            std::fill(begin(gvalues), end(gvalues), 0.0);
+            return calculate_gvalue(diploid_index, pop, gvalues);
+        }
+
+        double
+        calculate_gvalue(const std::size_t diploid_index,
+                         const DiploidPopulation &pop,
+                         std::vector<double> &buffer) const
+        {
+            buffer.resize(total_dim);
+            std::fill(begin(buffer), end(buffer), 0.0);
+
+            if (effect_sizes.valid_for(pop))
+                {
+                    const auto &dip = pop.diploids[diploid_index];
+                    for (auto key : pop.haploid_genomes[dip.first].smutations)
+                        {
+                            effect_sizes.add(key, buffer);
+                        }
+                    for (auto key : pop.haploid_genomes[dip.second].smutations)
+                        {
+                            effect_sizes.add(key, buffer);
+                        }
+                    return buffer[focal_trait_index];
+                }
 
             for (auto key :
                  pop.haploid_genomes[pop.diploids[diploid_index].first]
                      .smutations)
                 {
                     const auto &mut = pop.mutations[key];
-                    if (mut.esizes.size() != gvalues.size())
+                    if (mut.esizes.size() != buffer.size())
                         {
                             throw std::runtime_error(
                                 "dimensionality mismatch");
                         }
                     std::transform(begin(mut.esizes), end(mut.esizes),
-                                   begin(gvalues), begin(gvalues),
+                                   begin(buffer), begin(buffer),
                                    std::plus<double>());
                 }
 
@@ -70,16 +95,34 @@ namespace fwdpy11
                      .smutations)
                 {
                     const auto &mut = pop.mutations[key];
-                    if (mut.esizes.size() != gvalues.size())
+                    if (mut.esizes.size() != buffer.size())
                         {
                             throw std::runtime_error(
                                 "dimensionality mismatch");
                         }
                     std::transform(begin(mut.esizes), end(mut.esizes),
-                                   begin(gvalues), begin(gvalues),
+                                   begin(buffer), begin(buffer),
                                    std::plus<double>());
                 }
-            return gvalues[focal_trait_index];
+            return buffer[focal_trait_index];
+        }
+
+        bool
+        supports_threads() const
+        {
+            return true;
+        }
+
+        void
+        begin_fitness_calculation(const DiploidPopulation &pop) const
+        {
+            effect_sizes.fill(pop, total_dim);
+        }
+
+        void
+        end_fitness_calculation() const
+        {
+            effect_sizes.clear();
         }
 
         pybind11::object
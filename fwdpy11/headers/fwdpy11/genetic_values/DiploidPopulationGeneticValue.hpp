@@ -60,6 +60,80 @@ namespace fwdpy11
         // Callable from Python
         virtual double calculate_gvalue(const std::size_t /*diploid_index*/,
                                         const DiploidPopulation& /*pop*/) const = 0;
+
+        // Thread-safe API.  Genetic values are written to buffer instead
+        // of gvalues.  Derived classes overriding these functions must
+        // also override supports_threads.  The default
+        // implementations are NOT thread-safe.
+        virtual double
+        calculate_gvalue(const std::size_t diploid_index,
+                         const DiploidPopulation& pop,
+                         std::vector<double>& buffer) const
+        {
+            auto rv = calculate_gvalue(diploid_index, pop);
+            buffer.assign(gvalues.begin(), gvalues.end());
+            return rv;
+        }
+
+        virtual double
+        genetic_value_to_fitness(const DiploidMetadata& metadata,
+                                 const std::vector<double>& /*buffer*/) const
+        {
+            return genetic_value_to_fitness(metadata);
+        }
+
+        virtual void
+        genetic_values_to_fitnesses(std::vector<DiploidMetadata>& metadata,
+                                    const std::vector<double>& values,
+                                    const std::size_t first,
+                                    const std::size_t last) const
+        /// Sets metadata[i].w for i in [first, last).
+        /// values contains total_dim genetic values per individual.
+        /// Part of the thread-safe API.
+        {
+            std::vector<double> buffer(total_dim);
+            for (std::size_t i = first; i < last; ++i)
+                {
+                    auto row = values.begin() + i * total_dim;
+                    buffer.assign(row, row + total_dim);
+                    metadata[i].w
+                        = genetic_value_to_fitness(metadata[i], buffer);
+                }
+        }
+
+        virtual bool
+        supports_threads() const
+        /// If true, the functions taking a buffer may be called
+        /// from multiple threads at once.
+        {
+            return false;
+        }
+
+        virtual bool
+        uniform_without_selected_mutations() const
+        /// If true, all individuals without selected mutations
+        /// have the same genetic value, noise, and fitness, which
+        /// do not change over time.  When no selected mutations
+        /// are present or can arise, the simulation engine may
+        /// then skip the calculation of genetic values.
+        {
+            return false;
+        }
+
+        virtual void
+        begin_fitness_calculation(const DiploidPopulation& /*pop*/) const
+        /// Called by the simulation engine before calculating
+        /// the genetic values of all diploids in pop.  Data cached
+        /// here are only valid until end_fitness_calculation
+        /// is called.
+        {
+        }
+
+        virtual void
+        end_fitness_calculation() const
+        {
+        }
+
         // To be called from w/in a simulation
         virtual void
         operator()(const GSLrng_t& rng, std::size_t diploid_index,
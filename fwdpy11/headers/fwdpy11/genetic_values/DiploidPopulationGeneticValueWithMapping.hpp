@@ -47,12 +47,26 @@ namespace fwdpy11
         {
         }
 
+        using DiploidPopulationGeneticValue::genetic_value_to_fitness;
+
         inline virtual double
         genetic_value_to_fitness(const DiploidMetadata& metadata) const
         {
             return gv2w->operator()(metadata);
         }
 
+        inline virtual void
+        genetic_values_to_fitnesses(std::vector<DiploidMetadata>& metadata,
+                                    const std::vector<double>& /*values*/,
+                                    const std::size_t first,
+                                    const std::size_t last) const
+        /// Derived classes overriding genetic_value_to_fitness
+        /// must also override this function.
+        {
+            gv2w->set_fitnesses(metadata.begin() + first,
+                                metadata.begin() + last);
+        }
+
         inline virtual double
         noise(const GSLrng_t& rng, const DiploidMetadata& offspring_metadata,
               const std::size_t parent1, const std::size_t parent2,
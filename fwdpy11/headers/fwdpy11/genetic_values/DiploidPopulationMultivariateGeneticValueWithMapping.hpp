@@ -69,6 +69,25 @@ namespace fwdpy11
             return gv2w->operator()(metadata, gvalues);
         }
 
+        virtual double
+        genetic_value_to_fitness(const DiploidMetadata& metadata,
+                                 const std::vector<double>& buffer) const
+        {
+            return gv2w->operator()(metadata, buffer);
+        }
+
+        virtual void
+        genetic_values_to_fitnesses(std::vector<DiploidMetadata>& metadata,
+                                    const std::vector<double>& values,
+                                    const std::size_t first,
+                                    const std::size_t last) const
+        {
+            gv2w->set_fitnesses(metadata.begin() + first,
+                                metadata.begin() + last,
+                                values.begin() + first * total_dim,
+                                total_dim);
+        }
+
         virtual double
         noise(const GSLrng_t& rng, const DiploidMetadata& offspring_metadata,
               const std::size_t parent1, const std::size_t parent2,
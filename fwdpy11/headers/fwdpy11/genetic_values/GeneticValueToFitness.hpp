@@ -39,6 +39,20 @@ namespace fwdpy11
         virtual ~GeneticValueToFitnessMap() = default;
         virtual double
         operator()(const DiploidMetadata & /*metadata*/) const = 0;
+
+        virtual void
+        set_fitnesses(std::vector<DiploidMetadata>::iterator first,
+                      std::vector<DiploidMetadata>::iterator last) const
+        /// Sets the fitness of each individual in [first, last).
+        /// Derived classes may override this with a loop
+        /// free of virtual function calls.
+        {
+            for (; first < last; ++first)
+                {
+                    first->w = this->operator()(*first);
+                }
+        }
+
         virtual void update(const DiploidPopulation & /*pop*/) = 0;
         virtual std::unique_ptr<GeneticValueToFitnessMap> clone() const = 0;
         virtual pybind11::object pickle() const = 0;
@@ -52,6 +66,16 @@ namespace fwdpy11
             return metadata.g;
         }
 
+        inline void
+        set_fitnesses(std::vector<DiploidMetadata>::iterator first,
+                      std::vector<DiploidMetadata>::iterator last) const
+        {
+            for (; first < last; ++first)
+                {
+                    first->w = first->g;
+                }
+        }
+
         DEFAULT_DIPLOID_POP_UPDATE()
 
         inline std::unique_ptr<GeneticValueToFitnessMap>
@@ -73,6 +97,22 @@ namespace fwdpy11
     {
     };
 
+    inline void
+    gaussian_stabilizing_selection(
+        std::vector<DiploidMetadata>::iterator first,
+        std::vector<DiploidMetadata>::iterator last, const double opt,
+        const double VS)
+    /// Sets the fitnesses of [first, last).  The result for each
+    /// individual is the same as from GSS::operator().
+    {
+        const double denominator = 2.0 * VS;
+        for (; first < last; ++first)
+            {
+                first->w = std::exp(
+                    -(std::pow(first->g + first->e - opt, 2.0) / denominator));
+            }
+    }
+
     struct GSS : public GeneticValueIsTrait
     {
         const double opt, VS;
@@ -96,6 +136,13 @@ namespace fwdpy11
                 -(std::pow(metadata.g + metadata.e - opt, 2.0) / (2.0 * VS)));
         }
 
+        inline void
+        set_fitnesses(std::vector<DiploidMetadata>::iterator first,
+                      std::vector<DiploidMetadata>::iterator last) const
+        {
+            gaussian_stabilizing_selection(first, last, opt, VS);
+        }
+
         DEFAULT_DIPLOID_POP_UPDATE()
 
         inline std::unique_ptr<GeneticValueToFitnessMap>
@@ -163,6 +210,13 @@ namespace fwdpy11
                 -(std::pow(metadata.g + metadata.e - opt, 2.0) / (2.0 * VS)));
         }
 
+        inline void
+        set_fitnesses(std::vector<DiploidMetadata>::iterator first,
+                      std::vector<DiploidMetadata>::iterator last) const
+        {
+            gaussian_stabilizing_selection(first, last, opt, VS);
+        }
+
         template <typename poptype>
         inline void
         update_details(const poptype &pop)
@@ -53,6 +53,28 @@ namespace fwdpy11
             return std::exp(-sqdiff / (2.0 * VS));
         }
 
+        void
+        set_fitnesses(std::vector<DiploidMetadata>::iterator first,
+                      std::vector<DiploidMetadata>::iterator last,
+                      std::vector<double>::const_iterator values,
+                      const std::size_t ndim) const
+        {
+            if (ndim != optima.size())
+                {
+                    throw std::runtime_error("dimension mismatch");
+                }
+            const double denominator = 2.0 * VS;
+            for (; first < last; ++first, values += ndim)
+                {
+                    double sqdiff = 0.0;
+                    for (std::size_t i = 0; i < ndim; ++i)
+                        {
+                            sqdiff += gsl_pow_2(values[i] - optima[i]);
+                        }
+                    first->w = std::exp(-sqdiff / denominator);
+                }
+        }
+
         std::unique_ptr<MultivariateGeneticValueToFitnessMap>
         clone() const
         {
@@ -38,6 +38,22 @@ namespace fwdpy11
         virtual double
         operator()(const DiploidMetadata& /*metadata*/,
                    const std::vector<double>& /*values*/) const = 0;
+
+        virtual void
+        set_fitnesses(std::vector<DiploidMetadata>::iterator first,
+                      std::vector<DiploidMetadata>::iterator last,
+                      std::vector<double>::const_iterator values,
+                      const std::size_t ndim) const
+        /// Sets the fitness of each individual in [first, last).
+        /// values contains ndim genetic values per individual.
+        {
+            std::vector<double> buffer(ndim);
+            for (; first < last; ++first, values += ndim)
+                {
+                    buffer.assign(values, values + ndim);
+                    first->w = this->operator()(*first, buffer);
+                }
+        }
         virtual void update(const DiploidPopulation& /*pop*/) = 0;
         virtual std::unique_ptr<MultivariateGeneticValueToFitnessMap>
         clone() const = 0;
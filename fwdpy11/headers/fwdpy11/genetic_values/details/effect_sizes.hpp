@@ -0,0 +1,166 @@
+//
+// Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+//
+// This file is part of fwdpy11.
+//
+// fwdpy11 is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// fwdpy11 is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+//
+
+#ifndef FWDPY11_GENETIC_VALUES_DETAILS_EFFECT_SIZES_HPP
+#define FWDPY11_GENETIC_VALUES_DETAILS_EFFECT_SIZES_HPP
+
+#include <algorithm>
+#include <cstddef>
+#include <cstdint>
+#include <stdexcept>
+#include <vector>
+#include <fwdpy11/types/DiploidPopulation.hpp>
+
+namespace fwdpy11
+{
+    // Each Mutation stores its effect sizes in its own vector,
+    // so summing the effects of many mutations on many traits
+    // visits many small allocations.  This arena stores the
+    // effect sizes of all mutations in a few contiguous blocks
+    // indexed by mutation key.  When most effect sizes are zero,
+    // only the nonzero ones are stored, along with their traits.
+
+    struct effect_size_arena
+    /// The arena is only valid while the population is not
+    /// modified, and is filled and cleared by the simulation
+    /// engine around each calculation of fitnesses.
+    {
+        const DiploidPopulation* pop;
+        std::size_t ndim;
+        bool sparse;
+        /// Dense: ndim values per mutation.
+        /// Sparse: the nonzero values of mutation i are
+        /// in [offsets[i], offsets[i+1]).
+        std::vector<double> values;
+        std::vector<std::uint32_t> traits;
+        std::vector<std::size_t> offsets;
+        /// Zero if the effect sizes of a mutation do not
+        /// have ndim dimensions
+        std::vector<std::uint8_t> valid;
+
+        effect_size_arena()
+            : pop{ nullptr }, ndim{ 0 }, sparse{ false }, values{},
+              traits{}, offsets{}, valid{}
+        {
+        }
+
+        void
+        fill(const DiploidPopulation& population, const std::size_t n)
+        {
+            const auto& mutations = population.mutations;
+            ndim = n;
+            valid.assign(mutations.size(), 0);
+            std::size_t nonzero = 0;
+            for (std::size_t i = 0; i < mutations.size(); ++i)
+                {
+                    if (mutations[i].esizes.size() == ndim)
+                        {
+                            valid[i] = 1;
+                            for (auto x : mutations[i].esizes)
+                                {
+                                    nonzero += (x != 0.0);
+                                }
+                        }
+                }
+            sparse = 2 * nonzero <= mutations.size() * ndim;
+            values.clear();
+            traits.clear();
+            offsets.clear();
+            if (sparse)
+                {
+                    values.reserve(nonzero);
+                    traits.reserve(nonzero);
+                    offsets.reserve(mutations.size() + 1);
+                    offsets.push_back(0);
+                    for (std::size_t i = 0; i < mutations.size(); ++i)
+                        {
+                            if (valid[i])
+                                {
+                                    for (std::size_t t = 0; t < ndim; ++t)
+                                        {
+                                            const auto x
+                                                = mutations[i].esizes[t];
+                                            if (x != 0.0)
+                                                {
+                                                    values.push_back(x);
+                                                    traits.push_back(t);
+                                                }
+                                        }
+                                }
+                            offsets.push_back(values.size());
+                        }
+                }
+            else
+                {
+                    values.resize(mutations.size() * ndim, 0.0);
+                    auto row = values.begin();
+                    for (std::size_t i = 0; i < mutations.size();
+                         ++i, row += ndim)
+                        {
+                            if (valid[i])
+                                {
+                                    std::copy(mutations[i].esizes.begin(),
+                                              mutations[i].esizes.end(), row);
+                                }
+                        }
+                }
+            pop = &population;
+        }
+
+        void
+        clear()
+        {
+            pop = nullptr;
+        }
+
+        inline bool
+        valid_for(const DiploidPopulation& population) const
+        {
+            return pop == &population;
+        }
+
+        inline void
+        add(const fwdpp::uint_t key, std::vector<double>& buffer) const
+        /// Adds the effect sizes of mutation key to buffer.
+        /// The result is the same as adding all ndim values.
+        {
+            if (!valid[key] || buffer.size() != ndim)
+                {
+                    throw std::runtime_error("dimensionality mismatch");
+                }
+            if (sparse)
+                {
+                    for (auto i = offsets[key]; i < offsets[key + 1]; ++i)
+                        {
+                            buffer[traits[i]] += values[i];
+                        }
+                }
+            else
+                {
+                    const double* row = values.data() + key * ndim;
+                    for (std::size_t t = 0; t < ndim; ++t)
+                        {
+                            buffer[t] += row[t];
+                        }
+                }
+        }
+    };
+} // namespace fwdpy11
+
+#endif
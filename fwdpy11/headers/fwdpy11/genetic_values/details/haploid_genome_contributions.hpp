@@ -0,0 +1,491 @@
+//
+// Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+//
+// This file is part of fwdpy11.
+//
+// fwdpy11 is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// fwdpy11 is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+//
+
+#ifndef FWDPY11_GENETIC_VALUES_DETAILS_HAPLOID_GENOME_CONTRIBUTIONS_HPP
+#define FWDPY11_GENETIC_VALUES_DETAILS_HAPLOID_GENOME_CONTRIBUTIONS_HPP
+
+#include <algorithm>
+#include <cmath>
+#include <cstddef>
+#include <limits>
+#include <vector>
+#include <fwdpp/fitness_models.hpp>
+#include <fwdpy11/types/DiploidPopulation.hpp>
+
+namespace fwdpy11
+{
+    // The genetic value of a diploid under the additive and
+    // multiplicative models is decomposed into a contribution
+    // from each of its two haploid genomes plus a correction
+    // for the mutations that are homozygous in the diploid.
+    // The contribution of a haploid genome only depends on
+    // that genome, so it can be calculated once per generation
+    // and shared by all diploids carrying it.
+    //
+    // A policy provides mutation_effect, which returns the
+    // heterozygous and homozygous effects of a mutation,
+    // genome_value, which returns the contribution of a genome
+    // and may append entries to be used by diploid_value, and
+    // diploid_value, which combines the contributions of
+    // two genomes.  The effects are passed to the latter two
+    // as a function of the mutation key, so that they can be
+    // calculated once for all genomes.
+
+    struct dominance_entry
+    /// The effects of a selected mutation, which may
+    /// depend on zygosity.
+    {
+        double pos, het, hom;
+        std::size_t key;
+    };
+
+    inline std::size_t
+    key_of(const dominance_entry& e)
+    {
+        return e.key;
+    }
+
+    inline std::size_t
+    key_of(const fwdpp::uint_t k)
+    {
+        return k;
+    }
+
+    template <typename Iterator, typename Position, typename Visitor>
+    inline void
+    visit_diploid_mutations(Iterator first1, Iterator last1,
+                            Iterator first2, Iterator last2,
+                            const Position& position, const Visitor& visit)
+    /// Visits the mutations of a diploid, given as two ranges
+    /// of keys or entries sorted by position.  Calls visit(x, false)
+    /// for each heterozygous mutation and visit(x, true) once for
+    /// each homozygous mutation.  Mutations at the same position
+    /// may be in any order within each range.
+    {
+        const auto key = [](const Iterator i) { return key_of(*i); };
+        while (first1 < last1 && first2 < last2)
+            {
+                const double pos1 = position(*first1),
+                             pos2 = position(*first2);
+                if (key(first1) == key(first2))
+                    {
+                        visit(*first1, true);
+                        ++first1;
+                        ++first2;
+                    }
+                else if (pos2 < pos1)
+                    {
+                        visit(*first2, false);
+                        ++first2;
+                    }
+                else if (pos1 < pos2)
+                    {
+                        visit(*first1, false);
+                        ++first1;
+                    }
+                else
+                    {
+                        // Different mutations at the same position
+                        auto end1 = first1, end2 = first2;
+                        while (end1 < last1 && position(*end1) == pos1)
+                            {
+                                ++end1;
+                            }
+                        while (end2 < last2 && position(*end2) == pos1)
+                            {
+                                ++end2;
+                            }
+                        for (auto i = first1; i < end1; ++i)
+                            {
+                                bool homozygous = false;
+                                for (auto j = first2; j < end2; ++j)
+                                    {
+                                        homozygous = homozygous
+                                                     || key(i) == key(j);
+                                    }
+                                visit(*i, homozygous);
+                            }
+                        for (auto j = first2; j < end2; ++j)
+                            {
+                                bool homozygous = false;
+                                for (auto i = first1; i < end1; ++i)
+                                    {
+                                        homozygous = homozygous
+                                                     || key(i) == key(j);
+                                    }
+                                if (!homozygous)
+                                    {
+                                        visit(*j, false);
+                                    }
+                            }
+                        first1 = end1;
+                        first2 = end2;
+                    }
+            }
+        for (; first1 < last1; ++first1)
+            {
+                visit(*first1, false);
+            }
+        for (; first2 < last2; ++first2)
+            {
+                visit(*first2, false);
+            }
+    }
+
+    struct additive_contributions
+    /// A mutation whose homozygous effect is twice its
+    /// heterozygous effect, which is the case for h = 1 and
+    /// scaling = 2, goes into the sum of its genome.  Every
+    /// other mutation is an entry, and the entries of the
+    /// two genomes of a diploid are merged.
+    {
+        double scaling;
+        bool gvalue_is_trait;
+
+        static inline double
+        identity()
+        {
+            return 0.0;
+        }
+
+        explicit additive_contributions(const fwdpp::additive_diploid& gv)
+            : scaling{ gv.scaling }, gvalue_is_trait{ gv.gvalue_is_trait }
+        {
+        }
+
+        inline dominance_entry
+        mutation_effect(const Mutation& m, const std::size_t key) const
+        {
+            return dominance_entry{ m.pos, m.h * m.s, scaling * m.s, key };
+        }
+
+        template <typename Effects>
+        inline double
+        genome_value(const std::vector<fwdpp::uint_t>& keys,
+                     const Effects& effect,
+                     std::vector<dominance_entry>& entries) const
+        {
+            double value = 0.0;
+            for (auto k : keys)
+                {
+                    const dominance_entry e = effect(k);
+                    if (e.hom == 2.0 * e.het)
+                        {
+                            value += e.het;
+                        }
+                    else
+                        {
+                            entries.push_back(e);
+                        }
+                }
+            return value;
+        }
+
+        template <typename Effects>
+        inline double
+        diploid_value(const DiploidPopulation& /*pop*/,
+                      const DiploidGenotype& /*dip*/, const double value1,
+                      const double value2, const dominance_entry* first1,
+                      const dominance_entry* last1,
+                      const dominance_entry* first2,
+                      const dominance_entry* last2,
+                      const Effects& /*effect*/) const
+        {
+            double value = value1 + value2;
+            visit_diploid_mutations(
+                first1, last1, first2, last2,
+                [](const dominance_entry& e) { return e.pos; },
+                [&value](const dominance_entry& e, const bool homozygous) {
+                    value += homozygous ? e.hom : e.het;
+                });
+            if (gvalue_is_trait)
+                {
+                    return value;
+                }
+            return std::max(0.0, 1.0 + value);
+        }
+    };
+
+    struct multiplicative_contributions
+    /// The contribution of a genome is the sum of log(1 + hs)
+    /// over its mutations.  For each diploid, only the mutations
+    /// in both genomes are visited, to replace two heterozygous
+    /// effects by the homozygous effect.  The keys of the two
+    /// genomes are merged using the positions in the effects,
+    /// which are stored contiguously by the cache, rather than
+    /// those of the mutations themselves.  Genomes with a factor
+    /// 1 + hs <= 0, and diploids with a homozygous factor
+    /// 1 + scaling*s <= 0, are calculated without logarithms.
+    {
+        double scaling;
+        bool gvalue_is_trait;
+
+        static inline double
+        identity()
+        {
+            return 0.0;
+        }
+
+        explicit multiplicative_contributions(
+            const fwdpp::multiplicative_diploid& gv)
+            : scaling{ gv.scaling }, gvalue_is_trait{ gv.gvalue_is_trait }
+        {
+        }
+
+        inline dominance_entry
+        mutation_effect(const Mutation& m, const std::size_t key) const
+        /// het is log(1 + hs), or NaN if 1 + hs <= 0,
+        /// and hom is scaling*s.
+        {
+            return dominance_entry{
+                m.pos,
+                m.h * m.s > -1.0 ? std::log1p(m.h * m.s)
+                                 : std::numeric_limits<double>::quiet_NaN(),
+                scaling * m.s, key
+            };
+        }
+
+        template <typename Effects>
+        inline double
+        genome_value(const std::vector<fwdpp::uint_t>& keys,
+                     const Effects& effect,
+                     std::vector<dominance_entry>& /*entries*/) const
+        /// Returns NaN if a factor is not positive
+        {
+            double value = 0.0;
+            for (auto k : keys)
+                {
+                    value += effect(k).het;
+                }
+            return value;
+        }
+
+        inline double
+        finalize(const double value) const
+        {
+            if (gvalue_is_trait)
+                {
+                    return value - 1.0;
+                }
+            return std::max(0.0, value);
+        }
+
+        inline double
+        product(const DiploidPopulation& pop,
+                const DiploidGenotype& dip) const
+        /// The genetic value, as a product in position order
+        {
+            const auto& keys1 = pop.haploid_genomes[dip.first].smutations;
+            const auto& keys2 = pop.haploid_genomes[dip.second].smutations;
+            double value = 1.0;
+            visit_diploid_mutations(
+                keys1.begin(), keys1.end(), keys2.begin(), keys2.end(),
+                [&pop](const fwdpp::uint_t k) { return pop.mutations[k].pos; },
+                [this, &pop, &value](const fwdpp::uint_t k,
+                                     const bool homozygous) {
+                    const auto& m = pop.mutations[k];
+                    value *= 1.0 + (homozygous ? scaling : m.h) * m.s;
+                });
+            return finalize(value);
+        }
+
+        template <typename Effects>
+        inline double
+        diploid_value(const DiploidPopulation& pop, const DiploidGenotype& dip,
+                      const double value1, const double value2,
+                      const dominance_entry* /*first1*/,
+                      const dominance_entry* /*last1*/,
+                      const dominance_entry* /*first2*/,
+                      const dominance_entry* /*last2*/,
+                      const Effects& effect) const
+        {
+            if (std::isnan(value1) || std::isnan(value2))
+                {
+                    return product(pop, dip);
+                }
+            const auto& keys1 = pop.haploid_genomes[dip.first].smutations;
+            const auto& keys2 = pop.haploid_genomes[dip.second].smutations;
+            double value = 0.0;
+            bool positive = true;
+            if (dip.first == dip.second)
+                // Every mutation is homozygous
+                {
+                    for (auto k : keys1)
+                        {
+                            const double hom = effect(k).hom;
+                            positive = positive && hom > -1.0;
+                            value += std::log1p(hom);
+                        }
+                }
+            else
+                {
+                    value = value1 + value2;
+                    visit_diploid_mutations(
+                        keys1.begin(), keys1.end(), keys2.begin(),
+                        keys2.end(),
+                        [&effect](const fwdpp::uint_t k) {
+                            return effect(k).pos;
+                        },
+                        [&effect, &value, &positive](const fwdpp::uint_t k,
+                                                     const bool homozygous) {
+                            if (homozygous)
+                                {
+                                    const dominance_entry e = effect(k);
+                                    positive = positive && e.hom > -1.0;
+                                    value += std::log1p(e.hom) - 2.0 * e.het;
+                                }
+                        });
+                }
+            if (!positive)
+                {
+                    return product(pop, dip);
+                }
+            return finalize(std::exp(value));
+        }
+    };
+
+    struct no_contributions
+    /// Policy for genetic value types that cannot be decomposed.
+    {
+        template <typename fwdppT> explicit no_contributions(const fwdppT&)
+        {
+        }
+    };
+
+    template <typename fwdppT> struct haploid_genome_contribution_policy
+    /// Maps a fwdpp genetic value type to the policy
+    /// used to decompose it.
+    {
+        using type = no_contributions;
+    };
+
+    template <>
+    struct haploid_genome_contribution_policy<fwdpp::additive_diploid>
+    {
+        using type = additive_contributions;
+    };
+
+    template <>
+    struct haploid_genome_contribution_policy<fwdpp::multiplicative_diploid>
+    {
+        using type = multiplicative_contributions;
+    };
+
+    template <typename policy> struct haploid_genome_contributions
+    /// Cache of the contribution of each haploid genome
+    /// in a population.  The entries of genome i are in
+    /// [offsets[i], offsets[i+1]), and effects holds the
+    /// effects of each mutation, indexed by key.
+    ///
+    /// The cache is only valid while the population is not
+    /// modified, and is filled and cleared by the simulation
+    /// engine around each calculation of fitnesses.
+    {
+        const DiploidPopulation* pop;
+        std::vector<double> values;
+        std::vector<std::size_t> offsets;
+        std::vector<dominance_entry> entries, effects;
+
+        haploid_genome_contributions()
+            : pop{ nullptr }, values{}, offsets{}, entries{}, effects{}
+        {
+        }
+
+        void
+        fill(const policy& p, const DiploidPopulation& population)
+        {
+            effects.resize(population.mutations.size());
+            for (std::size_t k = 0; k < effects.size(); ++k)
+                {
+                    effects[k] = p.mutation_effect(population.mutations[k], k);
+                }
+            const auto effect
+                = [this](const std::size_t k) -> const dominance_entry& {
+                return effects[k];
+            };
+            const auto n = population.haploid_genomes.size();
+            values.assign(n, policy::identity());
+            offsets.assign(n + 1, 0);
+            entries.clear();
+            for (std::size_t i = 0; i < n; ++i)
+                {
+                    const auto& g = population.haploid_genomes[i];
+                    if (g.n > 0)
+                        {
+                            values[i]
+                                = p.genome_value(g.smutations, effect, entries);
+                        }
+                    offsets[i + 1] = entries.size();
+                }
+            pop = &population;
+        }
+
+        void
+        clear()
+        {
+            pop = nullptr;
+        }
+
+        inline bool
+        valid_for(const DiploidPopulation& population) const
+        {
+            return pop == &population;
+        }
+
+        inline double
+        operator()(const policy& p, const DiploidPopulation& population,
+                   const std::size_t diploid_index) const
+        {
+            const auto& dip = population.diploids[diploid_index];
+            return p.diploid_value(
+                population, dip, values[dip.first], values[dip.second],
+                entries.data() + offsets[dip.first],
+                entries.data() + offsets[dip.first + 1],
+                entries.data() + offsets[dip.second],
+                entries.data() + offsets[dip.second + 1],
+                [this](const std::size_t k) -> const dominance_entry& {
+                    return effects[k];
+                });
+        }
+    };
+
+    template <typename policy>
+    inline double
+    uncached_genetic_value(const policy& p, const DiploidPopulation& pop,
+                           const std::size_t diploid_index)
+    /// The same calculation as haploid_genome_contributions,
+    /// for use when the cache has not been filled.
+    {
+        const auto& dip = pop.diploids[diploid_index];
+        const auto effect = [&p, &pop](const std::size_t k) {
+            return p.mutation_effect(pop.mutations[k], k);
+        };
+        std::vector<dominance_entry> entries1, entries2;
+        const double value1 = p.genome_value(
+            pop.haploid_genomes[dip.first].smutations, effect, entries1);
+        const double value2 = p.genome_value(
+            pop.haploid_genomes[dip.second].smutations, effect, entries2);
+        return p.diploid_value(pop, dip, value1, value2, entries1.data(),
+                               entries1.data() + entries1.size(),
+                               entries2.data(),
+                               entries2.data() + entries2.size(), effect);
+    }
+} // namespace fwdpy11
+
+#endif
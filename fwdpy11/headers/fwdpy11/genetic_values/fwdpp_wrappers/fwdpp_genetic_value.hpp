@@ -5,6 +5,7 @@
 #include <functional>
 #include "../DiploidPopulationGeneticValueWithMapping.hpp"
 #include "../noise.hpp"
+#include "../details/haploid_genome_contributions.hpp"
 
 namespace fwdpy11
 {
@@ -14,8 +15,13 @@ namespace fwdpy11
     {
         using gvalue_map_ptr
             = std::unique_ptr<fwdpy11::GeneticValueToFitnessMap>;
+        using contribution_policy =
+            typename haploid_genome_contribution_policy<fwdppT>::type;
         const fwdppT gv;
         const pickleFunction pickle_fxn;
+        const contribution_policy policy;
+        mutable haploid_genome_contributions<contribution_policy>
+            contributions;
         static_assert(
             std::is_convertible<pickleFunction, std::function<pybind11::object(
                                                     const fwdppT&)>>::value,
@@ -26,7 +32,7 @@ namespace fwdpy11
         fwdpp_genetic_value(forwarded_fwdppT&& gv_)
             : DiploidPopulationGeneticValueWithMapping{ GeneticValueIsFitness() },
               gv{ std::forward<forwarded_fwdppT>(gv_) },
-              pickle_fxn(pickleFunction{})
+              pickle_fxn(pickleFunction{}), policy{ gv }, contributions{}
         {
         }
 
@@ -35,7 +41,7 @@ namespace fwdpy11
                                    const GeneticValueToFitnessMap& gv2w_)
             : DiploidPopulationGeneticValueWithMapping{ gv2w_ },
               gv{ std::forward<forwarded_fwdppT>(gv_) },
-              pickle_fxn(pickleFunction())
+              pickle_fxn(pickleFunction()), policy{ gv }, contributions{}
         {
         }
 
@@ -47,8 +53,7 @@ namespace fwdpy11
               gv{ std::forward<forwarded_fwdppT>(gv_)
 
               },
-              pickle_fxn(pickleFunction())
-
+              pickle_fxn(pickleFunction()), policy{ gv }, contributions{}
         {
         }
 
@@ -56,9 +61,81 @@ namespace fwdpy11
         calculate_gvalue(const std::size_t diploid_index,
                          const fwdpy11::DiploidPopulation& pop) const
         {
-            gvalues[0]
-                = gv(pop.diploids[diploid_index], pop.haploid_genomes, pop.mutations);
-            return gvalues[0];
+            return calculate_gvalue(diploid_index, pop, gvalues);
+        }
+
+        inline double
+        calculate_gvalue(const std::size_t diploid_index,
+                         const fwdpy11::DiploidPopulation& pop,
+                         std::vector<double>& buffer) const
+        {
+            buffer.resize(1);
+            buffer[0] = genetic_value(
+                diploid_index, pop,
+                std::is_same<contribution_policy, no_contributions>());
+            return buffer[0];
+        }
+
+        inline double
+        genetic_value(const std::size_t diploid_index,
+                      const fwdpy11::DiploidPopulation& pop,
+                      std::true_type) const
+        {
+            return gv(pop.diploids[diploid_index], pop.haploid_genomes,
+                      pop.mutations);
+        }
+
+        inline double
+        genetic_value(const std::size_t diploid_index,
+                      const fwdpy11::DiploidPopulation& pop,
+                      std::false_type) const
+        {
+            if (contributions.valid_for(pop))
+                {
+                    return contributions(policy, pop, diploid_index);
+                }
+            return uncached_genetic_value(policy, pop, diploid_index);
+        }
+
+        inline void
+        begin_fitness_calculation(const fwdpy11::DiploidPopulation& pop) const
+        {
+            fill_contributions(
+                pop, std::is_same<contribution_policy, no_contributions>());
+        }
+
+        inline void
+        end_fitness_calculation() const
+        {
+            contributions.clear();
+        }
+
+        inline void
+        fill_contributions(const fwdpy11::DiploidPopulation& /*pop*/,
+                           std::true_type) const
+        {
+        }
+
+        inline void
+        fill_contributions(const fwdpy11::DiploidPopulation& pop,
+                           std::false_type) const
+        {
+            contributions.fill(policy, pop);
+        }
+
+        inline bool
+        supports_threads() const
+        {
+            return true;
+        }
+
+        inline bool
+        uniform_without_selected_mutations() const
+        {
+            return dynamic_cast<const GeneticValueIsFitness*>(gv2w.get())
+                       != nullptr
+                   && dynamic_cast<const NoNoise*>(noise_fxn.get())
+                          != nullptr;
         }
 
         inline void
@@ -0,0 +1,76 @@
+//
+// Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+//
+// This file is part of fwdpy11.
+//
+// fwdpy11 is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// fwdpy11 is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+//
+
+#ifndef FWDPY11_GENETIC_VALUES_INDIVIDUALS_HPP
+#define FWDPY11_GENETIC_VALUES_INDIVIDUALS_HPP
+
+#include <cstddef>
+#include <cstdint>
+#include <numeric>
+#include <stdexcept>
+#include <vector>
+#include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
+#include <fwdpy11/types/DiploidPopulation.hpp>
+
+namespace fwdpy11
+{
+    inline std::vector<std::size_t>
+    individuals_from_python(const DiploidPopulation& pop,
+                            pybind11::object individuals)
+    /// Converts the individuals argument of the batched
+    /// genetic value, fitness, and noise functions into
+    /// a vector of indexes.  If individuals is None, all
+    /// individuals in pop are returned.
+    ///
+    /// The indexes are copied so that the GIL may be released
+    /// while they are used.
+    {
+        std::vector<std::size_t> rv;
+        if (individuals.is_none())
+            {
+                rv.resize(pop.diploids.size());
+                std::iota(rv.begin(), rv.end(), 0);
+                return rv;
+            }
+        auto a = individuals.cast<pybind11::array_t<
+            std::int64_t, pybind11::array::c_style
+                              | pybind11::array::forcecast>>();
+        if (a.ndim() != 1)
+            {
+                throw std::invalid_argument(
+                    "individuals must be a 1d array");
+            }
+        auto r = a.unchecked<1>();
+        rv.reserve(r.shape(0));
+        for (decltype(r.shape(0)) i = 0; i < r.shape(0); ++i)
+            {
+                if (r(i) < 0
+                    || static_cast<std::size_t>(r(i)) >= pop.diploids.size())
+                    {
+                        throw std::invalid_argument(
+                            "individual index out of range");
+                    }
+                rv.push_back(static_cast<std::size_t>(r(i)));
+            }
+        return rv;
+    }
+} // namespace fwdpy11
+
+#endif
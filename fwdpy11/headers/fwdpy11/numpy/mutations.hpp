@@ -0,0 +1,172 @@
+//
+// Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+//
+// This file is part of fwdpy11.
+//
+// fwdpy11 is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// fwdpy11 is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+//
+
+#ifndef FWDPY11_NUMPY_MUTATIONS_HPP
+#define FWDPY11_NUMPY_MUTATIONS_HPP
+
+#include <cstdint>
+#include <stdexcept>
+#include <utility>
+#include <vector>
+#include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
+#include <fwdpy11/types/Mutation.hpp>
+#include "array.hpp"
+
+namespace fwdpy11
+{
+    struct flattened_Mutation
+    /// The fixed-size fields of Mutation.
+    /// The numpy dtype is registered in init_MutationVector.
+    {
+        double pos, s, h;
+        fwdpp::uint_t g;
+        decltype(Mutation::xtra) label;
+        std::int16_t neutral;
+    };
+
+    inline pybind11::array
+    make_flattened_Mutation_array(const std::vector<Mutation>& mutations)
+    {
+        std::vector<flattened_Mutation> vfm;
+        vfm.reserve(mutations.size());
+        for (auto&& m : mutations)
+            {
+                vfm.push_back(flattened_Mutation{ m.pos, m.s, m.h, m.g, m.xtra,
+                                                  m.neutral });
+            }
+        return make_1d_array_with_capsule(std::move(vfm));
+    }
+
+    inline pybind11::tuple
+    mutations_to_ndarrays(const std::vector<Mutation>& mutations)
+    /// Returns the fixed-size fields as a structured array
+    /// followed by the offsets and values of esizes and heffects.
+    {
+        std::vector<std::size_t> esizes_offsets, heffects_offsets;
+        esizes_offsets.reserve(mutations.size() + 1);
+        heffects_offsets.reserve(mutations.size() + 1);
+        esizes_offsets.push_back(0);
+        heffects_offsets.push_back(0);
+        for (auto&& m : mutations)
+            {
+                esizes_offsets.push_back(esizes_offsets.back()
+                                         + m.esizes.size());
+                heffects_offsets.push_back(heffects_offsets.back()
+                                           + m.heffects.size());
+            }
+        std::vector<double> esizes, heffects;
+        esizes.reserve(esizes_offsets.back());
+        heffects.reserve(heffects_offsets.back());
+        for (auto&& m : mutations)
+            {
+                esizes.insert(end(esizes), begin(m.esizes), end(m.esizes));
+                heffects.insert(end(heffects), begin(m.heffects),
+                                end(m.heffects));
+            }
+        return pybind11::make_tuple(
+            make_flattened_Mutation_array(mutations),
+            make_1d_array_with_capsule(std::move(esizes_offsets)),
+            make_1d_array_with_capsule(std::move(esizes)),
+            make_1d_array_with_capsule(std::move(heffects_offsets)),
+            make_1d_array_with_capsule(std::move(heffects)));
+    }
+
+    namespace detail
+    {
+        template <typename offsets_t>
+        inline void
+        validate_offsets(const offsets_t& offsets,
+                         const std::size_t nmutations,
+                         const std::size_t nvalues)
+        {
+            if (static_cast<std::size_t>(offsets.shape(0)) != nmutations + 1)
+                {
+                    throw std::invalid_argument(
+                        "offsets must have length len(mutations) + 1");
+                }
+            if (offsets(0) != 0
+                || static_cast<std::size_t>(offsets(offsets.shape(0) - 1))
+                       != nvalues)
+                {
+                    throw std::invalid_argument(
+                        "offsets must start at 0 and end at the number "
+                        "of values");
+                }
+            for (decltype(offsets.shape(0)) i = 1; i < offsets.shape(0); ++i)
+                {
+                    if (offsets(i) < offsets(i - 1))
+                        {
+                            throw std::invalid_argument(
+                                "offsets must be non-decreasing");
+                        }
+                }
+        }
+    } // namespace detail
+
+    inline std::vector<Mutation>
+    mutations_from_ndarrays(
+        pybind11::array mutations,
+        pybind11::array_t<std::uint64_t, pybind11::array::c_style
+                                             | pybind11::array::forcecast>
+            esizes_offsets,
+        pybind11::array_t<double, pybind11::array::c_style
+                                      | pybind11::array::forcecast>
+            esizes,
+        pybind11::array_t<std::uint64_t, pybind11::array::c_style
+                                             | pybind11::array::forcecast>
+            heffects_offsets,
+        pybind11::array_t<double, pybind11::array::c_style
+                                      | pybind11::array::forcecast>
+            heffects)
+    /// Inverse of mutations_to_ndarrays.
+    {
+        auto fm = mutations.cast<pybind11::array_t<
+            flattened_Mutation, pybind11::array::c_style
+                                    | pybind11::array::forcecast>>();
+        if (fm.ndim() != 1 || esizes_offsets.ndim() != 1
+            || esizes.ndim() != 1 || heffects_offsets.ndim() != 1
+            || heffects.ndim() != 1)
+            {
+                throw std::invalid_argument("all arrays must be 1d");
+            }
+        const auto n = static_cast<std::size_t>(fm.shape(0));
+        auto eo = esizes_offsets.unchecked<1>();
+        auto ho = heffects_offsets.unchecked<1>();
+        detail::validate_offsets(eo, n, esizes.shape(0));
+        detail::validate_offsets(ho, n, heffects.shape(0));
+        auto fmr = fm.unchecked<1>();
+        const double* e = esizes.data();
+        const double* h = heffects.data();
+        std::vector<Mutation> rv;
+        rv.reserve(n);
+        for (std::size_t i = 0; i < n; ++i)
+            {
+                const auto& m = fmr(i);
+                rv.emplace_back(m.pos, m.s, m.h, m.g,
+                                std::vector<double>(e + eo(i), e + eo(i + 1)),
+                                std::vector<double>(h + ho(i), h + ho(i + 1)),
+                                m.label);
+                rv.back().neutral = (m.neutral != 0);
+            }
+        return rv;
+    }
+} // namespace fwdpy11
+
+#endif
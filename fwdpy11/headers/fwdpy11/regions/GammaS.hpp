@@ -52,7 +52,7 @@ namespace fwdpy11
         operator()(
             fwdpp::flagged_mutation_queue& recycling_bin,
             std::vector<Mutation>& mutations,
-            std::unordered_multimap<double, std::uint32_t>& lookup_table,
+            mutation_position_index& lookup_table,
             const std::uint32_t generation, const GSLrng_t& rng) const
         {
             return infsites_Mutation(
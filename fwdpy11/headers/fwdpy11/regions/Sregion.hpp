@@ -4,10 +4,10 @@
 #include <memory>
 #include <vector>
 #include <cmath>
-#include <unordered_map>
 #include <fwdpp/forward_types.hpp>
 #include <fwdpp/simfunctions/recycling.hpp>
 #include <fwdpy11/types/Mutation.hpp>
+#include <fwdpy11/types/mutation_position_index.hpp>
 #include <fwdpy11/rng.hpp>
 #include "Region.hpp"
 
@@ -58,7 +58,7 @@ namespace fwdpy11
         virtual std::uint32_t operator()(
             fwdpp::flagged_mutation_queue& /*recycling_bin*/,
             std::vector<Mutation>& /*mutations*/,
-            std::unordered_multimap<double, std::uint32_t>& /*lookup_table*/,
+            mutation_position_index& /*lookup_table*/,
             const std::uint32_t /*generation*/,
             const GSLrng_t& /*rng*/) const = 0;
 
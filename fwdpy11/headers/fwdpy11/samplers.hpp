@@ -27,6 +27,15 @@ namespace fwdpy11
     // Applied each generation to record any data of interest.
     using DiploidPopulation_temporal_sampler
         = std::function<void(const fwdpy11::DiploidPopulation&)>;
+
+    struct RecordNothing
+    /// A temporal sampler that does nothing.
+    {
+        inline void
+        operator()(const Population&) const
+        {
+        }
+    };
 }
 
 #endif
@@ -0,0 +1,278 @@
+//
+// Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+//
+// This file is part of fwdpy11.
+//
+// fwdpy11 is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// fwdpy11 is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+//
+/*! \file arrays.hpp
+ * \brief Conversion of a DiploidPopulation to and from a dict of
+ * numpy arrays, for pickling with few, large buffers.
+ */
+#ifndef FWDPY11_SERIALIZATION_ARRAYS_HPP
+#define FWDPY11_SERIALIZATION_ARRAYS_HPP
+
+#include <algorithm>
+#include <cstdint>
+#include <stdexcept>
+#include <utility>
+#include <string>
+#include <vector>
+#include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
+#include <fwdpy11/types/DiploidPopulation.hpp>
+#include <fwdpy11/numpy/array.hpp>
+#include <fwdpy11/numpy/mutations.hpp>
+
+namespace fwdpy11
+{
+    namespace serialization
+    {
+        namespace arrays
+        {
+            inline constexpr int
+            format_version()
+            {
+                return 1;
+            }
+
+            template <typename T>
+            inline pybind11::array
+            view(const std::vector<T>& v, pybind11::handle owner)
+            // Read-only array over the data of v,
+            // which is kept alive by owner.
+            {
+                pybind11::array_t<T> rv({ v.size() }, { sizeof(T) }, v.data(),
+                                        owner);
+                rv.attr("flags").attr("writeable") = false;
+                return std::move(rv);
+            }
+
+            template <typename T>
+            inline std::vector<T>
+            to_vector(pybind11::handle a)
+            {
+                auto x = a.cast<pybind11::array_t<
+                    T, pybind11::array::c_style
+                           | pybind11::array::forcecast>>();
+                if (x.ndim() != 1)
+                    {
+                        throw std::invalid_argument("array must be 1d");
+                    }
+                return std::vector<T>(x.data(), x.data() + x.size());
+            }
+
+            inline pybind11::tuple
+            haploid_genomes_to_arrays(
+                const std::vector<fwdpp::haploid_genome>& genomes)
+            // Returns the counts followed by the neutral and selected
+            // keys in compressed sparse row format.
+            {
+                std::vector<fwdpp::uint_t> counts;
+                std::vector<std::uint64_t> offsets, soffsets;
+                std::vector<fwdpp::uint_t> keys, skeys;
+                counts.reserve(genomes.size());
+                offsets.reserve(genomes.size() + 1);
+                soffsets.reserve(genomes.size() + 1);
+                offsets.push_back(0);
+                soffsets.push_back(0);
+                for (auto& g : genomes)
+                    {
+                        counts.push_back(g.n);
+                        offsets.push_back(offsets.back()
+                                          + g.mutations.size());
+                        soffsets.push_back(soffsets.back()
+                                           + g.smutations.size());
+                    }
+                keys.reserve(offsets.back());
+                skeys.reserve(soffsets.back());
+                for (auto& g : genomes)
+                    {
+                        keys.insert(end(keys), begin(g.mutations),
+                                    end(g.mutations));
+                        skeys.insert(end(skeys), begin(g.smutations),
+                                     end(g.smutations));
+                    }
+                return pybind11::make_tuple(
+                    make_1d_array_with_capsule(std::move(counts)),
+                    make_1d_array_with_capsule(std::move(offsets)),
+                    make_1d_array_with_capsule(std::move(keys)),
+                    make_1d_array_with_capsule(std::move(soffsets)),
+                    make_1d_array_with_capsule(std::move(skeys)));
+            }
+
+            inline std::vector<fwdpp::haploid_genome>
+            haploid_genomes_from_arrays(pybind11::tuple t)
+            {
+                auto counts = to_vector<fwdpp::uint_t>(t[0]);
+                auto offsets = to_vector<std::uint64_t>(t[1]);
+                auto keys = to_vector<fwdpp::uint_t>(t[2]);
+                auto soffsets = to_vector<std::uint64_t>(t[3]);
+                auto skeys = to_vector<fwdpp::uint_t>(t[4]);
+                const auto n = counts.size();
+                for (auto o : { std::make_pair(&offsets, keys.size()),
+                                std::make_pair(&soffsets, skeys.size()) })
+                    {
+                        if (o.first->size() != n + 1 || o.first->front() != 0
+                            || o.first->back() != o.second
+                            || !std::is_sorted(begin(*o.first),
+                                               end(*o.first)))
+                            {
+                                throw std::invalid_argument(
+                                    "invalid haploid genome offsets");
+                            }
+                    }
+                std::vector<fwdpp::haploid_genome> rv;
+                rv.reserve(n);
+                for (std::size_t i = 0; i < n; ++i)
+                    {
+                        rv.emplace_back(
+                            counts[i],
+                            decltype(fwdpp::haploid_genome::mutations)(
+                                begin(keys) + offsets[i],
+                                begin(keys) + offsets[i + 1]),
+                            decltype(fwdpp::haploid_genome::smutations)(
+                                begin(skeys) + soffsets[i],
+                                begin(skeys) + soffsets[i + 1]));
+                    }
+                return rv;
+            }
+
+            inline std::vector<Mutation>
+            mutations_from_arrays(pybind11::tuple t)
+            {
+                using offsets_t = pybind11::array_t<
+                    std::uint64_t, pybind11::array::c_style
+                                       | pybind11::array::forcecast>;
+                using values_t = pybind11::array_t<
+                    double, pybind11::array::c_style
+                                | pybind11::array::forcecast>;
+                return mutations_from_ndarrays(
+                    t[0].cast<pybind11::array>(), t[1].cast<offsets_t>(),
+                    t[2].cast<values_t>(), t[3].cast<offsets_t>(),
+                    t[4].cast<values_t>());
+            }
+
+            inline pybind11::dict
+            population_to_arrays(pybind11::object self)
+            // The fixed-size data are views of the population,
+            // meaning that they are not copied until pickled.
+            {
+                const auto& pop = self.cast<const DiploidPopulation&>();
+                pybind11::dict d;
+                d["version"] = format_version();
+                d["N"] = pop.N;
+                d["generation"] = pop.generation;
+                d["genome_length"] = pop.tables.genome_length();
+                d["diploids"] = view(pop.diploids, self);
+                d["haploid_genomes"]
+                    = haploid_genomes_to_arrays(pop.haploid_genomes);
+                d["mutations"] = mutations_to_ndarrays(pop.mutations);
+                d["fixations"] = mutations_to_ndarrays(pop.fixations);
+                d["fixation_times"] = view(pop.fixation_times, self);
+                d["mcounts"] = view(pop.mcounts, self);
+                d["mcounts_from_preserved_nodes"]
+                    = view(pop.mcounts_from_preserved_nodes, self);
+                d["diploid_metadata"] = view(pop.diploid_metadata, self);
+                d["ancient_sample_metadata"]
+                    = view(pop.ancient_sample_metadata, self);
+                d["ancient_sample_records"]
+                    = view(pop.ancient_sample_records, self);
+                d["nodes"] = view(pop.tables.node_table, self);
+                d["edges"] = view(pop.tables.edge_table, self);
+                d["sites"] = view(pop.tables.site_table, self);
+                d["mutation_table"] = view(pop.tables.mutation_table, self);
+                d["preserved_nodes"] = view(pop.tables.preserved_nodes, self);
+                d["genetic_value_matrix"]
+                    = view(pop.genetic_value_matrix, self);
+                d["ancient_sample_genetic_value_matrix"]
+                    = view(pop.ancient_sample_genetic_value_matrix, self);
+                return d;
+            }
+
+            inline DiploidPopulation
+            population_from_arrays(pybind11::dict d)
+            {
+                if (d["version"].cast<int>() > format_version())
+                    {
+                        throw std::invalid_argument(
+                            "format version is newer than this version of "
+                            "fwdpy11");
+                    }
+                DiploidPopulation pop(d["N"].cast<fwdpp::uint_t>(),
+                                      d["genome_length"].cast<double>());
+                pop.generation
+                    = d["generation"].cast<decltype(pop.generation)>();
+                pop.diploids = to_vector<DiploidGenotype>(d["diploids"]);
+                pop.haploid_genomes = haploid_genomes_from_arrays(
+                    d["haploid_genomes"].cast<pybind11::tuple>());
+                pop.mutations = mutations_from_arrays(
+                    d["mutations"].cast<pybind11::tuple>());
+                pop.fixations = mutations_from_arrays(
+                    d["fixations"].cast<pybind11::tuple>());
+                pop.fixation_times = to_vector<
+                    decltype(pop.fixation_times)::value_type>(
+                    d["fixation_times"]);
+                pop.mcounts = to_vector<decltype(pop.mcounts)::value_type>(
+                    d["mcounts"]);
+                pop.mcounts_from_preserved_nodes = to_vector<
+                    decltype(pop.mcounts_from_preserved_nodes)::value_type>(
+                    d["mcounts_from_preserved_nodes"]);
+                pop.diploid_metadata
+                    = to_vector<DiploidMetadata>(d["diploid_metadata"]);
+                pop.ancient_sample_metadata
+                    = to_vector<DiploidMetadata>(d["ancient_sample_metadata"]);
+                pop.ancient_sample_records = to_vector<ancient_sample_record>(
+                    d["ancient_sample_records"]);
+                pop.tables.node_table
+                    = to_vector<fwdpp::ts::node>(d["nodes"]);
+                pop.tables.edge_table
+                    = to_vector<fwdpp::ts::edge>(d["edges"]);
+                pop.tables.site_table
+                    = to_vector<fwdpp::ts::site>(d["sites"]);
+                pop.tables.mutation_table
+                    = to_vector<fwdpp::ts::mutation_record>(
+                        d["mutation_table"]);
+                pop.tables.preserved_nodes = to_vector<
+                    decltype(pop.tables.preserved_nodes)::value_type>(
+                    d["preserved_nodes"]);
+                pop.genetic_value_matrix
+                    = to_vector<double>(d["genetic_value_matrix"]);
+                pop.ancient_sample_genetic_value_matrix = to_vector<double>(
+                    d["ancient_sample_genetic_value_matrix"]);
+                if (pop.diploids.size() != pop.N
+                    || pop.diploid_metadata.size() != pop.N
+                    || pop.mcounts.size() != pop.mutations.size())
+                    {
+                        throw std::invalid_argument(
+                            "inconsistent population data");
+                    }
+                for (auto& dip : pop.diploids)
+                    {
+                        if (dip.first >= pop.haploid_genomes.size()
+                            || dip.second >= pop.haploid_genomes.size())
+                            {
+                                throw std::invalid_argument(
+                                    "haploid genome index out of range");
+                            }
+                    }
+                pop.rebuild_mutation_lookup();
+                pop.tables.build_indexes();
+                return pop;
+            }
+        } // namespace arrays
+    }     // namespace serialization
+} // namespace fwdpy11
+
+#endif
@@ -0,0 +1,142 @@
+//
+// Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+//
+// This file is part of fwdpy11.
+//
+// fwdpy11 is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// fwdpy11 is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+//
+/*! \file buffers.hpp
+ * \brief Serialization of populations directly to and from Python buffers.
+ */
+#ifndef FWDPY11_SERIALIZATION_BUFFERS_HPP
+#define FWDPY11_SERIALIZATION_BUFFERS_HPP
+
+#include <cstddef>
+#include <ios>
+#include <istream>
+#include <ostream>
+#include <stdexcept>
+#include <streambuf>
+#include <pybind11/pybind11.h>
+#include <fwdpy11/serialization.hpp>
+
+namespace fwdpy11
+{
+    namespace serialization
+    {
+        class counting_streambuf : public std::streambuf
+        /// Counts the bytes written to it, and stores nothing.
+        {
+          private:
+            std::size_t count;
+
+          protected:
+            std::streamsize
+            xsputn(const char*, std::streamsize n) override
+            {
+                count += static_cast<std::size_t>(n);
+                return n;
+            }
+
+            int_type
+            overflow(int_type c) override
+            {
+                if (!traits_type::eq_int_type(c, traits_type::eof()))
+                    {
+                        ++count;
+                    }
+                return traits_type::not_eof(c);
+            }
+
+          public:
+            counting_streambuf() : std::streambuf(), count{ 0 } {}
+
+            std::size_t
+            size() const
+            {
+                return count;
+            }
+        };
+
+        class memory_streambuf : public std::streambuf
+        /// Reads from or writes to memory owned by someone else.
+        /// Writing past the end of the memory fails.
+        {
+          public:
+            memory_streambuf(char* data, const std::size_t size)
+                : std::streambuf()
+            {
+                setp(data, data + size);
+                setg(data, data, data + size);
+            }
+
+            std::size_t
+            bytes_written() const
+            {
+                return static_cast<std::size_t>(pptr() - pbase());
+            }
+        };
+
+        template <typename poptype>
+        inline pybind11::bytes
+        serialize_to_bytes(const poptype& pop)
+        /// Same output as serialize_details, written into a bytes
+        /// object whose size is determined by a first pass.
+        {
+            counting_streambuf counter;
+            std::ostream count_stream(&counter);
+            serialize_details(count_stream, &pop);
+            const auto size = counter.size();
+
+            pybind11::bytes rv(nullptr, size);
+            memory_streambuf buffer(PyBytes_AsString(rv.ptr()), size);
+            std::ostream out(&buffer);
+            serialize_details(out, &pop);
+            if (!out || buffer.bytes_written() != size)
+                {
+                    throw std::runtime_error("error serializing population");
+                }
+            return rv;
+        }
+
+        template <typename poptype>
+        inline void
+        deserialize_from_buffer(pybind11::buffer data, poptype& pop)
+        /// Deserializes from any object supporting the buffer
+        /// protocol, without copying its contents.
+        ///
+        /// The stream throws as soon as a read goes past the end
+        /// of the buffer, so that sizes are never read from a
+        /// truncated buffer.
+        {
+            auto info = data.request();
+            memory_streambuf buffer(static_cast<char*>(info.ptr),
+                                    static_cast<std::size_t>(info.size)
+                                        * info.itemsize);
+            std::istream in(&buffer);
+            in.exceptions(std::ios_base::failbit | std::ios_base::badbit);
+            try
+                {
+                    deserialize_details()(in, pop);
+                }
+            catch (const std::ios_base::failure&)
+                {
+                    throw std::runtime_error(
+                        "error deserializing population");
+                }
+        }
+    } // namespace serialization
+} // namespace fwdpy11
+
+#endif
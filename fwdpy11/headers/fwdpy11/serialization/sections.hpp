@@ -0,0 +1,746 @@
+//
+// Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+//
+// This file is part of fwdpy11.
+//
+// fwdpy11 is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// fwdpy11 is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+//
+/*! \file sections.hpp
+ * \brief File format storing a population as independent sections.
+ *
+ * The file starts with an index giving the name, offset, and size
+ * of each section.  Each section may be zlib-compressed, and can be
+ * read without reading any other section.
+ */
+#ifndef FWDPY11_SERIALIZATION_SECTIONS_HPP
+#define FWDPY11_SERIALIZATION_SECTIONS_HPP
+
+#include <algorithm>
+#include <cstdint>
+#include <cstring>
+#include <fstream>
+#include <limits>
+#include <streambuf>
+#include <stdexcept>
+#include <string>
+#include <vector>
+#include <zlib.h>
+#include <fwdpp/io/scalar_serialization.hpp>
+#include <fwdpy11/types/DiploidPopulation.hpp>
+#include <fwdpy11/serialization/Mutation.hpp>
+#include <fwdpy11/serialization/diploid_metadata.hpp>
+
+namespace fwdpy11
+{
+    namespace serialization
+    {
+        namespace sections
+        {
+            inline const char*
+            magic()
+            {
+                return "fp11sect";
+            }
+
+            inline constexpr std::int32_t
+            format_version()
+            {
+                return 1;
+            }
+
+            struct index_entry
+            {
+                std::string name;
+                std::uint8_t compressed;
+                std::uint64_t offset, stored_size, size;
+            };
+
+            template <typename T>
+            inline void
+            write_vector(std::ostream& buffer, const std::vector<T>& v)
+            {
+                fwdpp::io::scalar_writer w;
+                std::size_t n = v.size();
+                w(buffer, &n);
+                if (n > 0)
+                    {
+                        w(buffer, v.data(), n);
+                    }
+            }
+
+            template <typename T>
+            inline void
+            read_vector(std::istream& buffer, std::vector<T>& v)
+            {
+                fwdpp::io::scalar_reader r;
+                std::size_t n;
+                r(buffer, &n);
+                v.resize(n);
+                if (n > 0)
+                    {
+                        r(buffer, v.data(), n);
+                    }
+            }
+
+            inline void
+            write_mutations(std::ostream& buffer,
+                            const std::vector<Mutation>& mutations)
+            {
+                fwdpp::io::scalar_writer w;
+                fwdpp::io::serialize_mutation<Mutation> sm;
+                std::size_t n = mutations.size();
+                w(buffer, &n);
+                for (auto& m : mutations)
+                    {
+                        sm(buffer, m);
+                    }
+            }
+
+            inline void
+            read_mutations(std::istream& buffer,
+                           std::vector<Mutation>& mutations)
+            {
+                fwdpp::io::scalar_reader r;
+                fwdpp::io::deserialize_mutation<Mutation> dm;
+                std::size_t n;
+                r(buffer, &n);
+                mutations.clear();
+                mutations.reserve(n);
+                for (std::size_t i = 0; i < n; ++i)
+                    {
+                        mutations.emplace_back(dm(buffer));
+                    }
+            }
+
+            inline void
+            write_haploid_genomes(
+                std::ostream& buffer,
+                const std::vector<fwdpp::haploid_genome>& genomes)
+            {
+                fwdpp::io::scalar_writer w;
+                std::size_t n = genomes.size();
+                w(buffer, &n);
+                for (auto& g : genomes)
+                    {
+                        w(buffer, &g.n);
+                        write_vector(buffer, g.mutations);
+                        write_vector(buffer, g.smutations);
+                    }
+            }
+
+            inline void
+            read_haploid_genomes(std::istream& buffer,
+                                 std::vector<fwdpp::haploid_genome>& genomes)
+            {
+                fwdpp::io::scalar_reader r;
+                std::size_t n;
+                r(buffer, &n);
+                genomes.clear();
+                genomes.reserve(n);
+                decltype(fwdpp::haploid_genome::mutations) neutral, selected;
+                for (std::size_t i = 0; i < n; ++i)
+                    {
+                        fwdpp::uint_t count;
+                        r(buffer, &count);
+                        read_vector(buffer, neutral);
+                        read_vector(buffer, selected);
+                        genomes.emplace_back(count, neutral, selected);
+                    }
+            }
+
+            struct section
+            /// Reads and writes one part of a DiploidPopulation.
+            {
+                const char* name;
+                void (*write)(std::ostream&, const DiploidPopulation&);
+                void (*read)(std::istream&, DiploidPopulation&);
+            };
+
+            inline const std::vector<section>&
+            population_sections()
+            /// All sections, in the order in which they are written.
+            {
+                static const std::vector<section> s{
+                    { "population",
+                      [](std::ostream& o, const DiploidPopulation& pop) {
+                          fwdpp::io::scalar_writer w;
+                          double L = pop.tables.genome_length();
+                          w(o, &pop.generation);
+                          w(o, &pop.N);
+                          w(o, &L);
+                      },
+                      [](std::istream& i, DiploidPopulation& pop) {
+                          fwdpp::io::scalar_reader r;
+                          double L;
+                          r(i, &pop.generation);
+                          r(i, &pop.N);
+                          r(i, &L);
+                          pop.tables = fwdpp::ts::table_collection(L);
+                      } },
+                    { "diploid_metadata",
+                      [](std::ostream& o, const DiploidPopulation& pop) {
+                          serialize_diploid_metadata()(o,
+                                                       pop.diploid_metadata);
+                      },
+                      [](std::istream& i, DiploidPopulation& pop) {
+                          deserialize_diploid_metadata()(i,
+                                                         pop.diploid_metadata);
+                      } },
+                    { "ancient_sample_metadata",
+                      [](std::ostream& o, const DiploidPopulation& pop) {
+                          serialize_diploid_metadata()(
+                              o, pop.ancient_sample_metadata);
+                      },
+                      [](std::istream& i, DiploidPopulation& pop) {
+                          deserialize_diploid_metadata()(
+                              i, pop.ancient_sample_metadata);
+                      } },
+                    { "ancient_sample_records",
+                      [](std::ostream& o, const DiploidPopulation& pop) {
+                          write_vector(o, pop.ancient_sample_records);
+                      },
+                      [](std::istream& i, DiploidPopulation& pop) {
+                          read_vector(i, pop.ancient_sample_records);
+                      } },
+                    { "mutations",
+                      [](std::ostream& o, const DiploidPopulation& pop) {
+                          write_mutations(o, pop.mutations);
+                      },
+                      [](std::istream& i, DiploidPopulation& pop) {
+                          read_mutations(i, pop.mutations);
+                      } },
+                    { "mcounts",
+                      [](std::ostream& o, const DiploidPopulation& pop) {
+                          write_vector(o, pop.mcounts);
+                      },
+                      [](std::istream& i, DiploidPopulation& pop) {
+                          read_vector(i, pop.mcounts);
+                      } },
+                    { "mcounts_from_preserved_nodes",
+                      [](std::ostream& o, const DiploidPopulation& pop) {
+                          write_vector(o, pop.mcounts_from_preserved_nodes);
+                      },
+                      [](std::istream& i, DiploidPopulation& pop) {
+                          read_vector(i, pop.mcounts_from_preserved_nodes);
+                      } },
+                    { "fixations",
+                      [](std::ostream& o, const DiploidPopulation& pop) {
+                          write_mutations(o, pop.fixations);
+                      },
+                      [](std::istream& i, DiploidPopulation& pop) {
+                          read_mutations(i, pop.fixations);
+                      } },
+                    { "fixation_times",
+                      [](std::ostream& o, const DiploidPopulation& pop) {
+                          write_vector(o, pop.fixation_times);
+                      },
+                      [](std::istream& i, DiploidPopulation& pop) {
+                          read_vector(i, pop.fixation_times);
+                      } },
+                    { "haploid_genomes",
+                      [](std::ostream& o, const DiploidPopulation& pop) {
+                          write_haploid_genomes(o, pop.haploid_genomes);
+                      },
+                      [](std::istream& i, DiploidPopulation& pop) {
+                          read_haploid_genomes(i, pop.haploid_genomes);
+                      } },
+                    { "diploids",
+                      [](std::ostream& o, const DiploidPopulation& pop) {
+                          write_vector(o, pop.diploids);
+                      },
+                      [](std::istream& i, DiploidPopulation& pop) {
+                          read_vector(i, pop.diploids);
+                      } },
+                    { "tables.nodes",
+                      [](std::ostream& o, const DiploidPopulation& pop) {
+                          write_vector(o, pop.tables.node_table);
+                      },
+                      [](std::istream& i, DiploidPopulation& pop) {
+                          read_vector(i, pop.tables.node_table);
+                      } },
+                    { "tables.edges",
+                      [](std::ostream& o, const DiploidPopulation& pop) {
+                          write_vector(o, pop.tables.edge_table);
+                      },
+                      [](std::istream& i, DiploidPopulation& pop) {
+                          read_vector(i, pop.tables.edge_table);
+                      } },
+                    { "tables.sites",
+                      [](std::ostream& o, const DiploidPopulation& pop) {
+                          write_vector(o, pop.tables.site_table);
+                      },
+                      [](std::istream& i, DiploidPopulation& pop) {
+                          read_vector(i, pop.tables.site_table);
+                      } },
+                    { "tables.mutations",
+                      [](std::ostream& o, const DiploidPopulation& pop) {
+                          write_vector(o, pop.tables.mutation_table);
+                      },
+                      [](std::istream& i, DiploidPopulation& pop) {
+                          read_vector(i, pop.tables.mutation_table);
+                      } },
+                    { "tables.preserved_nodes",
+                      [](std::ostream& o, const DiploidPopulation& pop) {
+                          write_vector(o, pop.tables.preserved_nodes);
+                      },
+                      [](std::istream& i, DiploidPopulation& pop) {
+                          read_vector(i, pop.tables.preserved_nodes);
+                      } },
+                    { "genetic_value_matrix",
+                      [](std::ostream& o, const DiploidPopulation& pop) {
+                          write_vector(o, pop.genetic_value_matrix);
+                      },
+                      [](std::istream& i, DiploidPopulation& pop) {
+                          read_vector(i, pop.genetic_value_matrix);
+                      } },
+                    { "ancient_sample_genetic_value_matrix",
+                      [](std::ostream& o, const DiploidPopulation& pop) {
+                          write_vector(o,
+                                       pop.ancient_sample_genetic_value_matrix);
+                      },
+                      [](std::istream& i, DiploidPopulation& pop) {
+                          read_vector(i,
+                                      pop.ancient_sample_genetic_value_matrix);
+                      } },
+                };
+                return s;
+            }
+
+            inline const section&
+            find_section(const std::string& name)
+            {
+                for (auto& s : population_sections())
+                    {
+                        if (name == s.name)
+                            {
+                                return s;
+                            }
+                    }
+                throw std::invalid_argument("unknown section: " + name);
+            }
+
+            class deflate_streambuf : public std::streambuf
+            /// Compresses the data written to it in zlib format,
+            /// writing the output to another stream in chunks.
+            /// finish must be called after the last write.
+            {
+              private:
+                static constexpr std::size_t chunk_size = 1 << 16;
+                std::ostream& out;
+                z_stream z;
+                std::vector<char> input, output;
+                std::uint64_t raw_size;
+                bool finished;
+
+                bool
+                deflate_input(const int flush)
+                {
+                    z.next_in = reinterpret_cast<Bytef*>(pbase());
+                    z.avail_in = static_cast<uInt>(pptr() - pbase());
+                    raw_size += z.avail_in;
+                    int rv;
+                    do
+                        {
+                            z.next_out = reinterpret_cast<Bytef*>(&output[0]);
+                            z.avail_out = static_cast<uInt>(output.size());
+                            rv = deflate(&z, flush);
+                            if (rv == Z_STREAM_ERROR)
+                                {
+                                    return false;
+                                }
+                            out.write(output.data(),
+                                      output.size() - z.avail_out);
+                        }
+                    while (z.avail_out == 0);
+                    setp(&input[0], &input[0] + input.size());
+                    return static_cast<bool>(out)
+                           && (flush != Z_FINISH || rv == Z_STREAM_END);
+                }
+
+              protected:
+                int_type
+                overflow(int_type c) override
+                {
+                    if (!deflate_input(Z_NO_FLUSH))
+                        {
+                            return traits_type::eof();
+                        }
+                    if (!traits_type::eq_int_type(c, traits_type::eof()))
+                        {
+                            *pptr() = traits_type::to_char_type(c);
+                            pbump(1);
+                        }
+                    return traits_type::not_eof(c);
+                }
+
+              public:
+                deflate_streambuf(std::ostream& o, const int level)
+                    : std::streambuf(), out(o), z(), input(chunk_size),
+                      output(chunk_size), raw_size{ 0 }, finished{ false }
+                {
+                    if (deflateInit(&z, level) != Z_OK)
+                        {
+                            throw std::runtime_error(
+                                "error compressing section");
+                        }
+                    setp(&input[0], &input[0] + input.size());
+                }
+
+                ~deflate_streambuf()
+                {
+                    deflateEnd(&z);
+                }
+
+                bool
+                finish()
+                {
+                    return deflate_input(Z_FINISH);
+                }
+
+                std::uint64_t
+                size() const
+                /// Number of uncompressed bytes
+                {
+                    return raw_size;
+                }
+            };
+
+            class inflate_streambuf : public std::streambuf
+            /// Decompresses stored_size bytes read from
+            /// another stream in chunks.
+            {
+              private:
+                static constexpr std::size_t chunk_size = 1 << 16;
+                std::istream& in;
+                std::uint64_t remaining;
+                z_stream z;
+                std::vector<char> input, output;
+                bool done, error;
+
+              protected:
+                int_type
+                underflow() override
+                {
+                    while (!done && !error)
+                        {
+                            if (z.avail_in == 0 && remaining > 0)
+                                {
+                                    const auto n = static_cast<std::size_t>(
+                                        std::min<std::uint64_t>(
+                                            remaining, input.size()));
+                                    in.read(&input[0], n);
+                                    if (!in)
+                                        {
+                                            error = true;
+                                            break;
+                                        }
+                                    remaining -= n;
+                                    z.next_in
+                                        = reinterpret_cast<Bytef*>(&input[0]);
+                                    z.avail_in = static_cast<uInt>(n);
+                                }
+                            z.next_out = reinterpret_cast<Bytef*>(&output[0]);
+                            z.avail_out = static_cast<uInt>(output.size());
+                            const int rv = inflate(&z, Z_NO_FLUSH);
+                            if (rv == Z_STREAM_END)
+                                {
+                                    done = true;
+                                }
+                            else if (rv != Z_OK
+                                     && !(rv == Z_BUF_ERROR && remaining > 0))
+                                {
+                                    error = true;
+                                }
+                            const auto n = output.size() - z.avail_out;
+                            if (n > 0)
+                                {
+                                    setg(&output[0], &output[0],
+                                         &output[0] + n);
+                                    return traits_type::to_int_type(
+                                        output[0]);
+                                }
+                        }
+                    return traits_type::eof();
+                }
+
+              public:
+                inflate_streambuf(std::istream& i,
+                                  const std::uint64_t stored_size)
+                    : std::streambuf(), in(i), remaining{ stored_size }, z(),
+                      input(chunk_size), output(chunk_size), done{ false },
+                      error{ false }
+                {
+                    if (inflateInit(&z) != Z_OK)
+                        {
+                            throw std::runtime_error(
+                                "error decompressing section");
+                        }
+                }
+
+                ~inflate_streambuf()
+                {
+                    inflateEnd(&z);
+                }
+
+                bool
+                failed() const
+                {
+                    return error;
+                }
+
+                std::uint64_t
+                size() const
+                /// Number of uncompressed bytes so far
+                {
+                    return z.total_out;
+                }
+            };
+
+            inline void
+            write_index(std::ostream& out,
+                        const std::vector<index_entry>& index)
+            {
+                fwdpp::io::scalar_writer w;
+                out.write(magic(), std::strlen(magic()));
+                auto version = format_version();
+                w(out, &version);
+                std::uint64_t nsections = index.size();
+                w(out, &nsections);
+                for (auto& e : index)
+                    {
+                        std::uint32_t len = e.name.size();
+                        w(out, &len);
+                        out.write(e.name.data(), len);
+                        w(out, &e.compressed);
+                        w(out, &e.offset);
+                        w(out, &e.stored_size);
+                        w(out, &e.size);
+                    }
+            }
+
+            inline void
+            write_sections(const DiploidPopulation& pop,
+                           const std::string& filename,
+                           const int compression_level)
+            /// Each section is written, and compressed, directly
+            /// to the file.  The index has a fixed size, so it is
+            /// written first and rewritten once the offsets and
+            /// sizes of the sections are known.
+            {
+                if (compression_level < 0 || compression_level > 9)
+                    {
+                        throw std::invalid_argument(
+                            "compression_level must be in [0, 9]");
+                    }
+                std::ofstream out(filename.c_str(), std::ios_base::binary);
+                if (!out)
+                    {
+                        throw std::runtime_error(
+                            "could not open file for writing");
+                    }
+                std::vector<index_entry> index;
+                for (auto& s : population_sections())
+                    {
+                        index.push_back(index_entry{
+                            s.name, compression_level > 0, 0, 0, 0 });
+                    }
+                write_index(out, index);
+                auto e = begin(index);
+                for (auto& s : population_sections())
+                    {
+                        e->offset = static_cast<std::uint64_t>(out.tellp());
+                        if (compression_level > 0)
+                            {
+                                deflate_streambuf buffer(out,
+                                                         compression_level);
+                                std::ostream o(&buffer);
+                                s.write(o, pop);
+                                if (!o || !buffer.finish())
+                                    {
+                                        throw std::runtime_error(
+                                            "error compressing section");
+                                    }
+                                e->size = buffer.size();
+                            }
+                        else
+                            {
+                                s.write(out, pop);
+                            }
+                        e->stored_size
+                            = static_cast<std::uint64_t>(out.tellp())
+                              - e->offset;
+                        if (compression_level == 0)
+                            {
+                                e->size = e->stored_size;
+                            }
+                        ++e;
+                    }
+                out.seekp(0);
+                write_index(out, index);
+                if (!out)
+                    {
+                        throw std::runtime_error("error writing file");
+                    }
+            }
+
+            inline std::vector<index_entry>
+            read_index(std::istream& in)
+            {
+                const auto n = std::strlen(magic());
+                std::string m(n, '\0');
+                in.read(&m[0], n);
+                if (!in || m != magic())
+                    {
+                        throw std::runtime_error(
+                            "file is not a population sections file");
+                    }
+                fwdpp::io::scalar_reader r;
+                std::int32_t version;
+                r(in, &version);
+                if (version > format_version())
+                    {
+                        throw std::runtime_error(
+                            "file format version is newer than this "
+                            "version of fwdpy11");
+                    }
+                std::uint64_t nsections;
+                r(in, &nsections);
+                std::vector<index_entry> index;
+                for (std::uint64_t i = 0; i < nsections && in; ++i)
+                    {
+                        index_entry e;
+                        std::uint32_t len;
+                        r(in, &len);
+                        e.name.resize(len);
+                        in.read(&e.name[0], len);
+                        r(in, &e.compressed);
+                        r(in, &e.offset);
+                        r(in, &e.stored_size);
+                        r(in, &e.size);
+                        index.emplace_back(std::move(e));
+                    }
+                if (!in)
+                    {
+                        throw std::runtime_error("error reading file index");
+                    }
+                return index;
+            }
+
+            inline void
+            read_section(std::istream& in,
+                         const std::vector<index_entry>& index,
+                         const section& s, DiploidPopulation& pop)
+            {
+                auto e = std::find_if(
+                    begin(index), end(index),
+                    [&s](const index_entry& i) { return i.name == s.name; });
+                if (e == end(index))
+                    {
+                        throw std::runtime_error(std::string("section ")
+                                                 + s.name
+                                                 + " not found in file");
+                    }
+                in.seekg(e->offset);
+                bool ok;
+                if (e->compressed)
+                    {
+                        inflate_streambuf buffer(in, e->stored_size);
+                        std::istream section_stream(&buffer);
+                        s.read(section_stream, pop);
+                        ok = section_stream && !buffer.failed()
+                             && buffer.size() == e->size;
+                    }
+                else
+                    {
+                        s.read(in, pop);
+                        ok = in
+                             && static_cast<std::uint64_t>(in.tellg())
+                                    == e->offset + e->stored_size;
+                    }
+                if (!ok)
+                    {
+                        throw std::runtime_error(std::string("error reading ")
+                                                 + s.name);
+                    }
+            }
+
+            inline DiploidPopulation
+            read_sections(const std::string& filename,
+                          const std::vector<std::string>& names)
+            /// Returns a population with only the requested
+            /// sections filled in.  The population section is
+            /// always read.
+            {
+                std::vector<const section*> requested;
+                for (auto& n : names)
+                    {
+                        requested.push_back(&find_section(n));
+                    }
+                std::ifstream in(filename.c_str(), std::ios_base::binary);
+                if (!in)
+                    {
+                        throw std::runtime_error(
+                            "could not open file for reading");
+                    }
+                auto index = read_index(in);
+                DiploidPopulation pop(1, std::numeric_limits<double>::max());
+                read_section(in, index, find_section("population"), pop);
+                for (auto s : requested)
+                    {
+                        if (std::strcmp(s->name, "population") != 0)
+                            {
+                                read_section(in, index, *s, pop);
+                            }
+                    }
+                return pop;
+            }
+
+            inline fwdpp::ts::table_collection
+            read_tables(const std::string& filename)
+            /// Reads the tables without reading the rest of
+            /// the population.
+            {
+                auto pop = read_sections(
+                    filename,
+                    { "tables.nodes", "tables.edges", "tables.sites",
+                      "tables.mutations", "tables.preserved_nodes" });
+                pop.tables.build_indexes();
+                return std::move(pop.tables);
+            }
+
+            inline DiploidPopulation
+            read_population(const std::string& filename)
+            {
+                std::vector<std::string> names;
+                for (auto& s : population_sections())
+                    {
+                        names.emplace_back(s.name);
+                    }
+                auto pop = read_sections(filename, names);
+                if (pop.diploids.size() != pop.N
+                    || pop.diploid_metadata.size() != pop.N)
+                    {
+                        throw std::runtime_error(
+                            "population size does not match the number of "
+                            "individuals");
+                    }
+                pop.rebuild_mutation_lookup();
+                pop.tables.build_indexes();
+                return pop;
+            }
+        } // namespace sections
+    }     // namespace serialization
+} // namespace fwdpy11
+
+#endif
@@ -3,7 +3,7 @@
 
 #include "PyPopulation.hpp"
 #include "Mutation.hpp"
-#include <unordered_map>
+#include "mutation_position_index.hpp"
 #include <fwdpp/fwd_functional.hpp>
 
 namespace fwdpy11
@@ -14,7 +14,7 @@ namespace fwdpy11
         = PyPopulation<Mutation, std::vector<Mutation>,
                        std::vector<fwdpp::haploid_genome>, std::vector<Mutation>,
                        std::vector<fwdpp::uint_t>,
-                       std::unordered_multimap<double,fwdpp::uint_t>>;
+                       mutation_position_index>;
 }
 
 #endif
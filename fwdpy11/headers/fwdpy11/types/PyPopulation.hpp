@@ -197,6 +197,25 @@ namespace fwdpy11
             // This is correct/validated as of fwdpp 0.7.2
             return tables == rhs.tables;
         }
+
+        void
+        rebuild_mutation_lookup()
+        // Fills mut_lookup with the mutations that are not extinct,
+        // for use when a population is built from serialized data.
+        {
+            this->mut_lookup.clear();
+            this->mut_lookup.reserve(this->mutations.size());
+            for (std::size_t i = 0; i < this->mutations.size(); ++i)
+                {
+                    if ((i < this->mcounts.size() && this->mcounts[i] > 0)
+                        || (i < this->mcounts_from_preserved_nodes.size()
+                            && this->mcounts_from_preserved_nodes[i] > 0))
+                        {
+                            this->mut_lookup.emplace(this->mutations[i].pos,
+                                                     i);
+                        }
+                }
+        }
     };
 } // namespace fwdpy11
 
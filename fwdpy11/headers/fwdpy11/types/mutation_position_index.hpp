@@ -0,0 +1,368 @@
+//
+// Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+//
+// This file is part of fwdpy11.
+//
+// fwdpy11 is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// fwdpy11 is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+//
+/*! \file mutation_position_index.hpp
+ * \brief Flat lookup table from mutation positions to mutation indexes.
+ */
+#ifndef FWDPY11_TYPES_MUTATION_POSITION_INDEX_HPP
+#define FWDPY11_TYPES_MUTATION_POSITION_INDEX_HPP
+
+#include <algorithm>
+#include <cstddef>
+#include <cstdint>
+#include <cstring>
+#include <iterator>
+#include <limits>
+#include <utility>
+#include <vector>
+
+namespace fwdpy11
+{
+    class mutation_position_index
+    /// Maps mutation positions to mutation indexes.
+    ///
+    /// This is an open-addressing hash table with linear probing
+    /// that is stored in a single vector, replacing the
+    /// std::unordered_multimap used as a population's mut_lookup.
+    /// The interface is the subset of the multimap interface
+    /// used by fwdpy11 and fwdpp: find, equal_range, count,
+    /// emplace, insert, erase, and clear.
+    ///
+    /// As with a multimap, more than one index may be stored
+    /// for a position.  Erased entries are marked as such
+    /// and their slots are reclaimed when the table is rehashed.
+    {
+      public:
+        using key_type = double;
+        using mapped_type = std::uint32_t;
+        using value_type = std::pair<double, std::uint32_t>;
+        using size_type = std::size_t;
+
+      private:
+        static constexpr std::uint32_t empty_slot
+            = std::numeric_limits<std::uint32_t>::max();
+        static constexpr std::uint32_t erased_slot = empty_slot - 1;
+        static constexpr std::size_t min_capacity = 16;
+
+        std::vector<value_type> slots;
+        std::size_t mask, nentries, nerased;
+
+        static std::size_t
+        hash(double pos)
+        {
+            // -0.0 == 0.0, so they must hash to the same value
+            if (pos == 0.0)
+                {
+                    pos = 0.0;
+                }
+            std::uint64_t bits;
+            std::memcpy(&bits, &pos, sizeof(double));
+            // Finalizer of splitmix64, which mixes the
+            // high (exponent) bits into the low ones.
+            bits = (bits ^ (bits >> 30)) * 0xbf58476d1ce4e5b9ULL;
+            bits = (bits ^ (bits >> 27)) * 0x94d049bb133111ebULL;
+            return static_cast<std::size_t>(bits ^ (bits >> 31));
+        }
+
+        static value_type
+        empty_value()
+        {
+            const std::uint32_t index = empty_slot;
+            return value_type(0.0, index);
+        }
+
+        static bool
+        occupied(const value_type& slot)
+        {
+            return slot.second < erased_slot;
+        }
+
+        static std::size_t
+        capacity_for(const std::size_t n)
+        // Smallest power of two keeping the load under 1/2
+        {
+            std::size_t c = min_capacity;
+            while (c < 2 * n + 1)
+                {
+                    c <<= 1;
+                }
+            return c;
+        }
+
+        void
+        rehash(const std::size_t capacity)
+        {
+            std::vector<value_type> old(capacity, empty_value());
+            old.swap(slots);
+            mask = capacity - 1;
+            nerased = 0;
+            for (auto& slot : old)
+                {
+                    if (occupied(slot))
+                        {
+                            place(slot);
+                        }
+                }
+        }
+
+        void
+        place(const value_type& value)
+        // Store value in the first free slot of its probe sequence.
+        // Does not update nentries and the caller is responsible
+        // for the table having free slots.
+        {
+            auto i = hash(value.first) & mask;
+            while (slots[i].second != empty_slot)
+                {
+                    i = (i + 1) & mask;
+                }
+            slots[i] = value;
+        }
+
+      public:
+        class const_iterator
+        /// Either visits all entries in the table or,
+        /// when returned by find or equal_range,
+        /// the entries for a single position.
+        {
+          private:
+            friend class mutation_position_index;
+            const mutation_position_index* table;
+            std::size_t slot;
+            double pos;
+            bool probing;
+
+            const_iterator(const mutation_position_index* t,
+                           const std::size_t i, const double p,
+                           const bool single_position)
+                : table{ t }, slot{ i }, pos{ p }, probing{ single_position }
+            {
+            }
+
+            void
+            advance()
+            {
+                const auto& slots = table->slots;
+                if (probing)
+                    {
+                        for (slot = (slot + 1) & table->mask;
+                             slots[slot].second != empty_slot;
+                             slot = (slot + 1) & table->mask)
+                            {
+                                if (occupied(slots[slot])
+                                    && slots[slot].first == pos)
+                                    {
+                                        return;
+                                    }
+                            }
+                        slot = slots.size();
+                        return;
+                    }
+                for (++slot; slot < slots.size() && !occupied(slots[slot]);
+                     ++slot)
+                    {
+                    }
+            }
+
+          public:
+            using iterator_category = std::forward_iterator_tag;
+            using value_type = mutation_position_index::value_type;
+            using difference_type = std::ptrdiff_t;
+            using pointer = const value_type*;
+            using reference = const value_type&;
+
+            const_iterator()
+                : table{ nullptr }, slot{ 0 }, pos{ 0.0 }, probing{ false }
+            {
+            }
+
+            reference operator*() const
+            {
+                return table->slots[slot];
+            }
+
+            pointer operator->() const
+            {
+                return &table->slots[slot];
+            }
+
+            const_iterator&
+            operator++()
+            {
+                advance();
+                return *this;
+            }
+
+            const_iterator
+            operator++(int)
+            {
+                auto rv = *this;
+                advance();
+                return rv;
+            }
+
+            bool
+            operator==(const const_iterator& rhs) const
+            {
+                return slot == rhs.slot;
+            }
+
+            bool
+            operator!=(const const_iterator& rhs) const
+            {
+                return slot != rhs.slot;
+            }
+        };
+
+        using iterator = const_iterator;
+
+        mutation_position_index()
+            : slots(min_capacity, empty_value()),
+              mask{ min_capacity - 1 }, nentries{ 0 }, nerased{ 0 }
+        {
+        }
+
+        const_iterator
+        begin() const
+        {
+            const_iterator rv(this, 0, 0.0, false);
+            if (!slots.empty() && !occupied(slots[0]))
+                {
+                    rv.advance();
+                }
+            return rv;
+        }
+
+        const_iterator
+        end() const
+        {
+            return const_iterator(this, slots.size(), 0.0, false);
+        }
+
+        const_iterator
+        find(const double pos) const
+        {
+            for (auto i = hash(pos) & mask; slots[i].second != empty_slot;
+                 i = (i + 1) & mask)
+                {
+                    if (occupied(slots[i]) && slots[i].first == pos)
+                        {
+                            return const_iterator(this, i, pos, true);
+                        }
+                }
+            return end();
+        }
+
+        std::pair<const_iterator, const_iterator>
+        equal_range(const double pos) const
+        {
+            return std::make_pair(find(pos), end());
+        }
+
+        size_type
+        count(const double pos) const
+        {
+            size_type n = 0;
+            for (auto i = find(pos); i != end(); ++i)
+                {
+                    ++n;
+                }
+            return n;
+        }
+
+        const_iterator
+        emplace(const double pos, const std::uint32_t index)
+        {
+            if (2 * (nentries + nerased + 1) > slots.size())
+                {
+                    rehash(capacity_for(nentries + 1));
+                }
+            auto i = hash(pos) & mask;
+            while (slots[i].second != empty_slot)
+                {
+                    i = (i + 1) & mask;
+                }
+            slots[i] = value_type(pos, index);
+            ++nentries;
+            return const_iterator(this, i, pos, false);
+        }
+
+        const_iterator
+        insert(const value_type& value)
+        {
+            return emplace(value.first, value.second);
+        }
+
+        const_iterator
+        erase(const_iterator itr)
+        /// Returns the entry after itr, visited in the same
+        /// way as itr visits the table.
+        {
+            auto next = itr;
+            ++next;
+            // Erased slots are not part of any probe sequence
+            // if followed by an empty slot.
+            const auto i = itr.slot;
+            if (slots[(i + 1) & mask].second == empty_slot)
+                {
+                    slots[i].second = empty_slot;
+                }
+            else
+                {
+                    slots[i].second = erased_slot;
+                    ++nerased;
+                }
+            --nentries;
+            return next;
+        }
+
+        void
+        clear()
+        {
+            std::fill(slots.begin(), slots.end(), empty_value());
+            nentries = nerased = 0;
+        }
+
+        void
+        reserve(const size_type n)
+        /// Bulk rebuilds (e.g. after pruning extinct mutations)
+        /// should call this after clear so that the table is
+        /// allocated once.
+        {
+            auto c = capacity_for(n);
+            if (c > slots.size() || nerased)
+                {
+                    rehash(std::max(c, slots.size()));
+                }
+        }
+
+        size_type
+        size() const
+        {
+            return nentries;
+        }
+
+        bool
+        empty() const
+        {
+            return nentries == 0;
+        }
+    };
+} // namespace fwdpy11
+
+#endif
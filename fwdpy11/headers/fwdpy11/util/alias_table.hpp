@@ -0,0 +1,218 @@
+//
+// Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+//
+// This file is part of fwdpy11.
+//
+// fwdpy11 is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// fwdpy11 is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+//
+#ifndef FWDPY11_UTIL_ALIAS_TABLE_HPP
+#define FWDPY11_UTIL_ALIAS_TABLE_HPP
+
+#include <cmath>
+#include <cstddef>
+#include <iterator>
+#include <vector>
+#include <gsl/gsl_rng.h>
+#include "../rng.hpp"
+
+namespace fwdpy11
+{
+    class alias_table
+    /// Samples indexes in proportion to non-negative weights
+    /// using Walker's alias method.
+    ///
+    /// The table is built in O(n) time, as gsl_ran_discrete_preproc
+    /// does, but a table is meant to be kept for the whole simulation
+    /// and rebuilt each generation, so that its buffers are reused.
+    /// Each draw takes a single uniform deviate.
+    ///
+    /// When all weights are equal, which is the case for neutral
+    /// models, no table is built and indexes are sampled uniformly.
+    /// As for gsl_ran_discrete_preproc, weights that are all zero
+    /// also give uniform sampling.
+    {
+      private:
+        // Entries hold the normalized weights until they are
+        // assigned the probability of keeping their own index.
+        std::vector<double> probabilities;
+        std::vector<std::size_t> aliases, small, large;
+        std::size_t K;
+        bool uniform;
+
+      public:
+        alias_table()
+            : probabilities{}, aliases{}, small{}, large{}, K{ 0 },
+              uniform{ false }
+        {
+        }
+
+        template <typename Iterator>
+        bool
+        assign(Iterator first, Iterator last)
+        /// Rebuild the table from the weights in [first, last).
+        /// Returns false if there are no weights, or if any
+        /// weight is negative or not finite, in which case the
+        /// table must not be used.
+        {
+            K = static_cast<std::size_t>(std::distance(first, last));
+            if (K == 0)
+                {
+                    return false;
+                }
+            double total = 0.0;
+            uniform = true;
+            for (auto i = first; i != last; ++i)
+                {
+                    if (!(*i >= 0.0))
+                        {
+                            return false;
+                        }
+                    total += *i;
+                    uniform = uniform && (*i == *first);
+                }
+            if (!std::isfinite(total))
+                {
+                    return false;
+                }
+            if (uniform || total == 0.0)
+                {
+                    uniform = true;
+                    return true;
+                }
+
+            probabilities.resize(K);
+            aliases.resize(K);
+            small.clear();
+            large.clear();
+            const double mean = 1.0 / static_cast<double>(K);
+            std::size_t k = 0;
+            for (auto i = first; i != last; ++i, ++k)
+                {
+                    probabilities[k] = *i / total;
+                    if (probabilities[k] < mean)
+                        {
+                            small.push_back(k);
+                        }
+                    else
+                        {
+                            large.push_back(k);
+                        }
+                }
+            while (!small.empty())
+                {
+                    const auto s = small.back();
+                    small.pop_back();
+                    if (large.empty())
+                        {
+                            // Only possible due to rounding
+                            aliases[s] = s;
+                            probabilities[s] = 1.0;
+                            continue;
+                        }
+                    const auto b = large.back();
+                    large.pop_back();
+                    aliases[s] = b;
+                    const double d = mean - probabilities[s];
+                    probabilities[s] *= static_cast<double>(K);
+                    probabilities[b] -= d;
+                    if (probabilities[b] < mean)
+                        {
+                            small.push_back(b);
+                        }
+                    else if (probabilities[b] > mean)
+                        {
+                            large.push_back(b);
+                        }
+                    else
+                        {
+                            aliases[b] = b;
+                            probabilities[b] = 1.0;
+                        }
+                }
+            for (auto b : large)
+                {
+                    aliases[b] = b;
+                    probabilities[b] = 1.0;
+                }
+            large.clear();
+            return true;
+        }
+
+        void
+        assign_uniform(const std::size_t n)
+        /// Sample from n indexes with equal probability,
+        /// without visiting any weights.
+        {
+            K = n;
+            uniform = true;
+        }
+
+        std::size_t
+        size() const
+        {
+            return K;
+        }
+
+        bool
+        is_uniform() const
+        /// True if indexes are sampled without a table
+        {
+            return uniform;
+        }
+
+        std::size_t
+        operator()(const GSLrng_t& rng) const
+        /// Sample an index
+        {
+            const double x
+                = gsl_rng_uniform(rng.get()) * static_cast<double>(K);
+            const auto k = static_cast<std::size_t>(x);
+            if (uniform
+                || x - static_cast<double>(k) < probabilities[k])
+                {
+                    return k;
+                }
+            return aliases[k];
+        }
+
+        template <typename OutputIterator>
+        OutputIterator
+        sample(const GSLrng_t& rng, std::size_t n, OutputIterator out) const
+        /// Sample n indexes, writing them to out.  The result is
+        /// the same as for n calls to operator().
+        {
+            const auto dK = static_cast<double>(K);
+            if (uniform)
+                {
+                    for (; n > 0; --n, ++out)
+                        {
+                            *out = static_cast<std::size_t>(
+                                gsl_rng_uniform(rng.get()) * dK);
+                        }
+                    return out;
+                }
+            for (; n > 0; --n, ++out)
+                {
+                    const double x = gsl_rng_uniform(rng.get()) * dK;
+                    const auto k = static_cast<std::size_t>(x);
+                    *out = (x - static_cast<double>(k) < probabilities[k])
+                               ? k
+                               : aliases[k];
+                }
+            return out;
+        }
+    };
+} // namespace fwdpy11
+
+#endif
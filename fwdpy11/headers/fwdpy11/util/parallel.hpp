@@ -0,0 +1,214 @@
+//
+// Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+//
+// This file is part of fwdpy11.
+//
+// fwdpy11 is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// fwdpy11 is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+//
+#ifndef FWDPY11_UTIL_PARALLEL_HPP
+#define FWDPY11_UTIL_PARALLEL_HPP
+
+#include <algorithm>
+#include <condition_variable>
+#include <cstddef>
+#include <exception>
+#include <functional>
+#include <mutex>
+#include <stdexcept>
+#include <thread>
+#include <vector>
+
+namespace fwdpy11
+{
+    namespace util
+    {
+        inline std::size_t
+        chunk_begin(const std::size_t n, const std::size_t nthreads,
+                    const std::size_t thread)
+        // The range [0, n) is split into nthreads contiguous
+        // chunks.  The split only depends on n and nthreads,
+        // so that work done by a given thread is reproducible.
+        {
+            return (n * thread) / nthreads;
+        }
+
+        class thread_pool
+        /// A fixed set of worker threads, created once
+        /// and reused for every call to run.
+        ///
+        /// Thread 0 is the calling thread, so that a pool
+        /// of size one has no workers.  A pool may only be
+        /// used by one calling thread at a time.
+        {
+          private:
+            std::vector<std::thread> workers;
+            std::mutex mutex;
+            std::condition_variable task_ready, task_done;
+            std::function<void(std::size_t)> task;
+            std::vector<std::exception_ptr> errors;
+            std::size_t generation, pending;
+            bool stopping;
+
+            void
+            worker_loop(const std::size_t thread)
+            {
+                std::size_t last_generation = 0;
+                while (true)
+                    {
+                        {
+                            std::unique_lock<std::mutex> lock(mutex);
+                            task_ready.wait(lock, [this, last_generation]() {
+                                return stopping
+                                       || generation != last_generation;
+                            });
+                            if (stopping)
+                                {
+                                    return;
+                                }
+                            last_generation = generation;
+                        }
+                        try
+                            {
+                                task(thread);
+                            }
+                        catch (...)
+                            {
+                                errors[thread] = std::current_exception();
+                            }
+                        std::lock_guard<std::mutex> lock(mutex);
+                        if (--pending == 0)
+                            {
+                                task_done.notify_one();
+                            }
+                    }
+            }
+
+            void
+            stop_workers()
+            {
+                {
+                    std::lock_guard<std::mutex> lock(mutex);
+                    stopping = true;
+                }
+                task_ready.notify_all();
+                for (auto& w : workers)
+                    {
+                        w.join();
+                    }
+                workers.clear();
+            }
+
+          public:
+            explicit thread_pool(const std::size_t nthreads)
+                : workers{}, mutex{}, task_ready{}, task_done{}, task{},
+                  errors(nthreads, nullptr), generation{ 0 }, pending{ 0 },
+                  stopping{ false }
+            {
+                if (nthreads == 0)
+                    {
+                        throw std::invalid_argument(
+                            "number of threads must be > 0");
+                    }
+                try
+                    {
+                        for (std::size_t t = 1; t < nthreads; ++t)
+                            {
+                                workers.emplace_back(
+                                    &thread_pool::worker_loop, this, t);
+                            }
+                    }
+                catch (...)
+                    {
+                        stop_workers();
+                        throw;
+                    }
+            }
+
+            thread_pool(const thread_pool&) = delete;
+            thread_pool& operator=(const thread_pool&) = delete;
+
+            ~thread_pool()
+            {
+                stop_workers();
+            }
+
+            std::size_t
+            size() const
+            {
+                return workers.size() + 1;
+            }
+
+            template <typename F>
+            void
+            run(const F& f)
+            // Calls f(thread) once for each thread of the pool
+            // and waits for all calls to return.  An exception
+            // thrown by any thread is rethrown afterwards.
+            {
+                if (workers.empty())
+                    {
+                        f(std::size_t{ 0 });
+                        return;
+                    }
+                {
+                    std::lock_guard<std::mutex> lock(mutex);
+                    task = [&f](const std::size_t thread) { f(thread); };
+                    std::fill(begin(errors), end(errors), nullptr);
+                    pending = workers.size();
+                    ++generation;
+                }
+                task_ready.notify_all();
+                try
+                    {
+                        f(std::size_t{ 0 });
+                    }
+                catch (...)
+                    {
+                        errors[0] = std::current_exception();
+                    }
+                {
+                    std::unique_lock<std::mutex> lock(mutex);
+                    task_done.wait(lock, [this]() { return pending == 0; });
+                    task = nullptr;
+                }
+                for (auto& e : errors)
+                    {
+                        if (e != nullptr)
+                            {
+                                std::rethrow_exception(e);
+                            }
+                    }
+            }
+        };
+
+        template <typename F>
+        void
+        parallel_for(thread_pool& pool, const std::size_t n, const F& f)
+        // Calls f(begin, end, thread) for each chunk of [0, n),
+        // using the threads of pool.
+        {
+            const auto nthreads = pool.size();
+            if (nthreads < 2 || n < 2)
+                {
+                    f(std::size_t{ 0 }, n, std::size_t{ 0 });
+                    return;
+                }
+            pool.run([&f, n, nthreads](const std::size_t t) {
+                f(chunk_begin(n, nthreads, t), chunk_begin(n, nthreads, t + 1),
+                  t);
+            });
+        }
+    } // namespace util
+} // namespace fwdpy11
+#endif
@@ -21,6 +21,7 @@
 #include <pybind11/stl.h>
 
 #include <fwdpy11/discrete_demography/DiscreteDemography.hpp>
+#include "scipy_sparse.hpp"
 
 namespace py = pybind11;
 namespace ddemog = fwdpy11::discrete_demography;
@@ -51,6 +52,19 @@ namespace
         return ddemog::DiscreteDemography({}, {}, p, {}, nullptr, {});
     }
 
+    ddemog::MigrationMatrix
+    sparse_migration_matrix(py::object m, const bool scaled)
+    {
+        auto csr = ddemog::sparse_rates_from_scipy(m);
+        if (csr.nrows != csr.ncols)
+            {
+                throw std::invalid_argument("MigrationMatrix must be square");
+            }
+        return ddemog::MigrationMatrix(
+            csr.nrows, std::move(csr.row_offsets),
+            std::move(csr.destinations), std::move(csr.rates), scaled);
+    }
+
     ddemog::MigrationMatrix
     decode_migration_matrix_input(py::object o)
     {
@@ -61,11 +75,32 @@ namespace
                     throw std::invalid_argument(
                         "MigrationMatrix must be square");
                 }
-            auto d = r.data(0, 0);
-            std::vector<double> M(d, d + r.shape(0) * r.shape(1));
+            std::vector<double> M;
+            M.reserve(r.shape(0) * r.shape(1));
+            for (decltype(r.shape(0)) i = 0; i < r.shape(0); ++i)
+                {
+                    for (decltype(i) j = 0; j < r.shape(1); ++j)
+                        {
+                            M.push_back(r(i, j));
+                        }
+                }
             return M;
         };
 
+        if (py::isinstance<ddemog::MigrationMatrix>(o))
+            {
+                return o.cast<ddemog::MigrationMatrix>();
+            }
+        if (ddemog::is_scipy_sparse(o))
+            {
+                return sparse_migration_matrix(o, true);
+            }
+        if (py::isinstance<py::tuple>(o) && py::len(o) == 2
+            && ddemog::is_scipy_sparse(o.cast<py::tuple>()[0]))
+            {
+                py::tuple t = o.cast<py::tuple>();
+                return sparse_migration_matrix(t[0], t[1].cast<bool>());
+            }
         try
             {
                 py::array_t<double> m = o.cast<py::array_t<double>>();
@@ -117,6 +152,11 @@ static const auto INIT_DOCSTRING_LISTS = R"delim(
 :param migmatrix: A migraton matrix. See :ref:`migration`.
 :param set_migration_rates: Instances of :class:`fwdpy11.SetMigrationRates`
 :type set_migration_rates: list
+
+.. versionchanged:: 0.6.0
+
+    `migmatrix` may be a :mod:`scipy.sparse` matrix, or
+    a tuple of a :mod:`scipy.sparse` matrix and a bool.
 )delim";
 
 void
@@ -20,6 +20,7 @@
 #include <fwdpy11/numpy/array.hpp>
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include "scipy_sparse.hpp"
 
 namespace py = pybind11;
 namespace ddemog = fwdpy11::discrete_demography;
@@ -27,11 +28,31 @@ namespace ddemog = fwdpy11::discrete_demography;
 static const auto INIT_DOCSTRING = R"delim(
 
 :param migmatrix: A square matrix of non-negative floats.
-:type migmatrix: numpy.ndarray
+:type migmatrix: numpy.ndarray or scipy.sparse matrix
 :param scaled: (True) If entries in `migmatrix` will be multiplied by deme sizes during simulation
 :type scaled: bool
+
+.. versionchanged:: 0.6.0
+
+    `migmatrix` may be a :mod:`scipy.sparse` matrix.
 )delim";
 
+namespace
+{
+    ddemog::MigrationMatrix
+    init_from_scipy(py::object m, const bool scaled)
+    {
+        auto csr = ddemog::sparse_rates_from_scipy(m);
+        if (csr.nrows != csr.ncols)
+            {
+                throw std::invalid_argument("MigrationMatrix must be square");
+            }
+        return ddemog::MigrationMatrix(
+            csr.nrows, std::move(csr.row_offsets),
+            std::move(csr.destinations), std::move(csr.rates), scaled);
+    }
+} // namespace
+
 void
 init_MigrationMatrix(py::module &m)
 {
@@ -39,17 +60,44 @@ init_MigrationMatrix(py::module &m)
                                          R"delim(
         The forward migration matrix for a simulation.
 
+        Only the nonzero rates are stored, so that models with
+        many demes and few migration routes between them, such as
+        stepping-stone models, may be constructed from
+        :mod:`scipy.sparse` matrices without creating dense matrices.
+
         .. versionadded:: 0.5.3
+
+        .. versionchanged:: 0.6.0
+
+            Rates are stored in compressed sparse row form.
         )delim")
-        .def(py::init([](py::array_t<double> m, const bool scaled) {
-                 auto r = m.unchecked<2>();
+        .def(py::init([](py::object m, const bool scaled) {
+                 if (ddemog::is_scipy_sparse(m))
+                     {
+                         return init_from_scipy(m, scaled);
+                     }
+                 auto a = py::array_t<double>::ensure(m);
+                 if (!a)
+                     {
+                         throw py::type_error(
+                             "migmatrix must be a numpy.ndarray or a "
+                             "scipy.sparse matrix");
+                     }
+                 auto r = a.unchecked<2>();
                  if (r.shape(0) != r.shape(1))
                      {
                          throw std::invalid_argument(
                              "MigrationMatrix must be square");
                      }
-                 auto d = r.data(0, 0);
-                 std::vector<double> M(d, d + r.shape(0) * r.shape(1));
+                 std::vector<double> M;
+                 M.reserve(r.shape(0) * r.shape(1));
+                 for (decltype(r.shape(0)) i = 0; i < r.shape(0); ++i)
+                     {
+                         for (decltype(i) j = 0; j < r.shape(1); ++j)
+                             {
+                                 M.push_back(r(i, j));
+                             }
+                     }
                  return ddemog::MigrationMatrix(std::move(M), r.shape(0),
                                                  scaled);
              }),
@@ -62,14 +110,37 @@ init_MigrationMatrix(py::module &m)
                                })
         .def_property_readonly("M",
                                [](const ddemog::MigrationMatrix &self) {
-                                   auto M(self.M);
+                                   auto M(self.dense());
                                    return fwdpy11::make_2d_array_with_capsule(
                                        std::move(M), self.npops, self.npops);
                                })
+        .def_property_readonly(
+            "nnz", &ddemog::MigrationMatrix::nnz,
+            R"delim(
+            The number of nonzero rates.
+
+            .. versionadded:: 0.6.0
+            )delim")
         .def_readonly("scaled", &ddemog::MigrationMatrix::scaled)
+        .def("tocsr",
+             [](const ddemog::MigrationMatrix &self) {
+                 return ddemog::sparse_rates_to_scipy(
+                     self.npops, self.npops, self.row_offsets,
+                     self.destinations, self.rates);
+             },
+             R"delim(
+             Return a copy of the rates as a
+             :class:`scipy.sparse.csr_matrix`.
+             Requires :mod:`scipy`.
+
+             .. versionadded:: 0.6.0
+             )delim")
         .def("_set_migration_rates",
-             &ddemog::MigrationMatrix::set_migration_rates, py::arg("source"),
-             py::arg("rates"))
+             [](ddemog::MigrationMatrix &self, std::int32_t source,
+                const std::vector<double> &rates) {
+                 self.set_migration_rates(source, rates);
+             },
+             py::arg("source"), py::arg("rates"))
         .def("_set_migration_rates",
              [](ddemog::MigrationMatrix &self, py::array_t<double> migrates) {
                  auto r = migrates.unchecked<2>();
@@ -85,17 +156,27 @@ init_MigrationMatrix(py::module &m)
              })
         .def(py::pickle(
             [](const ddemog::MigrationMatrix &self) {
-                return py::make_tuple(self.M, self.npops, self.scaled);
+                return py::make_tuple(self.npops, self.scaled,
+                                      self.row_offsets, self.destinations,
+                                      self.rates);
             },
             [](pybind11::tuple t) {
-                if (t.size() != 3)
+                if (t.size() == 3)
+                    {
+                        // Dense matrices, as pickled prior to 0.6.0
+                        auto M = t[0].cast<std::vector<double>>();
+                        auto n = t[1].cast<std::size_t>();
+                        auto s = t[2].cast<bool>();
+                        return ddemog::MigrationMatrix(std::move(M), n, s);
+                    }
+                if (t.size() != 5)
                     {
                         throw std::runtime_error("invalid tuple size");
                     }
-                auto M = t[0].cast<std::vector<double>>();
-                auto n = t[1].cast<std::size_t>();
-                auto s = t[2].cast<bool>();
-                return ddemog::MigrationMatrix(std::move(M), n, s);
+                return ddemog::MigrationMatrix(
+                    t[0].cast<std::size_t>(),
+                    t[2].cast<std::vector<std::size_t>>(),
+                    t[3].cast<std::vector<std::int32_t>>(),
+                    t[4].cast<std::vector<double>>(), t[1].cast<bool>());
             }));
 }
-
@@ -22,6 +22,7 @@
 #include <pybind11/stl.h>
 #include <fwdpy11/numpy/array.hpp>
 #include <fwdpy11/discrete_demography/SetMigrationRates.hpp>
+#include "scipy_sparse.hpp"
 
 namespace py = pybind11;
 namespace ddemog = fwdpy11::discrete_demography;
@@ -34,16 +35,40 @@ static const auto INIT_DOCSTRING = R"delim(
 :param deme: The row index of the migration matrix
 :type when: int
 :param migrates: The migration rates from `deme` to all other populations.
-:type migrates: list
+:type migrates: list or scipy.sparse matrix with one row
+
+.. versionchanged:: 0.6.0
+
+    `migrates` may be a :mod:`scipy.sparse` matrix with one row.
 )delim";
 
 static const auto INIT_DOCSTRING_NUMPY = R"delim(
 :param when: The generation when the event occurs
 :type when: int
 :param migmatrix: A square matrix representing the migration matrix
-:type migmatrix: numpy.ndarray
+:type migmatrix: numpy.ndarray or scipy.sparse matrix
+
+.. versionchanged:: 0.6.0
+
+    `migmatrix` may be a :mod:`scipy.sparse` matrix.
 )delim";
 
+namespace
+{
+    SMR
+    init_from_scipy(std::uint32_t when, std::int32_t deme, py::object m)
+    {
+        auto csr = ddemog::sparse_rates_from_scipy(m);
+        if (deme == ddemog::NULLDEME && csr.nrows != csr.ncols)
+            {
+                throw std::invalid_argument(
+                    "SetMigrationRates: input matrix must be square");
+            }
+        return SMR(when, deme, csr.ncols, std::move(csr.row_offsets),
+                   std::move(csr.destinations), std::move(csr.rates));
+    }
+} // namespace
+
 void
 init_SetMigrationRate(py::module& m)
 {
@@ -54,37 +79,86 @@ init_SetMigrationRate(py::module& m)
         deme or the entire migration matrix.
         
         .. versionadded:: 0.5.3
+
+        .. versionchanged:: 0.6.0
+
+            Only nonzero rates are stored, and rates may be
+            given as :mod:`scipy.sparse` matrices.
         )delim")
 
-        .def(py::init<std::uint32_t, std::int32_t, std::vector<double>>(),
+        .def(py::init([](std::uint32_t when, std::int32_t deme,
+                         py::object migrates) {
+                 if (ddemog::is_scipy_sparse(migrates))
+                     {
+                         if (deme < 0)
+                             {
+                                 throw std::invalid_argument(
+                                     "SetMigrationRates: deme label must be "
+                                     "non-negative");
+                             }
+                         return init_from_scipy(when, deme, migrates);
+                     }
+                 return SMR(when, deme,
+                            migrates.cast<std::vector<double>>());
+             }),
              py::arg("when"), py::arg("deme"), py::arg("migrates"),
              INIT_DOCSTRING)
-        .def(py::init<std::uint32_t, py::array_t<double>>(), py::arg("when"),
-             py::arg("migmatrix"), INIT_DOCSTRING_NUMPY)
+        .def(py::init([](std::uint32_t when, py::object migmatrix) {
+                 if (ddemog::is_scipy_sparse(migmatrix))
+                     {
+                         return init_from_scipy(when, ddemog::NULLDEME,
+                                                migmatrix);
+                     }
+                 return SMR(when, migmatrix.cast<py::array_t<double>>());
+             }),
+             py::arg("when"), py::arg("migmatrix"), INIT_DOCSTRING_NUMPY)
         .def_readonly("when", &SMR::when)
         .def_readonly("deme", &SMR::deme)
         .def_property_readonly(
             "migrates",
             [](const SMR& self) {
-                if (self.deme == ddemog::NULLDEME)
-                    {
-                        auto dim = std::sqrt(self.migrates.size());
-                        return fwdpy11::make_2d_ndarray_readonly(self.migrates,
-                                                                 dim, dim);
-                    }
-                else
-                    {
-                        return fwdpy11::make_1d_ndarray_readonly(
-                            self.migrates);
-                    }
-            })
+                auto rv
+                    = (self.deme == ddemog::NULLDEME)
+                          ? fwdpy11::make_2d_array_with_capsule(
+                              self.dense(), self.npops, self.npops)
+                          : fwdpy11::make_1d_array_with_capsule(self.dense());
+                rv.attr("flags").attr("writeable") = false;
+                return rv;
+            },
+            "A copy of the rates, including zeros.")
+        .def("tocsr",
+             [](const SMR& self) {
+                 return ddemog::sparse_rates_to_scipy(
+                     self.row_offsets.size() - 1, self.npops,
+                     self.row_offsets, self.destinations, self.rates);
+             },
+             R"delim(
+             Return a copy of the rates as a
+             :class:`scipy.sparse.csr_matrix`, with one row
+             unless the entire migration matrix is set.
+             Requires :mod:`scipy`.
+
+             .. versionadded:: 0.6.0
+             )delim")
         .def(py::pickle(
             [](const SMR& self) {
-                return py::make_tuple(self.when, self.deme, self.migrates);
+                return py::make_tuple(self.when, self.deme, self.npops,
+                                      self.row_offsets, self.destinations,
+                                      self.rates);
             },
             [](py::tuple t) {
+                if (t.size() == 3)
+                    {
+                        // Dense rates, as pickled prior to 0.6.0
+                        return SMR(t[0].cast<decltype(SMR::when)>(),
+                                   t[1].cast<decltype(SMR::deme)>(),
+                                   t[2].cast<std::vector<double>>());
+                    }
                 return SMR(t[0].cast<decltype(SMR::when)>(),
                            t[1].cast<decltype(SMR::deme)>(),
-                           t[2].cast<decltype(SMR::migrates)>());
+                           t[2].cast<decltype(SMR::npops)>(),
+                           t[3].cast<decltype(SMR::row_offsets)>(),
+                           t[4].cast<decltype(SMR::destinations)>(),
+                           t[5].cast<decltype(SMR::rates)>());
             }));
 }
@@ -0,0 +1,164 @@
+//
+// Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+//
+// This file is part of fwdpy11.
+//
+// fwdpy11 is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// fwdpy11 is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+//
+
+// Conversion of migration rates to and from scipy.sparse
+// matrices, without creating dense matrices.  SciPy is
+// an optional dependency, and is only imported by
+// sparse_rates_to_scipy.
+
+#ifndef FWDPY11_DISCRETE_DEMOGRAPHY_SCIPY_SPARSE_HPP
+#define FWDPY11_DISCRETE_DEMOGRAPHY_SCIPY_SPARSE_HPP
+
+#include <cstdint>
+#include <stdexcept>
+#include <vector>
+#include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
+#include <pybind11/stl.h>
+
+namespace fwdpy11
+{
+    namespace discrete_demography
+    {
+        struct sparse_rates
+        /// Migration rates in compressed sparse row form.
+        /// See MigrationMatrix.
+        {
+            std::size_t nrows, ncols;
+            std::vector<std::size_t> row_offsets;
+            std::vector<std::int32_t> destinations;
+            std::vector<double> rates;
+        };
+
+        inline bool
+        is_scipy_sparse(const pybind11::handle& o)
+        {
+            return pybind11::hasattr(o, "tocsr");
+        }
+
+        inline sparse_rates
+        sparse_rates_from_scipy(const pybind11::object& o)
+        /// Duplicate entries are summed and
+        /// explicit zeros are removed.
+        {
+            pybind11::object csr = o.attr("tocsr")();
+            if (csr.attr("has_canonical_format").cast<bool>() == false)
+                {
+                    // Do not modify the input
+                    csr = csr.attr("copy")();
+                    csr.attr("sum_duplicates")();
+                }
+            auto shape = csr.attr("shape").cast<pybind11::tuple>();
+            auto indptr
+                = pybind11::array_t<std::int64_t,
+                                    pybind11::array::c_style
+                                        | pybind11::array::forcecast>::
+                    ensure(csr.attr("indptr"));
+            auto indices
+                = pybind11::array_t<std::int64_t,
+                                    pybind11::array::c_style
+                                        | pybind11::array::forcecast>::
+                    ensure(csr.attr("indices"));
+            auto data
+                = pybind11::array_t<double, pybind11::array::c_style
+                                                | pybind11::array::forcecast>::
+                    ensure(csr.attr("data"));
+            if (!indptr || !indices || !data)
+                {
+                    throw std::invalid_argument(
+                        "invalid sparse matrix of migration rates");
+                }
+            sparse_rates rv{ shape[0].cast<std::size_t>(),
+                             shape[1].cast<std::size_t>(),
+                             std::vector<std::size_t>(1, 0),
+                             {},
+                             {} };
+            if (indptr.ndim() != 1 || indices.ndim() != 1 || data.ndim() != 1
+                || static_cast<std::size_t>(indptr.shape(0)) != rv.nrows + 1)
+                {
+                    throw std::invalid_argument(
+                        "invalid sparse matrix of migration rates");
+                }
+            auto p = indptr.unchecked<1>();
+            auto i = indices.unchecked<1>();
+            auto d = data.unchecked<1>();
+            if (p(0) != 0 || p(rv.nrows) > i.shape(0)
+                || p(rv.nrows) > d.shape(0))
+                {
+                    throw std::invalid_argument(
+                        "invalid sparse matrix of migration rates");
+                }
+            for (std::size_t row = 0; row < rv.nrows; ++row)
+                {
+                    if (p(row + 1) < p(row))
+                        {
+                            throw std::invalid_argument(
+                                "invalid sparse matrix of migration rates");
+                        }
+                }
+            const auto ncols = static_cast<std::int64_t>(rv.ncols);
+            for (std::int64_t j = 0; j < p(rv.nrows); ++j)
+                {
+                    if (i(j) < 0 || i(j) >= ncols)
+                        {
+                            throw std::invalid_argument(
+                                "invalid sparse matrix of migration rates");
+                        }
+                }
+            rv.destinations.reserve(d.shape(0));
+            rv.rates.reserve(d.shape(0));
+            for (std::size_t row = 0; row < rv.nrows; ++row)
+                {
+                    for (auto j = p(row); j < p(row + 1); ++j)
+                        {
+                            if (d(j) != 0.0)
+                                {
+                                    rv.destinations.push_back(
+                                        static_cast<std::int32_t>(i(j)));
+                                    rv.rates.push_back(d(j));
+                                }
+                        }
+                    rv.row_offsets.push_back(rv.destinations.size());
+                }
+            return rv;
+        }
+
+        inline pybind11::object
+        sparse_rates_to_scipy(const std::size_t nrows, const std::size_t ncols,
+                              const std::vector<std::size_t>& row_offsets,
+                              const std::vector<std::int32_t>& destinations,
+                              const std::vector<double>& rates)
+        /// Returns a scipy.sparse.csr_matrix
+        {
+            auto sparse = pybind11::module::import("scipy.sparse");
+            std::vector<std::int64_t> indptr(row_offsets.begin(),
+                                             row_offsets.end());
+            return sparse.attr("csr_matrix")(
+                pybind11::make_tuple(
+                    pybind11::array_t<double>(rates.size(), rates.data()),
+                    pybind11::array_t<std::int32_t>(destinations.size(),
+                                                    destinations.data()),
+                    pybind11::array_t<std::int64_t>(indptr.size(),
+                                                    indptr.data())),
+                pybind11::arg("shape") = pybind11::make_tuple(nrows, ncols));
+        }
+    } // namespace discrete_demography
+} // namespace fwdpy11
+
+#endif
@@ -1,78 +1,234 @@
+#include <fwdpy11/util/parallel.hpp>
 #include "diploid_pop_fitness.hpp"
 #include "genetic_value_common.hpp"
 
 template <typename update_genotype_matrix>
-fwdpp::gsl_ran_discrete_t_ptr
+void
+calculate_fitness_batched(
+    const fwdpy11::GSLrng_t &rng, const fwdpy11::DiploidPopulation &pop,
+    const fwdpy11::DiploidPopulationGeneticValue &genetic_value_fxn,
+    std::vector<fwdpy11::DiploidMetadata> &new_metadata,
+    std::vector<double> &new_diploid_gvalues,
+    fwdpy11::util::thread_pool &threads, const update_genotype_matrix)
+// Genetic values are calculated for all individuals, then the noise,
+// then the fitnesses.  Genetic values and fitnesses are calculated in
+// parallel using a scratch buffer per thread, and fitnesses are set
+// for each thread's chunk of individuals in one call.  The noise is
+// calculated serially and in order, so that random number generation
+// is the same as for the per-individual calculation.
+{
+    const auto N = pop.diploids.size();
+    const auto dim = genetic_value_fxn.total_dim;
+    std::vector<double> scratch;
+    auto &values = update_genotype_matrix::value ? new_diploid_gvalues
+                                                 : scratch;
+    values.resize(N * dim);
+    fwdpy11::util::parallel_for(
+        threads, N,
+        [&](const std::size_t first, const std::size_t last,
+            const std::size_t /*thread*/) {
+            std::vector<double> buffer(dim);
+            for (std::size_t i = first; i < last; ++i)
+                {
+                    new_metadata[i] = pop.diploid_metadata[i];
+                    new_metadata[i].g = genetic_value_fxn.calculate_gvalue(
+                        i, pop, buffer);
+                    std::copy(begin(buffer), end(buffer),
+                              values.begin() + i * dim);
+                }
+        });
+    for (std::size_t i = 0; i < N; ++i)
+        {
+            new_metadata[i].e = genetic_value_fxn.noise(
+                rng, new_metadata[i], new_metadata[i].parents[0],
+                new_metadata[i].parents[1], pop);
+        }
+    fwdpy11::util::parallel_for(
+        threads, N,
+        [&](const std::size_t first, const std::size_t last,
+            const std::size_t /*thread*/) {
+            genetic_value_fxn.genetic_values_to_fitnesses(new_metadata,
+                                                          values, first, last);
+        });
+    // Leave gvalues as the serial calculation would
+    if (N > 0)
+        {
+            auto row = values.begin() + (N - 1) * dim;
+            genetic_value_fxn.gvalues.assign(row, row + dim);
+        }
+}
+
+struct fitness_calculation_guard
+// Makes sure that data cached by a genetic value
+// object are released, even if an exception is thrown.
+{
+    const fwdpy11::DiploidPopulationGeneticValue &genetic_value_fxn;
+    fitness_calculation_guard(
+        const fwdpy11::DiploidPopulationGeneticValue &g,
+        const fwdpy11::DiploidPopulation &pop)
+        : genetic_value_fxn(g)
+    {
+        genetic_value_fxn.begin_fitness_calculation(pop);
+    }
+
+    ~fitness_calculation_guard()
+    {
+        genetic_value_fxn.end_fitness_calculation();
+    }
+};
+
+template <typename update_genotype_matrix>
+void
 calculate_fitness_details(
     const fwdpy11::GSLrng_t &rng, fwdpy11::DiploidPopulation &pop,
     const fwdpy11::DiploidPopulationGeneticValue &genetic_value_fxn,
     std::vector<fwdpy11::DiploidMetadata> &new_metadata,
-    std::vector<double> &new_diploid_gvalues, const update_genotype_matrix um)
+    std::vector<double> &new_diploid_gvalues,
+    std::vector<double> &parental_fitnesses, fwdpy11::alias_table &lookup,
+    fwdpy11::util::thread_pool &threads, const update_genotype_matrix um)
+// The buffers for the fitnesses and the lookup table
+// belong to the caller, so that they are reused
+// in every generation.
 {
     // Calculate parental fitnesses
-    std::vector<double> parental_fitnesses(pop.diploids.size());
+    parental_fitnesses.resize(pop.diploids.size());
     double sum_parental_fitnesses = 0.0;
     new_metadata.resize(pop.N);
     resize_genotype_matrix(new_diploid_gvalues,
                            pop.N * genetic_value_fxn.total_dim, um);
-    auto gvoffset = new_diploid_gvalues.data();
-    for (std::size_t i = 0; i < pop.diploids.size();
-         ++i, gvoffset += genetic_value_fxn.total_dim)
+    fitness_calculation_guard guard(genetic_value_fxn, pop);
+    if (genetic_value_fxn.supports_threads())
         {
-            new_metadata[i] = pop.diploid_metadata[i];
-            genetic_value_fxn(rng, i, pop, new_metadata[i]);
-            copy_genetic_values(gvoffset, genetic_value_fxn.gvalues, um);
-            parental_fitnesses[i] = new_metadata[i].w;
-            sum_parental_fitnesses += parental_fitnesses[i];
+            calculate_fitness_batched(rng, pop, genetic_value_fxn,
+                                      new_metadata, new_diploid_gvalues,
+                                      threads, um);
+            for (std::size_t i = 0; i < pop.diploids.size(); ++i)
+                {
+                    parental_fitnesses[i] = new_metadata[i].w;
+                    sum_parental_fitnesses += parental_fitnesses[i];
+                }
+        }
+    else
+        {
+            auto gvoffset = new_diploid_gvalues.data();
+            for (std::size_t i = 0; i < pop.diploids.size();
+                 ++i, gvoffset += genetic_value_fxn.total_dim)
+                {
+                    new_metadata[i] = pop.diploid_metadata[i];
+                    genetic_value_fxn(rng, i, pop, new_metadata[i]);
+                    copy_genetic_values(gvoffset, genetic_value_fxn.gvalues,
+                                        um);
+                    parental_fitnesses[i] = new_metadata[i].w;
+                    sum_parental_fitnesses += parental_fitnesses[i];
+                }
         }
     pop.diploid_metadata.swap(new_metadata);
     pop.genetic_value_matrix.swap(new_diploid_gvalues);
     // If the sum of parental fitnesses is not finite,
     // then the genetic value calculator returned a non-finite value/
-    // Unfortunately, gsl_ran_discrete_preproc allows such values through
-    // without raising an error, so we have to check things here.
+    // We check for that here so that the error message
+    // differs from that for negative fitnesses.
     if (!std::isfinite(sum_parental_fitnesses))
         {
             throw std::runtime_error("non-finite fitnesses encountered");
         }
 
-    auto rv = fwdpp::gsl_ran_discrete_t_ptr(gsl_ran_discrete_preproc(
-        parental_fitnesses.size(), parental_fitnesses.data()));
-    if (rv == nullptr)
+    if (!lookup.assign(begin(parental_fitnesses), end(parental_fitnesses)))
         {
             // This is due to negative fitnesses
             throw std::runtime_error(
                 "fitness lookup table could not be generated");
         }
-    return rv;
 }
 
-std::function<fwdpp::gsl_ran_discrete_t_ptr(
-    const fwdpy11::GSLrng_t &g, fwdpy11::DiploidPopulation &,
-    const fwdpy11::DiploidPopulationGeneticValue &,
-    std::vector<fwdpy11::DiploidMetadata> &, std::vector<double> &)>
-wrap_calculate_fitness_DiploidPopulation(bool update_genotype_matrix)
+std::function<void(const fwdpy11::GSLrng_t &g, fwdpy11::DiploidPopulation &,
+                   const fwdpy11::DiploidPopulationGeneticValue &,
+                   std::vector<fwdpy11::DiploidMetadata> &,
+                   std::vector<double> &, fwdpy11::alias_table &)>
+wrap_calculate_fitness_DiploidPopulation(bool update_genotype_matrix,
+                                         fwdpy11::util::thread_pool &threads)
+// The threads belong to the caller and must outlive
+// the returned function.
 {
+    auto pool = &threads;
     if (update_genotype_matrix)
         {
-            return [](const fwdpy11::GSLrng_t &rng,
-                      fwdpy11::DiploidPopulation &pop,
-                      const fwdpy11::DiploidPopulationGeneticValue
-                          &genetic_value_fxn,
-                      std::vector<fwdpy11::DiploidMetadata> &new_metadata,
-                      std::vector<double> &new_diploid_gvalues) {
-                return calculate_fitness_details(
-                    rng, pop, genetic_value_fxn, new_metadata,
-                    new_diploid_gvalues, std::true_type());
+            std::vector<double> fitnesses;
+            return [pool, fitnesses](
+                       const fwdpy11::GSLrng_t &rng,
+                       fwdpy11::DiploidPopulation &pop,
+                       const fwdpy11::DiploidPopulationGeneticValue
+                           &genetic_value_fxn,
+                       std::vector<fwdpy11::DiploidMetadata> &new_metadata,
+                       std::vector<double> &new_diploid_gvalues,
+                       fwdpy11::alias_table &lookup) mutable {
+                calculate_fitness_details(rng, pop, genetic_value_fxn,
+                                          new_metadata, new_diploid_gvalues,
+                                          fitnesses, lookup, *pool,
+                                          std::true_type());
             };
         }
-    return [](const fwdpy11::GSLrng_t &rng, fwdpy11::DiploidPopulation &pop,
-              const fwdpy11::DiploidPopulationGeneticValue &genetic_value_fxn,
-              std::vector<fwdpy11::DiploidMetadata> &new_metadata,
-              std::vector<double> &new_diploid_gvalues) {
-        return calculate_fitness_details(rng, pop, genetic_value_fxn,
-                                         new_metadata, new_diploid_gvalues,
-                                         std::false_type());
+    std::vector<double> fitnesses;
+    return [pool, fitnesses](
+               const fwdpy11::GSLrng_t &rng, fwdpy11::DiploidPopulation &pop,
+               const fwdpy11::DiploidPopulationGeneticValue &genetic_value_fxn,
+               std::vector<fwdpy11::DiploidMetadata> &new_metadata,
+               std::vector<double> &new_diploid_gvalues,
+               fwdpy11::alias_table &lookup) mutable {
+        calculate_fitness_details(rng, pop, genetic_value_fxn, new_metadata,
+                                  new_diploid_gvalues, fitnesses, lookup,
+                                  *pool, std::false_type());
     };
 }
 
+bool
+genetic_values_are_uniform(
+    const fwdpy11::DiploidPopulationGeneticValue &genetic_value_fxn,
+    const fwdpy11::DiploidPopulation &pop)
+{
+    if (!genetic_value_fxn.uniform_without_selected_mutations())
+        {
+            return false;
+        }
+    for (auto &dip : pop.diploids)
+        {
+            if (!pop.haploid_genomes[dip.first].smutations.empty()
+                || !pop.haploid_genomes[dip.second].smutations.empty())
+                {
+                    return false;
+                }
+        }
+    return true;
+}
+
+void
+set_uniform_genetic_values(
+    const fwdpy11::GSLrng_t &rng, fwdpy11::DiploidPopulation &pop,
+    const fwdpy11::DiploidPopulationGeneticValue &genetic_value_fxn,
+    const bool update_genotype_matrix)
+// Only the first individual is evaluated.
+{
+    if (pop.diploid_metadata.empty())
+        {
+            return;
+        }
+    auto md = pop.diploid_metadata[0];
+    genetic_value_fxn(rng, 0, pop, md);
+    for (auto &i : pop.diploid_metadata)
+        {
+            i.g = md.g;
+            i.e = md.e;
+            i.w = md.w;
+        }
+    if (update_genotype_matrix)
+        {
+            const auto &gvalues = genetic_value_fxn.gvalues;
+            pop.genetic_value_matrix.resize(pop.diploid_metadata.size()
+                                            * gvalues.size());
+            for (auto i = begin(pop.genetic_value_matrix);
+                 i < end(pop.genetic_value_matrix); i += gvalues.size())
+                {
+                    std::copy(begin(gvalues), end(gvalues), i);
+                }
+        }
+}
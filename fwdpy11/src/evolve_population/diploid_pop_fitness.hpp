@@ -1,14 +1,31 @@
 #ifndef FWDPY11_TSEVOLVE_SLOCUS_FITNESS_HPP
 #define FWDPY11_TSEVOLVE_SLOCUS_FITNESS_HPP
 
-#include <fwdpp/gsl_discrete.hpp>
+#include <functional>
+#include <vector>
+#include <fwdpy11/util/alias_table.hpp>
+#include <fwdpy11/util/parallel.hpp>
 #include <fwdpy11/types/DiploidPopulation.hpp>
 #include <fwdpy11/genetic_values/DiploidPopulationGeneticValue.hpp>
 
-std::function<fwdpp::gsl_ran_discrete_t_ptr(
-    const fwdpy11::GSLrng_t &g, fwdpy11::DiploidPopulation &,
-    const fwdpy11::DiploidPopulationGeneticValue &,
-    std::vector<fwdpy11::DiploidMetadata> &, std::vector<double> &)>
-wrap_calculate_fitness_DiploidPopulation(bool update_genotype_matrix);
+std::function<void(const fwdpy11::GSLrng_t &g, fwdpy11::DiploidPopulation &,
+                   const fwdpy11::DiploidPopulationGeneticValue &,
+                   std::vector<fwdpy11::DiploidMetadata> &,
+                   std::vector<double> &, fwdpy11::alias_table &)>
+wrap_calculate_fitness_DiploidPopulation(bool update_genotype_matrix,
+                                         fwdpy11::util::thread_pool &threads);
+
+// True if all individuals have the same fitness
+// because none of them has selected mutations.
+bool genetic_values_are_uniform(
+    const fwdpy11::DiploidPopulationGeneticValue &genetic_value_fxn,
+    const fwdpy11::DiploidPopulation &pop);
+
+// Sets the metadata, and optionally the genetic value matrix,
+// when genetic_values_are_uniform is true.
+void set_uniform_genetic_values(
+    const fwdpy11::GSLrng_t &rng, fwdpy11::DiploidPopulation &pop,
+    const fwdpy11::DiploidPopulationGeneticValue &genetic_value_fxn,
+    const bool update_genotype_matrix);
 
 #endif
@@ -0,0 +1,330 @@
+#ifndef FWDPY11_EVOLVE_POPULATION_EVOLVETS_DEMOGRAPHY_HPP
+#define FWDPY11_EVOLVE_POPULATION_EVOLVETS_DEMOGRAPHY_HPP
+
+#include <algorithm>
+#include <cstdint>
+#include <memory>
+#include <numeric>
+#include <stdexcept>
+#include <utility>
+#include <vector>
+#include <gsl/gsl_randist.h>
+#include <fwdpy11/rng.hpp>
+#include <fwdpy11/util/alias_table.hpp>
+#include <fwdpy11/types/DiploidPopulation.hpp>
+#include <fwdpy11/discrete_demography/DiscreteDemography.hpp>
+#include <fwdpy11/discrete_demography/simulation.hpp>
+
+// The demographic models of evolve_with_tree_sequences.
+// Each generation, the simulation calls prepare_generation,
+// which returns the number of offspring, and then picks
+// the parents of each offspring, in order, using first_parent,
+// second_parent, and offspring_metadata.  After the offspring
+// are born, offspring_generated is called.  Finally,
+// fitnesses_updated receives the fitness lookup table of
+// the new generation.  The table is owned by the simulation,
+// which rebuilds it in place each generation.
+//
+// If fitnesses_from_metadata returns true, the model reads
+// the fitnesses of the parents from their metadata, which
+// must be up to date when prepare_generation is called.
+
+class fixed_population_sizes
+// A single deme whose size in each generation is given
+// by the user.  Parents are chosen with probability
+// proportional to fitness.
+//
+// Without selfing, the parents of all offspring are
+// sampled at once by prepare_generation.
+{
+  private:
+    const std::vector<std::uint32_t> sizes;
+    const double selfing_rate;
+    const fwdpy11::alias_table *lookup;
+    std::vector<std::size_t> parents;
+    std::size_t next_parent;
+
+  public:
+    fixed_population_sizes(std::vector<std::uint32_t> popsizes,
+                           const double selfing)
+        : sizes(std::move(popsizes)), selfing_rate(selfing), lookup(nullptr),
+          parents(), next_parent(0)
+    {
+    }
+
+    std::uint32_t
+    num_generations() const
+    {
+        return static_cast<std::uint32_t>(sizes.size());
+    }
+
+    std::uint32_t
+    prepare_generation(const fwdpy11::GSLrng_t &rng,
+                       fwdpy11::DiploidPopulation & /*pop*/,
+                       const std::uint32_t gen)
+    {
+        next_parent = 0;
+        if (selfing_rate == 0.0)
+            {
+                parents.resize(2 * static_cast<std::size_t>(sizes[gen]));
+                lookup->sample(rng, parents.size(), begin(parents));
+            }
+        return sizes[gen];
+    }
+
+    void
+    offspring_generated(fwdpy11::DiploidPopulation & /*pop*/)
+    {
+    }
+
+    void
+    fitnesses_updated(const fwdpy11::alias_table &fitness_lookup)
+    {
+        lookup = &fitness_lookup;
+    }
+
+    bool
+    fitnesses_from_metadata() const
+    {
+        return false;
+    }
+
+    std::size_t
+    first_parent(const fwdpy11::GSLrng_t &rng)
+    {
+        if (selfing_rate == 0.0)
+            {
+                return parents[next_parent++];
+            }
+        return (*lookup)(rng);
+    }
+
+    std::size_t
+    second_parent(const fwdpy11::GSLrng_t &rng, const std::size_t p1)
+    {
+        if (selfing_rate == 0.0)
+            {
+                return parents[next_parent++];
+            }
+        if (selfing_rate == 1.0 || gsl_rng_uniform(rng.get()) < selfing_rate)
+            {
+                return p1;
+            }
+        return (*lookup)(rng);
+    }
+
+    void
+    offspring_metadata(fwdpy11::DiploidMetadata &offspring_metadata,
+                       const std::size_t p1, const std::size_t p2) const
+    {
+        offspring_metadata.deme = 0;
+        offspring_metadata.parents[0] = p1;
+        offspring_metadata.parents[1] = p2;
+    }
+};
+
+class discrete_demography_model
+// A multi-deme model defined by a DiscreteDemography.
+//
+// The generations with events are found once, when the
+// simulation starts.  In all other generations, the only
+// changes to the model are due to exponential growth,
+// and the migration lookup tables are only rebuilt
+// if a deme size changed.
+//
+// The parents of all offspring are chosen by prepare_generation,
+// with offspring ordered by deme.  The engine asks for the
+// first and then the second parent of each offspring, in order,
+// which is how the stored parents are handed out.
+{
+  private:
+    fwdpy11::discrete_demography::DiscreteDemography &demography;
+    const std::uint32_t simlen;
+    const std::int32_t maxdemes;
+    fwdpy11::discrete_demography::demographic_event_timeline timeline;
+    fwdpy11::discrete_demography::multideme_fitness_lookups<std::uint32_t>
+        fitnesses;
+    fwdpy11::discrete_demography::deme_properties sizes_rates;
+    std::unique_ptr<fwdpy11::discrete_demography::MigrationMatrix> M;
+    fwdpy11::discrete_demography::migration_lookup miglookup;
+    // Deme sizes when miglookup was last built
+    std::vector<std::uint32_t> migration_lookup_deme_sizes;
+    bool growing;
+    std::vector<fwdpy11::discrete_demography::parent_data> parents;
+    std::vector<std::int32_t> offspring_demes;
+    std::size_t next_parent;
+
+    static std::unique_ptr<fwdpy11::discrete_demography::MigrationMatrix>
+    copy_migration_matrix(
+        const fwdpy11::discrete_demography::DiscreteDemography &d)
+    // The input is const so that it may be reused, but
+    // SetMigrationRates events change the matrix.
+    {
+        if (d.migmatrix == nullptr)
+            {
+                return nullptr;
+            }
+        return d.migmatrix->clone();
+    }
+
+    bool
+    any_growth() const
+    {
+        const auto &G = sizes_rates.growth_rates.get();
+        return std::any_of(begin(G), end(G), [](const double g) {
+            return g != fwdpy11::discrete_demography::NOGROWTH;
+        });
+    }
+
+  public:
+    discrete_demography_model(
+        fwdpy11::discrete_demography::DiscreteDemography &d,
+        const std::uint32_t num_generations,
+        const fwdpy11::DiploidPopulation &pop)
+        : demography(d), simlen(num_generations),
+          maxdemes(fwdpy11::discrete_demography::get_max_number_of_demes()(
+              pop.diploid_metadata, d)),
+          timeline(d, pop.generation), fitnesses(maxdemes),
+          sizes_rates(maxdemes, pop.diploid_metadata),
+          M(copy_migration_matrix(d)), miglookup(maxdemes, M == nullptr),
+          migration_lookup_deme_sizes(), growing(false), parents(),
+          offspring_demes(), next_parent(0)
+    {
+        if (M != nullptr && M->npops != static_cast<std::size_t>(maxdemes))
+            {
+                throw std::invalid_argument(
+                    "MigrationMatrix contains too few demes");
+            }
+        demography.update_event_times(pop.generation);
+    }
+
+    std::uint32_t
+    num_generations() const
+    {
+        return simlen;
+    }
+
+    std::uint32_t
+    prepare_generation(const fwdpy11::GSLrng_t &rng,
+                       fwdpy11::DiploidPopulation &pop,
+                       const std::uint32_t /*gen*/)
+    // Events are applied at the generation of the parents.
+    {
+        namespace ddemog = fwdpy11::discrete_demography;
+        const auto t = pop.generation;
+        const bool events = timeline.events_at(t);
+        if (events)
+            {
+                ddemog::mass_migration(
+                    rng, t, demography.mass_migration_tracker,
+                    sizes_rates.growth_rates,
+                    sizes_rates.growth_rate_onset_times,
+                    sizes_rates.growth_initial_sizes, pop.diploid_metadata);
+            }
+        ddemog::get_current_deme_sizes(pop.diploid_metadata,
+                                       sizes_rates.current_deme_sizes);
+        fitnesses.update(sizes_rates.current_deme_sizes, pop.diploid_metadata);
+        if (events)
+            {
+                ddemog::apply_demographic_events(t, demography, M,
+                                                 sizes_rates);
+                growing = any_growth();
+            }
+        else
+            {
+                // Equivalent to apply_demographic_events
+                // when there are no events.
+                std::copy(begin(sizes_rates.current_deme_sizes.get()),
+                          end(sizes_rates.current_deme_sizes.get()),
+                          begin(sizes_rates.next_deme_sizes.get()));
+                if (growing)
+                    {
+                        ddemog::detail::apply_growth_rates(t, sizes_rates);
+                    }
+            }
+        if (M != nullptr
+            && (events
+                || migration_lookup_deme_sizes
+                       != sizes_rates.current_deme_sizes.get()))
+            {
+                ddemog::build_migration_lookup(
+                    M, sizes_rates.current_deme_sizes,
+                    sizes_rates.selfing_rates, miglookup);
+                migration_lookup_deme_sizes
+                    = sizes_rates.current_deme_sizes.get();
+            }
+
+        const auto &next_deme_sizes = sizes_rates.next_deme_sizes.get();
+        const std::uint32_t N_next = std::accumulate(
+            begin(next_deme_sizes), end(next_deme_sizes), 0u);
+        if (N_next == 0)
+            {
+                throw std::runtime_error("all demes have gone extinct");
+            }
+        parents.clear();
+        offspring_demes.clear();
+        parents.reserve(N_next);
+        offspring_demes.reserve(N_next);
+        for (std::int32_t deme = 0; deme < maxdemes; ++deme)
+            {
+                for (std::uint32_t i = 0; i < next_deme_sizes[deme]; ++i)
+                    {
+                        parents.push_back(ddemog::pick_parents(
+                            rng, deme, miglookup,
+                            sizes_rates.current_deme_sizes,
+                            sizes_rates.selfing_rates, fitnesses));
+                        offspring_demes.push_back(deme);
+                    }
+            }
+        next_parent = 0;
+        return N_next;
+    }
+
+    void
+    offspring_generated(fwdpy11::DiploidPopulation &pop)
+    // Record the deme of each offspring in its nodes
+    {
+        for (auto &md : pop.diploid_metadata)
+            {
+                pop.tables.node_table[md.nodes[0]].population = md.deme;
+                pop.tables.node_table[md.nodes[1]].population = md.deme;
+            }
+    }
+
+    void
+    fitnesses_updated(const fwdpy11::alias_table & /*fitness_lookup*/)
+    // The lookup tables for each deme are built from
+    // the metadata by prepare_generation.
+    {
+    }
+
+    bool
+    fitnesses_from_metadata() const
+    {
+        return true;
+    }
+
+    std::size_t
+    first_parent(const fwdpy11::GSLrng_t & /*rng*/) const
+    {
+        return parents[next_parent].parent1;
+    }
+
+    std::size_t
+    second_parent(const fwdpy11::GSLrng_t & /*rng*/,
+                  const std::size_t /*p1*/)
+    {
+        return parents[next_parent++].parent2;
+    }
+
+    void
+    offspring_metadata(fwdpy11::DiploidMetadata &offspring_metadata,
+                       const std::size_t p1, const std::size_t p2) const
+    {
+        offspring_metadata.deme = offspring_demes[offspring_metadata.label];
+        offspring_metadata.parents[0] = p1;
+        offspring_metadata.parents[1] = p2;
+    }
+};
+
+#endif
@@ -1,8 +1,12 @@
 #include <pybind11/pybind11.h>
-#include <fwdpy11/types/Population.hpp>
+#include <fwdpy11/types/DiploidPopulation.hpp>
 
+// The signature must match the stopping criterion
+// of evolve_with_tree_sequences, so that pybind11
+// does not call this function via Python.
+// See python_callbacks.cc.
 bool
-no_stopping(const fwdpy11::Population &, const bool)
+no_stopping(const fwdpy11::DiploidPopulation &, const bool)
 {
     return false;
 }
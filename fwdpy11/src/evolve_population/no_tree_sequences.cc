@@ -24,6 +24,7 @@
 #include <pybind11/stl.h>
 #include <functional>
 #include <tuple>
+#include <vector>
 #include <queue>
 #include <cmath>
 #include <stdexcept>
@@ -38,6 +39,7 @@
 #include <fwdpy11/regions/RecombinationRegions.hpp>
 #include <fwdpy11/regions/MutationRegions.hpp>
 #include "diploid_pop_fitness.hpp"
+#include "python_callbacks.hpp"
 
 namespace py = pybind11;
 
@@ -69,8 +71,8 @@ evolve_without_tree_sequences(
     const double mu_selected, const fwdpy11::MutationRegions &mmodel,
     const fwdpy11::GeneticMap &rmodel,
     fwdpy11::DiploidPopulationGeneticValue &genetic_value_fxn,
-    fwdpy11::DiploidPopulation_temporal_sampler recorder,
-    const double selfing_rate, const bool remove_selected_fixations)
+    py::object recorder_object, const double selfing_rate,
+    const bool remove_selected_fixations)
 {
     //validate the input params
     if (!std::isfinite(mu_neutral))
@@ -103,6 +105,14 @@ evolve_without_tree_sequences(
         {
             throw std::invalid_argument("empty list of population sizes");
         }
+    std::vector<std::uint32_t> sizes;
+    sizes.reserve(num_generations);
+    auto popsizes_ = popsizes.unchecked<1>();
+    for (std::uint32_t gen = 0; gen < num_generations; ++gen)
+        {
+            sizes.push_back(popsizes_(gen));
+        }
+    const auto recorder = temporal_sampler_from_python(recorder_object);
 
     // E[S_{2N}] I got the expression from Ewens.
     pop.mutations.reserve(std::ceil(
@@ -125,17 +135,18 @@ evolve_without_tree_sequences(
     genetic_value_fxn.update(pop);
     std::vector<fwdpy11::DiploidMetadata> new_metadata(pop.N);
     std::vector<double> new_diploid_gvalues;
-    auto calculate_fitness = wrap_calculate_fitness_DiploidPopulation(false);
-    auto lookup = calculate_fitness(rng, pop, genetic_value_fxn, new_metadata,
-                                    new_diploid_gvalues);
+    fwdpy11::util::thread_pool threads(1);
+    auto calculate_fitness
+        = wrap_calculate_fitness_DiploidPopulation(false, threads);
+    fwdpy11::alias_table lookup;
+    calculate_fitness(rng, pop, genetic_value_fxn, new_metadata,
+                      new_diploid_gvalues, lookup);
 
     // Generate our fxns for picking parents
 
     // Because lambdas that capture by reference do a "late" binding of
     // params, this is safe w.r.to updating lookup after each generation.
-    const auto pick_first_parent = [&rng, &lookup]() {
-        return gsl_ran_discrete(rng.get(), lookup.get());
-    };
+    const auto pick_first_parent = [&rng, &lookup]() { return lookup(rng); };
 
     const auto pick_second_parent
         = [&rng, &lookup, selfing_rate](const std::size_t p1) {
@@ -145,7 +156,7 @@ evolve_without_tree_sequences(
                   {
                       return p1;
                   }
-              return gsl_ran_discrete(rng.get(), lookup.get());
+              return lookup(rng);
           };
 
     const auto generate_offspring_metadata
@@ -159,10 +170,14 @@ evolve_without_tree_sequences(
               offspring_metadata.nodes[0] = offspring_metadata.nodes[1] = -1;
           };
 
+    // Nothing in the generation loop touches Python objects,
+    // except for a recorder defined in Python, which acquires
+    // the GIL when called.
+    py::gil_scoped_release release;
     for (std::uint32_t gen = 0; gen < num_generations; ++gen)
         {
             ++pop.generation;
-            const auto N_next = popsizes.at(gen);
+            const auto N_next = sizes[gen];
             fwdpy11::evolve_generation(
                 rng, pop, N_next, mu_neutral + mu_selected, bound_mmodel,
                 bound_rmodel, pick_first_parent, pick_second_parent,
@@ -172,8 +187,8 @@ evolve_without_tree_sequences(
             pop.N = N_next;
             // TODO: deal with random effects
             genetic_value_fxn.update(pop);
-            lookup = calculate_fitness(rng, pop, genetic_value_fxn,
-                                       new_metadata, new_diploid_gvalues);
+            calculate_fitness(rng, pop, genetic_value_fxn, new_metadata,
+                              new_diploid_gvalues, lookup);
             recorder(pop); // The user may now analyze the pop'n
         }
 }
@@ -0,0 +1,60 @@
+#include <pybind11/functional.h>
+#include <fwdpy11/evolvets/recorders.hpp>
+#include "python_callbacks.hpp"
+
+namespace py = pybind11;
+
+// Defined in no_stopping.cc
+bool no_stopping(const fwdpy11::DiploidPopulation &, const bool);
+
+fwdpy11::DiploidPopulation_temporal_sampler
+temporal_sampler_from_python(py::object recorder)
+{
+    if (py::isinstance<fwdpy11::RecordNothing>(recorder))
+        {
+            return fwdpy11::RecordNothing();
+        }
+    return recorder.cast<fwdpy11::DiploidPopulation_temporal_sampler>();
+}
+
+fwdpy11::DiploidPopulation_sample_recorder
+sample_recorder_from_python(py::object recorder)
+{
+    if (py::isinstance<fwdpy11::no_ancient_samples>(recorder))
+        {
+            return fwdpy11::no_ancient_samples();
+        }
+    if (py::isinstance<fwdpy11::random_ancient_samples>(recorder))
+        {
+            // The caller keeps recorder alive, and its
+            // state must be updated during the simulation.
+            auto &r = recorder.cast<fwdpy11::random_ancient_samples &>();
+            return [&r](const fwdpy11::DiploidPopulation &pop,
+                        fwdpy11::SampleRecorder &sr) { r(pop, sr); };
+        }
+    return recorder.cast<fwdpy11::DiploidPopulation_sample_recorder>();
+}
+
+stopping_criterion_t
+stopping_criterion_from_python(py::object stopping_criterion)
+{
+    // pybind11 unwraps C++ functions with the same
+    // signature as stopping_criterion_t, such as
+    // fwdpy11._no_stopping.
+    return stopping_criterion.cast<stopping_criterion_t>();
+}
+
+bool
+reads_population(const fwdpy11::DiploidPopulation_sample_recorder &recorder)
+{
+    return recorder.target<fwdpy11::no_ancient_samples>() == nullptr;
+}
+
+bool
+reads_population(const stopping_criterion_t &stopping_criterion)
+{
+    using function_pointer
+        = bool (*)(const fwdpy11::DiploidPopulation &, const bool);
+    auto f = stopping_criterion.target<function_pointer>();
+    return f == nullptr || *f != &no_stopping;
+}
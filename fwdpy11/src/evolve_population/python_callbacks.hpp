@@ -0,0 +1,35 @@
+#ifndef FWDPY11_EVOLVE_POPULATION_PYTHON_CALLBACKS_HPP
+#define FWDPY11_EVOLVE_POPULATION_PYTHON_CALLBACKS_HPP
+
+#include <functional>
+#include <pybind11/pybind11.h>
+#include <fwdpy11/samplers.hpp>
+#include <fwdpy11/evolvets/sample_recorder_types.hpp>
+
+// The built-in callables that do nothing are replaced
+// by C++ functions, which do not need the GIL.
+// Any other callable is wrapped by pybind11, which
+// acquires the GIL each time the callable is called.
+
+fwdpy11::DiploidPopulation_temporal_sampler
+temporal_sampler_from_python(pybind11::object recorder);
+
+fwdpy11::DiploidPopulation_sample_recorder
+sample_recorder_from_python(pybind11::object recorder);
+
+using stopping_criterion_t
+    = std::function<bool(const fwdpy11::DiploidPopulation &, const bool)>;
+
+stopping_criterion_t
+stopping_criterion_from_python(pybind11::object stopping_criterion);
+
+// The built-in callables that do nothing are the only
+// ones known not to read the population.
+
+bool
+reads_population(const fwdpy11::DiploidPopulation_sample_recorder &recorder);
+
+bool
+reads_population(const stopping_criterion_t &stopping_criterion);
+
+#endif
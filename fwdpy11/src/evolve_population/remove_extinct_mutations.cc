@@ -81,9 +81,10 @@ remove_extinct_mutations(fwdpy11::Population& pop)
 
     // Easiest way to update the lookup table:
     pop.mut_lookup.clear();
+    pop.mut_lookup.reserve(pop.mutations.size());
     for (std::size_t i = 0; i < pop.mutations.size(); ++i)
         {
-            pop.mut_lookup.insert(std::make_pair(pop.mutations[i].pos, i));
+            pop.mut_lookup.emplace(pop.mutations[i].pos, i);
         }
 }
 
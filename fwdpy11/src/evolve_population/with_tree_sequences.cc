@@ -24,8 +24,10 @@
 #include <pybind11/functional.h>
 #include <pybind11/stl.h>
 #include <functional>
+#include <chrono>
 #include <cmath>
 #include <stdexcept>
+#include <vector>
 #include <fwdpp/diploid.hh>
 #include <fwdpp/simparams.hpp>
 #include <fwdpy11/rng.hpp>
@@ -34,6 +36,8 @@
 #include <fwdpy11/evolvets/evolve_generation_ts.hpp>
 #include <fwdpy11/evolvets/simplify_tables.hpp>
 #include <fwdpy11/evolvets/sample_recorder_types.hpp>
+#include <fwdpy11/evolvets/SimplificationScheduler.hpp>
+#include <fwdpy11/evolvets/EvolvetsTimings.hpp>
 #include <fwdpy11/regions/MutationRegions.hpp>
 #include <fwdpy11/regions/RecombinationRegions.hpp>
 #include <fwdpy11/samplers.hpp>
@@ -46,6 +50,8 @@
 #include "remove_extinct_mutations.hpp"
 #include "track_ancestral_counts.hpp"
 #include "remove_extinct_genomes.hpp"
+#include "python_callbacks.hpp"
+#include "evolvets_demography.hpp"
 
 namespace py = pybind11;
 
@@ -64,26 +70,34 @@ apply_treseq_resetting_of_ancient_samples(
         }
 }
 
+double
+seconds_since(const std::chrono::steady_clock::time_point &start)
+{
+    return std::chrono::duration<double>(std::chrono::steady_clock::now()
+                                         - start)
+        .count();
+}
+
+template <typename DemographicModel>
 void
-evolve_with_tree_sequences(
+evolve_with_tree_sequences_details(
     const fwdpy11::GSLrng_t &rng, fwdpy11::DiploidPopulation &pop,
-    fwdpy11::SampleRecorder &sr, const unsigned simplification_interval,
-    py::array_t<std::uint32_t> popsizes, const double mu_neutral,
+    fwdpy11::SampleRecorder &sr,
+    fwdpy11::SimplificationScheduler &simplification_scheduler,
+    DemographicModel &demography, const double mu_neutral,
     const double mu_selected, const fwdpy11::MutationRegions &mmodel,
     const fwdpy11::GeneticMap &rmodel,
     fwdpy11::DiploidPopulationGeneticValue &genetic_value_fxn,
-    fwdpy11::DiploidPopulation_sample_recorder recorder,
-    std::function<bool(const fwdpy11::DiploidPopulation &, const bool)>
-        &stopping_criteron,
-    const double selfing_rate,
+    py::object recorder_object, py::object stopping_criterion_object,
     // NOTE: this is the complement of what a user will input, which is "prune_selected"
     const bool preserve_selected_fixations,
     const bool suppress_edge_table_indexing, bool record_genotype_matrix,
     const bool track_mutation_counts_during_sim,
     const bool remove_extinct_mutations_at_finish,
     const bool reset_treeseqs_to_alive_nodes_after_simplification,
-    const fwdpy11::DiploidPopulation_temporal_sampler
-        &post_simplification_recorder)
+    py::object post_simplification_recorder_object,
+    const bool incremental_simplification, const std::size_t nthreads,
+    py::object timings_object)
 {
     //validate the input params
     if (pop.tables.genome_length() == std::numeric_limits<double>::max())
@@ -115,23 +129,36 @@ evolve_with_tree_sequences(
             throw std::invalid_argument(
                 "nonzero mutation rate incompatible with empty regions");
         }
-    const std::uint32_t num_generations
-        = static_cast<std::uint32_t>(popsizes.size());
-    if (!num_generations)
-        {
-            throw std::invalid_argument("empty list of population sizes");
-        }
+    const std::uint32_t num_generations = demography.num_generations();
     if (pop.tables.node_table.empty())
         {
             throw std::invalid_argument("node table is not initialized");
         }
+    if (nthreads == 0)
+        {
+            throw std::invalid_argument("number of threads must be > 0");
+        }
+    const auto recorder = sample_recorder_from_python(recorder_object);
+    const auto stopping_criteron
+        = stopping_criterion_from_python(stopping_criterion_object);
+    const auto post_simplification_recorder
+        = temporal_sampler_from_python(post_simplification_recorder_object);
+    // Phases are only timed if the user asks for it
+    fwdpy11::EvolvetsTimings *timings
+        = timings_object.is_none()
+              ? nullptr
+              : timings_object.cast<fwdpy11::EvolvetsTimings *>();
+    using fwdpy11::evolvets_phase;
+    std::uint64_t new_mutations = 0;
 
     double total_mutation_rate = mu_neutral + mu_selected;
-    const auto bound_mmodel = [&rng, &mmodel, &pop, total_mutation_rate](
+    const auto bound_mmodel = [&rng, &mmodel, &pop, total_mutation_rate,
+                               &new_mutations](
                                   fwdpp::flagged_mutation_queue &recycling_bin,
                                   std::vector<fwdpy11::Mutation> &mutations) {
         std::vector<fwdpp::uint_t> rv;
         unsigned nmuts = gsl_ran_poisson(rng.get(), total_mutation_rate);
+        new_mutations += nmuts;
         for (unsigned i = 0; i < nmuts; ++i)
             {
                 std::size_t x
@@ -157,39 +184,56 @@ evolve_with_tree_sequences(
     // so we must call update(...) prior to calculating fitness,
     // else bad stuff like segfaults could happen.
     genetic_value_fxn.update(pop);
+    // The worker threads are started once and used
+    // by every generation of the simulation.
+    fwdpy11::util::thread_pool threads(nthreads);
     std::vector<fwdpy11::DiploidMetadata> new_metadata(pop.N);
     std::vector<double> new_diploid_gvalues;
     auto calculate_fitness
-        = wrap_calculate_fitness_DiploidPopulation(record_genotype_matrix);
-    auto lookup = calculate_fitness(rng, pop, genetic_value_fxn, new_metadata,
-                                    new_diploid_gvalues);
+        = wrap_calculate_fitness_DiploidPopulation(record_genotype_matrix,
+                                                   threads);
+    fwdpy11::alias_table fitness_lookup;
+    calculate_fitness(rng, pop, genetic_value_fxn, new_metadata,
+                      new_diploid_gvalues, fitness_lookup);
+    demography.fitnesses_updated(fitness_lookup);
 
-    // Generate our fxns for picking parents
-
-    // Because lambdas that capture by reference do a "late" binding of
-    // params, this is safe w.r.to updating lookup after each generation.
-    const auto pick_first_parent = [&rng, &lookup]() {
-        return gsl_ran_discrete(rng.get(), lookup.get());
+    // If selected mutations are neither present nor arise,
+    // all individuals have the same fitness.  Parents are then
+    // sampled uniformly, and genetic values are only calculated
+    // when the metadata are needed, by update_uniform_metadata.
+    const bool uniform_fitness
+        = mu_selected == 0.0
+          && genetic_values_are_uniform(genetic_value_fxn, pop);
+    bool metadata_outdated = false;
+    const auto update_uniform_metadata = [&]() {
+        if (metadata_outdated)
+            {
+                genetic_value_fxn.update(pop);
+                set_uniform_genetic_values(rng, pop, genetic_value_fxn,
+                                           record_genotype_matrix);
+                metadata_outdated = false;
+            }
     };
+    const bool recorder_reads_population = reads_population(recorder);
+    const bool stopping_criterion_reads_population
+        = reads_population(stopping_criteron);
+
+    // Generate our fxns for picking parents.
+    // The demographic model is updated each generation,
+    // and these lambdas refer to it.
+    const auto pick_first_parent
+        = [&rng, &demography]() { return demography.first_parent(rng); };
 
     const auto pick_second_parent
-        = [&rng, &lookup, selfing_rate](const std::size_t p1) {
-              if (selfing_rate == 1.0
-                  || (selfing_rate > 0.0
-                      && gsl_rng_uniform(rng.get()) < selfing_rate))
-                  {
-                      return p1;
-                  }
-              return gsl_ran_discrete(rng.get(), lookup.get());
+        = [&rng, &demography](const std::size_t p1) {
+              return demography.second_parent(rng, p1);
           };
     const auto generate_offspring_metadata
-        = [](fwdpy11::DiploidMetadata &offspring_metadata,
-             const std::size_t p1, const std::size_t p2,
-             const std::vector<fwdpy11::DiploidMetadata>
-                 & /*parental_metadata*/) {
-              offspring_metadata.deme = 0;
-              offspring_metadata.parents[0] = p1;
-              offspring_metadata.parents[1] = p2;
+        = [&demography](fwdpy11::DiploidMetadata &offspring_metadata,
+                        const std::size_t p1, const std::size_t p2,
+                        const std::vector<fwdpy11::DiploidMetadata>
+                            & /*parental_metadata*/) {
+              demography.offspring_metadata(offspring_metadata, p1, p2);
           };
     if (!pop.mutations.empty())
         {
@@ -236,46 +280,131 @@ evolve_with_tree_sequences(
     const bool simulating_neutral_variants = (mu_neutral > 0.0) ? true : false;
     std::pair<std::vector<fwdpp::ts::TS_NODE_INT>, std::vector<std::size_t>>
         simplification_rv;
+    // We make no assumptions about the sort order of the input
+    // tables, so the first simplification always sorts everything.
+    fwdpy11::sorted_table_offsets sorted_offsets;
+    simplification_scheduler.begin_simulation();
+    const auto initial_num_mutations = pop.mutations.size();
+    // From here on, Python objects are only used by callbacks
+    // defined in Python, which acquire the GIL when called.
+    // When all callbacks are built-in, the simulation runs
+    // without holding the GIL.
+    py::gil_scoped_release release;
     for (std::uint32_t gen = 0;
          gen < num_generations && !stopping_criteron_met; ++gen)
         {
-            ++pop.generation;
-            const auto N_next = popsizes.at(gen);
+            const auto generation_start = std::chrono::steady_clock::now();
+            if (timings != nullptr)
+                {
+                    ++timings->generations;
+                }
             // TODO: can simplify function further b/c we are referring
             // to data that fwdpy11 Populations contain.
-            fwdpy11::evolve_generation_ts(
-                rng, pop, genetics, N_next, pick_first_parent,
-                pick_second_parent, generate_offspring_metadata,
-                pop.generation, pop.tables, first_parental_index, next_index);
+            {
+                fwdpy11::evolvets_phase_timer timer(
+                    timings, evolvets_phase::offspring_generation);
+                if (demography.fitnesses_from_metadata())
+                    {
+                        update_uniform_metadata();
+                    }
+                // Demographic events happen in the parental generation
+                const auto N_next
+                    = demography.prepare_generation(rng, pop, gen);
+                ++pop.generation;
+                if (nthreads > 1)
+                    {
+                        fwdpy11::evolve_generation_ts_parallel(
+                            rng, pop, genetics, N_next, pick_first_parent,
+                            pick_second_parent, generate_offspring_metadata,
+                            pop.generation, pop.tables, first_parental_index,
+                            next_index, threads);
+                    }
+                else
+                    {
+                        fwdpy11::evolve_generation_ts(
+                            rng, pop, genetics, N_next, pick_first_parent,
+                            pick_second_parent, generate_offspring_metadata,
+                            pop.generation, pop.tables, first_parental_index,
+                            next_index);
+                    }
+                demography.offspring_generated(pop);
+                pop.N = N_next;
+            }
 
             //N_next, mu_selected, pick_first_parent,
             //pick_second_parent, generate_offspring_metadata, bound_mmodel,
             //mutation_recycling_bin, bound_rmodel, pop.generation,
             //first_parental_index, next_index);
 
-            pop.N = N_next;
-            // TODO: deal with random effects
-            genetic_value_fxn.update(pop);
-            lookup = calculate_fitness(rng, pop, genetic_value_fxn,
-                                       new_metadata, new_diploid_gvalues);
-            if (gen > 0 && gen % simplification_interval == 0.0)
+            {
+                fwdpy11::evolvets_phase_timer timer(
+                    timings, evolvets_phase::fitness_calculation);
+                if (uniform_fitness)
+                    {
+                        fitness_lookup.assign_uniform(pop.N);
+                        metadata_outdated = true;
+                    }
+                else
+                    {
+                        // TODO: deal with random effects
+                        genetic_value_fxn.update(pop);
+                        calculate_fitness(rng, pop, genetic_value_fxn,
+                                          new_metadata, new_diploid_gvalues,
+                                          fitness_lookup);
+                    }
+                demography.fitnesses_updated(fitness_lookup);
+            }
+            simplification_scheduler.generation_completed(
+                seconds_since(generation_start));
+            if (simplification_scheduler.simplify(pop, gen))
                 {
-                    // TODO: update this to allow neutral mutations to be simulated
-                    simplification_rv = fwdpy11::simplify_tables(
-                        pop, pop.mcounts_from_preserved_nodes, pop.tables,
-                        simplifier, preserve_selected_fixations,
-                        simulating_neutral_variants,
-                        suppress_edge_table_indexing);
-                    simplified = true;
-                    next_index = pop.tables.num_nodes();
-                    first_parental_index = 0;
-                    remap_metadata(pop.ancient_sample_metadata,
-                                   simplification_rv.first);
-                    remap_metadata(pop.diploid_metadata,
-                                   simplification_rv.first);
+                    const std::uint64_t edges_before
+                        = pop.tables.edge_table.size(),
+                        nodes_before = pop.tables.node_table.size(),
+                        bytes_before
+                        = fwdpy11::table_collection_bytes(pop.tables);
+                    {
+                        fwdpy11::evolvets_phase_timer timer(
+                            timings, evolvets_phase::simplification);
+                        fwdpy11::simplification_tables_record tables_record{};
+                        if (timings != nullptr)
+                            {
+                                tables_record
+                                    = fwdpy11::EvolvetsTimings::
+                                        before_simplification(pop.generation,
+                                                              pop.tables);
+                            }
+                        const auto simplification_start
+                            = std::chrono::steady_clock::now();
+                        // TODO: update this to allow neutral mutations to be simulated
+                        simplification_rv = fwdpy11::simplify_tables(
+                            pop, pop.mcounts_from_preserved_nodes, pop.tables,
+                            simplifier, preserve_selected_fixations,
+                            simulating_neutral_variants,
+                            suppress_edge_table_indexing,
+                            incremental_simplification, sorted_offsets);
+                        simplification_scheduler.simplification_completed(
+                            pop, edges_before, nodes_before, bytes_before,
+                            seconds_since(simplification_start));
+                        if (timings != nullptr)
+                            {
+                                timings->simplification_completed(
+                                    tables_record, pop.tables);
+                            }
+                        simplified = true;
+                        next_index = pop.tables.num_nodes();
+                        first_parental_index = 0;
+                        remap_metadata(pop.ancient_sample_metadata,
+                                       simplification_rv.first);
+                        remap_metadata(pop.diploid_metadata,
+                                       simplification_rv.first);
+                    }
                     if (reset_treeseqs_to_alive_nodes_after_simplification
                         == true)
                         {
+                            fwdpy11::evolvets_phase_timer timer(
+                                timings, evolvets_phase::recorders);
+                            update_uniform_metadata();
                             apply_treseq_resetting_of_ancient_samples(
                                 post_simplification_recorder, pop);
                         }
@@ -288,13 +417,25 @@ evolve_with_tree_sequences(
                 }
             if (track_mutation_counts_during_sim)
                 {
+                    fwdpy11::evolvets_phase_timer timer(
+                        timings, evolvets_phase::mutation_counting);
                     track_mutation_counts(pop, simplified,
                                           suppress_edge_table_indexing);
                 }
             // The user may now analyze the pop'n and record ancient samples
-            recorder(pop, sr);
+            {
+                fwdpy11::evolvets_phase_timer timer(timings,
+                                                    evolvets_phase::recorders);
+                if (recorder_reads_population)
+                    {
+                        update_uniform_metadata();
+                    }
+                recorder(pop, sr);
+            }
             if (simplified)
                 {
+                    fwdpy11::evolvets_phase_timer timer(
+                        timings, evolvets_phase::recycling_bin_rebuild);
                     if (suppress_edge_table_indexing == false)
                         {
                             // Behavior change in 0.5.3: set all fixation counts to 0
@@ -353,6 +494,9 @@ evolve_with_tree_sequences(
             // TODO: deal with the result of the recorder populating sr
             if (!sr.samples.empty())
                 {
+                    fwdpy11::evolvets_phase_timer timer(
+                        timings, evolvets_phase::ancient_samples);
+                    update_uniform_metadata();
                     for (auto i : sr.samples)
                         {
                             if (i >= pop.N)
@@ -390,8 +534,24 @@ evolve_with_tree_sequences(
                     // Finally, clear the input
                     sr.samples.clear();
                 }
+            fwdpy11::evolvets_phase_timer timer(timings,
+                                                evolvets_phase::recorders);
+            if (stopping_criterion_reads_population)
+                {
+                    update_uniform_metadata();
+                }
             stopping_criteron_met = stopping_criteron(pop, simplified);
         }
+    update_uniform_metadata();
+    if (timings != nullptr)
+        {
+            // Mutations not appended to pop.mutations
+            // reused the slot of an extinct or fixed one.
+            timings->new_mutations += new_mutations;
+            timings->recycled_mutations
+                += new_mutations
+                   - (pop.mutations.size() - initial_num_mutations);
+        }
 
     // NOTE: if tables.preserved_nodes overlaps with samples,
     // then simplification throws an error. But, since it is annoying
@@ -406,21 +566,53 @@ evolve_with_tree_sequences(
 
     if (!simplified)
         {
-            // TODO: update this to allow neutral mutations to be simulated
-            auto rv = fwdpy11::simplify_tables(
-                pop, pop.mcounts_from_preserved_nodes, pop.tables, simplifier,
-                preserve_selected_fixations, simulating_neutral_variants,
-                suppress_edge_table_indexing);
+            {
+                fwdpy11::evolvets_phase_timer timer(
+                    timings, evolvets_phase::simplification);
+                fwdpy11::simplification_tables_record tables_record{};
+                if (timings != nullptr)
+                    {
+                        tables_record
+                            = fwdpy11::EvolvetsTimings::before_simplification(
+                                pop.generation, pop.tables);
+                    }
+                const std::uint64_t
+                    edges_before = pop.tables.edge_table.size(),
+                    nodes_before = pop.tables.node_table.size(),
+                    bytes_before = fwdpy11::table_collection_bytes(pop.tables);
+                const auto simplification_start
+                    = std::chrono::steady_clock::now();
+                // TODO: update this to allow neutral mutations to be simulated
+                auto rv = fwdpy11::simplify_tables(
+                    pop, pop.mcounts_from_preserved_nodes, pop.tables,
+                    simplifier, preserve_selected_fixations,
+                    simulating_neutral_variants, suppress_edge_table_indexing,
+                    incremental_simplification, sorted_offsets);
+                simplification_scheduler.simplification_completed(
+                    pop, edges_before, nodes_before, bytes_before,
+                    seconds_since(simplification_start));
+                if (timings != nullptr)
+                    {
+                        timings->simplification_completed(tables_record,
+                                                          pop.tables);
+                    }
 
-            remap_metadata(pop.ancient_sample_metadata, rv.first);
-            remap_metadata(pop.diploid_metadata, rv.first);
+                remap_metadata(pop.ancient_sample_metadata, rv.first);
+                remap_metadata(pop.diploid_metadata, rv.first);
+            }
             if (reset_treeseqs_to_alive_nodes_after_simplification == true)
                 {
+                    fwdpy11::evolvets_phase_timer timer(
+                        timings, evolvets_phase::recorders);
                     apply_treseq_resetting_of_ancient_samples(
                         post_simplification_recorder, pop);
                 }
         }
-    index_and_count_mutations(suppress_edge_table_indexing, pop);
+    {
+        fwdpy11::evolvets_phase_timer timer(
+            timings, evolvets_phase::mutation_counting);
+        index_and_count_mutations(suppress_edge_table_indexing, pop);
+    }
     if (!preserve_selected_fixations)
         {
             auto itr = std::remove_if(
@@ -459,8 +651,91 @@ evolve_with_tree_sequences(
     remove_extinct_genomes(pop);
 }
 
+void
+evolve_with_tree_sequences(
+    const fwdpy11::GSLrng_t &rng, fwdpy11::DiploidPopulation &pop,
+    fwdpy11::SampleRecorder &sr,
+    fwdpy11::SimplificationScheduler &simplification_scheduler,
+    py::array_t<std::uint32_t> popsizes, const double mu_neutral,
+    const double mu_selected, const fwdpy11::MutationRegions &mmodel,
+    const fwdpy11::GeneticMap &rmodel,
+    fwdpy11::DiploidPopulationGeneticValue &genetic_value_fxn,
+    py::object recorder_object, py::object stopping_criterion_object,
+    const double selfing_rate, const bool preserve_selected_fixations,
+    const bool suppress_edge_table_indexing, bool record_genotype_matrix,
+    const bool track_mutation_counts_during_sim,
+    const bool remove_extinct_mutations_at_finish,
+    const bool reset_treeseqs_to_alive_nodes_after_simplification,
+    py::object post_simplification_recorder_object,
+    const bool incremental_simplification, const std::size_t nthreads,
+    py::object timings_object)
+{
+    if (popsizes.size() == 0)
+        {
+            throw std::invalid_argument("empty list of population sizes");
+        }
+    std::vector<std::uint32_t> sizes;
+    sizes.reserve(popsizes.size());
+    auto popsizes_ = popsizes.unchecked<1>();
+    for (decltype(popsizes_.shape(0)) gen = 0; gen < popsizes_.shape(0);
+         ++gen)
+        {
+            sizes.push_back(popsizes_(gen));
+        }
+    fixed_population_sizes demography(std::move(sizes), selfing_rate);
+    evolve_with_tree_sequences_details(
+        rng, pop, sr, simplification_scheduler, demography, mu_neutral,
+        mu_selected, mmodel, rmodel, genetic_value_fxn, recorder_object,
+        stopping_criterion_object, preserve_selected_fixations,
+        suppress_edge_table_indexing, record_genotype_matrix,
+        track_mutation_counts_during_sim, remove_extinct_mutations_at_finish,
+        reset_treeseqs_to_alive_nodes_after_simplification,
+        post_simplification_recorder_object, incremental_simplification,
+        nthreads, timings_object);
+}
+
+void
+evolve_with_tree_sequences_and_discrete_demography(
+    const fwdpy11::GSLrng_t &rng, fwdpy11::DiploidPopulation &pop,
+    fwdpy11::SampleRecorder &sr,
+    fwdpy11::SimplificationScheduler &simplification_scheduler,
+    fwdpy11::discrete_demography::DiscreteDemography &discrete_demography,
+    const std::uint32_t simlen, const double mu_neutral,
+    const double mu_selected, const fwdpy11::MutationRegions &mmodel,
+    const fwdpy11::GeneticMap &rmodel,
+    fwdpy11::DiploidPopulationGeneticValue &genetic_value_fxn,
+    py::object recorder_object, py::object stopping_criterion_object,
+    const bool preserve_selected_fixations,
+    const bool suppress_edge_table_indexing, bool record_genotype_matrix,
+    const bool track_mutation_counts_during_sim,
+    const bool remove_extinct_mutations_at_finish,
+    const bool reset_treeseqs_to_alive_nodes_after_simplification,
+    py::object post_simplification_recorder_object,
+    const bool incremental_simplification, const std::size_t nthreads,
+    py::object timings_object)
+// Selfing rates are part of the DiscreteDemography
+{
+    if (simlen == 0)
+        {
+            throw std::invalid_argument(
+                "number of generations must be > 0");
+        }
+    discrete_demography_model demography(discrete_demography, simlen, pop);
+    evolve_with_tree_sequences_details(
+        rng, pop, sr, simplification_scheduler, demography, mu_neutral,
+        mu_selected, mmodel, rmodel, genetic_value_fxn, recorder_object,
+        stopping_criterion_object, preserve_selected_fixations,
+        suppress_edge_table_indexing, record_genotype_matrix,
+        track_mutation_counts_during_sim, remove_extinct_mutations_at_finish,
+        reset_treeseqs_to_alive_nodes_after_simplification,
+        post_simplification_recorder_object, incremental_simplification,
+        nthreads, timings_object);
+}
+
 void
 init_evolve_with_tree_sequences(py::module &m)
 {
     m.def("evolve_with_tree_sequences", &evolve_with_tree_sequences);
+    m.def("evolve_with_tree_sequences_and_discrete_demography",
+          &evolve_with_tree_sequences_and_discrete_demography);
 }
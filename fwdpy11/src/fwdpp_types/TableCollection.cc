@@ -1,5 +1,6 @@
 #include <fwdpp/ts/table_collection.hpp>
 #include <fwdpy11/util/convert_lists.hpp>
+#include <fwdpy11/serialization/sections.hpp>
 #include <pybind11/pybind11.h>
 #include <pybind11/numpy.h>
 #include <pybind11/stl.h>
@@ -77,6 +78,25 @@ init_ts_TableCollection(py::module& m)
                     t[5].cast<py::list>());
                 tables.build_indexes();
                 return tables;
-            }));
+            }))
+        .def_static(
+            "load_from_sections_file",
+            [](const std::string& filename) {
+                return fwdpy11::serialization::sections::read_tables(
+                    filename);
+            },
+            py::arg("filename"),
+            R"delim(
+            Load the tables from a file written by
+            :func:`fwdpy11.DiploidPopulation.dump_sections_to_file`.
+            The other sections of the file are not read.
+
+            :param filename: The file name
+            :type filename: str
+
+            :rtype: :class:`fwdpy11.TableCollection`
+
+            .. versionadded:: 0.6.0
+            )delim");
 }
 
@@ -20,7 +20,6 @@
 // TODO: make a versionchanged entry for all things affected by "length"
 
 #include <limits>
-#include <sstream>
 #include <fstream>
 #include <type_traits>
 #include <pybind11/pybind11.h>
@@ -28,8 +27,12 @@
 #include <fwdpy11/types/DiploidPopulation.hpp>
 #include <fwdpy11/types/create_pops.hpp>
 #include <fwdpy11/serialization.hpp>
+#include <fwdpy11/serialization/buffers.hpp>
 #include <fwdpy11/serialization/Mutation.hpp>
 #include <fwdpy11/serialization/Diploid.hpp>
+#include <fwdpy11/serialization/sections.hpp>
+#include <fwdpy11/serialization/arrays.hpp>
+#include <fwdpy11/numpy/array.hpp>
 #include "get_individuals.hpp"
 
 namespace py = pybind11;
@@ -40,11 +43,110 @@ namespace
    A :class:`fwdpy11.DiploidVector`.
    )delim";
 
+    // First object written by pickle_to_file
+    static const char* PICKLED_ARRAYS_TAG = "fwdpy11.DiploidPopulation.arrays";
+
 } // namespace
 
 PYBIND11_MAKE_OPAQUE(std::vector<fwdpy11::DiploidGenotype>);
+PYBIND11_MAKE_OPAQUE(std::vector<fwdpy11::DiploidMetadata>);
 PYBIND11_MAKE_OPAQUE(fwdpy11::DiploidPopulation::gcont_t);
 PYBIND11_MAKE_OPAQUE(fwdpy11::DiploidPopulation::mcont_t);
+PYBIND11_MAKE_OPAQUE(fwdpp::ts::node_vector);
+PYBIND11_MAKE_OPAQUE(fwdpp::ts::edge_vector);
+PYBIND11_MAKE_OPAQUE(fwdpp::ts::mutation_key_vector);
+PYBIND11_MAKE_OPAQUE(fwdpp::ts::site_vector);
+
+namespace
+{
+    py::object
+    section_to_python(fwdpy11::DiploidPopulation& pop,
+                      const std::string& name)
+    // Moves a section read by load_sections_from_file
+    // into a Python object.
+    {
+        if (name == "population")
+            {
+                py::dict d;
+                d["generation"] = pop.generation;
+                d["N"] = pop.N;
+                d["genome_length"] = pop.tables.genome_length();
+                return std::move(d);
+            }
+        if (name == "diploid_metadata")
+            {
+                return py::cast(std::move(pop.diploid_metadata));
+            }
+        if (name == "ancient_sample_metadata")
+            {
+                return py::cast(std::move(pop.ancient_sample_metadata));
+            }
+        if (name == "mutations")
+            {
+                return py::cast(std::move(pop.mutations));
+            }
+        if (name == "mcounts")
+            {
+                return fwdpy11::make_1d_array_with_capsule(
+                    std::move(pop.mcounts));
+            }
+        if (name == "mcounts_from_preserved_nodes")
+            {
+                return fwdpy11::make_1d_array_with_capsule(
+                    std::move(pop.mcounts_from_preserved_nodes));
+            }
+        if (name == "fixations")
+            {
+                return py::cast(std::move(pop.fixations));
+            }
+        if (name == "fixation_times")
+            {
+                return fwdpy11::make_1d_array_with_capsule(
+                    std::move(pop.fixation_times));
+            }
+        if (name == "haploid_genomes")
+            {
+                return py::cast(std::move(pop.haploid_genomes));
+            }
+        if (name == "diploids")
+            {
+                return py::cast(std::move(pop.diploids));
+            }
+        if (name == "tables.nodes")
+            {
+                return py::cast(std::move(pop.tables.node_table));
+            }
+        if (name == "tables.edges")
+            {
+                return py::cast(std::move(pop.tables.edge_table));
+            }
+        if (name == "tables.sites")
+            {
+                return py::cast(std::move(pop.tables.site_table));
+            }
+        if (name == "tables.mutations")
+            {
+                return py::cast(std::move(pop.tables.mutation_table));
+            }
+        if (name == "tables.preserved_nodes")
+            {
+                return fwdpy11::make_1d_array_with_capsule(
+                    std::move(pop.tables.preserved_nodes));
+            }
+        if (name == "genetic_value_matrix")
+            {
+                return fwdpy11::make_1d_array_with_capsule(
+                    std::move(pop.genetic_value_matrix));
+            }
+        if (name == "ancient_sample_genetic_value_matrix")
+            {
+                return fwdpy11::make_1d_array_with_capsule(
+                    std::move(pop.ancient_sample_genetic_value_matrix));
+            }
+        throw std::invalid_argument("section " + name
+                                    + " cannot be loaded separately");
+    }
+} // namespace
 
 fwdpy11::DiploidPopulation
 create_DiploidPopulation_from_tree_sequence(py::object ts);
@@ -137,17 +239,13 @@ init_DiploidPopulation(py::module& m)
         )delim")
         .def(py::pickle(
             [](const fwdpy11::DiploidPopulation& pop) -> py::object {
-                std::ostringstream o;
-                fwdpy11::serialization::serialize_details(o, &pop);
-                auto pb = py::bytes(o.str());
-                return py::object(std::move(pb));
+                return fwdpy11::serialization::serialize_to_bytes(pop);
             },
-            [](py::object pickled) -> fwdpy11::DiploidPopulation {
-                auto s = pickled.cast<py::bytes>().cast<std::string>();
+            [](py::buffer pickled) -> fwdpy11::DiploidPopulation {
                 fwdpy11::DiploidPopulation pop(
                     1, std::numeric_limits<double>::max());
-                std::istringstream in(std::move(s));
-                fwdpy11::serialization::deserialize_details()(in, pop);
+                fwdpy11::serialization::deserialize_from_buffer(pickled,
+                                                                pop);
                 return pop;
             }))
         .def(
@@ -245,73 +343,126 @@ init_DiploidPopulation(py::module& m)
             },
             "Load a population from a binary file.")
         .def(
-            "pickle_to_file",
-            [](const fwdpy11::DiploidPopulation& self, py::object f) {
-                auto dump = py::module::import("pickle").attr("dump");
-                dump(py::make_tuple(
-                         self.diploids.size(), self.haploid_genomes.size(),
-                         self.mutations.size(), self.fixations.size(),
-                         self.generation, self.tables.genome_length()),
-                     f);
-                for (auto& d : self.diploids)
-                    {
-                        dump(d, f);
-                    }
-                for (auto& g : self.haploid_genomes)
-                    {
-                        dump(g, f);
-                    }
-                for (auto& m : self.mutations)
-                    {
-                        dump(m, f);
-                    }
-                for (auto& m : self.fixations)
-                    {
-                        dump(m, f);
-                    }
-                dump(self.fixation_times, f);
-                dump(self.mcounts, f);
-                dump(self.mcounts_from_preserved_nodes, f);
-                dump(py::make_tuple(self.diploid_metadata.size(),
-                                    self.ancient_sample_metadata.size()),
-                     f);
-                for (auto& md : self.diploid_metadata)
-                    {
-                        dump(md, f);
-                    }
-                for (auto& md : self.ancient_sample_metadata)
-                    {
-                        dump(md, f);
-                    }
-                dump(py::make_tuple(self.tables.node_table.size(),
-                                    self.tables.edge_table.size(),
-                                    self.tables.mutation_table.size(),
-                                    self.tables.site_table.size()),
-                     f);
-                for (auto& n : self.tables.node_table)
-                    {
-                        dump(n, f);
-                    }
-                for (auto& e : self.tables.edge_table)
-                    {
-                        dump(e, f);
-                    }
-                for (auto& m : self.tables.mutation_table)
-                    {
-                        dump(m, f);
-                    }
-                for (auto& s : self.tables.site_table)
+            "dump_sections_to_file",
+            [](const fwdpy11::DiploidPopulation& pop,
+               const std::string& filename, const int compression_level) {
+                fwdpy11::serialization::sections::write_sections(
+                    pop, filename, compression_level);
+            },
+            py::arg("filename"), py::arg("compression_level") = 0,
+            R"delim(
+            Write a population to a file whose contents are
+            stored in independent sections.
+
+            :param filename: The file name
+            :type filename: str
+            :param compression_level: zlib compression level of each section.
+            :type compression_level: int
+
+            The default compression level of 0 stores sections without
+            compression.
+
+            The file begins with an index of its sections, allowing
+            :func:`fwdpy11.DiploidPopulation.load_sections_from_file`
+            to read parts of a population without reading the rest of
+            the file.
+            Each section is serialized and compressed directly into
+            the file, so that no copy of the population is held in
+            memory.
+
+            Read the population back in with
+            :func:`fwdpy11.DiploidPopulation.load_from_sections_file`.
+
+            .. versionadded:: 0.6.0
+            )delim")
+        .def_static(
+            "load_from_sections_file",
+            [](const std::string& filename) {
+                return fwdpy11::serialization::sections::read_population(
+                    filename);
+            },
+            py::arg("filename"),
+            R"delim(
+            Load a population from a file written by
+            :func:`fwdpy11.DiploidPopulation.dump_sections_to_file`.
+
+            :param filename: The file name
+            :type filename: str
+
+            :rtype: :class:`fwdpy11.DiploidPopulation`
+
+            .. versionadded:: 0.6.0
+            )delim")
+        .def_static(
+            "load_sections_from_file",
+            [](const std::string& filename,
+               const std::vector<std::string>& sections) {
+                auto pop = fwdpy11::serialization::sections::read_sections(
+                    filename, sections);
+                py::dict rv;
+                for (auto& s : sections)
                     {
-                        dump(s, f);
+                        rv[py::str(s)] = section_to_python(pop, s);
                     }
-                dump(self.tables.preserved_nodes, f);
+                return rv;
+            },
+            py::arg("filename"), py::arg("sections"),
+            R"delim(
+            Load parts of a population from a file written by
+            :func:`fwdpy11.DiploidPopulation.dump_sections_to_file`.
+            Only the requested sections are read from the file.
+
+            :param filename: The file name
+            :type filename: str
+            :param sections: The names of the sections to load
+            :type sections: list
+
+            :returns: The sections, keyed by name
+            :rtype: dict
+
+            The sections are:
+
+            * "population": a dict with the generation, N, and genome_length
+            * "diploid_metadata" and "ancient_sample_metadata"
+            * "mutations" and "fixations"
+            * "mcounts", "mcounts_from_preserved_nodes", and
+              "fixation_times", as numpy arrays
+            * "haploid_genomes" and "diploids"
+            * "tables.nodes", "tables.edges", "tables.sites", and
+              "tables.mutations"
+            * "tables.preserved_nodes", as a numpy array
+            * "genetic_value_matrix" and
+              "ancient_sample_genetic_value_matrix", as 1d numpy arrays
+
+            .. versionadded:: 0.6.0
+            )delim")
+        .def("_to_arrays",
+             [](py::object self) {
+                 return fwdpy11::serialization::arrays::population_to_arrays(
+                     self);
+             })
+        .def_static("_from_arrays", [](py::dict d) {
+            return fwdpy11::serialization::arrays::population_from_arrays(d);
+        })
+        .def(
+            "pickle_to_file",
+            [](py::object self, py::object f) {
+                auto pickle = py::module::import("pickle");
+                auto dump = pickle.attr("dump");
+                auto protocol = pickle.attr("HIGHEST_PROTOCOL");
+                dump(PICKLED_ARRAYS_TAG, f, protocol);
+                dump(fwdpy11::serialization::arrays::population_to_arrays(
+                         self),
+                     f, protocol);
             },
             R"delim(
              Pickle the population to an open file.
 
-             This function may be preferred over 
-             the direct pickling method because it uses less
-             memory.  It is, however, slower.
+             The population is written as the same arrays
+             used by pickle protocol 5.  The genomes and
+             mutations are copied into these arrays, so
+             this function does not use less memory than
+             pickling the population directly.
 
              To read the population back in, you must call
              :func:`fwdpy11.DiploidPopulation.load_from_pickle_file`.
@@ -319,12 +470,29 @@ init_DiploidPopulation(py::module& m)
              :param f: A handle to an open file
 
              .. versionadded:: 0.3.0
+
+             .. versionchanged:: 0.6.0
+
+                The population is pickled as a small number of
+                numpy arrays, using the highest pickle protocol.
              )delim")
         .def_static(
             "load_from_pickle_file",
             [](py::object f) {
                 auto load = py::module::import("pickle").attr("load");
-                py::tuple popdata = load(f);
+                py::object first = load(f);
+                if (py::isinstance<py::str>(first))
+                    {
+                        if (first.cast<std::string>() != PICKLED_ARRAYS_TAG)
+                            {
+                                throw std::runtime_error(
+                                    "unrecognized pickle file contents");
+                            }
+                        return fwdpy11::serialization::arrays::
+                            population_from_arrays(load(f));
+                    }
+                // Files written by fwdpy11 < 0.6.0
+                py::tuple popdata = first;
                 fwdpy11::DiploidPopulation rv(popdata[0].cast<fwdpp::uint_t>(),
                                               popdata[5].cast<double>());
                 rv.generation
@@ -430,6 +598,11 @@ init_DiploidPopulation(py::module& m)
             :param f: A handle to a file opened in 'rb' mode.
 
             .. versionadded: 0.3.0
+
+            .. versionchanged:: 0.6.0
+
+                Read the format written by fwdpy11 0.6.0.
+                Files written by previous versions can still be read.
             )delim")
         .def_static(
             "create_from_tskit",
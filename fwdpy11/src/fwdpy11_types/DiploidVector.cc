@@ -56,6 +56,8 @@ void init_DiploidVector(py::module & m)
 
     PYBIND11_NUMPY_DTYPE(fwdpy11::DiploidMetadata, g, e, w, geography, label,
                          parents, deme, sex, nodes);
+    // Used when pickling populations as arrays
+    PYBIND11_NUMPY_DTYPE(fwdpy11::ancient_sample_record, time, n1, n2);
 
     py::bind_vector<std::vector<fwdpy11::DiploidMetadata>>(
         m, "DiploidMetadataVector", py::module_local(false),
@@ -0,0 +1,98 @@
+#include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
+#include <fwdpy11/evolvets/EvolvetsTimings.hpp>
+
+namespace py = pybind11;
+
+namespace
+{
+    template <typename T>
+    py::dict
+    phase_dict(const T& values)
+    {
+        py::dict rv;
+        for (std::size_t i = 0; i < values.size(); ++i)
+            {
+                rv[fwdpy11::evolvets_phase_name(i)] = values[i];
+            }
+        return rv;
+    }
+} // namespace
+
+void
+init_EvolvetsTimings(py::module& m)
+{
+    PYBIND11_NUMPY_DTYPE(fwdpy11::simplification_tables_record, generation,
+                         nodes_before, nodes_after, edges_before, edges_after,
+                         sites_before, sites_after, mutations_before,
+                         mutations_after);
+
+    py::class_<fwdpy11::EvolvetsTimings>(m, "EvolvetsTimings",
+                                         R"delim(
+        Time spent in the phases of each generation of
+        :func:`fwdpy11.evolvets`.
+
+        Pass an instance to :func:`fwdpy11.evolvets` using
+        the `timings` argument.  The wall time and number
+        of calls of each phase are added to the values
+        from previous simulations until :func:`clear` is called.
+
+        The phases are:
+
+        * offspring_generation: creating the genomes of offspring
+          and recording the new nodes and edges.
+        * fitness_calculation: updating the genetic value object and
+          calculating genetic values and fitnesses.
+        * simplification
+        * mutation_counting: counting mutations during the simulation
+          if requested and when the simulation ends.
+        * recycling_bin_rebuild: finding the mutations that
+          can be recycled after each simplification.
+        * recorders: calling the recorder, the post-simplification
+          recorder, and the stopping criterion.
+        * ancient_samples: recording the individuals
+          preserved by the recorder.
+
+        .. versionadded:: 0.6.0
+        )delim")
+        .def(py::init<>())
+        .def_property_readonly(
+            "seconds",
+            [](const fwdpy11::EvolvetsTimings& self) {
+                return phase_dict(self.seconds);
+            },
+            "A dict of the total wall time, in seconds, of each phase.")
+        .def_property_readonly(
+            "counts",
+            [](const fwdpy11::EvolvetsTimings& self) {
+                return phase_dict(self.counts);
+            },
+            "A dict of the number of times each phase was timed.")
+        .def_readonly("generations", &fwdpy11::EvolvetsTimings::generations,
+                      "The number of generations simulated.")
+        .def_readonly("new_mutations",
+                      &fwdpy11::EvolvetsTimings::new_mutations,
+                      "The number of new mutations.")
+        .def_readonly("recycled_mutations",
+                      &fwdpy11::EvolvetsTimings::recycled_mutations,
+                      R"delim(
+            The number of new mutations stored in the place
+            of an extinct or fixed mutation rather than
+            appended to :attr:`fwdpy11.PopulationBase.mutations`.
+            )delim")
+        .def_property_readonly(
+            "simplifications",
+            [](const fwdpy11::EvolvetsTimings& self) {
+                return py::array_t<fwdpy11::simplification_tables_record>(
+                    self.simplifications.size(),
+                    self.simplifications.data());
+            },
+            R"delim(
+            A structured array with the generation of each
+            simplification and the numbers of nodes, edges,
+            sites, and mutations before and after it.
+            )delim")
+        .def("clear", &fwdpy11::EvolvetsTimings::clear,
+             "Set all times and counts to zero and remove "
+             "all simplification records.");
+}
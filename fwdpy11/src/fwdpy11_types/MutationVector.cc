@@ -21,6 +21,7 @@
 #include <pybind11/stl.h>
 #include <pybind11/stl_bind.h>
 #include <fwdpy11/types/Mutation.hpp>
+#include <fwdpy11/numpy/mutations.hpp>
 
 namespace py = pybind11;
 
@@ -29,6 +30,9 @@ PYBIND11_MAKE_OPAQUE(std::vector<fwdpy11::Mutation>);
 void
 init_MutationVector(py::module& m)
 {
+    PYBIND11_NUMPY_DTYPE(fwdpy11::flattened_Mutation, pos, s, h, g, label,
+                         neutral);
+
     py::bind_vector<std::vector<fwdpy11::Mutation>>(
         m, "MutationVector",
         "C++ representation of a list of "
@@ -51,5 +55,46 @@ init_MutationVector(py::module& m)
                         rv.push_back(i.cast<fwdpy11::Mutation>());
                     }
                 return rv;
-            }));
+            }))
+        .def("to_ndarrays",
+             [](const std::vector<fwdpy11::Mutation>& self) {
+                 return fwdpy11::mutations_to_ndarrays(self);
+             },
+             R"delim(
+             Export the mutations as numpy arrays.
+
+             :return: A structured array of the fields
+                      pos, s, h, g, label, and neutral,
+                      followed by the offsets and values
+                      of esizes and then heffects.
+             :rtype: tuple
+
+             The esizes of mutation i are
+             ``esizes[esizes_offsets[i]:esizes_offsets[i+1]]``,
+             and likewise for heffects.
+
+             .. versionadded:: 0.6.0
+             )delim")
+        .def_static("from_ndarrays", &fwdpy11::mutations_from_ndarrays,
+                    py::arg("mutations"), py::arg("esizes_offsets"),
+                    py::arg("esizes"), py::arg("heffects_offsets"),
+                    py::arg("heffects"),
+                    R"delim(
+             Create a new instance from the output of
+             :func:`fwdpy11.MutationVector.to_ndarrays`.
+
+             :param mutations: Structured array of pos, s, h, g, label,
+                               and neutral
+             :type mutations: numpy.ndarray
+             :param esizes_offsets: Offsets into esizes.
+             :type esizes_offsets: numpy.ndarray
+             :param esizes: Effect sizes
+             :type esizes: numpy.ndarray
+             :param heffects_offsets: Offsets into heffects.
+             :type heffects_offsets: numpy.ndarray
+             :param heffects: Heterozygous effects
+             :type heffects: numpy.ndarray
+
+             .. versionadded:: 0.6.0
+             )delim");
 }
@@ -21,17 +21,10 @@
 #include <pybind11/stl.h>
 #include <fwdpy11/types/Population.hpp>
 #include <fwdpy11/numpy/array.hpp>
+#include <fwdpy11/numpy/mutations.hpp>
 
 namespace py = pybind11;
 
-struct flattened_Mutation
-{
-    double pos, s, h;
-    fwdpp::uint_t g;
-    decltype(fwdpy11::Mutation::xtra) label;
-    std::int16_t neutral;
-};
-
 namespace
 {
     static const auto MCOUNTS_DOCSTRING = R"delim(
@@ -63,17 +56,37 @@ namespace
     )delim";
 
     py::array
-    make_flattened_Mutation_array(
-        const fwdpy11::Population::mcont_t& mutations)
+    make_readonly(py::array a)
     {
-        std::vector<flattened_Mutation> vfm;
-        vfm.reserve(mutations.size());
-        for (auto&& m : mutations)
+        a.attr("flags").attr("writeable") = false;
+        return a;
+    }
+
+    py::tuple
+    make_haploid_genome_keys_csr(const fwdpy11::Population::gcont_t& genomes,
+                                 const bool selected)
+    {
+        std::vector<std::size_t> offsets;
+        offsets.reserve(genomes.size() + 1);
+        offsets.push_back(0);
+        std::size_t nkeys = 0;
+        for (auto& g : genomes)
+            {
+                nkeys += selected ? g.smutations.size() : g.mutations.size();
+                offsets.push_back(nkeys);
+            }
+        std::vector<fwdpp::uint_t> keys;
+        keys.reserve(nkeys);
+        for (auto& g : genomes)
             {
-                vfm.push_back(flattened_Mutation{ m.pos, m.s, m.h, m.g, m.xtra,
-                                                  m.neutral });
+                const auto& k = selected ? g.smutations : g.mutations;
+                keys.insert(end(keys), begin(k), end(k));
             }
-        return fwdpy11::make_1d_array_with_capsule(std::move(vfm));
+        return py::make_tuple(
+            make_readonly(
+                fwdpy11::make_1d_array_with_capsule(std::move(offsets))),
+            make_readonly(
+                fwdpy11::make_1d_array_with_capsule(std::move(keys))));
     }
 } // namespace
 
@@ -84,8 +97,6 @@ PYBIND11_MAKE_OPAQUE(std::vector<fwdpy11::DiploidMetadata>);
 void
 init_PopulationBase(py::module& m)
 {
-    PYBIND11_NUMPY_DTYPE(flattened_Mutation, pos, s, h, g, label, neutral);
-
     py::class_<fwdpy11::Population>(m, "PopulationBase",
                                     "Abstract base class for populations "
                                     "based on :class:`fwdpy11.Mutation`")
@@ -97,7 +108,7 @@ init_PopulationBase(py::module& m)
         .def_property_readonly(
             "mutations_ndarray",
             [](const fwdpy11::Population& self) {
-                return make_flattened_Mutation_array(self.mutations);
+                return fwdpy11::make_flattened_Mutation_array(self.mutations);
             },
             R"delim(
                                Return readonly numpy.ndarray of mutation data.
@@ -197,6 +208,54 @@ init_PopulationBase(py::module& m)
             py::arg("pos"))
         .def_readonly("haploid_genomes", &fwdpy11::Population::haploid_genomes,
                       GAMETES_DOCSTRING)
+        .def(
+            "haploid_genome_keys",
+            [](const fwdpy11::Population& self, const bool selected) {
+                return make_haploid_genome_keys_csr(self.haploid_genomes,
+                                                    selected);
+            },
+            py::arg("selected") = true,
+            R"delim(
+            Return the mutation keys of all haploid genomes
+            in compressed sparse row format.
+
+            :param selected: (True) If True, return keys to selected
+                             mutations.  Otherwise, return keys to
+                             neutral mutations.
+            :type selected: bool
+            :return: offsets and keys
+            :rtype: tuple
+
+            The keys of genome i are ``keys[offsets[i]:offsets[i+1]]``.
+            Both arrays are read-only and are created without any
+            intermediate Python objects.
+
+            .. note::
+
+                Extinct genomes are included.  See
+                :attr:`fwdpy11.PopulationBase.haploid_genome_counts`.
+
+            .. versionadded:: 0.6.0
+            )delim")
+        .def_property_readonly(
+            "haploid_genome_counts",
+            [](const fwdpy11::Population& self) {
+                std::vector<fwdpp::uint_t> n;
+                n.reserve(self.haploid_genomes.size());
+                for (auto& g : self.haploid_genomes)
+                    {
+                        n.push_back(g.n);
+                    }
+                return make_readonly(
+                    fwdpy11::make_1d_array_with_capsule(std::move(n)));
+            },
+            R"delim(
+            Read-only numpy.ndarray of the number of occurrences
+            of each haploid genome.  Extinct genomes have a count
+            of zero.
+
+            .. versionadded:: 0.6.0
+            )delim")
         .def_readonly("fixations", &fwdpy11::Population::fixations,
                       FIXATIONS_DOCSTRING)
         .def_readonly("fixation_times", &fwdpy11::Population::fixation_times,
@@ -1,19 +1,11 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/functional.h>
-#include <fwdpy11/types/Population.hpp>
-
-struct RecordNothing
-{
-    inline void
-    operator()(const fwdpy11::Population &) const
-    {
-    }
-};
+#include <fwdpy11/samplers.hpp>
 
 void
 init_RecordNothing(pybind11::module &m)
 {
-    pybind11::class_<RecordNothing>(m, "RecordNothing")
+    pybind11::class_<fwdpy11::RecordNothing>(m, "RecordNothing")
         .def(pybind11::init<>())
-        .def("__call__", &RecordNothing::operator());
+        .def("__call__", &fwdpy11::RecordNothing::operator());
 }
@@ -0,0 +1,102 @@
+#include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
+#include <fwdpy11/evolvets/SimplificationScheduler.hpp>
+
+namespace py = pybind11;
+
+void
+init_SimplificationScheduler(py::module& m)
+{
+    PYBIND11_NUMPY_DTYPE(fwdpy11::simplification_record, generation, interval,
+                         edges_before, edges_after, nodes_before, nodes_after,
+                         bytes_before, bytes_after, simplification_time,
+                         generation_time);
+
+    py::class_<fwdpy11::SimplificationScheduler>(
+        m, "SimplificationScheduler",
+        R"delim(
+        ABC for deciding when to simplify during simulations
+        with tree sequences.  See :func:`fwdpy11.evolvets`.
+
+        .. versionadded:: 0.6.0
+        )delim")
+        .def_property_readonly(
+            "records",
+            [](const fwdpy11::SimplificationScheduler& self) {
+                return py::array_t<fwdpy11::simplification_record>(
+                    self.records.size(), self.records.data());
+            },
+            R"delim(
+            A structured array describing each simplification.
+            The fields are the generation of the simplification,
+            the number of generations since the previous one,
+            the numbers of edges, nodes, and the estimated table
+            memory use (in bytes) before and after simplification,
+            and the wall times (in seconds) of the simplification
+            and of the generations since the previous one.
+            )delim")
+        .def("clear_records",
+             [](fwdpy11::SimplificationScheduler& self) {
+                 self.records.clear();
+             },
+             "Clear the records.");
+
+    py::class_<fwdpy11::FixedSimplificationInterval,
+               fwdpy11::SimplificationScheduler>(
+        m, "FixedSimplificationInterval",
+        R"delim(
+        Simplify every `interval` generations.  This is the
+        behavior when an integer is passed to :func:`fwdpy11.evolvets`.
+
+        .. versionadded:: 0.6.0
+        )delim")
+        .def(py::init<std::uint32_t>(), py::arg("interval"))
+        .def_readonly("interval",
+                      &fwdpy11::FixedSimplificationInterval::interval);
+
+    py::class_<fwdpy11::EdgeTableSizeScheduler,
+               fwdpy11::SimplificationScheduler>(
+        m, "EdgeTableSizeScheduler",
+        R"delim(
+        Simplify when the number of edges is at least `max_edges`.
+
+        .. versionadded:: 0.6.0
+        )delim")
+        .def(py::init<std::uint64_t>(), py::arg("max_edges"))
+        .def_readonly("max_edges",
+                      &fwdpy11::EdgeTableSizeScheduler::max_edges);
+
+    py::class_<fwdpy11::MemoryBudgetScheduler,
+               fwdpy11::SimplificationScheduler>(
+        m, "MemoryBudgetScheduler",
+        R"delim(
+        Simplify when the node, edge, site, and mutation
+        tables use at least `max_bytes` of memory.
+
+        .. versionadded:: 0.6.0
+        )delim")
+        .def(py::init<std::uint64_t>(), py::arg("max_bytes"))
+        .def_readonly("max_bytes",
+                      &fwdpy11::MemoryBudgetScheduler::max_bytes);
+
+    py::class_<fwdpy11::TimeRatioScheduler, fwdpy11::SimplificationScheduler>(
+        m, "TimeRatioScheduler",
+        R"delim(
+        Simplify when the time taken by the previous simplification
+        is at most `ratio` times the time spent simulating the
+        generations since then.  The first simplification
+        happens after `initial_interval` generations.
+
+        :param ratio: Target ratio of simplification time to generation time.
+        :type ratio: float
+        :param initial_interval: Number of generations before the first simplification.
+        :type initial_interval: int
+
+        .. versionadded:: 0.6.0
+        )delim")
+        .def(py::init<double, std::uint32_t>(), py::arg("ratio"),
+             py::arg("initial_interval") = 100)
+        .def_readonly("ratio", &fwdpy11::TimeRatioScheduler::ratio)
+        .def_readonly("initial_interval",
+                      &fwdpy11::TimeRatioScheduler::initial_interval);
+}
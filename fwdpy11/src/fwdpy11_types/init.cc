@@ -12,6 +12,8 @@ void init_rng(py::module &);
 void init_PopulationBase(py::module & m);
 void init_DiploidPopulation(py::module & m);
 void init_tsrecorders(py::module & m);
+void init_SimplificationScheduler(py::module & m);
+void init_EvolvetsTimings(py::module & m);
 void
 init_RecordNothing(pybind11::module &);
 
@@ -28,4 +30,6 @@ void initialize_fwdpy11_types(py::module & m)
     init_DiploidPopulation(m);
     init_RecordNothing(m);
     init_tsrecorders(m);
+    init_SimplificationScheduler(m);
+    init_EvolvetsTimings(m);
 }
@@ -1,5 +1,8 @@
 #include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
 #include <fwdpy11/genetic_values/noise.hpp>
+#include <fwdpy11/genetic_values/individuals.hpp>
+#include <fwdpy11/numpy/array.hpp>
 
 namespace py = pybind11;
 
@@ -8,5 +11,41 @@ init_GeneticValueNoise(py::module& m)
 {
     py::class_<fwdpy11::GeneticValueNoise>(
         m, "GeneticValueNoise",
-        "ABC for noise classes affecting :class:`fwdpy11.DiploidPopulation`.");
+        "ABC for noise classes affecting :class:`fwdpy11.DiploidPopulation`.")
+        .def("sample",
+             [](const fwdpy11::GeneticValueNoise& noise,
+                const fwdpy11::GSLrng_t& rng,
+                const fwdpy11::DiploidPopulation& pop,
+                py::object individuals) {
+                 auto idx = fwdpy11::individuals_from_python(pop, individuals);
+                 std::vector<double> rv(idx.size());
+                 {
+                     py::gil_scoped_release release;
+                     auto out = rv.begin();
+                     for (auto i : idx)
+                         {
+                             const auto& md = pop.diploid_metadata[i];
+                             *out++ = noise(rng, md, md.parents[0],
+                                            md.parents[1], pop);
+                         }
+                 }
+                 return fwdpy11::make_1d_array_with_capsule(std::move(rv));
+             },
+             R"delim(
+             Generate random effects for many individuals.
+
+             :param rng: Random number generator
+             :type rng: :class:`fwdpy11.GSLrng`
+             :param pop: The population containing the individuals
+             :type pop: :class:`fwdpy11.DiploidPopulation`
+             :param individuals: (None) The indexes of the individuals.
+                                 If None, all individuals are used.
+             :type individuals: numpy.ndarray
+             :return: The random effects.
+             :rtype: numpy.ndarray
+
+             .. versionadded:: 0.6.0
+             )delim",
+             py::arg("rng"), py::arg("pop"),
+             py::arg("individuals") = py::none());
 }
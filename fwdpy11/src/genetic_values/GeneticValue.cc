@@ -1,5 +1,10 @@
+#include <algorithm>
+#include <stdexcept>
 #include <fwdpy11/genetic_values/DiploidPopulationGeneticValue.hpp>
+#include <fwdpy11/genetic_values/individuals.hpp>
+#include <fwdpy11/numpy/array.hpp>
 #include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
 
 namespace py = pybind11;
 
@@ -41,6 +46,92 @@ init_GeneticValue(py::module& m)
         :rtype: float
         )delim",
              py::arg("diploid_index"), py::arg("pop"))
+        .def("calculate",
+             [](const fwdpy11::DiploidPopulationGeneticValue& gv,
+                const fwdpy11::DiploidPopulation& pop,
+                py::object individuals) {
+                 auto idx = fwdpy11::individuals_from_python(pop, individuals);
+                 std::vector<double> rv(idx.size() * gv.total_dim);
+                 {
+                     py::gil_scoped_release release;
+                     std::vector<double> buffer(gv.total_dim);
+                     auto out = rv.begin();
+                     for (auto i : idx)
+                         {
+                             gv.calculate_gvalue(i, pop, buffer);
+                             if (buffer.size() != gv.total_dim)
+                                 {
+                                     throw std::runtime_error(
+                                         "dimensionality mismatch");
+                                 }
+                             out = std::copy(begin(buffer), end(buffer), out);
+                         }
+                 }
+                 if (gv.total_dim == 1)
+                     {
+                         return fwdpy11::make_1d_array_with_capsule(
+                             std::move(rv));
+                     }
+                 return fwdpy11::make_2d_array_with_capsule(
+                     std::move(rv), idx.size(), gv.total_dim);
+             },
+             R"delim(
+             Calculate the genetic values of many individuals.
+
+             :param pop: The population object containing the individuals.
+             :type pop: :class:`fwdpy11.DiploidPopulation`
+             :param individuals: (None) The indexes of the individuals.
+                                 If None, all individuals are used.
+             :type individuals: numpy.ndarray
+             :return: The genetic values.  For multivariate genetic values,
+                      each row contains the values of one individual.
+             :rtype: numpy.ndarray
+
+             .. versionadded:: 0.6.0
+             )delim",
+             py::arg("pop"), py::arg("individuals") = py::none())
+        .def("fitnesses",
+             [](const fwdpy11::DiploidPopulationGeneticValue& gv,
+                const fwdpy11::DiploidPopulation& pop,
+                py::object individuals) {
+                 auto idx = fwdpy11::individuals_from_python(pop, individuals);
+                 std::vector<double> rv(idx.size());
+                 {
+                     py::gil_scoped_release release;
+                     std::vector<double> buffer(gv.total_dim);
+                     auto out = rv.begin();
+                     for (auto i : idx)
+                         {
+                             if (gv.total_dim > 1)
+                                 {
+                                     gv.calculate_gvalue(i, pop, buffer);
+                                 }
+                             *out++ = gv.genetic_value_to_fitness(
+                                 pop.diploid_metadata[i], buffer);
+                         }
+                 }
+                 return fwdpy11::make_1d_array_with_capsule(std::move(rv));
+             },
+             R"delim(
+             Calculate the fitnesses of many individuals from their
+             metadata.
+
+             :param pop: The population containing the individuals
+             :type pop: :class:`fwdpy11.DiploidPopulation`
+             :param individuals: (None) The indexes of the individuals.
+                                 If None, all individuals are used.
+             :type individuals: numpy.ndarray
+             :return: The fitnesses.
+             :rtype: numpy.ndarray
+
+             .. note::
+
+                For multivariate genetic values, the genetic values
+                of each individual are recalculated from `pop`.
+
+             .. versionadded:: 0.6.0
+             )delim",
+             py::arg("pop"), py::arg("individuals") = py::none())
         .def_property_readonly(
             "shape",
             [](const fwdpy11::DiploidPopulationGeneticValue& self) {
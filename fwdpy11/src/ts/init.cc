@@ -8,6 +8,7 @@ void init_count_mutations(py::module&);
 void init_simplify_functions(py::module&);
 void init_data_matrix_from_tables(py::module&);
 void init_infinite_sites(py::module&);
+void init_tskit_columns(py::module&);
 void
 init_DataMatrixIterator(py::module& m);
 
@@ -21,4 +22,5 @@ init_ts(py::module& m)
     init_data_matrix_from_tables(m);
     init_infinite_sites(m);
     init_DataMatrixIterator(m);
+    init_tskit_columns(m);
 }
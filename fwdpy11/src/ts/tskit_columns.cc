@@ -0,0 +1,311 @@
+//
+// Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+//
+// This file is part of fwdpy11.
+//
+// fwdpy11 is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// fwdpy11 is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+//
+
+// Column data for the export of a DiploidPopulation to tskit.
+// See fwdpy11/_monkeypatch/_diploid_population.py
+
+#include <algorithm>
+#include <cstdint>
+#include <cstring>
+#include <limits>
+#include <stdexcept>
+#include <string>
+#include <vector>
+#include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
+#include <fwdpy11/types/DiploidPopulation.hpp>
+#include <fwdpy11/numpy/array.hpp>
+
+namespace py = pybind11;
+
+namespace
+{
+    // Metadata are returned in the format expected by
+    // the set_columns functions of tskit tables.
+    struct metadata_columns
+    {
+        std::vector<std::int8_t> metadata;
+        std::vector<std::uint32_t> offsets;
+
+        metadata_columns(const std::size_t n) : metadata{}, offsets{}
+        {
+            offsets.reserve(n + 1);
+            offsets.push_back(0);
+        }
+
+        void
+        end_row()
+        {
+            if (metadata.size() > std::numeric_limits<std::uint32_t>::max())
+                {
+                    throw std::runtime_error(
+                        "metadata too large for tskit offsets");
+                }
+            offsets.push_back(static_cast<std::uint32_t>(metadata.size()));
+        }
+
+        void
+        append(const char* s, const std::size_t n)
+        {
+            auto p = reinterpret_cast<const std::int8_t*>(s);
+            metadata.insert(end(metadata), p, p + n);
+        }
+
+        void
+        append(const std::string& s)
+        {
+            append(s.data(), s.size());
+        }
+
+        template <typename T>
+        void
+        append_binary(const T value)
+        {
+            char buffer[sizeof(T)];
+            std::memcpy(buffer, &value, sizeof(T));
+            append(buffer, sizeof(T));
+        }
+
+        py::tuple
+        to_tuple()
+        {
+            return py::make_tuple(
+                fwdpy11::make_1d_array_with_capsule(std::move(metadata)),
+                fwdpy11::make_1d_array_with_capsule(std::move(offsets)));
+        }
+    };
+
+    std::string
+    float_repr(const double x)
+    // Same as repr(x) in Python
+    {
+        char* s = PyOS_double_to_string(x, 'r', 0, Py_DTSF_ADD_DOT_0, nullptr);
+        if (s == nullptr)
+            {
+                throw std::bad_alloc();
+            }
+        std::string rv(s);
+        PyMem_Free(s);
+        return rv;
+    }
+
+    std::string
+    float_list_repr(const std::vector<double>& v)
+    {
+        std::string rv("[");
+        for (std::size_t i = 0; i < v.size(); ++i)
+            {
+                if (i > 0)
+                    {
+                        rv += ", ";
+                    }
+                rv += float_repr(v[i]);
+            }
+        rv += ']';
+        return rv;
+    }
+
+    void
+    append_individual_metadata(const fwdpy11::DiploidMetadata& md,
+                               const bool binary, metadata_columns& columns)
+    {
+        if (binary)
+            {
+                columns.append_binary(md.g);
+                columns.append_binary(md.e);
+                columns.append_binary(md.w);
+                for (auto x : md.geography)
+                    {
+                        columns.append_binary(x);
+                    }
+                for (auto p : md.parents)
+                    {
+                        columns.append_binary(static_cast<std::uint64_t>(p));
+                    }
+                columns.append_binary(md.sex);
+                columns.append_binary(md.deme);
+                columns.append_binary(static_cast<std::uint64_t>(md.label));
+            }
+        else
+            {
+                // Same as str() of the dict written by fwdpy11 0.5
+                std::string s = "{'g': " + float_repr(md.g)
+                                + ", 'e': " + float_repr(md.e)
+                                + ", 'w': " + float_repr(md.w)
+                                + ", 'geography': ("
+                                + float_repr(md.geography[0]) + ", "
+                                + float_repr(md.geography[1]) + ", "
+                                + float_repr(md.geography[2])
+                                + "), 'parents': ("
+                                + std::to_string(md.parents[0]) + ", "
+                                + std::to_string(md.parents[1])
+                                + "), 'sex': " + std::to_string(md.sex)
+                                + ", 'deme': " + std::to_string(md.deme)
+                                + ", 'label': " + std::to_string(md.label)
+                                + "}";
+                columns.append(s);
+            }
+        columns.end_row();
+    }
+
+    py::tuple
+    individual_metadata(const fwdpy11::DiploidPopulation& pop,
+                        const bool binary)
+    {
+        metadata_columns columns(pop.diploid_metadata.size()
+                                 + pop.ancient_sample_metadata.size());
+        for (auto& md : pop.diploid_metadata)
+            {
+                append_individual_metadata(md, binary, columns);
+            }
+        for (auto& md : pop.ancient_sample_metadata)
+            {
+                append_individual_metadata(md, binary, columns);
+            }
+        return columns.to_tuple();
+    }
+
+    py::tuple
+    mutation_metadata(const fwdpy11::DiploidPopulation& pop,
+                      const bool binary)
+    // NOTE: mutation origin times are recorded forwards in time,
+    // So we convert them into mutation ages.
+    {
+        metadata_columns columns(pop.tables.mutation_table.size());
+        for (auto& mr : pop.tables.mutation_table)
+            {
+                const auto& m = pop.mutations[mr.key];
+                const std::int64_t age
+                    = static_cast<std::int64_t>(pop.generation)
+                      - static_cast<std::int64_t>(m.g) + 1;
+                if (binary)
+                    {
+                        columns.append_binary(m.s);
+                        columns.append_binary(m.h);
+                        columns.append_binary(age);
+                        columns.append_binary(
+                            static_cast<std::uint16_t>(m.xtra));
+                        columns.append_binary(
+                            static_cast<std::uint8_t>(m.neutral));
+                        columns.append_binary(
+                            static_cast<std::uint64_t>(mr.key));
+                        columns.append_binary(
+                            static_cast<std::uint32_t>(m.esizes.size()));
+                        columns.append_binary(
+                            static_cast<std::uint32_t>(m.heffects.size()));
+                        for (auto x : m.esizes)
+                            {
+                                columns.append_binary(x);
+                            }
+                        for (auto x : m.heffects)
+                            {
+                                columns.append_binary(x);
+                            }
+                    }
+                else
+                    {
+                        std::string s
+                            = "{'s': " + float_repr(m.s)
+                              + ", 'h': " + float_repr(m.h)
+                              + ", 'age': " + std::to_string(age)
+                              + ", 'label': " + std::to_string(m.xtra)
+                              + ", 'esizes': " + float_list_repr(m.esizes)
+                              + ", 'heffects': " + float_list_repr(m.heffects)
+                              + ", 'neutral': "
+                              + (m.neutral ? "True" : "False")
+                              + ", 'key': " + std::to_string(mr.key) + "}";
+                        columns.append(s);
+                    }
+                columns.end_row();
+            }
+        return columns.to_tuple();
+    }
+
+    py::tuple
+    node_columns(const fwdpy11::DiploidPopulation& pop)
+    // Returns flags, time, population, and individual.
+    // Times are converted from forwards to backwards in time.
+    {
+        const auto& nodes = pop.tables.node_table;
+        const auto nnodes = nodes.size();
+        if (2 * static_cast<std::size_t>(pop.N) > nnodes)
+            {
+                throw std::runtime_error("too few nodes in table collection");
+            }
+        std::vector<std::uint32_t> flags(nnodes, 0);
+        std::vector<double> time(nnodes);
+        std::vector<std::int32_t> population(nnodes),
+            individual(nnodes, -1);
+        double max_time = std::numeric_limits<double>::lowest();
+        for (auto& n : nodes)
+            {
+                max_time = std::max(max_time, n.time);
+            }
+        for (std::size_t i = 0; i < nnodes; ++i)
+            {
+                time[i] = max_time - nodes[i].time;
+                population[i] = nodes[i].population;
+            }
+        // Alive individuals are the first 2N nodes
+        for (std::size_t i = 0; i < 2 * static_cast<std::size_t>(pop.N); ++i)
+            {
+                flags[i] = 1;
+                individual[i] = static_cast<std::int32_t>(i / 2);
+            }
+        // Bug fixed in 0.3.1: add preserved nodes to samples list
+        for (auto n : pop.tables.preserved_nodes)
+            {
+                flags[n] = 1;
+            }
+        auto next_individual = static_cast<std::int32_t>(pop.N);
+        for (auto& md : pop.ancient_sample_metadata)
+            {
+                individual[md.nodes[0]] = next_individual;
+                individual[md.nodes[1]] = next_individual;
+                ++next_individual;
+            }
+        return py::make_tuple(
+            fwdpy11::make_1d_array_with_capsule(std::move(flags)),
+            fwdpy11::make_1d_array_with_capsule(std::move(time)),
+            fwdpy11::make_1d_array_with_capsule(std::move(population)),
+            fwdpy11::make_1d_array_with_capsule(std::move(individual)));
+    }
+
+    py::array
+    site_positions(const fwdpy11::DiploidPopulation& pop)
+    // One site per mutation table row
+    {
+        std::vector<double> pos;
+        pos.reserve(pop.tables.mutation_table.size());
+        for (auto& mr : pop.tables.mutation_table)
+            {
+                pos.push_back(pop.mutations[mr.key].pos);
+            }
+        return fwdpy11::make_1d_array_with_capsule(std::move(pos));
+    }
+} // namespace
+
+void
+init_tskit_columns(py::module& m)
+{
+    m.def("_tskit_node_columns", &node_columns);
+    m.def("_tskit_site_positions", &site_positions);
+    m.def("_tskit_individual_metadata", &individual_metadata);
+    m.def("_tskit_mutation_metadata", &mutation_metadata);
+}
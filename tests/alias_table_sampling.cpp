@@ -0,0 +1,78 @@
+//
+// Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+//
+// This file is part of fwdpy11.
+//
+// fwdpy11 is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// fwdpy11 is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+//
+#include <cstddef>
+#include <stdexcept>
+#include <vector>
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+#include <fwdpy11/rng.hpp>
+#include <fwdpy11/util/alias_table.hpp>
+
+// Expose fwdpy11::alias_table for unit testing
+
+namespace py = pybind11;
+
+namespace
+{
+    fwdpy11::alias_table
+    make_table(const std::vector<double>& weights)
+    {
+        fwdpy11::alias_table table;
+        if (!table.assign(weights.begin(), weights.end()))
+            {
+                throw std::invalid_argument("invalid weights");
+            }
+        return table;
+    }
+} // namespace
+
+PYBIND11_MODULE(alias_table_sampling, m)
+{
+    m.def("assign", [](const std::vector<double>& weights) {
+        fwdpy11::alias_table table;
+        return table.assign(weights.begin(), weights.end());
+    });
+
+    m.def("is_uniform", [](const std::vector<double>& weights) {
+        return make_table(weights).is_uniform();
+    });
+
+    m.def("sample",
+          [](const std::vector<double>& weights, const unsigned seed,
+             const std::size_t n) {
+              const auto table = make_table(weights);
+              fwdpy11::GSLrng_t rng(seed);
+              std::vector<std::size_t> rv(n);
+              table.sample(rng, n, rv.begin());
+              return rv;
+          });
+
+    m.def("sample_one_at_a_time",
+          [](const std::vector<double>& weights, const unsigned seed,
+             const std::size_t n) {
+              const auto table = make_table(weights);
+              fwdpy11::GSLrng_t rng(seed);
+              std::vector<std::size_t> rv;
+              for (std::size_t i = 0; i < n; ++i)
+                  {
+                      rv.push_back(table(rng));
+                  }
+              return rv;
+          });
+}
@@ -0,0 +1,101 @@
+//
+// Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+//
+// This file is part of fwdpy11.
+//
+// fwdpy11 is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// fwdpy11 is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+//
+#include <algorithm>
+#include <cstdint>
+#include <utility>
+#include <vector>
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+#include <fwdpy11/types/mutation_position_index.hpp>
+
+// Expose fwdpy11::mutation_position_index for unit testing.
+// Lists of indexes are sorted, as the order of entries
+// in the table is unspecified.
+
+namespace py = pybind11;
+
+using index_t = fwdpy11::mutation_position_index;
+
+PYBIND11_MODULE(mutation_position_index, m)
+{
+    py::class_<index_t>(m, "MutationPositionIndex")
+        .def(py::init<>())
+        .def("__len__", &index_t::size)
+        .def("emplace",
+             [](index_t& self, const double pos, const std::uint32_t index) {
+                 self.emplace(pos, index);
+             })
+        .def("clear", &index_t::clear)
+        .def("reserve", &index_t::reserve)
+        .def("count", &index_t::count)
+        .def("find",
+             [](const index_t& self, const double pos) -> py::object {
+                 auto i = self.find(pos);
+                 if (i == self.end())
+                     {
+                         return py::none();
+                     }
+                 return py::cast(i->second);
+             })
+        .def("equal_range",
+             [](const index_t& self, const double pos) {
+                 std::vector<std::uint32_t> rv;
+                 auto r = self.equal_range(pos);
+                 for (; r.first != r.second; ++r.first)
+                     {
+                         rv.push_back(r.first->second);
+                     }
+                 std::sort(rv.begin(), rv.end());
+                 return rv;
+             })
+        .def("erase",
+             [](index_t& self, const double pos, const std::uint32_t index) {
+                 // The same loop as update_mutations
+                 auto itr = self.equal_range(pos);
+                 while (itr.first != itr.second)
+                     {
+                         if (itr.first->second == index)
+                             {
+                                 self.erase(itr.first);
+                                 return true;
+                             }
+                         ++itr.first;
+                     }
+                 return false;
+             })
+        .def("erase_all",
+             [](index_t& self, const double pos) {
+                 // Erase while iterating over equal_range
+                 std::vector<std::uint32_t> rv;
+                 auto itr = self.equal_range(pos);
+                 while (itr.first != itr.second)
+                     {
+                         rv.push_back(itr.first->second);
+                         itr.first = self.erase(itr.first);
+                     }
+                 std::sort(rv.begin(), rv.end());
+                 return rv;
+             })
+        .def("items", [](const index_t& self) {
+            std::vector<std::pair<double, std::uint32_t>> rv(self.begin(),
+                                                             self.end());
+            std::sort(rv.begin(), rv.end());
+            return rv;
+        });
+}
@@ -1,5 +1,6 @@
 #include <pybind11/pybind11.h>
 #include <fwdpy11/types/Mutation.hpp>
+#include <fwdpy11/types/DiploidPopulation.hpp>
 
 namespace py = pybind11;
 
@@ -21,8 +22,22 @@ general_pickler(py::object p)
     return f(p,-1);
 }
 
+//The records of ancient samples are not exposed
+//to Python, so we return them as tuples
+py::list
+ancient_sample_records(const fwdpy11::DiploidPopulation& pop)
+{
+    py::list rv;
+    for (auto& r : pop.ancient_sample_records)
+        {
+            rv.append(py::make_tuple(r.time, r.n1, r.n2));
+        }
+    return rv;
+}
+
 PYBIND11_MODULE(pickling_cpp, m)
 {
     m.def("pickle_mutation", &pickle_mutation);
     m.def("general_pickler", &general_pickler);
+    m.def("ancient_sample_records", &ancient_sample_records);
 }
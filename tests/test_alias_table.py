@@ -0,0 +1,97 @@
+#
+# Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+#
+# This file is part of fwdpy11.
+#
+# fwdpy11 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# fwdpy11 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Tests of the alias tables used to sample parents.
+
+import unittest
+import numpy as np
+import fwdpy11
+import alias_table_sampling as ats
+
+
+def check_frequencies(test, weights, seed, n):
+    """
+    The counts of each index are within 5 standard
+    deviations of their expected values, and indexes
+    with zero weight are never sampled.
+    """
+    x = np.array(ats.sample(weights, seed, n))
+    test.assertEqual(len(x), n)
+    test.assertTrue(np.all(x < len(weights)))
+    counts = np.bincount(x, minlength=len(weights))
+    w = np.array(weights)
+    p = w/w.sum() if w.sum() > 0 else np.ones(len(w))/len(w)
+    expected = n*p
+    sd = np.sqrt(n*p*(1.0 - p))
+    test.assertTrue(np.all(np.abs(counts - expected) <= 5.0*sd + 1.0))
+    test.assertTrue(np.all(counts[p == 0.0] == 0))
+
+
+class testAssign(unittest.TestCase):
+    def testInvalidWeights(self):
+        self.assertFalse(ats.assign([]))
+        self.assertFalse(ats.assign([1.0, -1.0]))
+        self.assertFalse(ats.assign([1.0, np.nan]))
+        self.assertFalse(ats.assign([1.0, np.inf]))
+        self.assertFalse(ats.assign([1e308, 1e308]))
+
+    def testValidWeights(self):
+        self.assertTrue(ats.assign([1.0]))
+        self.assertTrue(ats.assign([0.0, 1.0, 2.0]))
+
+    def testUniform(self):
+        self.assertTrue(ats.is_uniform([2.5]*10))
+        self.assertTrue(ats.is_uniform([0.0]*7))
+        self.assertFalse(ats.is_uniform([1.0, 2.0]))
+
+
+class testFrequencies(unittest.TestCase):
+    def testEqualWeights(self):
+        check_frequencies(self, [2.5]*10, 42, 100000)
+
+    def testZeroWeights(self):
+        check_frequencies(self, [0.0]*7, 42, 100000)
+        check_frequencies(self, [0.0, 1.0, 0.0, 3.0, 0.0], 42, 100000)
+
+    def testRandomWeights(self):
+        np.random.seed(101)
+        for K in [2, 3, 10, 100]:
+            w = np.random.uniform(0, 1, K)
+            w[np.random.choice(K, K//4, replace=False)] = 0.0
+            check_frequencies(self, w.tolist(), K, 200000)
+
+    def testRounding(self):
+        """
+        These weights leave a small entry with no
+        large entry to pair it with, due to rounding.
+        """
+        w = [0.1, np.nextafter(0.1, 0.0), 0.1]
+        self.assertFalse(ats.is_uniform(w))
+        check_frequencies(self, w, 42, 100000)
+
+
+class testSample(unittest.TestCase):
+    def testSameAsOneAtATime(self):
+        for w in [[1.0]*5, [0.0, 1.0, 0.5, 3.0],
+                  [0.1, np.nextafter(0.1, 0.0), 0.1]]:
+            self.assertEqual(ats.sample(w, 13, 1000),
+                             ats.sample_one_at_a_time(w, 13, 1000))
+
+
+if __name__ == "__main__":
+    unittest.main()
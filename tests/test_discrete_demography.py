@@ -21,6 +21,7 @@ import unittest
 import pickle
 import discrete_demography_roundtrips as ddr
 import numpy as np
+import scipy.sparse
 
 
 class TestMoveOrCopyIndividuals(unittest.TestCase):
@@ -169,6 +170,85 @@ class TestMigrationMatrix(unittest.TestCase):
         except:  # NOQA
             self.fail("unexpected exception")
 
+    def test_init_from_sparse(self):
+        mm = np.array([[0.9, 0.1, 0.], [0., 1., 0.], [0.5, 0., 0.5]])
+        m = fwdpy11.MigrationMatrix(scipy.sparse.coo_matrix(mm), False)
+        self.assertEqual(m.shape, (3, 3))
+        self.assertEqual(m.nnz, 5)
+        self.assertEqual(m.scaled, False)
+        self.assertTrue(np.array_equal(m.M, mm))
+        self.assertTrue(np.array_equal(m.tocsr().toarray(), mm))
+
+    def test_sparse_duplicates_and_zeros(self):
+        # Duplicates are summed and explicit zeros are removed
+        # without modifying the input
+        s = scipy.sparse.csr_matrix((np.array([0.25, 0.25, 0., 1.]),
+                                     np.array([0, 0, 1, 1]),
+                                     np.array([0, 3, 4])), shape=(2, 2))
+        m = fwdpy11.MigrationMatrix(s)
+        self.assertEqual(m.nnz, 2)
+        self.assertTrue(np.array_equal(m.M, np.array([[0.5, 0.], [0., 1.]])))
+        self.assertEqual(s.nnz, 4)
+
+    def test_invalid_sparse_input(self):
+        with self.assertRaises(ValueError):
+            fwdpy11.MigrationMatrix(scipy.sparse.csr_matrix(np.ones((2, 3))))
+        with self.assertRaises(ValueError):
+            fwdpy11.MigrationMatrix(scipy.sparse.csr_matrix(
+                np.array([[1., -1.], [0., 1.]])))
+        with self.assertRaises(ValueError):
+            fwdpy11.MigrationMatrix(scipy.sparse.csr_matrix(
+                np.array([[1., np.inf], [0., 1.]])))
+
+    def test_malformed_sparse_input(self):
+        """
+        Arrays that scipy would not accept
+        are rejected before they are read.
+        """
+        class MalformedCSR(object):
+            def __init__(self, data, indices, indptr, shape):
+                self.data = np.array(data)
+                self.indices = np.array(indices, dtype=np.int64)
+                self.indptr = np.array(indptr, dtype=np.int64)
+                self.shape = shape
+                self.has_canonical_format = True
+
+            def tocsr(self):
+                return self
+
+        # Valid input
+        m = fwdpy11.MigrationMatrix(MalformedCSR(
+            [1., 1.], [0, 1], [0, 1, 2], (2, 2)))
+        self.assertTrue(np.array_equal(m.M, np.identity(2)))
+        # indptr too short
+        with self.assertRaises(ValueError):
+            fwdpy11.MigrationMatrix(MalformedCSR(
+                [1., 1.], [0, 1], [0, 1], (2, 2)))
+        # indptr not monotonic
+        with self.assertRaises(ValueError):
+            fwdpy11.MigrationMatrix(MalformedCSR(
+                [1., 1.], [0, 1], [0, 2, 1], (2, 2)))
+        # indptr past the end of indices
+        with self.assertRaises(ValueError):
+            fwdpy11.MigrationMatrix(MalformedCSR(
+                [1., 1.], [0, 1], [0, 1, 3], (2, 2)))
+        # Index that wraps to a valid deme if narrowed to int32
+        with self.assertRaises(ValueError):
+            fwdpy11.MigrationMatrix(MalformedCSR(
+                [1., 1.], [0, 2**32 + 1], [0, 1, 2], (2, 2)))
+        with self.assertRaises(ValueError):
+            fwdpy11.MigrationMatrix(MalformedCSR(
+                [1., 1.], [0, -1], [0, 1, 2], (2, 2)))
+
+    def test_pickle_sparse(self):
+        n = 1000
+        s = scipy.sparse.diags([0.05, 0.9, 0.05], [-1, 0, 1], shape=(n, n))
+        m = fwdpy11.MigrationMatrix(s)
+        up = pickle.loads(pickle.dumps(m, -1))
+        self.assertEqual(up.shape, (n, n))
+        self.assertEqual(up.nnz, s.nnz)
+        self.assertEqual((up.tocsr() != s.tocsr()).nnz, 0)
+
 
 class TestSetMigrationRates(unittest.TestCase):
     def test_init_from_list(self):
@@ -195,8 +275,45 @@ class TestSetMigrationRates(unittest.TestCase):
         self.assertEqual(m.deme, up.deme)
         self.assertEqual(m.migrates.tolist(), up.migrates.tolist())
 
+    def test_init_from_sparse_row(self):
+        m = fwdpy11.SetMigrationRates(
+            0, 1, scipy.sparse.csr_matrix([[0., 0.5, 0.5]]))
+        self.assertEqual(m.deme, 1)
+        self.assertTrue(np.array_equal(m.migrates, np.array([0, 0.5, 0.5])))
+        self.assertEqual(m.tocsr().shape, (1, 3))
+        self.assertEqual(m.tocsr().nnz, 2)
+
+    def test_reset_entire_sparse_matrix(self):
+        s = scipy.sparse.identity(3)
+        m = fwdpy11.SetMigrationRates(3, s)
+        self.assertTrue(np.array_equal(m.migrates, np.identity(3)))
+        up = pickle.loads(pickle.dumps(m, -1))
+        self.assertEqual(up.deme, m.deme)
+        self.assertEqual((up.tocsr() != s).nnz, 0)
+
+    def test_invalid_sparse_input(self):
+        with self.assertRaises(ValueError):
+            fwdpy11.SetMigrationRates(
+                0, -1, scipy.sparse.csr_matrix([[0., 1.]]))
+        with self.assertRaises(ValueError):
+            fwdpy11.SetMigrationRates(
+                0, 0, scipy.sparse.csr_matrix(np.identity(2)))
+        with self.assertRaises(ValueError):
+            fwdpy11.SetMigrationRates(
+                0, scipy.sparse.csr_matrix(np.ones((2, 3))))
+
 
 class TestDiscreteDemographyInitialization(unittest.TestCase):
+    def test_init_sparse_migmatrix(self):
+        s = scipy.sparse.identity(10)
+        d = fwdpy11.DiscreteDemography(migmatrix=s)
+        self.assertEqual(d.migmatrix.scaled, True)
+        self.assertEqual(d.migmatrix.nnz, 10)
+        d = fwdpy11.DiscreteDemography(migmatrix=(s, False))
+        self.assertEqual(d.migmatrix.scaled, False)
+        up = pickle.loads(pickle.dumps(d, -1))
+        self.assertEqual(up.migmatrix.nnz, 10)
+
     def test_init_migmatrix_with_tuple(self):
         try:
             d = fwdpy11.DiscreteDemography(migmatrix=((np.identity(10), True)))
@@ -691,5 +808,177 @@ class TestDiscreteDemography(unittest.TestCase):
                 self.fail("invalid parental deme type")
 
 
+class TestDiscreteDemographyWithTreeSequences(unittest.TestCase):
+    """
+    Tests of fwdpy11.evolvets with a DiscreteDemography
+    """
+    @classmethod
+    def setUp(self):
+        self.pop = fwdpy11.DiploidPopulation(100, 1.)
+        self.pdict = {'nregions': [],
+                      'sregions': [],
+                      'recregions': [fwdpy11.Region(0, 1, 1)],
+                      'rates': (0., 0., 1e-3),
+                      'gvalue': fwdpy11.Multiplicative(2.),
+                      'simlen': 20}
+
+    def stepping_stone(self, ndemes, m):
+        """
+        A circular stepping-stone migration matrix
+        """
+        mm = np.diag([1. - m]*ndemes)
+        for i in range(ndemes):
+            mm[i, (i + 1) % ndemes] += m/2.
+            mm[i, (i - 1) % ndemes] += m/2.
+        return mm
+
+    def test_simlen_required(self):
+        self.pdict['demography'] = fwdpy11.DiscreteDemography()
+        del self.pdict['simlen']
+        params = fwdpy11.ModelParams(**self.pdict)
+        with self.assertRaises(TypeError):
+            fwdpy11.evolvets(fwdpy11.GSLrng(42), self.pop, params, 100)
+
+    def test_pself_not_allowed(self):
+        self.pdict['demography'] = fwdpy11.DiscreteDemography()
+        self.pdict['pself'] = 0.5
+        params = fwdpy11.ModelParams(**self.pdict)
+        with self.assertRaises(ValueError):
+            fwdpy11.evolvets(fwdpy11.GSLrng(42), self.pop, params, 100)
+
+    def test_stepping_stone(self):
+        ndemes = 4
+        md = np.array(self.pop.diploid_metadata, copy=False)
+        md['deme'][:] = np.repeat(np.arange(ndemes), self.pop.N//ndemes)
+        self.pdict['demography'] = fwdpy11.DiscreteDemography(
+            migmatrix=self.stepping_stone(ndemes, 0.1))
+        params = fwdpy11.ModelParams(**self.pdict)
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), self.pop, params, 7)
+        self.assertEqual(self.pop.generation, params.simlen)
+        md = np.array(self.pop.diploid_metadata, copy=False)
+        deme_sizes = np.unique(md['deme'], return_counts=True)
+        self.assertEqual(len(deme_sizes[0]), ndemes)
+        for i in deme_sizes[1]:
+            self.assertEqual(i, self.pop.N//ndemes)
+        # The nodes of each individual record its deme
+        nodes = np.array(self.pop.tables.nodes, copy=False)
+        for i in range(2):
+            self.assertTrue(np.array_equal(
+                nodes['population'][md['nodes'][:, i]], md['deme']))
+
+    def test_parents_from_neighbors(self):
+        class ParentalDemes(object):
+            def __init__(self, demes, ndemes):
+                self.demes = demes
+                self.ndemes = ndemes
+                self.distances = set()
+
+            def __call__(self, pop, sampler):
+                md = np.array(pop.diploid_metadata, copy=False)
+                d = self.demes[md['parents']] - md['deme'][:, None]
+                self.distances.update(np.unique(d % self.ndemes).tolist())
+                self.demes = np.array(md['deme'], copy=True)
+
+        ndemes = 10
+        md = np.array(self.pop.diploid_metadata, copy=False)
+        md['deme'][:] = np.repeat(np.arange(ndemes), self.pop.N//ndemes)
+        self.pdict['demography'] = fwdpy11.DiscreteDemography(
+            migmatrix=self.stepping_stone(ndemes, 0.5))
+        params = fwdpy11.ModelParams(**self.pdict)
+        r = ParentalDemes(np.array(md['deme'], copy=True), ndemes)
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), self.pop, params, 100, r)
+        self.assertEqual(r.distances, set([0, 1, ndemes - 1]))
+
+    def test_unscaled_migration_rates(self):
+        # Migration rates are not weighted by deme size,
+        # but empty demes are never sources of parents.
+        md = np.array(self.pop.diploid_metadata, copy=False)
+        md['deme'][90:] = 1
+        mm = fwdpy11.MigrationMatrix(np.array([[0.5, 0.5, 0.],
+                                               [0.5, 0.5, 0.],
+                                               [0.5, 0.5, 1.]]), False)
+        self.pdict['demography'] = fwdpy11.DiscreteDemography(
+            migmatrix=mm, set_deme_sizes=[fwdpy11.SetDemeSize(0, 0, 50),
+                                          fwdpy11.SetDemeSize(0, 1, 50)])
+        self.pdict['simlen'] = 1
+        params = fwdpy11.ModelParams(**self.pdict)
+        demes = np.array(md['deme'], copy=True)
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), self.pop, params, 100)
+        md = np.array(self.pop.diploid_metadata, copy=False)
+        # About half of the parents are from deme 1, rather
+        # than 10%, which would be the case if the rates were
+        # scaled by the deme sizes.
+        n1 = (demes[md['parents']] == 1).sum()
+        self.assertTrue(n1 > 0.3*2*self.pop.N)
+        self.assertTrue(n1 < 0.7*2*self.pop.N)
+
+    def test_events(self):
+        md = np.array(self.pop.diploid_metadata, copy=False)
+        md['deme'][self.pop.N//2:] = 1
+        mm = self.stepping_stone(3, 0.2)
+        # Deme 2 is founded by a mass migration in
+        # generation 5, and then grows.  No parents
+        # come from deme 2 until it is founded.
+        mm[:, 2] = 0.
+        mm[2, 2] = 1.
+        mmigs = [fwdpy11.move_individuals(5, 0, 2, 0.5)]
+        g = [fwdpy11.SetExponentialGrowth(6, 2, 1.1),
+             fwdpy11.SetExponentialGrowth(10, 2, fwdpy11.NOGROWTH)]
+        smr = [fwdpy11.SetMigrationRates(
+            6, 2, [0.1, 0.1, 0.8])]
+        self.pdict['demography'] = fwdpy11.DiscreteDemography(
+            mass_migrations=mmigs, set_growth_rates=g, migmatrix=mm,
+            set_migration_rates=smr)
+        params = fwdpy11.ModelParams(**self.pdict)
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), self.pop, params, 100)
+        md = np.array(self.pop.diploid_metadata, copy=False)
+        deme_sizes = dict(zip(*np.unique(md['deme'], return_counts=True)))
+        self.assertEqual(deme_sizes[0], 25)
+        self.assertEqual(deme_sizes[1], 50)
+        self.assertEqual(deme_sizes[2], np.round(25*1.1**4))
+        self.assertEqual(self.pop.N, len(md))
+
+    def test_sparse_migration_matrix(self):
+        ndemes = 4
+        md = np.array(self.pop.diploid_metadata, copy=False)
+        md['deme'][:] = np.repeat(np.arange(ndemes), self.pop.N//ndemes)
+        pop2 = fwdpy11.DiploidPopulation(self.pop.N, 1.)
+        md2 = np.array(pop2.diploid_metadata, copy=False)
+        md2['deme'][:] = md['deme']
+        mm = self.stepping_stone(ndemes, 0.1)
+        rates = [0., 0.5, 0.5, 0.]
+        dense = fwdpy11.DiscreteDemography(
+            migmatrix=mm,
+            set_migration_rates=[fwdpy11.SetMigrationRates(5, 0, rates)])
+        sparse = fwdpy11.DiscreteDemography(
+            migmatrix=scipy.sparse.csr_matrix(mm),
+            set_migration_rates=[fwdpy11.SetMigrationRates(
+                5, 0, scipy.sparse.csr_matrix([rates]))])
+        self.pdict['demography'] = dense
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), self.pop,
+                         fwdpy11.ModelParams(**self.pdict), 100)
+        self.pdict['demography'] = sparse
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), pop2,
+                         fwdpy11.ModelParams(**self.pdict), 100)
+        self.assertTrue(self.pop == pop2)
+
+    def test_demography_is_reusable(self):
+        ndemes = 2
+        md = np.array(self.pop.diploid_metadata, copy=False)
+        md['deme'][self.pop.N//ndemes:] = 1
+        mmigs = [fwdpy11.move_individuals(3, 1, 0, 0.5)]
+        self.pdict['demography'] = fwdpy11.DiscreteDemography(
+            mass_migrations=mmigs, migmatrix=self.stepping_stone(ndemes, 0.1))
+        params = fwdpy11.ModelParams(**self.pdict)
+        pop2 = fwdpy11.DiploidPopulation(self.pop.N, 1.)
+        md2 = np.array(pop2.diploid_metadata, copy=False)
+        md2['deme'][:] = md['deme']
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), self.pop, params, 100)
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), pop2, params, 100)
+        self.assertTrue(self.pop == pop2)
+        md = np.array(self.pop.diploid_metadata, copy=False)
+        self.assertEqual(len(np.where(md['deme'] == 0)[0]), 75)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,147 @@
+import unittest
+import fwdpy11
+import numpy as np
+import copy
+
+
+class GenerationRecorder(object):
+    def __init__(self):
+        self.generations = []
+
+    def __call__(self, pop, sr):
+        self.generations.append(pop.generation)
+
+
+def set_up_model():
+    N = 100
+    GSSmo = fwdpy11.GSSmo([(0, 0, 1), (N, 1, 1)])
+    a = fwdpy11.Additive(2.0, GSSmo)
+    p = {'nregions': [],
+         'sregions': [fwdpy11.GaussianS(0, 1, 1, 0.25)],
+         'recregions': [fwdpy11.Region(0, 1, 1)],
+         'rates': (0.0, 0.025, 1./(4*N)),
+         'gvalue': a,
+         'prune_selected': False,
+         'demography': np.array([N]*2*N, dtype=np.uint32)
+         }
+    params = fwdpy11.ModelParams(**p)
+    pop = fwdpy11.DiploidPopulation(N, 1.0)
+    return params, pop
+
+
+class testEvolveReplicates(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.params, self.pop = set_up_model()
+        self.seeds = [11, 42, 101]
+
+    def test_evolvets_replicates(self):
+        results = list(fwdpy11.evolve_replicates(
+            self.pop, self.params, self.seeds, GenerationRecorder,
+            simplification_interval=100, max_workers=3))
+        self.assertEqual(sorted(r.seed for r in results), self.seeds)
+        self.assertEqual(self.pop.generation, 0)
+        for r in results:
+            self.assertTrue(r.seconds >= 0.0)
+            self.assertEqual(r.pop.generation, 200)
+            self.assertEqual(r.recorder.generations, list(range(1, 201)))
+            # Same output as a serial simulation
+            pop = copy.deepcopy(self.pop)
+            fwdpy11.evolvets(fwdpy11.GSLrng(r.seed), pop,
+                             copy.deepcopy(self.params), 100)
+            self.assertTrue(pop == r.pop)
+
+    def test_evolve_genomes_replicates(self):
+        results = list(fwdpy11.evolve_replicates(
+            self.pop, self.params, self.seeds, max_workers=2))
+        self.assertEqual(sorted(r.seed for r in results), self.seeds)
+        for r in results:
+            self.assertTrue(r.recorder is None)
+            self.assertEqual(r.pop.generation, 200)
+            pop = copy.deepcopy(self.pop)
+            fwdpy11.evolve_genomes(fwdpy11.GSLrng(r.seed), pop,
+                                   copy.deepcopy(self.params))
+            self.assertTrue(pop == r.pop)
+
+    def test_shared_scheduler(self):
+        with self.assertRaises(ValueError):
+            fwdpy11.evolve_replicates(
+                self.pop, self.params, self.seeds,
+                simplification_interval=fwdpy11.FixedSimplificationInterval(
+                    100))
+
+    def test_evolve_genomes_kwargs(self):
+        with self.assertRaises(ValueError):
+            fwdpy11.evolve_replicates(
+                self.pop, self.params, self.seeds,
+                track_mutation_counts=True)
+
+    def test_results_are_not_kept(self):
+        import gc
+        import weakref
+        recorders = weakref.WeakSet()
+
+        def factory():
+            r = GenerationRecorder()
+            recorders.add(r)
+            return r
+
+        seeds = list(range(10))
+        nalive = []
+        for r in fwdpy11.evolve_replicates(self.pop, self.params, seeds,
+                                           factory, max_workers=2):
+            del r
+            gc.collect()
+            nalive.append(len(recorders))
+        self.assertEqual(len(nalive), len(seeds))
+        self.assertTrue(max(nalive) <= 2)
+
+    def test_close_early(self):
+        nstarted = []
+
+        def factory():
+            nstarted.append(1)
+            return GenerationRecorder()
+
+        results = fwdpy11.evolve_replicates(self.pop, self.params,
+                                            list(range(10)), factory,
+                                            max_workers=2)
+        next(results)
+        results.close()
+        self.assertTrue(len(nstarted) < 10)
+
+    def test_scheduler_factory(self):
+        results = list(fwdpy11.evolve_replicates(
+            self.pop, self.params, self.seeds,
+            simplification_interval=lambda: fwdpy11.EdgeTableSizeScheduler(
+                10000)))
+        self.assertEqual(len(results), len(self.seeds))
+
+
+class testCallbacksWithoutGIL(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.params, self.pop = set_up_model()
+
+    def test_python_exception(self):
+        def stop(pop, simplified):
+            if pop.generation == 10:
+                raise RuntimeError("stop")
+            return False
+
+        with self.assertRaises(RuntimeError):
+            fwdpy11.evolvets(fwdpy11.GSLrng(42), copy.deepcopy(self.pop),
+                             copy.deepcopy(self.params), 100,
+                             stopping_criterion=stop)
+
+    def test_random_ancient_samples(self):
+        recorder = fwdpy11.RandomAncientSamples(
+            seed=13, samplesize=10, timepoints=[50, 100])
+        pop = copy.deepcopy(self.pop)
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), pop,
+                         copy.deepcopy(self.params), 100, recorder)
+        self.assertEqual(len(pop.ancient_sample_metadata), 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
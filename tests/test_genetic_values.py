@@ -179,5 +179,147 @@ class testGSSandGSSmoConsistency(unittest.TestCase):
             self.assertEqual(i, j)
 
 
+def brute_force_genetic_value(pop, i, scaling, multiplicative):
+    """
+    Genetic value of diploid i, assuming no
+    two mutations are at the same position.
+    """
+    keys = [pop.haploid_genomes[pop.diploids[i].first].smutations,
+            pop.haploid_genomes[pop.diploids[i].second].smutations]
+    counts = {}
+    for k in keys:
+        for j in k:
+            counts[j] = counts.get(j, 0) + 1
+    w = 1.0 if multiplicative else 0.0
+    for k, n in counts.items():
+        m = pop.mutations[k]
+        e = scaling*m.s if n == 2 else m.h*m.s
+        if multiplicative:
+            w *= 1.0 + e
+        else:
+            w += e
+    return w - 1.0 if multiplicative else w
+
+
+class testHaploidGenomeContributions(unittest.TestCase):
+    """
+    Additive and Multiplicative calculate genetic values
+    from cached contributions of haploid genomes during
+    simulations.
+    """
+    @classmethod
+    def setUpClass(self):
+        N = 500
+        self.pop = fwdpy11.DiploidPopulation(N, 1.0)
+        self.gvalues = [(fwdpy11.Additive(2.0, fwdpy11.GSS(0.0, 1.0)),
+                         False),
+                        (fwdpy11.Multiplicative(2.0, fwdpy11.GSS(0.0, 1.0)),
+                         True)]
+        p = {'nregions': [],
+             'sregions': [fwdpy11.GaussianS(0, 1, 1, 0.1, h=1.0),
+                          fwdpy11.GaussianS(0, 1, 1, 0.1, h=0.25)],
+             'recregions': [fwdpy11.Region(0, 1, 1)],
+             'rates': (0.0, 0.01, 1e-3),
+             'gvalue': self.gvalues[0][0],
+             'prune_selected': False,
+             'demography': np.array([N]*200, dtype=np.uint32)
+             }
+        self.params = fwdpy11.ModelParams(**p)
+        fwdpy11.evolvets(fwdpy11.GSLrng(101), self.pop, self.params, 100)
+
+    def testMetadata(self):
+        for i, md in enumerate(self.pop.diploid_metadata):
+            self.assertEqual(md.g, self.gvalues[0][0](i, self.pop))
+            self.assertAlmostEqual(md.g, brute_force_genetic_value(
+                self.pop, i, 2.0, False))
+
+    def testMetadataFitness(self):
+        """
+        Fitnesses are set for all individuals at once
+        during simulations.
+        """
+        for i, md in enumerate(self.pop.diploid_metadata):
+            self.assertEqual(md.w, self.gvalues[0][0].fitness(i, self.pop))
+
+    def testBruteForce(self):
+        for gv, multiplicative in self.gvalues:
+            for i in range(self.pop.N):
+                self.assertAlmostEqual(gv(i, self.pop),
+                                       brute_force_genetic_value(
+                                           self.pop, i, 2.0, multiplicative))
+
+
+class testMultiplicativeContributions(unittest.TestCase):
+    """
+    Multiplicative fitness calculated from cached contributions
+    of haploid genomes, including mutations whose homozygous
+    effect gives a non-positive factor.
+    """
+    @classmethod
+    def setUpClass(self):
+        N = 500
+        self.pop = fwdpy11.DiploidPopulation(N, 1.0)
+        self.gv = fwdpy11.Multiplicative(2.0)
+        p = {'nregions': [],
+             'sregions': [fwdpy11.ExpS(0, 1, 1, -0.05, h=0.25),
+                          fwdpy11.ExpS(0, 1, 1, 0.01, h=1.0),
+                          fwdpy11.ConstantS(0, 1, 0.01, -1.0, h=0.0)],
+             'recregions': [fwdpy11.Region(0, 1, 1)],
+             'rates': (0.0, 0.01, 1e-3),
+             'gvalue': self.gv,
+             'prune_selected': False,
+             'demography': np.array([N]*200, dtype=np.uint32)
+             }
+        self.params = fwdpy11.ModelParams(**p)
+        fwdpy11.evolvets(fwdpy11.GSLrng(202), self.pop, self.params, 100)
+
+    def testMetadata(self):
+        for i, md in enumerate(self.pop.diploid_metadata):
+            self.assertEqual(md.w, self.gv(i, self.pop))
+            w = 1.0 + brute_force_genetic_value(self.pop, i, 2.0, True)
+            self.assertAlmostEqual(md.w, max(0.0, w))
+
+
+class testBatchAPI(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        from quick_pops import quick_nonneutral_slocus
+        self.pop = quick_nonneutral_slocus(N=500, simlen=50)
+        self.gv = fwdpy11.Additive(2.0, fwdpy11.GSS(0.0, 1.0))
+
+    def testCalculate(self):
+        g = self.gv.calculate(self.pop)
+        self.assertEqual(len(g), self.pop.N)
+        for i, gi in enumerate(g):
+            self.assertEqual(gi, self.gv(i, self.pop))
+
+    def testCalculateSubset(self):
+        idx = np.array([3, 1, 3], dtype=np.int32)
+        g = self.gv.calculate(self.pop, idx)
+        self.assertEqual(len(g), 3)
+        for i, gi in zip(idx, g):
+            self.assertEqual(gi, self.gv(int(i), self.pop))
+
+    def testFitnesses(self):
+        w = self.gv.fitnesses(self.pop)
+        for i, wi in enumerate(w):
+            self.assertEqual(wi, self.gv.fitness(i, self.pop))
+
+    def testNoise(self):
+        n = fwdpy11.GaussianNoise(mean=0.0, sd=1.0)
+        e1 = n.sample(fwdpy11.GSLrng(42), self.pop)
+        e2 = n.sample(fwdpy11.GSLrng(42), self.pop)
+        self.assertEqual(len(e1), self.pop.N)
+        self.assertTrue(np.array_equal(e1, e2))
+        self.assertTrue(np.all(fwdpy11.NoNoise().sample(
+            fwdpy11.GSLrng(42), self.pop) == 0.0))
+
+    def testInvalidIndexes(self):
+        with self.assertRaises(ValueError):
+            self.gv.calculate(self.pop, np.array([self.pop.N]))
+        with self.assertRaises(ValueError):
+            self.gv.fitnesses(self.pop, np.array([-1]))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -85,5 +85,35 @@ class TestMultivariateGSSmoCPP(unittest.TestCase):
         self.assertTrue(co == co2)
 
 
+class TestMultivariateBatchAPI(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.params, self.rng, self.pop, self.ntraits = \
+            set_up_quant_trait_model()
+        self.params.demography = np.array([self.pop.N]*100, dtype=np.uint32)
+        fwdpy11.evolvets(self.rng, self.pop, self.params, 100,
+                         record_gvalue_matrix=True)
+
+    def test_calculate(self):
+        g = self.params.gvalue.calculate(self.pop)
+        self.assertEqual(g.shape, (self.pop.N, self.ntraits))
+        md = np.array(self.pop.diploid_metadata, copy=False)
+        self.assertTrue(np.array_equal(g[:, 0], md['g']))
+
+    def test_fitnesses(self):
+        w = self.params.gvalue.fitnesses(self.pop)
+        md = np.array(self.pop.diploid_metadata, copy=False)
+        self.assertTrue(np.allclose(w, md['w']))
+
+    def test_genetic_value_matrix(self):
+        """
+        The simulation sums effect sizes stored contiguously,
+        which must give the same values as summing the
+        effect sizes of each mutation.
+        """
+        g = self.params.gvalue.calculate(self.pop)
+        self.assertTrue(np.array_equal(g, self.pop.genetic_values))
+
+
 if __name__ == "__main__":
     unittest.main()
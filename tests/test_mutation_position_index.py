@@ -0,0 +1,201 @@
+#
+# Copyright (C) 2019 Kevin Thornton <krthornt@uci.edu>
+#
+# This file is part of fwdpy11.
+#
+# fwdpy11 is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# fwdpy11 is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with fwdpy11.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Tests of the table mapping mutation positions to
+# mutation indexes.  The table is compared to a dict
+# of lists, which behaves as the multimap it replaces.
+
+import unittest
+import numpy as np
+import fwdpy11
+from mutation_position_index import MutationPositionIndex
+
+
+class Reference(object):
+    def __init__(self):
+        self.lookup = {}
+
+    def emplace(self, pos, index):
+        self.lookup.setdefault(pos, []).append(index)
+
+    def erase(self, pos, index):
+        if index not in self.lookup.get(pos, []):
+            return False
+        self.lookup[pos].remove(index)
+        if len(self.lookup[pos]) == 0:
+            del self.lookup[pos]
+        return True
+
+    def items(self):
+        return sorted((p, i) for p, v in self.lookup.items() for i in v)
+
+
+def check_table(test, table, reference, positions):
+    test.assertEqual(len(table), len(reference.items()))
+    test.assertEqual(table.items(), reference.items())
+    for pos in positions:
+        expected = sorted(reference.lookup.get(pos, []))
+        test.assertEqual(table.equal_range(pos), expected)
+        test.assertEqual(table.count(pos), len(expected))
+        if len(expected) == 0:
+            test.assertTrue(table.find(pos) is None)
+        else:
+            test.assertTrue(table.find(pos) in expected)
+
+
+class testMutationPositionIndex(unittest.TestCase):
+    def setUp(self):
+        self.table = MutationPositionIndex()
+        self.reference = Reference()
+
+    def emplace(self, pos, index):
+        self.table.emplace(pos, index)
+        self.reference.emplace(pos, index)
+
+    def testDuplicatePositions(self):
+        for i in range(5):
+            self.emplace(0.5, i)
+        self.emplace(0.25, 5)
+        self.assertEqual(self.table.count(0.5), 5)
+        self.assertEqual(self.table.equal_range(0.5), [0, 1, 2, 3, 4])
+        self.assertTrue(self.table.erase(0.5, 3))
+        self.assertFalse(self.table.erase(0.5, 3))
+        self.reference.erase(0.5, 3)
+        check_table(self, self.table, self.reference, [0.25, 0.5, 0.75])
+
+    def testEraseDuringEqualRange(self):
+        for i in range(20):
+            self.emplace(0.5, i)
+            self.emplace(i/20., 100 + i)
+        self.assertEqual(self.table.erase_all(0.5),
+                         sorted(self.reference.lookup.pop(0.5)))
+        check_table(self, self.table, self.reference,
+                    [0.5] + [i/20. for i in range(20)])
+
+    def testEraseThenFind(self):
+        """
+        With hundreds of positions, probe sequences
+        share slots, so erasing an entry must not hide
+        the entries stored after it.
+        """
+        positions = np.random.RandomState(42).uniform(0, 1, 500).tolist()
+        for i, pos in enumerate(positions):
+            self.emplace(pos, i)
+        for i, pos in enumerate(positions):
+            if i % 2 == 0:
+                self.assertTrue(self.table.erase(pos, i))
+                self.reference.erase(pos, i)
+        check_table(self, self.table, self.reference, positions)
+        for i, pos in enumerate(positions):
+            if i % 2 == 0:
+                self.emplace(pos, i + len(positions))
+        check_table(self, self.table, self.reference, positions)
+
+    def testRehashWithTombstones(self):
+        rng = np.random.RandomState(101)
+        index = 0
+        positions = []
+        for _ in range(50):
+            new = rng.uniform(0, 1, 100).tolist()
+            for pos in new:
+                self.emplace(pos, index)
+                index += 1
+            positions.extend(new)
+            for p, i in self.reference.items():
+                if rng.uniform() < 0.9:
+                    self.assertTrue(self.table.erase(p, i))
+                    self.reference.erase(p, i)
+            check_table(self, self.table, self.reference, positions[-200:])
+        check_table(self, self.table, self.reference, positions)
+
+    def testRandomOperations(self):
+        """
+        Few distinct positions, so that most of them
+        are duplicated.
+        """
+        rng = np.random.RandomState(13)
+        positions = [0.0, 0.1, 0.2, 0.3, 1e-300, 1.0, 2.0, 3.0]
+        for index in range(5000):
+            pos = positions[rng.randint(len(positions))]
+            if rng.uniform() < 0.55:
+                self.emplace(pos, index)
+            else:
+                candidates = self.reference.lookup.get(pos, [])
+                if len(candidates) > 0:
+                    i = candidates[rng.randint(len(candidates))]
+                    self.assertTrue(self.table.erase(pos, i))
+                    self.reference.erase(pos, i)
+            if index % 100 == 0:
+                check_table(self, self.table, self.reference, positions)
+        check_table(self, self.table, self.reference, positions)
+
+    def testSignedZero(self):
+        self.table.emplace(-0.0, 0)
+        self.table.emplace(0.0, 1)
+        self.assertEqual(self.table.count(0.0), 2)
+        self.assertEqual(self.table.equal_range(-0.0), [0, 1])
+        self.assertTrue(self.table.erase(0.0, 0))
+        self.assertTrue(self.table.erase(-0.0, 1))
+        self.assertTrue(self.table.find(0.0) is None)
+        self.assertEqual(len(self.table), 0)
+
+    def testClearAndReserve(self):
+        for i in range(100):
+            self.table.emplace(i/100., i)
+        self.table.clear()
+        self.assertEqual(len(self.table), 0)
+        self.assertEqual(self.table.items(), [])
+        self.table.reserve(1000)
+        for i in range(1000):
+            self.emplace(i/1000., i)
+        check_table(self, self.table, self.reference,
+                    [i/1000. for i in range(1000)])
+
+
+class testPopulationLookup(unittest.TestCase):
+    """
+    After a simulation with fixations and recycled
+    mutations, the population's table contains
+    exactly the extant mutations.
+    """
+    @classmethod
+    def setUpClass(self):
+        from quick_pops import quick_nonneutral_slocus
+        self.pop = quick_nonneutral_slocus(
+            N=50, simlen=1000, dfe=fwdpy11.ExpS(0, 1, 1, 0.05))
+
+    def testFixationsAndRecycling(self):
+        self.assertTrue(len(self.pop.fixations) > 0)
+        self.assertTrue(any(i == 0 for i in self.pop.mcounts))
+
+    def testLookup(self):
+        extant = {}
+        for i, m in enumerate(self.pop.mutations):
+            if self.pop.mcounts[i] > 0:
+                extant.setdefault(m.pos, []).append(i)
+        self.assertEqual(self.pop.mut_lookup, extant)
+        for pos, indexes in extant.items():
+            self.assertEqual(self.pop.mutation_indexes(pos).tolist(),
+                             sorted(indexes))
+        for f in self.pop.fixations:
+            if f.pos not in extant:
+                self.assertTrue(self.pop.mutation_indexes(f.pos) is None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -52,6 +52,60 @@ class test_DiploidPopulation(unittest.TestCase):
             self.assertEqual(i['first'], j.first)
             self.assertEqual(i['second'], j.second)
 
+    def testHaploidGenomeKeys(self):
+        for selected in [True, False]:
+            offsets, keys = self.pop.haploid_genome_keys(selected)
+            self.assertEqual(len(offsets), len(self.pop.haploid_genomes) + 1)
+            self.assertEqual(offsets[-1], len(keys))
+            for i, g in enumerate(self.pop.haploid_genomes):
+                k = g.smutations if selected else g.mutations
+                self.assertTrue(np.array_equal(
+                    keys[offsets[i]:offsets[i+1]], np.array(k)))
+            with self.assertRaises(ValueError):
+                keys[0] = 0
+
+    def testHaploidGenomeCounts(self):
+        n = self.pop.haploid_genome_counts
+        self.assertTrue(np.array_equal(
+            n, [g.n for g in self.pop.haploid_genomes]))
+        self.assertEqual(n.sum(), 2*self.pop.N)
+
+
+class test_MutationVectorArrays(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.mutations = fwdpy11.MutationVector()
+        for i in range(10):
+            esizes = [0.1*j for j in range(i % 3)]
+            heffects = [1.0]*len(esizes)
+            self.mutations.append(fwdpy11.Mutation(
+                0.1*i, -0.01*i, 1.0, i, esizes, heffects, i))
+        self.arrays = self.mutations.to_ndarrays()
+
+    def testExport(self):
+        m, eo, e, ho, h = self.arrays
+        self.assertEqual(len(m), len(self.mutations))
+        self.assertEqual(len(eo), len(self.mutations) + 1)
+        for i, j in enumerate(self.mutations):
+            self.assertEqual(m[i]['pos'], j.pos)
+            self.assertEqual(m[i]['label'], j.label)
+            self.assertEqual(m[i]['neutral'], j.neutral)
+            self.assertEqual(list(e[eo[i]:eo[i+1]]), list(j.esizes))
+            self.assertEqual(list(h[ho[i]:ho[i+1]]), list(j.heffects))
+
+    def testRoundTrip(self):
+        mv = fwdpy11.MutationVector.from_ndarrays(*self.arrays)
+        self.assertEqual(len(mv), len(self.mutations))
+        for i, j in zip(mv, self.mutations):
+            self.assertTrue(i == j)
+
+    def testInvalidOffsets(self):
+        m, eo, e, ho, h = self.arrays
+        with self.assertRaises(ValueError):
+            fwdpy11.MutationVector.from_ndarrays(m, eo[:-1], e, ho, h)
+        with self.assertRaises(ValueError):
+            fwdpy11.MutationVector.from_ndarrays(m, eo, e[:-1], ho, h)
+
 
 if __name__ == "__main__":
     unittest.main()
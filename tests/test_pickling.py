@@ -98,6 +98,22 @@ class testPickleDiploidPopulation(unittest.TestCase):
         pp = pickle.loads(p)
         self.assertEqual(pp, self.pop)
 
+    def testUnpickleFromBuffers(self):
+        import fwdpy11
+        state = self.pop.__getstate__()
+        for buffer in [memoryview(state), bytearray(state)]:
+            pp = fwdpy11.DiploidPopulation.__new__(fwdpy11.DiploidPopulation)
+            pp.__setstate__(buffer)
+            self.assertEqual(pp, self.pop)
+
+    def testUnpickleTruncatedBuffer(self):
+        import fwdpy11
+        state = self.pop.__getstate__()
+        for size in [0, 3, len(state)//2, len(state) - 1]:
+            pp = fwdpy11.DiploidPopulation.__new__(fwdpy11.DiploidPopulation)
+            with self.assertRaises(RuntimeError):
+                pp.__setstate__(memoryview(state)[:size])
+
     def testPickleTableCollection(self):
         import pickle
         import numpy as np
@@ -4,6 +4,7 @@ import numpy as np
 import copy
 import os
 import pickle
+import pickling_cpp
 
 
 class Recorder(object):
@@ -227,6 +228,46 @@ class testTreeSequencesNoAncientSamplesKeepFixations(unittest.TestCase):
 
         self.assertEqual(mcounts_comparison(self.pop, dumped_ts), True)
 
+    def test_dump_to_tskit_binary_metadata(self):
+        import struct
+        import tskit
+        dumped_ts = self.pop.dump_tables_to_tskit(binary_metadata=True)
+        ts = self.pop.dump_tables_to_tskit()
+        self.assertTrue(np.array_equal(dumped_ts.tables.nodes.time,
+                                       ts.tables.nodes.time))
+        self.assertTrue(np.array_equal(dumped_ts.tables.nodes.individual,
+                                       ts.tables.nodes.individual))
+        md = tskit.unpack_bytes(dumped_ts.tables.individuals.metadata,
+                                dumped_ts.tables.individuals.metadata_offset)
+        self.assertEqual(len(md), self.pop.N)
+        for i, j in zip(self.pop.diploid_metadata, md):
+            d = struct.unpack("<6d2Q2iQ", j)
+            self.assertEqual(i.g, d[0])
+            self.assertEqual(i.e, d[1])
+            self.assertEqual(i.w, d[2])
+            self.assertEqual(i.geography, d[3:6])
+            self.assertEqual(i.parents, d[6:8])
+            self.assertEqual(i.sex, d[8])
+            self.assertEqual(i.deme, d[9])
+            self.assertEqual(i.label, d[10])
+
+        md = tskit.unpack_bytes(dumped_ts.tables.mutations.metadata,
+                                dumped_ts.tables.mutations.metadata_offset)
+        fmt = "<2dqHBQ2I"
+        for i, j in zip(self.pop.tables.mutations, md):
+            d = struct.unpack_from(fmt, j)
+            m = self.pop.mutations[i.key]
+            self.assertEqual(d[0], m.s)
+            self.assertEqual(d[1], m.h)
+            self.assertEqual(d[2], self.pop.generation - m.g + 1)
+            self.assertEqual(d[3], m.label)
+            self.assertEqual(bool(d[4]), m.neutral)
+            self.assertEqual(d[5], i.key)
+            values = struct.unpack_from("<{}d".format(d[6] + d[7]), j,
+                                        struct.calcsize(fmt))
+            self.assertEqual(values[:d[6]], tuple(m.esizes))
+            self.assertEqual(values[d[6]:], tuple(m.heffects))
+
     def test_TreeIterator(self):
         # The first test ensures that TreeIterator
         # simply holds a reference to the input tables,
@@ -780,6 +821,69 @@ class testTreeSequencesWithAncientSamplesPruneFixations(unittest.TestCase):
         if os.path.exists(ofile):
             os.remove(ofile)
 
+    def test_sections_round_trip(self):
+        ofile = "poptest_with_ancient_prune_fixations.sections"
+        for level in (0, 6):
+            self.pop.dump_sections_to_file(ofile, level)
+            pop2 = fwdpy11.DiploidPopulation.load_from_sections_file(ofile)
+            self.assertTrue(self.pop == pop2)
+            self.assertEqual(len(self.pop.ancient_sample_metadata),
+                             len(pop2.ancient_sample_metadata))
+            self.assertTrue(np.array_equal(
+                self.pop.genetic_value_matrix, pop2.genetic_value_matrix))
+        if os.path.exists(ofile):
+            os.remove(ofile)
+
+    def test_load_sections(self):
+        ofile = "poptest_with_ancient_prune_fixations_partial.sections"
+        self.pop.dump_sections_to_file(ofile, 1)
+        s = fwdpy11.DiploidPopulation.load_sections_from_file(
+            ofile, ["population", "tables.nodes", "tables.edges",
+                    "ancient_sample_metadata"])
+        self.assertEqual(len(s), 4)
+        self.assertEqual(s["population"]["generation"], self.pop.generation)
+        self.assertEqual(s["population"]["N"], self.pop.N)
+        self.assertEqual(s["population"]["genome_length"],
+                         self.pop.tables.genome_length)
+        self.assertTrue(np.array_equal(
+            np.array(s["tables.nodes"]), np.array(self.pop.tables.nodes)))
+        self.assertTrue(np.array_equal(
+            np.array(s["tables.edges"]), np.array(self.pop.tables.edges)))
+        self.assertTrue(np.array_equal(
+            np.array(s["ancient_sample_metadata"]),
+            np.array(self.pop.ancient_sample_metadata)))
+        with self.assertRaises(ValueError):
+            fwdpy11.DiploidPopulation.load_sections_from_file(
+                ofile, ["no_such_section"])
+        if os.path.exists(ofile):
+            os.remove(ofile)
+
+    def test_tables_from_sections_file(self):
+        ofile = "poptest_with_ancient_prune_fixations_tables.sections"
+        self.pop.dump_sections_to_file(ofile)
+        tables = fwdpy11.TableCollection.load_from_sections_file(ofile)
+        self.assertTrue(tables == self.pop.tables)
+        samples = [i for i in range(2*self.pop.N)]
+        tt = 0.0
+        for t in fwdpy11.TreeIterator(tables, samples):
+            tt += t.total_time(tables.nodes)
+        tt_pop = 0.0
+        for t in fwdpy11.TreeIterator(self.pop.tables, samples):
+            tt_pop += t.total_time(self.pop.tables.nodes)
+        self.assertEqual(tt, tt_pop)
+
+        views = fwdpy11.TableCollection.memmap_sections_file(ofile)
+        for name in ('nodes', 'edges', 'sites', 'mutations'):
+            v = views[name]
+            self.assertFalse(v.flags.writeable)
+            self.assertTrue(np.array_equal(
+                v, np.array(getattr(self.pop.tables, name))))
+        self.assertTrue(np.array_equal(views['preserved_nodes'],
+                                       self.pop.tables.preserved_nodes))
+        del views
+        if os.path.exists(ofile):
+            os.remove(ofile)
+
     def test_fast_pickling(self):
         p = pickle.dumps(self.pop, -1)
         up = pickle.loads(p)
@@ -792,9 +896,29 @@ class testTreeSequencesWithAncientSamplesPruneFixations(unittest.TestCase):
         with open(ofile, 'rb') as f:
             pop2 = fwdpy11.DiploidPopulation.load_from_pickle_file(f)
         self.assertTrue(self.pop == pop2)
+        records = pickling_cpp.ancient_sample_records(self.pop)
+        self.assertTrue(len(records) > 0)
+        self.assertEqual(pickling_cpp.ancient_sample_records(pop2), records)
         if os.path.exists(ofile):
             os.remove(ofile)
 
+    @unittest.skipIf(pickle.HIGHEST_PROTOCOL < 5, "requires pickle protocol 5")
+    def test_pickle_protocol_5(self):
+        buffers = []
+        p = pickle.dumps(self.pop, protocol=5,
+                         buffer_callback=buffers.append)
+        self.assertTrue(len(buffers) > 0)
+        up = pickle.loads(p, buffers=buffers)
+        self.assertTrue(self.pop == up)
+        self.assertTrue(np.array_equal(
+            np.array(self.pop.ancient_sample_metadata),
+            np.array(up.ancient_sample_metadata)))
+        self.assertTrue(np.array_equal(self.pop.mcounts_from_preserved_nodes,
+                                       up.mcounts_from_preserved_nodes))
+        records = pickling_cpp.ancient_sample_records(self.pop)
+        self.assertTrue(len(records) > 0)
+        self.assertEqual(pickling_cpp.ancient_sample_records(up), records)
+
     def test_genotype_matrix(self):
         dm = fwdpy11.data_matrix_from_tables(self.pop.tables,
                                              [i for i in range(2*self.pop.N)],
@@ -842,6 +966,251 @@ class testSimplificationInterval(unittest.TestCase):
         vi = fwdpy11.TreeIterator(self.pop.tables, samples)
 
 
+class TestIncrementalSimplification(unittest.TestCase):
+    """
+    Sorting only the new data prior to simplification
+    must not change the output of a simulation.
+    """
+    @classmethod
+    def setUpClass(self):
+        self.params, self.rng, self.pop = set_up_standard_pop_gen_model()
+        self.params.demography = np.array([self.pop.N]*500, dtype=np.uint32)
+        self.pop2 = copy.deepcopy(self.pop)
+        self.rng2 = fwdpy11.GSLrng(666**2)
+        self.ancient_samples = fwdpy11.RandomAncientSamples(
+            seed=42, samplesize=10, timepoints=[i for i in range(1, 501, 50)])
+        self.ancient_samples2 = fwdpy11.RandomAncientSamples(
+            seed=42, samplesize=10, timepoints=[i for i in range(1, 501, 50)])
+        fwdpy11.evolvets(self.rng, self.pop, self.params, 37,
+                         self.ancient_samples)
+        fwdpy11.evolvets(self.rng2, self.pop2, self.params, 37,
+                         self.ancient_samples2,
+                         incremental_simplification=True)
+
+    def test_tables(self):
+        self.assertTrue(self.pop.tables == self.pop2.tables)
+
+    def test_populations(self):
+        self.assertTrue(self.pop == self.pop2)
+
+
+class TestSimplificationSchedulers(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.params, self.rng, self.pop = set_up_standard_pop_gen_model()
+        self.params.demography = np.array([self.pop.N]*250, dtype=np.uint32)
+
+    def test_fixed_interval(self):
+        pop = copy.deepcopy(self.pop)
+        pop2 = copy.deepcopy(self.pop)
+        s = fwdpy11.FixedSimplificationInterval(100)
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), pop, self.params, 100)
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), pop2, self.params, s)
+        self.assertTrue(pop == pop2)
+        r = s.records
+        # Two simplifications during the simulation, and
+        # one at the end.
+        self.assertEqual(len(r), 3)
+        self.assertEqual(r['generation'][-1], pop2.generation)
+        self.assertTrue(all(r['edges_after'] <= r['edges_before']))
+        self.assertTrue(all(r['nodes_after'] <= r['nodes_before']))
+        self.assertTrue(all(r['simplification_time'] >= 0.0))
+        s.clear_records()
+        self.assertEqual(len(s.records), 0)
+
+    def test_edge_table_size(self):
+        pop = copy.deepcopy(self.pop)
+        s = fwdpy11.EdgeTableSizeScheduler(20*pop.N)
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), pop, self.params, s)
+        r = s.records
+        self.assertTrue(len(r) > 1)
+        self.assertTrue(all(r['edges_before'][:-1] >= 20*pop.N))
+
+    def test_memory_budget(self):
+        pop = copy.deepcopy(self.pop)
+        s = fwdpy11.MemoryBudgetScheduler(1024**2)
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), pop, self.params, s)
+        r = s.records
+        self.assertTrue(len(r) > 1)
+        self.assertTrue(all(r['bytes_before'][:-1] >= 1024**2))
+
+    def test_time_ratio(self):
+        pop = copy.deepcopy(self.pop)
+        s = fwdpy11.TimeRatioScheduler(0.1, 10)
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), pop, self.params, s)
+        r = s.records
+        self.assertTrue(len(r) > 1)
+        self.assertEqual(r['interval'][0], 10)
+
+    def test_invalid_schedulers(self):
+        with self.assertRaises(ValueError):
+            fwdpy11.FixedSimplificationInterval(0)
+        with self.assertRaises(ValueError):
+            fwdpy11.EdgeTableSizeScheduler(0)
+        with self.assertRaises(ValueError):
+            fwdpy11.MemoryBudgetScheduler(0)
+        with self.assertRaises(ValueError):
+            fwdpy11.TimeRatioScheduler(-1.0)
+
+
+class TestEvolvetsTimings(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.params, self.rng, self.pop = set_up_standard_pop_gen_model()
+        self.params.demography = np.array([self.pop.N]*250, dtype=np.uint32)
+
+    def test_timings(self):
+        pop = copy.deepcopy(self.pop)
+        pop2 = copy.deepcopy(self.pop)
+        t = fwdpy11.EvolvetsTimings()
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), pop, self.params, 100)
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), pop2, self.params, 100,
+                         timings=t)
+        # Timing does not change the output
+        self.assertTrue(pop == pop2)
+        self.assertEqual(t.generations, 250)
+        self.assertEqual(t.counts['offspring_generation'], 250)
+        self.assertEqual(t.counts['fitness_calculation'], 250)
+        self.assertEqual(t.counts['simplification'], 3)
+        self.assertEqual(t.counts['recycling_bin_rebuild'], 2)
+        self.assertEqual(t.counts['mutation_counting'], 1)
+        self.assertEqual(t.counts['ancient_samples'], 0)
+        self.assertTrue(all(i >= 0.0 for i in t.seconds.values()))
+        self.assertEqual(sorted(t.seconds.keys()), sorted(t.counts.keys()))
+        self.assertTrue(t.recycled_mutations <= t.new_mutations)
+        r = t.simplifications
+        self.assertEqual(len(r), 3)
+        self.assertEqual(r['generation'][-1], pop2.generation)
+        self.assertTrue(all(r['edges_after'] <= r['edges_before']))
+        self.assertTrue(all(r['nodes_after'] <= r['nodes_before']))
+
+        # Times and counts accumulate over simulations
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), pop2, self.params, 100,
+                         timings=t)
+        self.assertEqual(t.generations, 500)
+        self.assertEqual(len(t.simplifications), 6)
+        t.clear()
+        self.assertEqual(t.generations, 0)
+        self.assertEqual(len(t.simplifications), 0)
+        self.assertTrue(all(i == 0 for i in t.counts.values()))
+
+
+class TestParallelOffspringGeneration(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.params, self.rng, self.pop = set_up_standard_pop_gen_model()
+        self.params.demography = np.array([self.pop.N]*500, dtype=np.uint32)
+        self.pop2 = copy.deepcopy(self.pop)
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), self.pop, self.params, 100,
+                         nthreads=2)
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), self.pop2, self.params, 100,
+                         nthreads=4)
+
+    def test_output_does_not_depend_on_nthreads(self):
+        self.assertTrue(self.pop == self.pop2)
+
+    def test_mutation_counts_from_genomes(self):
+        mc = [0] * len(self.pop.mutations)
+        for g in self.pop.haploid_genomes:
+            if g.n > 0:
+                for k in g.smutations:
+                    mc[k] += g.n
+        self.assertTrue(
+            all([i == j for i, j in zip(mc, self.pop.mcounts)]) is True)
+
+    def test_genomes_sorted(self):
+        for g in self.pop.haploid_genomes:
+            if g.n > 0:
+                pos = [self.pop.mutations[k].pos for k in g.smutations]
+                self.assertTrue(pos == sorted(pos))
+
+    def test_invalid_nthreads(self):
+        with self.assertRaises(ValueError):
+            fwdpy11.evolvets(fwdpy11.GSLrng(42), self.pop, self.params, 100,
+                             nthreads=0)
+
+
+class TestParallelFitnessCalculation(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.params, self.rng, self.pop = set_up_quant_trait_model()
+        self.params.demography = np.array([self.pop.N]*200, dtype=np.uint32)
+        self.params.gvalue = fwdpy11.Additive(
+            2.0, fwdpy11.GSS(VS=1, opt=0), fwdpy11.GaussianNoise(sd=0.1))
+        self.pop2 = copy.deepcopy(self.pop)
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), self.pop, self.params, 100,
+                         nthreads=2)
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), self.pop2, self.params, 100,
+                         nthreads=4)
+
+    def test_output_does_not_depend_on_nthreads(self):
+        self.assertTrue(self.pop == self.pop2)
+
+    def test_metadata(self):
+        gv = self.params.gvalue
+        for i, md in enumerate(self.pop.diploid_metadata):
+            self.assertEqual(md.g, gv(i, self.pop))
+            self.assertEqual(md.w, gv.fitness(i, self.pop))
+
+
+class TestUniformFitness(unittest.TestCase):
+    """
+    Neutral models skip the calculation of genetic values
+    """
+    @classmethod
+    def setUpClass(self):
+        N = 500
+        self.pdict = {'nregions': [fwdpy11.Region(0, 1, 1)],
+                      'sregions': [],
+                      'recregions': [fwdpy11.Region(0, 1, 1)],
+                      'rates': (1e-3, 0., 1e-3),
+                      'gvalue': fwdpy11.Additive(2.0),
+                      'demography': np.array([N]*200, dtype=np.uint32)
+                      }
+        self.pop = fwdpy11.DiploidPopulation(N, 1.0)
+
+    def test_metadata(self):
+        pop = copy.deepcopy(self.pop)
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), pop,
+                         fwdpy11.ModelParams(**self.pdict), 100,
+                         record_gvalue_matrix=True)
+        md = np.array(pop.diploid_metadata, copy=False)
+        self.assertTrue(np.all(md['g'] == 1.0))
+        self.assertTrue(np.all(md['e'] == 0.0))
+        self.assertTrue(np.all(md['w'] == 1.0))
+        self.assertTrue(np.all(pop.genetic_values == 1.0))
+
+    def test_recorder_sees_metadata(self):
+        fitnesses = []
+
+        def recorder(pop, sampler):
+            md = np.array(pop.diploid_metadata, copy=False)
+            fitnesses.append(np.all(md['w'] == 1.0))
+
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), copy.deepcopy(self.pop),
+                         fwdpy11.ModelParams(**self.pdict), 100, recorder)
+        self.assertEqual(len(fitnesses), 200)
+        self.assertTrue(all(fitnesses))
+
+    def test_same_output_as_constant_fitness(self):
+        """
+        A trait with no mutations gives every individual
+        the same fitness, but genetic values are calculated.
+        """
+        pop = copy.deepcopy(self.pop)
+        pop2 = copy.deepcopy(self.pop)
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), pop,
+                         fwdpy11.ModelParams(**self.pdict), 100)
+        pdict = dict(self.pdict)
+        pdict['gvalue'] = fwdpy11.Additive(2.0, fwdpy11.GSS(VS=1, opt=0))
+        fwdpy11.evolvets(fwdpy11.GSLrng(42), pop2,
+                         fwdpy11.ModelParams(**pdict), 100)
+        for t in ('nodes', 'edges', 'mutations'):
+            self.assertTrue(np.array_equal(
+                np.array(getattr(pop.tables, t)),
+                np.array(getattr(pop2.tables, t))))
+
+
 class testFixationPreservation(unittest.TestCase):
     def testQtraitSim(self):
         N = 1000